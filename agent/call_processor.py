@@ -21,14 +21,13 @@ from datetime import datetime
 from typing import Optional, Callable
 
 import pytz
-import requests
 from anthropic import Anthropic
 
+import tools.serper_cache as serper_cache
+
 logger = logging.getLogger(__name__)
 CST = pytz.timezone("America/Chicago")
 
-SERPER_URL = "https://google.serper.dev/search"
-
 
 class CallProcessor:
 
@@ -659,14 +658,11 @@ Body:
         if not self._serper_key:
             return []
         try:
-            r = requests.post(
-                SERPER_URL,
-                json={"q": query, "num": num},
-                headers={"X-API-KEY": self._serper_key, "Content-Type": "application/json"},
-                timeout=10,
+            data = serper_cache.search(
+                query, "call_processor._serper_search", api_key=self._serper_key,
+                num=num, timeout=10,
             )
-            r.raise_for_status()
-            return r.json().get("organic", [])
+            return data.get("organic", [])
         except Exception as e:
             logger.warning(f"[CallProcessor] Serper search failed: {e}")
             return []
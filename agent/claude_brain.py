@@ -36,7 +36,7 @@ TOOLS = [
     },
     {
         "name": "get_research_queue_status",
-        "description": "Get current research job and queue depth.",
+        "description": "Get in-flight research jobs, queue depth and ETA.",
         "input_schema": {"type": "object", "properties": {}, "required": []},
     },
     {
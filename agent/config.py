@@ -33,6 +33,21 @@ GOOGLE_SERVICE_ACCOUNT_JSON = os.environ.get("GOOGLE_SERVICE_ACCOUNT_JSON", "")
 GAS_WEBHOOK_URL = os.environ.get("GAS_WEBHOOK_URL", "")
 GAS_SECRET_TOKEN = os.environ.get("GAS_SECRET_TOKEN", "")
 
+# Persistent state
+# DATA_DIR holds on-disk state that has to outlive a redeploy: the territory
+# snapshot and warm-start index, Serper / page caches, research checkpoints and
+# traces, the email pattern store. /tmp is wiped on every Railway redeploy, so
+# attach a volume — Railway sets RAILWAY_VOLUME_MOUNT_PATH; SCOUT_DATA_DIR
+# overrides it. Each store's own *_DIR variable still overrides its subfolder.
+DATA_DIR = (os.environ.get("SCOUT_DATA_DIR") or os.environ.get("RAILWAY_VOLUME_MOUNT_PATH")
+            or "/tmp")
+
+
+def data_dir_persistent() -> bool:
+    """False when DATA_DIR fell back to /tmp (caches and checkpoints die with the container)."""
+    return bool(os.environ.get("SCOUT_DATA_DIR") or os.environ.get("RAILWAY_VOLUME_MOUNT_PATH"))
+
+
 def gas_bridge_configured() -> bool:
     """Returns True if GAS bridge variables are set."""
     return bool(GAS_WEBHOOK_URL and GAS_SECRET_TOKEN)
@@ -19,12 +19,13 @@ from telegram.ext import Application, MessageHandler, filters, ContextTypes
 from agent.config import (
     TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, AGENT_NAME,
     GAS_WEBHOOK_URL, GAS_SECRET_TOKEN, gas_bridge_configured,
+    DATA_DIR, data_dir_persistent,
 )
 from agent.claude_brain import process_message, build_draft_prompt, draft_email_with_claude
 from agent.memory_manager import MemoryManager
 from agent.scheduler import Scheduler
 from agent.voice_trainer import VoiceTrainer
-from tools.research_engine import research_queue   # singleton queue from Phase 2
+from tools.research_engine import research_queue, PRIORITY_BULK   # singleton queue from Phase 2
 import tools.sheets_writer as sheets_writer
 import tools.activity_tracker as activity_tracker
 import tools.csv_importer as csv_importer
@@ -33,6 +34,11 @@ import tools.district_prospector as district_prospector
 import tools.pipeline_tracker as pipeline_tracker
 import tools.lead_importer as lead_importer
 import tools.territory_data as territory_data
+import tools.territory_index as territory_index
+import tools.research_planner as research_planner
+import tools.research_trace as research_trace
+import tools.page_cache as page_cache
+import tools.serper_cache as serper_cache
 import tools.todo_manager as todo_manager
 import tools.proximity_engine as proximity_engine
 import tools.signal_processor as signal_processor
@@ -353,6 +359,14 @@ async def _on_research_complete(result: dict):
         await send_message(f"❌ Research finished but sheet write failed: {e}")
 
 
+def _research_completion_for(context: dict | None):
+    """Completion callback for a research job resumed from its checkpoint context."""
+    prospect = (context or {}).get("prospect")
+    if prospect:
+        return lambda result: asyncio.ensure_future(_on_prospect_research_complete(result, prospect))
+    return _on_research_complete
+
+
 async def _on_prospect_research_complete(result: dict, prospect: dict):
     """Runs after research finishes for an approved prospect. Logs research, then auto-builds a sequence and marks complete."""
     # Run the standard research-complete flow first (writes to Sheets, sends Telegram summary)
@@ -612,11 +626,15 @@ async def execute_tool(tool_name: str, tool_input: dict) -> str:
             return f"❌ Could not read sheet: {e}"
 
     elif tool_name == "get_research_queue_status":
-        current = research_queue.current_job
-        depth = research_queue.queue_size
-        if not current:
+        status = research_queue.status()
+        if not status["in_flight"] and not status["queued"]:
             return "✅ No research running. Queue empty."
-        return f"🔍 Currently researching: *{current}*\nJobs queued: {depth}"
+        lines = [f"🔍 Researching {len(status['in_flight'])}/{status['workers']}:"]
+        for job in status["in_flight"]:
+            lines.append(f"• *{job['district_name']}* ({job['elapsed_seconds'] // 60} min)")
+        lines.append(f"Jobs queued: {status['queued']}")
+        lines.append(f"ETA to clear queue: ~{max(1, round(status['eta_seconds'] / 60))} min")
+        return "\n".join(lines)
 
     elif tool_name == "ping_gas_bridge":
         gas = get_gas_bridge()
@@ -1666,6 +1684,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             progress_callback=_on_research_progress,
             completion_callback=_on_research_complete,
             serper_cap_override=200,
+            force_all_layers=True,
         )
         return
 
@@ -2021,6 +2040,12 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 f"Schools: {result['schools_synced']:,}\n"
                 f"States: {', '.join(result['states_completed'])}"
             )
+            for st, kinds in (result.get("changes") or {}).items():
+                parts = [
+                    f"{kind} +{c['inserted']} ~{c['updated']} -{c['deleted']}"
+                    for kind, c in kinds.items()
+                ]
+                msg += f"\n{st}: {', '.join(parts)}"
             if result.get("errors"):
                 msg += f"\n⚠️ Errors: {'; '.join(result['errors'])}"
             await send_message(msg)
@@ -2028,6 +2053,23 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await send_message(f"❌ Territory sync error: {e}")
         return
 
+    elif user_text.lower().startswith("/research_stats"):
+        args = user_text[len("/research_stats"):].strip()
+        limit = int(args) if args.isdigit() else research_trace.RESEARCH_STATS_RECENT_JOBS
+        try:
+            loop = asyncio.get_running_loop()
+            stats = await loop.run_in_executor(None, research_trace.research_stats, limit)
+            savings = await loop.run_in_executor(None, research_planner.projected_savings)
+            planner = research_planner.format_projected_savings(savings)
+            report = research_trace.format_research_stats(stats)
+            if planner and stats.get("jobs"):
+                report = f"{report}\n\n{planner}"
+            cache = serper_cache.format_stats(serper_cache.stats())
+            await send_message(f"{report}\n\n{cache}" if cache else report)
+        except Exception as e:
+            await send_message(f"❌ Research stats error: {e}")
+        return
+
     elif user_text.lower().startswith("/territory_stats"):
         args = user_text[len("/territory_stats"):].strip()
         try:
@@ -2560,6 +2602,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         completion_callback=lambda result, prospect=d: asyncio.ensure_future(
                             _on_prospect_research_complete(result, prospect)
                         ),
+                        priority=PRIORITY_BULK,
+                        context={"prospect": d},
                     )
 
             # Warn about flagged districts and ask for confirmation
@@ -2956,6 +3000,8 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     completion_callback=lambda result, prospect=d: asyncio.ensure_future(
                         _on_prospect_research_complete(result, prospect)
                     ),
+                    priority=PRIORITY_BULK,
+                    context={"prospect": d},
                 )
         except Exception as e:
             await send_message(f"Force-approve error: {e}")
@@ -4607,6 +4653,21 @@ async def _check_precall_briefs(gas):
 
 # ── Entry point ────────────────────────────────────────────────────────────────
 
+def _prune_serper_cache():
+    """Delete expired Serper cache files and log per-caller hit rates, then trim the
+    page cache (age + size cap). Never raises."""
+    try:
+        removed = serper_cache.prune()
+        logger.info(f"Serper cache: pruned {removed} expired entries; stats {serper_cache.stats()}")
+    except Exception as e:
+        logger.warning(f"Serper cache prune failed (non-fatal): {e}")
+    try:
+        removed = page_cache.prune()
+        logger.info(f"Page cache: pruned {removed} entries")
+    except Exception as e:
+        logger.warning(f"Page cache prune failed (non-fatal): {e}")
+
+
 async def _run_telegram_and_scheduler():
     app = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
@@ -4619,6 +4680,28 @@ async def _run_telegram_and_scheduler():
     await app.start()
     await app.updater.start_polling()
 
+    if not data_dir_persistent():
+        logger.warning(f"SCOUT_DATA_DIR / RAILWAY_VOLUME_MOUNT_PATH not set — persistent state "
+                       f"is under {DATA_DIR} and will be lost on the next redeploy")
+
+    # Load the shared NCES territory index (warm-start file) in the background
+    asyncio.get_running_loop().run_in_executor(None, territory_index.warm_start)
+    # Drop expired Serper / page cache entries (repeated daily in the loop below)
+    asyncio.get_running_loop().run_in_executor(None, _prune_serper_cache)
+    serper_prune_last_check: float = time.time()
+
+    # Resume research jobs a redeploy/crash interrupted (from their last checkpointed phase)
+    try:
+        resumed = await research_queue.resume_interrupted(
+            _on_research_progress, _research_completion_for
+        )
+        if resumed:
+            await send_message(
+                f"♻️ Resuming {len(resumed)} interrupted research job(s): {', '.join(resumed)}"
+            )
+    except Exception as e:
+        logger.warning(f"Research resume failed (non-fatal): {e}")
+
     # One-time sheet cleanup: remove unused tabs + apply alternating row colors
     try:
         loop = asyncio.get_running_loop()
@@ -4628,9 +4711,12 @@ async def _run_telegram_and_scheduler():
 
     gas_status = "GAS bridge ready" if gas_bridge_configured() else "GAS bridge not configured"
     ff_status = "Fireflies ready" if FIREFLIES_API_KEY else "FIREFLIES_API_KEY not set"
+    data_status = (f"State in {DATA_DIR}" if data_dir_persistent()
+                   else "⚠️ No data volume — caches/checkpoints reset on redeploy")
     await send_message(
         f"Scout is online — Phase 6F+ active.\n"
         f"{gas_status} | {ff_status}\n"
+        f"{data_status}\n"
         f"Commands: /brief | /recent_calls | /call [id] | /push_code [file]\n"
         f"/call_list [N] | /progress | /pipeline | /eod\n"
         f"/prospect | /prospect_discover [state] | /prospect_upward | send CSV to import"
@@ -4684,6 +4770,9 @@ async def _run_telegram_and_scheduler():
                 asyncio.create_task(_run_budget_scan())
             elif sched_event == "campaign_autopilot":
                 asyncio.create_task(_run_campaign_autopilot())
+            if time.time() - serper_prune_last_check >= 24 * 3600:
+                serper_prune_last_check = time.time()
+                asyncio.get_running_loop().run_in_executor(None, _prune_serper_cache)
             if gas and FIREFLIES_API_KEY:
                 asyncio.create_task(_check_precall_briefs(gas))
                 now_ts = time.time()
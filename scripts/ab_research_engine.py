@@ -3,8 +3,9 @@ Research engine A/B harness — v1 (flags off) vs v1 (Round 1 flags on).
 
 Runs two ResearchJob instances serially against the same target and captures:
   - real per-call Claude token usage via response.usage
-  - exact Serper query count from the result dict
-  - Exa / Brave query count approximated from layers_used / skipped_layers
+  - exact Serper / Exa / Brave / Firecrawl call counts from the job's
+    per-layer trace (result["provider_calls"]); older results without a trace
+    fall back to approximating Exa / Brave from layers_used / skipped_layers
   - wall clock elapsed
   - full contact diff (shared, v1-only, v2-only)
 
@@ -38,21 +39,22 @@ from dotenv import load_dotenv  # noqa: E402
 load_dotenv()
 
 from tools.research_engine import ResearchJob  # noqa: E402
+import tools.research_trace as research_trace  # noqa: E402
 
 
 # ─────────────────────────────────────────────
-# Pricing constants (2026 rates)
+# Pricing constants (2026 rates) — shared with the per-layer traces
 # ─────────────────────────────────────────────
-# Claude Sonnet 4.6: $3/M input, $15/M output (standard, no caching)
-_CLAUDE_INPUT_PER_TOKEN = 3.0 / 1_000_000
-_CLAUDE_OUTPUT_PER_TOKEN = 15.0 / 1_000_000
+_CLAUDE_INPUT_PER_TOKEN = research_trace.CLAUDE_INPUT_PER_TOKEN
+_CLAUDE_OUTPUT_PER_TOKEN = research_trace.CLAUDE_OUTPUT_PER_TOKEN
 
 # Flat-rate search APIs
-_SERPER_PER_QUERY = 0.001
-_EXA_PER_QUERY = 0.005
-_BRAVE_PER_QUERY = 0.005
+_SERPER_PER_QUERY = research_trace.SERPER_PER_QUERY
+_EXA_PER_QUERY = research_trace.EXA_PER_QUERY
+_BRAVE_PER_QUERY = research_trace.BRAVE_PER_QUERY
+_FIRECRAWL_PER_CALL = research_trace.FIRECRAWL_PER_CALL
 
-# Exa/Brave query counts aren't tracked by the engine; we infer from
+# Fallback for results without provider_calls: infer Exa/Brave counts from
 # layers_used. L16 fires up to 4 broad queries when active, L17 up to 4
 # domain queries, L20 fires 1 brave query. Skipped layers fire 0.
 _EXA_L16_QUERIES = 4
@@ -71,6 +73,8 @@ def _layer_fired(result: dict, layer_tag: str) -> bool:
 
 
 def _exa_query_estimate(result: dict) -> int:
+    if "provider_calls" in result:
+        return result["provider_calls"].get("exa", 0)
     n = 0
     if _layer_fired(result, "L16:exa-broad"):
         n += _EXA_L16_QUERIES
@@ -80,6 +84,8 @@ def _exa_query_estimate(result: dict) -> int:
 
 
 def _brave_query_estimate(result: dict) -> int:
+    if "provider_calls" in result:
+        return result["provider_calls"].get("brave", 0)
     return _BRAVE_L20_QUERIES if _layer_fired(result, "L20:brave") else 0
 
 
@@ -101,7 +107,10 @@ def _compute_costs(result: dict) -> dict:
     brave_queries = _brave_query_estimate(result)
     brave_cost = brave_queries * _BRAVE_PER_QUERY
 
-    total = claude_cost + serper_cost + exa_cost + brave_cost
+    firecrawl_calls = (result.get("provider_calls") or {}).get("firecrawl", 0)
+    firecrawl_cost = firecrawl_calls * _FIRECRAWL_PER_CALL
+
+    total = claude_cost + serper_cost + exa_cost + brave_cost + firecrawl_cost
 
     return {
         "claude_calls": len(usage_records),
@@ -111,6 +120,7 @@ def _compute_costs(result: dict) -> dict:
         "cost_serper_usd": round(serper_cost, 4),
         "cost_exa_usd": round(exa_cost, 4),
         "cost_brave_usd": round(brave_cost, 4),
+        "cost_firecrawl_usd": round(firecrawl_cost, 4),
         "cost_total_usd": round(total, 4),
     }
 
@@ -228,6 +238,7 @@ async def _run_engine(label: str, district: str, state: str, **flags) -> tuple[d
                 "cost_serper_usd": 0.0,
                 "cost_exa_usd": 0.0,
                 "cost_brave_usd": 0.0,
+                "cost_firecrawl_usd": 0.0,
                 "claude_calls": 0,
                 "claude_input_tokens": 0,
                 "claude_output_tokens": 0,
@@ -271,6 +282,7 @@ def _print_comparison(v1: dict, v2: dict, diff: dict, gates: dict) -> None:
     _row("serper cost usd", v1["cost_serper_usd"], v2["cost_serper_usd"], ".4f")
     _row("exa cost usd", v1["cost_exa_usd"], v2["cost_exa_usd"], ".4f")
     _row("brave cost usd", v1["cost_brave_usd"], v2["cost_brave_usd"], ".4f")
+    _row("firecrawl cost usd", v1["cost_firecrawl_usd"], v2["cost_firecrawl_usd"], ".4f")
     _row("TOTAL cost usd", v1["cost_total_usd"], v2["cost_total_usd"], ".4f")
     _row("wall clock seconds", v1["wall_clock_seconds"], v2["wall_clock_seconds"])
     print("-" * 70)
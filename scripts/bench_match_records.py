@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: territory_matcher.match_records serial vs spawned-process batch mode.
+
+Seeds a throwaway territory snapshot with synthetic NCES-style districts and
+schools, writes a synthetic lead CSV (company / email / city / state — the
+shape the enrichment scripts feed in), then matches it serially and with
+2..N spawned workers. Checks every worker count returns exactly the serial
+results, in input order, and prints throughput (pool timings include spawning
+the workers and each one loading the index from the warm-start file). No
+Sheets or network I/O.
+
+Usage:
+    .venv/bin/python scripts/bench_match_records.py
+    .venv/bin/python scripts/bench_match_records.py --rows 50000 --workers 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+# setdefault: spawned workers re-import this module and must see the parent's dir
+os.environ.setdefault("TERRITORY_SNAPSHOT_DIR", tempfile.mkdtemp(prefix="bench_match_records_"))
+
+import tools.csv_importer as csv_importer  # noqa: E402
+import tools.territory_matcher as territory_matcher  # noqa: E402
+import tools.territory_snapshot as territory_snapshot  # noqa: E402
+from tools.territory_data import DISTRICT_COLUMNS, SCHOOL_COLUMNS  # noqa: E402
+
+_WORDS = (
+    "oak river lake spring pine cedar north south east west valley hill park grove "
+    "mesa bay harbor ridge fox eagle lincoln washington jefferson madison franklin "
+    "austin round rock plano frisco allen keller summit prairie canyon willow"
+).split()
+_DISTRICT_SUFFIXES = ["ISD", "Independent School District", "Public Schools", "Unified",
+                      "School District", "CUSD 300", "Community Schools"]
+_SCHOOL_SUFFIXES = ["High School", "Middle School", "Elementary", "Academy",
+                    "Elementary School", "Junior High"]
+_STATES = ["TX", "CA", "IL", "OH", "NV", "PA", "MI", "IN"]
+
+
+def _name(rng: random.Random, suffixes: list[str]) -> str:
+    words = rng.sample(_WORDS, rng.randint(1, 3))
+    return f"{' '.join(words).title()} {rng.choice(suffixes)}"
+
+
+def seed_territory(rng: random.Random, n_districts: int, n_schools: int) -> tuple[list, list]:
+    districts, schools = [], []
+    for i in range(n_districts):
+        name = _name(rng, _DISTRICT_SUFFIXES)
+        districts.append([
+            rng.choice(_STATES), name, str(4800000 + i), rng.choice(_WORDS).title(),
+            "1 Main St", "78701", "", "", "", rng.randint(100, 90000), rng.randint(1, 80),
+            "PK-12", "Regular local school district", 30 + rng.random() * 10,
+            -100 + rng.random() * 10, "2026-01-01", csv_importer.normalize_name(name),
+        ])
+    for i in range(n_schools):
+        d = rng.choice(districts)
+        name = _name(rng, _SCHOOL_SUFFIXES)
+        schools.append([
+            d[0], name, d[1], str(480000000000 + i), d[2], d[3], "", "", "", "",
+            rng.randint(50, 3000), "09-12", "Regular school", "No", d[13], d[14],
+            "2026-01-01", csv_importer.normalize_name(name),
+        ])
+    territory_snapshot.write_states("districts", DISTRICT_COLUMNS, districts, complete=True)
+    territory_snapshot.write_states("schools", SCHOOL_COLUMNS, schools, complete=True)
+    return districts, schools
+
+
+def write_leads(rng: random.Random, path: Path, rows: int, districts: list, schools: list):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["company", "email", "city", "state"])
+        for i in range(rows):
+            r = rng.random()
+            if r < 0.4:
+                s = rng.choice(schools)
+                company, state, city = s[1], s[0], s[5]
+            elif r < 0.7:
+                d = rng.choice(districts)
+                company, state, city = d[1], d[0], d[3]
+            else:
+                company = _name(rng, _SCHOOL_SUFFIXES + ["Learning Center", "Charter"])
+                state, city = rng.choice(_STATES + [""]), rng.choice(_WORDS).title()
+            if rng.random() < 0.3:
+                company = company.upper()
+            domain = "".join(w[0] for w in company.lower().split()) + rng.choice(["isd.org", "k12.us", ".edu"])
+            w.writerow([company, f"teacher{i}@{domain}", city, state if rng.random() < 0.8 else ""])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--districts", type=int, default=12000)
+    parser.add_argument("--schools", type=int, default=90000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({2, 4, os.cpu_count() or 1} - {1}))
+    args = parser.parse_args()
+
+    rng = random.Random(20260411)
+    t0 = time.time()
+    districts, schools = seed_territory(rng, args.districts, args.schools)
+    lead_path = Path(os.environ["TERRITORY_SNAPSHOT_DIR"]) / "leads.csv"
+    write_leads(rng, lead_path, args.rows, districts, schools)
+    with open(lead_path, newline="") as f:
+        leads = list(csv.DictReader(f))
+    territory_matcher.ensure_cache()
+    print(f"Setup: {len(districts)} districts, {len(schools)} schools, "
+          f"{len(leads)} leads in {time.time() - t0:.1f}s (cpu_count={os.cpu_count()})")
+
+    # Warm-up pass: fills normalize_name's memo and the lazy Tier 5 indexes
+    # (spawned workers start cold and build their own)
+    territory_matcher.match_records(leads)
+    baseline_stats: dict = {}
+    baseline = territory_matcher.match_records(leads, stats=baseline_stats)
+    matched = sum(1 for _, m in baseline if m)
+    print(f"\n  {'workers':>7} {'seconds':>9} {'records/s':>11} {'speedup':>8}  identical")
+    print(f"  {'serial':>7} {baseline_stats['seconds']:>9.2f} "
+          f"{baseline_stats['records_per_sec']:>11,.0f} {1.0:>7.1f}x  —")
+
+    ok = True
+    for n in args.workers:
+        if n == 1:
+            continue  # the serial row above
+        stats: dict = {}
+        got = territory_matcher.match_records(leads, workers=n, stats=stats)
+        same = (len(got) == len(baseline)
+                and all(a[0] is b[0] and a[1] == b[1] for a, b in zip(got, baseline)))
+        ok = ok and same
+        speedup = baseline_stats["seconds"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"  {n:>7} {stats['seconds']:>9.2f} {stats['records_per_sec']:>11,.0f} "
+              f"{speedup:>7.1f}x  {'yes' if same else 'NO'}")
+
+    print(f"\nMatched {matched}/{len(leads)} leads")
+    if not ok:
+        print("Parallel results differ from serial")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
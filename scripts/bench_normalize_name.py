@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: csv_importer.normalize_name vs the pre-compiled implementation.
+
+Builds a synthetic corpus of district / school / account names (suffix-heavy,
+abbreviations, parenthetical district tags, punctuation, odd Unicode), checks
+the current normalizer returns exactly what the reference does for every name,
+then times:
+
+  reference   — the original per-call re.sub(str pattern) pipeline
+  cold        — normalize_name with an empty memo (compiled patterns only)
+  warm        — normalize_name again over the same names (memo hits)
+  batch       — normalize_names(list) with a warm memo
+
+Usage:
+    .venv/bin/python scripts/bench_normalize_name.py
+    .venv/bin/python scripts/bench_normalize_name.py --names 100000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.csv_importer as csv_importer  # noqa: E402
+from tools.csv_importer import (  # noqa: E402
+    _KNOWN_ABBREVIATIONS,
+    _PAREN_DISTRICT_RE,
+    _SUFFIX_PATTERNS,
+)
+
+
+def reference_normalize_name(name: str) -> str:
+    """normalize_name as it was before compiled patterns and the memo."""
+    key = name.strip()
+    m = _PAREN_DISTRICT_RE.match(key)
+    if m:
+        key = m.group(1).strip()
+    key = key.lower()
+    key_clean = re.sub(r"[^\w\s]", "", key).strip()
+    if key_clean in _KNOWN_ABBREVIATIONS:
+        key = _KNOWN_ABBREVIATIONS[key_clean]
+    for pattern in _SUFFIX_PATTERNS:
+        key = re.sub(pattern, "", key, flags=re.IGNORECASE)
+    key = re.sub(r"[^\w\s]", "", key)
+    key = re.sub(r"\s+", " ", key).strip()
+    return key
+
+
+_PLACES = [
+    "Austin", "Round Rock", "Medina Valley", "Elk Grove", "Los Angeles", "Plano",
+    "St. John's", "O'Fallon", "Carlinville", "Lake Zurich", "North East",
+    "Cypress-Fairbanks", "San José", "Peñasco", "Çedar", "Jefferson", "Lincoln",
+]
+_SUFFIXES = [
+    "ISD", "Independent School District", "Unified School District", "Unified",
+    "School District", "Public Schools", "Community Unit School District 300",
+    "Community School District", "CUSD 200", "USD", "SD", "District", "Schools",
+    "Elementary", "High School", "Academy", "", "ſchools", "Public School",
+]
+_RAW = list(_KNOWN_ABBREVIATIONS) + ["LAUSD", "H.I.S.D.", "cps", "  NYCDOE  "]
+
+
+def build_corpus(n: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    names = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.05:
+            names.append(rng.choice(_RAW))
+        elif r < 0.20:
+            school = f"{rng.choice(_PLACES)} {rng.choice(['Elementary', 'Middle', 'High School'])}"
+            names.append(f"{school} ({rng.choice(_PLACES)} {rng.choice(_SUFFIXES)})")
+        else:
+            name = f"{rng.choice(_PLACES)} {rng.choice(_SUFFIXES)}"
+            if rng.random() < 0.3:
+                name = name.upper()
+            if rng.random() < 0.1:
+                name = f"  {name}. "
+            names.append(name)
+    return names
+
+
+def _time(fn, names: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(names)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = build_corpus(args.names)
+    unique = len(set(names))
+
+    mismatches = [(n, reference_normalize_name(n), csv_importer.normalize_name(n))
+                  for n in names if reference_normalize_name(n) != csv_importer.normalize_name(n)]
+    if mismatches:
+        for name, ref, got in mismatches[:20]:
+            print(f"MISMATCH {name!r}: reference={ref!r} current={got!r}")
+        print(f"{len(mismatches)} mismatches — current normalize_name is not behavior-identical")
+        return 1
+    print(f"Parity: {len(names)} names ({unique} unique) identical to reference")
+
+    # Distinct strings so the memo can't help the "cold" run
+    cold_names = [f"{n} {i}x" for i, n in enumerate(names)]
+
+    def run_reference(ns):
+        for n in ns:
+            reference_normalize_name(n)
+
+    def run_cold(ns):
+        csv_importer._normalize_name_cached.cache_clear()
+        for n in ns:
+            csv_importer.normalize_name(n)
+
+    def run_warm(ns):
+        for n in ns:
+            csv_importer.normalize_name(n)
+
+    t_ref = _time(run_reference, cold_names, args.repeat)
+    t_cold = _time(run_cold, cold_names, args.repeat)
+    csv_importer._normalize_name_cached.cache_clear()
+    csv_importer.normalize_names(names)
+    t_warm = _time(run_warm, names, args.repeat)
+    t_batch = _time(csv_importer.normalize_names, names, args.repeat)
+
+    n = len(names)
+    print(f"\n  {'variant':<12} {'total s':>9} {'µs/name':>9} {'speedup':>8}")
+    for label, t in [("reference", t_ref), ("cold", t_cold), ("warm", t_warm), ("batch", t_batch)]:
+        print(f"  {label:<12} {t:>9.3f} {t / n * 1e6:>9.2f} {t_ref / t:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: proximity_engine distance kernels on a Texas-sized state.
+
+Texas has the most districts in NCES territory data (~1,200 districts, 20
+ESCs). Generates synthetic points inside the TX bounding box and times the two
+state-wide many-to-many steps three ways:
+
+  scan    — the old pure-Python loops (haversine_miles per pair, first minimum)
+  grid    — spatial_index.nearest_each without NumPy (GeoGridIndex per target)
+  vector  — spatial_index.nearest_each with NumPy (chunked distance matrices)
+
+  sweep   — nearest active account within --radius for every district
+            (find_nearby_state)
+  esa     — nearest ESC for every district (map_districts_to_esa fallback)
+
+Checks grid and vector return exactly the scan's (index, miles) per district.
+
+Usage:
+    .venv/bin/python scripts/bench_proximity.py
+    .venv/bin/python scripts/bench_proximity.py --districts 12000 --accounts 2000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.spatial_index as spatial_index  # noqa: E402
+from tools.spatial_index import PointArray, haversine_miles, nearest_each  # noqa: E402
+
+# Texas bounding box
+_LAT = (25.84, 36.50)
+_LON = (-106.65, -93.51)
+
+
+def _points(rng: random.Random, n: int) -> list[tuple[float, float]]:
+    return [(rng.uniform(*_LAT), rng.uniform(*_LON)) for _ in range(n)]
+
+
+def scan_nearest(sources, targets, max_miles=None) -> list:
+    out = []
+    for lat, lon in sources:
+        min_dist, best = float("inf"), None
+        for j, (tlat, tlon) in enumerate(targets):
+            d = haversine_miles(lat, lon, tlat, tlon)
+            if d < min_dist:
+                min_dist, best = d, j
+        ok = best is not None and (max_miles is None or min_dist <= max_miles)
+        out.append((best, min_dist) if ok else None)
+    return out
+
+
+def _time(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--districts", type=int, default=1200)
+    parser.add_argument("--accounts", type=int, default=400)
+    parser.add_argument("--esas", type=int, default=20)
+    parser.add_argument("--radius", type=float, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if spatial_index._numpy() is None:
+        print("numpy not installed — vector column will time the grid fallback")
+
+    rng = random.Random(20260417)
+    districts = _points(rng, args.districts)
+    accounts = _points(rng, args.accounts)
+    esas = _points(rng, args.esas)
+    print(f"TX-sized state: {len(districts)} districts, {len(accounts)} accounts, "
+          f"{len(esas)} ESCs, radius {args.radius} mi")
+
+    cases = [
+        ("sweep", accounts, args.radius),
+        ("esa", esas, None),
+    ]
+    ok = True
+    print(f"\n  {'step':<6} {'scan s':>8} {'grid s':>8} {'vector s':>9} {'speedup':>8}  identical")
+    for label, targets, max_miles in cases:
+        t_scan, expected = _time(lambda: scan_nearest(districts, targets, max_miles), args.repeat)
+
+        def run(vectorized: bool):
+            saved = spatial_index._numpy
+            if not vectorized:
+                spatial_index._numpy = lambda: None
+            try:
+                src, dst = PointArray(districts), PointArray(targets)
+                return nearest_each(src, dst, max_miles=max_miles)
+            finally:
+                spatial_index._numpy = saved
+
+        t_grid, got_grid = _time(lambda: run(False), args.repeat)
+        t_vec, got_vec = _time(lambda: run(True), args.repeat)
+        same = got_grid == expected and got_vec == expected
+        ok = ok and same
+        print(f"  {label:<6} {t_scan:>8.3f} {t_grid:>8.3f} {t_vec:>9.3f} "
+              f"{t_scan / t_vec if t_vec else 0:>7.1f}x  {'yes' if same else 'NO'}")
+
+    if not ok:
+        print("\nResults differ from the linear scan")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -36,6 +36,7 @@ logger = logging.getLogger(__name__)
 # Audit theme #4 (S70): shared .env loader. Replaces local if-exists
 # branch that silently no-op'd on missing .env, and also fixes missing
 # quote-stripping on parsed values.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # repo root for tools/
 sys.path.insert(0, str(Path(__file__).resolve().parent))  # scripts/ for _env
 from _env import load_env_or_die  # noqa: E402
 load_env_or_die(required=[
@@ -45,6 +46,8 @@ load_env_or_die(required=[
     "GOOGLE_SHEETS_ID",
 ])
 
+import tools.serper_cache as serper_cache  # noqa: E402
+
 SERPER_API_KEY = os.environ["SERPER_API_KEY"]
 ANTHROPIC_API_KEY = os.environ["ANTHROPIC_API_KEY"]
 
@@ -203,16 +206,12 @@ def serper_search(query, num_results=5):
     if not SERPER_API_KEY:
         return []
     try:
-        resp = httpx.post(
-            "https://google.serper.dev/search",
-            headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-            json={"q": query, "num": num_results},
-            timeout=15.0,
+        data = serper_cache.search(
+            query, "scripts.enrich_c4_pass2", api_key=SERPER_API_KEY, num=num_results,
         )
-        resp.raise_for_status()
         return [
             {"title": r.get("title", ""), "snippet": r.get("snippet", ""), "link": r.get("link", "")}
-            for r in resp.json().get("organic", [])
+            for r in data.get("organic", [])
         ]
     except Exception as e:
         logger.warning(f"Serper error: {e}")
@@ -25,6 +25,9 @@ import httpx
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import tools.serper_cache as serper_cache  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S")
 logger = logging.getLogger(__name__)
 
@@ -165,14 +168,10 @@ def serper_search(query, num_results=5):
     if not SERPER_API_KEY:
         return []
     try:
-        resp = httpx.post(
-            "https://google.serper.dev/search",
-            headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-            json={"q": query, "num": num_results},
-            timeout=15.0,
+        data = serper_cache.search(
+            query, "scripts.enrich_c4_titles", api_key=SERPER_API_KEY, num=num_results,
         )
-        resp.raise_for_status()
-        results = resp.json().get("organic", [])
+        results = data.get("organic", [])
         return [{"title": r.get("title", ""), "snippet": r.get("snippet", ""), "link": r.get("link", "")} for r in results]
     except Exception as e:
         logger.warning(f"Serper error for '{query[:50]}': {e}")
@@ -294,11 +294,11 @@ def _active_account_lookup():
         if not key:
             continue
         idx.setdefault(key, a)
-    return idx, {k: True for k in idx}
+    return idx, csv_importer.FuzzyNameIndex(idx)
 
 
 def phase1_enrich(
-    rows: list[dict], active_idx: dict, active_fuzzy: dict
+    rows: list[dict], active_idx: dict, active_fuzzy: csv_importer.FuzzyNameIndex
 ) -> list[dict]:
     """Mutate rows in-place with Phase 1 results. Returns the list."""
     for row in rows:
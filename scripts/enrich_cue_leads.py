@@ -24,6 +24,8 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
+import tools.serper_cache as serper_cache  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
@@ -825,7 +827,6 @@ def resolve_unknowns_with_data(leads: list[dict]) -> list[dict]:
     """
     import anthropic
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    import httpx
     import time
 
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -869,24 +870,18 @@ def resolve_unknowns_with_data(leads: list[dict]) -> list[dict]:
 
         def _serper_search(query):
             try:
-                with httpx.Client(timeout=10.0) as http:
-                    resp = http.post(
-                        "https://google.serper.dev/search",
-                        headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-                        json={"q": query, "num": 3},
-                    )
-                    if resp.status_code != 200:
-                        return ""
-                    data = resp.json()
-                    parts = []
-                    for item in data.get("organic", [])[:3]:
-                        parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                    kg = data.get("knowledgeGraph", {})
-                    if kg:
-                        attrs = kg.get("attributes", {})
-                        addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                        parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                    return "\n".join(parts) if parts else ""
+                data = serper_cache.search(
+                    query, "scripts.enrich_cue_leads", api_key=serper_key, num=3, timeout=10.0,
+                )
+                parts = []
+                for item in data.get("organic", [])[:3]:
+                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+                kg = data.get("knowledgeGraph", {})
+                if kg:
+                    attrs = kg.get("attributes", {})
+                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+                return "\n".join(parts) if parts else ""
             except Exception:
                 return ""
 
@@ -1114,28 +1109,21 @@ ONLY the JSON array, no other text.
 
         # Serper search each domain
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        import httpx
 
         def _serper_search_l5(query):
             try:
-                with httpx.Client(timeout=10.0) as http:
-                    resp = http.post(
-                        "https://google.serper.dev/search",
-                        headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-                        json={"q": query, "num": 3},
-                    )
-                    if resp.status_code != 200:
-                        return ""
-                    data = resp.json()
-                    parts = []
-                    for item in data.get("organic", [])[:3]:
-                        parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                    kg = data.get("knowledgeGraph", {})
-                    if kg:
-                        attrs = kg.get("attributes", {})
-                        addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                        parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                    return "\n".join(parts) if parts else ""
+                data = serper_cache.search(
+                    query, "scripts.enrich_cue_leads", api_key=serper_key, num=3, timeout=10.0,
+                )
+                parts = []
+                for item in data.get("organic", [])[:3]:
+                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+                kg = data.get("knowledgeGraph", {})
+                if kg:
+                    attrs = kg.get("attributes", {})
+                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+                return "\n".join(parts) if parts else ""
             except Exception:
                 return ""
 
@@ -1371,7 +1359,6 @@ def _resolve_remaining_states(leads: list[dict]):
     """Final pass: resolve ALL remaining US leads without a state using Serper + Claude."""
     import anthropic
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    import httpx
 
     serper_key = os.environ.get("SERPER_API_KEY", "")
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -1388,24 +1375,18 @@ def _resolve_remaining_states(leads: list[dict]):
 
     def _serper_search(query):
         try:
-            with httpx.Client(timeout=10.0) as http:
-                resp = http.post(
-                    "https://google.serper.dev/search",
-                    headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-                    json={"q": query, "num": 3},
-                )
-                if resp.status_code != 200:
-                    return ""
-                data = resp.json()
-                parts = []
-                for item in data.get("organic", [])[:3]:
-                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                kg = data.get("knowledgeGraph", {})
-                if kg:
-                    attrs = kg.get("attributes", {})
-                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                return "\n".join(parts) if parts else ""
+            data = serper_cache.search(
+                query, "scripts.enrich_cue_leads", api_key=serper_key, num=3, timeout=10.0,
+            )
+            parts = []
+            for item in data.get("organic", [])[:3]:
+                parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+            kg = data.get("knowledgeGraph", {})
+            if kg:
+                attrs = kg.get("attributes", {})
+                addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+            return "\n".join(parts) if parts else ""
         except Exception:
             return ""
 
@@ -1523,7 +1504,6 @@ def _resolve_norcal_socal(ca_leads: list[dict]):
     """Resolve NorCal/SoCal for CA leads missing county info using Serper + Claude."""
     import anthropic
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    import httpx
 
     serper_key = os.environ.get("SERPER_API_KEY", "")
     api_key = os.environ.get("ANTHROPIC_API_KEY", "")
@@ -1553,24 +1533,19 @@ def _resolve_norcal_socal(ca_leads: list[dict]):
 
     def _serper_search(query):
         try:
-            with httpx.Client(timeout=10.0) as http:
-                resp = http.post(
-                    "https://google.serper.dev/search",
-                    headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-                    json={"q": query + " California county location", "num": 3},
-                )
-                if resp.status_code != 200:
-                    return ""
-                data = resp.json()
-                parts = []
-                for item in data.get("organic", [])[:3]:
-                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                kg = data.get("knowledgeGraph", {})
-                if kg:
-                    attrs = kg.get("attributes", {})
-                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                return "\n".join(parts) if parts else ""
+            data = serper_cache.search(
+                query + " California county location", "scripts.enrich_cue_leads",
+                api_key=serper_key, num=3, timeout=10.0,
+            )
+            parts = []
+            for item in data.get("organic", [])[:3]:
+                parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+            kg = data.get("knowledgeGraph", {})
+            if kg:
+                attrs = kg.get("attributes", {})
+                addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+            return "\n".join(parts) if parts else ""
         except Exception:
             return ""
 
@@ -49,8 +49,9 @@ load_env_or_die(required=["SERPER_API_KEY", "ANTHROPIC_API_KEY"])
 import httpx  # noqa: E402
 from bs4 import BeautifulSoup  # noqa: E402
 
-from tools.signal_processor import TERRITORY_STATES_WITH_CA, ABBR_TO_STATE_NAME, SERPER_URL  # noqa: E402
+from tools.signal_processor import TERRITORY_STATES_WITH_CA, ABBR_TO_STATE_NAME  # noqa: E402
 from tools import csv_importer  # noqa: E402
+import tools.serper_cache as serper_cache  # noqa: E402
 
 SERPER_KEY = os.environ["SERPER_API_KEY"]  # guaranteed by load_env_or_die above
 
@@ -194,13 +195,10 @@ NATIONAL_URL_WHITELIST_PATTERNS = (
 
 
 def serper_search(query: str, num: int = 10) -> list[dict]:
-    r = httpx.post(
-        SERPER_URL,
-        headers={"X-API-Key": SERPER_KEY, "Content-Type": "application/json"},
-        json={"q": query, "num": num},
-        timeout=20.0,
+    data = serper_cache.search(
+        query, "scripts.fetch_csta_roster", api_key=SERPER_KEY, num=num, timeout=20.0,
     )
-    return r.json().get("organic", [])
+    return data.get("organic", [])
 
 
 def discover_csteachers_urls_and_linkedin_snippets() -> tuple[set[str], list[dict]]:
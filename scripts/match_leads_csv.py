@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Match a lead CSV against the NCES territory (territory_matcher.match_records).
+
+Reads a CSV with company / email / city / state columns (names configurable),
+matches every row, and writes the same rows back out with the match appended:
+NCES Name, NCES Type, Parent District, NCES State, NCES ID, Enrollment,
+Match Confidence, Match Method. Unmatched rows keep blank match columns.
+
+--workers N spreads the batch over N spawned processes (each loads the
+territory index once from the warm-start file). That is the only supported
+way to run match_records in parallel — the bot itself always matches
+in-process.
+
+Usage:
+    .venv/bin/python scripts/match_leads_csv.py leads.csv -o leads_matched.csv
+    .venv/bin/python scripts/match_leads_csv.py leads.csv --workers 4 --email-priority
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from _env import load_env_or_die  # noqa: E402
+
+load_env_or_die(required=[])
+
+import tools.territory_matcher as territory_matcher  # noqa: E402
+
+MATCH_COLUMNS = ["NCES Name", "NCES Type", "Parent District", "NCES State", "NCES ID",
+                 "Enrollment", "Match Confidence", "Match Method"]
+
+
+def _match_columns(match) -> list:
+    if match is None:
+        return [""] * len(MATCH_COLUMNS)
+    return [match.canonical_name, match.entity_type, match.parent_district, match.state,
+            match.nces_id, match.enrollment, match.confidence, match.match_method]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("csv_path", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="default: <input>_matched.csv")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"processes (default 1; os.cpu_count() here is {os.cpu_count()})")
+    parser.add_argument("--name-field", default="company")
+    parser.add_argument("--email-field", default="email")
+    parser.add_argument("--city-field", default="city")
+    parser.add_argument("--state-field", default="state")
+    parser.add_argument("--email-priority", action="store_true",
+                        help="trust the email domain over the company name")
+    args = parser.parse_args()
+
+    with open(args.csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        leads = list(reader)
+    if args.name_field not in fieldnames:
+        print(f"ERROR: no '{args.name_field}' column in {args.csv_path}", file=sys.stderr)
+        return 2
+
+    stats: dict = {}
+    results = territory_matcher.match_records(
+        leads, name_field=args.name_field, email_field=args.email_field,
+        city_field=args.city_field, state_field=args.state_field,
+        email_priority=args.email_priority, workers=args.workers, stats=stats,
+    )
+
+    output = args.output or args.csv_path.with_name(f"{args.csv_path.stem}_matched.csv")
+    with open(output, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames + MATCH_COLUMNS)
+        for rec, match in results:
+            w.writerow([rec.get(col, "") for col in fieldnames] + _match_columns(match))
+
+    matched = sum(1 for _, m in results if m)
+    print(f"Matched {matched}/{len(results)} rows with {stats['workers']} worker(s) in "
+          f"{stats['seconds']:.1f}s ({stats['records_per_sec']:,.0f} records/s) → {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Unit tests for tools/email_pattern_store.py — persistent domain → email pattern
+evidence, and its use by ResearchJob L8 / L15.
+
+Checks pattern matching from names, evidence dedup by email, the solved
+threshold, that untrusted (research) contacts only count when VERIFIED, and
+that a solved domain drives L8 and lets L15 skip its verification queries.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_email_pattern_store.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["EMAIL_PATTERN_DIR"] = tempfile.mkdtemp(prefix="email_pattern_test_")
+os.environ["SERPER_CACHE_DIR"] = tempfile.mkdtemp(prefix="email_pattern_serper_")
+
+import httpx  # noqa: E402
+
+import tools.email_pattern_store as store  # noqa: E402
+import tools.research_engine as research_engine  # noqa: E402
+from tools.research_engine import ResearchJob  # noqa: E402
+from tools.research_http import ResearchHTTP, TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+# ── Matching ───────────────────────────────────────────────────────────
+check("first.last", store.match_pattern("Jane", "Doe", "jane.doe@x.org"), "{first}.{last}@{domain}")
+check("flast", store.match_pattern("Jane", "Doe", "JDoe@x.org"), "{f}{last}@{domain}")
+check("punctuation in names", store.match_pattern("Mary", "O'Neil", "mary.oneil@x.org"),
+      "{first}.{last}@{domain}")
+check("unmatched format → other", store.match_pattern("Jane", "Doe", "jd42@x.org"), store.OTHER)
+check("no name → nothing", store.match_pattern("", "Doe", "jane.doe@x.org"), "")
+check("domain normalized", store.normalize_domain("https://www.AustinISD.org/staff"), "austinisd.org")
+
+
+# ── Evidence ───────────────────────────────────────────────────────────
+def contact(first, last, email, conf="VERIFIED"):
+    return {"first_name": first, "last_name": last, "email": email, "email_confidence": conf}
+
+
+check("unknown domain", store.lookup("solved.org"), None)
+added = store.observe([
+    contact("Ann", "Lee", "ann.lee@solved.org"),
+    contact("Bob", "Ray", "bob.ray@solved.org"),
+    contact("Cy", "Young", "cy.young@solved.org", conf="INFERRED"),   # circular — ignored
+    contact("Dee", "Fox", "dee.fox@gmail.com"),                         # webmail — ignored
+])
+check("only verified district emails recorded", added, 2)
+check("two emails: not solved yet", store.lookup("solved.org")["solved"], False)
+check("same email again adds nothing", store.observe([contact("Ann", "Lee", "ann.lee@solved.org")],
+                                                     source="sheets"), 0)
+store.observe([contact("Cy", "Young", "cy.young@solved.org", conf="INFERRED")], source="sf_leads", trusted=True)
+entry = store.lookup("www.solved.org")
+check("trusted import counts any email; now solved",
+      (entry["pattern"], entry["evidence"], entry["confidence"], entry["solved"]),
+      ("{first}.{last}@{domain}", 3, 1.0, True))
+check("evidence by source", entry["sources"], {"research": 2, "sf_leads": 1})
+check("solved_pattern", store.solved_pattern("solved.org"), "{first}.{last}@{domain}")
+
+store.observe([contact("Al", "Bo", "abo@mixed.org"), contact("Cal", "Dee", "cdee@mixed.org"),
+               contact("Ed", "Fi", "ed.fi@mixed.org")])
+mixed = store.lookup("mixed.org")
+check("mixed evidence below confidence → unsolved", (mixed["pattern"], mixed["solved"]),
+      ("{f}{last}@{domain}", False))
+
+
+# ── ResearchJob: L8 uses the stored pattern, L15 skips verification ────
+served: list[str] = []
+
+
+def _serper(request: httpx.Request) -> httpx.Response:
+    served.append(json.loads(request.content)["q"])
+    return httpx.Response(200, json={})
+
+
+research_engine.SERPER_API_KEY = "test-key"
+research_engine.serper_limiter = TokenBucket(0)
+
+
+async def verify(domain):
+    http = ResearchHTTP(transport=httpx.MockTransport(_serper))
+    job = ResearchJob("Solved ISD", "TX", http=http)
+    job.district_domain = f"www.{domain}"
+    job.raw_pages = [("https://x", "contact bo.z@" + domain)]
+    await job._layer8_email_inference()
+    job.all_contacts = [
+        {"first_name": "Kim", "last_name": "Park", "title": "Teacher", "email": "",
+         "email_confidence": ""},
+        {"first_name": "Lu", "last_name": "Chen", "title": "Teacher", "email": f"lu.chen@{domain}",
+         "email_confidence": "INFERRED"},
+    ]
+    await job._layer15_email_verification()
+    await http.aclose()
+    return job
+
+
+job = asyncio.run(verify("solved.org"))
+check("L8: solved domain uses stored pattern", (job.email_pattern, job._email_pattern_source),
+      ("{first}.{last}@{domain}", "store"))
+check("L15: no verification queries", [q for q in served if q.startswith('"') and "@" in q and " " not in q], [])
+check("L15: blank email filled as LIKELY", (job.all_contacts[0]["email"], job.all_contacts[0]["email_confidence"]),
+      ("kim.park@solved.org", "LIKELY"))
+check("L15: inferred email upgraded", job.all_contacts[1]["email_confidence"], "LIKELY")
+
+served.clear()
+job = asyncio.run(verify("fresh.org"))
+check("L8: unknown domain falls back to detection", job._email_pattern_source, "detected")
+check("L15: unsolved domain still verifies", '"kim.park@fresh.org"' in served or '"kpark@fresh.org"' in served, True)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,166 @@
+"""
+Unit tests for the name-matching helpers in tools/csv_importer.py and
+tools/substring_index.py.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_name_matching.py
+
+FuzzyNameIndex must return exactly what the linear fuzzy_match_name scan
+returns for the same candidates — checked on hand-picked cases plus a seeded
+random corpus of district-style keys. SubstringIndex is checked the same way
+against a brute-force `in` scan.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from tools.csv_importer import (  # noqa: E402
+    FuzzyNameIndex,
+    fuzzy_match_name,
+    normalize_name,
+    normalize_names,
+)
+from tools.substring_index import SubstringIndex  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+# ── normalize_name ─────────────────────────────────────────────────────
+# Expected keys are the output of the original uncompiled implementation
+# (see scripts/bench_normalize_name.py for the full corpus parity check).
+NORMALIZE_CASES = [
+    ("Medina Valley ISD", "medina valley"),
+    ("AUSTIN INDEPENDENT SCHOOL DISTRICT", "austin"),
+    ("Los Angeles Unified", "los angeles"),
+    ("  LAUSD ", "los angeles"),
+    ("H.I.S.D.", "houston"),
+    ("Jefferson Elementary (Medina Valley ISD)", "jefferson elementary"),
+    ("CUSD 300", ""),
+    ("Community School District 5", "community"),  # suffix order matters
+    ("Public Schools of Robeson County", "of robeson county"),
+    ("Plano ISD.", "plano"),
+    ("Lincoln ſchools", "lincoln"),  # non-ASCII: IGNORECASE folds ſ → s
+    ("San José Unified", "san josé"),
+]
+for raw, expected in NORMALIZE_CASES:
+    check(f"normalize_name {raw!r}", normalize_name(raw), expected)
+    check(f"normalize_name memo {raw!r}", normalize_name(raw), expected)
+check("normalize_names batch", normalize_names([r for r, _ in NORMALIZE_CASES]),
+      [e for _, e in NORMALIZE_CASES])
+check("normalize_names empty", normalize_names([]), [])
+
+# ── fuzzy_match_name: hand-picked cases ────────────────────────────────
+CANDS = {
+    "carlinville": 1,
+    "effingham": 2,
+    "huntington beach senior": 3,
+    "sd u46": 4,
+    "round rock": 5,
+    "round rock christian": 6,
+    "plano": 7,
+    "": 8,
+}
+IDX = FuzzyNameIndex(CANDS)
+
+cases = [
+    ("exact", "plano", 0.7),
+    ("single-token containment", "carlinvilles", 0.7),
+    ("single-token containment below threshold", "carlinvillecommunity", 0.7),
+    ("2-token subset", "huntington beach", 0.7),
+    ("subset prefers first", "round rock", 0.7),
+    ("jaccard", "u46", 0.5),
+    ("no overlap", "austin", 0.7),
+    ("empty query", "", 0.7),
+    ("whitespace query", "   ", 0.7),
+    ("low threshold", "rock", 0.3),
+]
+for label, q, th in cases:
+    check(f"index parity: {label}", IDX.match(q, threshold=th), fuzzy_match_name(q, CANDS, threshold=th))
+
+check("containment hit", IDX.match("carlinvilles"), "carlinville")
+check("subset hit", IDX.match("huntington beach"), "huntington beach senior")
+check("fuzzy_match_name accepts index", fuzzy_match_name("huntington beach", IDX), "huntington beach senior")
+check("index __contains__", "plano" in IDX, True)
+check("empty index", FuzzyNameIndex({}).match("plano"), None)
+check("list candidates w/ dups", FuzzyNameIndex(["plano", "plano", "allen"]).match("plano east"),
+      fuzzy_match_name("plano east", ["plano", "plano", "allen"]))
+
+# ── fuzzy_match_name: randomized parity ────────────────────────────────
+random.seed(20260411)
+WORDS = [
+    "oak", "oaks", "river", "riverside", "lake", "spring", "springfield", "pine",
+    "north", "south", "east", "west", "valley", "hill", "hills", "park", "grove",
+    "st", "john", "johns", "county", "city", "unit", "1", "5", "u46", "jefferson",
+    "carlinville", "carlin", "round", "rock", "plano", "allen", "mesa", "mesas",
+]
+
+
+def rand_key() -> str:
+    return " ".join(random.choice(WORDS) for _ in range(random.randint(1, 4)))
+
+
+corpus = {rand_key(): i for i in range(800)}
+index = FuzzyNameIndex(corpus)
+mismatches = 0
+for _ in range(3000):
+    q = rand_key() if random.random() < 0.8 else random.choice(WORDS)[: random.randint(2, 6)]
+    th = random.choice([0.3, 0.5, 0.7, 0.85])
+    if index.match(q, threshold=th) != fuzzy_match_name(q, corpus, threshold=th):
+        mismatches += 1
+check("randomized parity (3000 queries)", mismatches, 0)
+
+# ── SubstringIndex ─────────────────────────────────────────────────────
+SUB_KEYS = ["lincoln", "lincoln park", "park", "oak", "oakwood elementary", "westlake", "ab"]
+SUB = SubstringIndex(SUB_KEYS, min_key_len=3)
+check("keys_in", [SUB.key(p) for p in SUB.keys_in("lincoln park west")], ["lincoln", "lincoln park", "park"])
+check("keys_in min_len", [SUB.key(p) for p in SUB.keys_in("lincoln park", min_len=5)], ["lincoln", "lincoln park"])
+check("keys_containing", [SUB.key(p) for p in SUB.keys_containing("lincoln")], ["lincoln", "lincoln park"])
+check("keys_containing short query", [SUB.key(p) for p in SUB.keys_containing("oa")], ["oak", "oakwood elementary"])
+check("keys_containing unknown gram", SUB.keys_containing("zzzz"), [])
+check("min_key_len drops short keys", len(SUB), 6)
+check("containment ordered", [SUB.key(p) for p in SUB.containment_candidates("lincoln")], ["lincoln", "lincoln park"])
+
+sub_corpus = list(dict.fromkeys(rand_key() for _ in range(600)))
+sub_index = SubstringIndex(sub_corpus, min_key_len=6)
+eligible = [k for k in sub_corpus if len(k) >= 6]
+mismatches = 0
+for _ in range(1500):
+    q = rand_key()
+    ratio = random.choice([0.0, 0.5])
+    expected = []
+    for k in eligible:
+        if k in q or q in k:
+            if ratio and min(len(k), len(q)) / max(len(k), len(q)) < ratio:
+                continue
+            expected.append(k)
+    got = [sub_index.key(p) for p in sub_index.containment_candidates(q, min_ratio=ratio)]
+    if ratio:
+        # Candidates may include extra keys; the ratio-passing ones must all be there, in order
+        got = [k for k in got if min(len(k), len(q)) / max(len(k), len(q)) >= ratio]
+    if got != expected:
+        mismatches += 1
+check("substring randomized parity (1500 queries)", mismatches, 0)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
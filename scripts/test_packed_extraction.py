@@ -0,0 +1,134 @@
+"""
+Unit tests for contact_extractor packed extraction (extract_contacts_packed,
+plan_packs) — several short pages per Claude request.
+
+The Anthropic client is replaced with a fake that answers from a per-URL
+table, so packed and per-page extraction can be compared call for call.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_packed_extraction.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.contact_extractor as ce  # noqa: E402
+import tools.csv_importer as csv_importer  # noqa: E402
+from tools.research_http import TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+DISTRICT = "Test ISD"
+ce.anthropic_limiter = TokenBucket(0)  # rate limiting covered in test_research_http
+ce._known_contacts_cache[csv_importer.normalize_name(DISTRICT)] = "- Known Person, Principal"
+
+# url → contacts Claude "finds" on that page
+TABLE = {
+    "https://test.edu/a": [{"first_name": "Ann", "last_name": "Lee", "title": "CS Director",
+                            "email": "ALEE@test.edu", "email_confidence": "verified"}],
+    "https://test.edu/b": [],
+    "https://test.edu/c": [{"first_name": "Bo", "last_name": "Diaz", "title": "STEM Coordinator"},
+                           {"first_name": "", "last_name": "", "title": "Nobody"}],
+    "https://test.edu/long": [{"first_name": "Cy", "last_name": "Park", "title": "Principal",
+                               "email_confidence": "bogus"}],
+}
+requests: list[dict] = []
+mode = {"reply": "ok"}
+
+
+def _create(model, max_tokens, system, messages):
+    prompt = messages[0]["content"]
+    urls = re.findall(r"^Source URL: (\S+)$", prompt, re.M)
+    requests.append({"urls": urls, "prompt": prompt})
+    out = []
+    for url in urls:
+        for c in TABLE.get(url, []):
+            out.append(dict(c, source_url=url + "/" if len(urls) > 1 else url))
+    if len(urls) > 1 and mode["reply"] == "stray":
+        out.append({"first_name": "Di", "last_name": "Shah", "source_url": "https://elsewhere.org"})
+    text = "not json" if len(urls) > 1 and mode["reply"] == "garbage" else "Here you go:\n" + json.dumps(out)
+    return SimpleNamespace(content=[SimpleNamespace(text=text)],
+                           usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=10))
+
+
+ce.client = SimpleNamespace(messages=SimpleNamespace(create=_create))
+
+short = "Staff directory snippet with names, titles and emails. " * 4
+pages = [
+    ("https://test.edu/a", short),
+    ("https://test.edu/b", short),
+    ("https://test.edu/long", "x" * (ce.EXTRACT_PACK_PAGE_MAX_CHARS + 1)),
+    ("https://test.edu/c", short),
+    ("https://test.edu/tiny", "too short"),
+]
+
+# ── Planning ───────────────────────────────────────────────────────────
+check("short pages packed, long page alone", ce.plan_packs(pages), [[2], [0, 1, 3, 4]])
+check("ceiling 0 → one unit per page", ce.plan_packs(pages, 0), [[0], [1], [2], [3], [4]])
+check("ceiling splits packs", ce.plan_packs(pages[:2], len(short) // 4), [[0], [1]])
+check("same URL never twice in a pack", ce.plan_packs([pages[0], pages[0]]), [[0], [1]])
+many = [(f"https://test.edu/p{i}", short) for i in range(ce.EXTRACT_PACK_MAX_PAGES + 1)]
+check("max pages per pack", [len(u) for u in ce.plan_packs(many)], [ce.EXTRACT_PACK_MAX_PAGES, 1])
+
+# ── Packed = per-page, in one request ──────────────────────────────────
+packable = [pages[i] for i in (0, 1, 3, 4)]
+requests.clear()
+per_page = [ce.extract_contacts(content, url, DISTRICT) for url, content in packable]
+check("per-page path: one request per live page", len(requests), 3)
+
+requests.clear()
+ce.start_usage_capture()
+packed = ce.extract_contacts_packed(packable, DISTRICT)
+usage = ce.stop_usage_capture()
+check("packed path: one request", len(requests), 1)
+check("packed results equal per-page", packed, per_page)
+check("contacts tagged with their page URL", [c["source_url"] for c in packed[0] + packed[2]],
+      ["https://test.edu/a", "https://test.edu/c"])
+check("known-contacts preamble sent once", requests[0]["prompt"].count("Known Person"), 1)
+check("usage recorded for the packed call", usage[0]["source_url"], "packed:3:https://test.edu/a")
+
+# ── Fallbacks ──────────────────────────────────────────────────────────
+for reply in ("stray", "garbage"):
+    mode["reply"] = reply
+    requests.clear()
+    check(f"{reply} reply → per-page fallback result", ce.extract_contacts_packed(packable, DISTRICT), per_page)
+    check(f"{reply} reply → 1 packed + 3 per-page requests", len(requests), 4)
+mode["reply"] = "ok"
+
+# ── Async pipeline: packs + singles merged in page order ───────────────
+serial = ce.extract_from_multiple(pages, DISTRICT)
+requests.clear()
+merged = asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT))
+check("async packed merge = serial merge", merged, serial)
+check("async packed: 2 requests instead of 4", len(requests), 2)
+requests.clear()
+unpacked = asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, pack_ceiling=0))
+check("pack_ceiling=0 restores per-page requests", (unpacked, len(requests)), (serial, 4))
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
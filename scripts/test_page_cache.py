@@ -0,0 +1,175 @@
+"""
+Unit tests for tools/page_cache.py — conditional-GET cache for district pages.
+
+Runs a localhost server that honours If-None-Match / If-Modified-Since and
+drives ResearchJob._fetch_page_cached through fresh → revalidated → fetched.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_page_cache.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["PAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="page_cache_test_")
+
+import tools.page_cache as page_cache  # noqa: E402
+import tools.research_engine as research_engine  # noqa: E402
+from tools.research_engine import ResearchJob  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+pages = {
+    "/etag": {"body": "<p>Jane Doe, CS Director</p>", "etag": '"v1"'},
+    "/lastmod": {"body": "<p>John Roe, CTE Coordinator</p>", "lastmod": "Wed, 01 Oct 2025 00:00:00 GMT"},
+    "/plain": {"body": "<p>No validators</p>"},
+}
+log: list[tuple[str, int]] = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        page = pages.get(self.path)
+        if page is None:
+            status, body, extra = 404, b"", {}
+        elif (page.get("etag") and self.headers.get("If-None-Match") == page["etag"]) or (
+                page.get("lastmod") and self.headers.get("If-Modified-Since") == page["lastmod"]):
+            status, body, extra = 304, b"", {}
+        else:
+            status, body = 200, f"<html><nav>menu</nav>{page['body']}</html>".encode()
+            extra = {}
+            if page.get("etag"):
+                extra["ETag"] = page["etag"]
+            if page.get("lastmod"):
+                extra["Last-Modified"] = page["lastmod"]
+        log.append((self.path, status))
+        self.send_response(status)
+        for k, v in extra.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+BASE = f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def fetch(path, hours=0):
+    async def go():
+        job = ResearchJob("Test ISD", "TX", page_freshness_hours=hours)
+        try:
+            return await job._fetch_page_cached(BASE + path), dict(job._page_stats)
+        finally:
+            if job._http is not None:
+                await job._http.aclose()
+    return asyncio.run(go())
+
+
+# ── First fetch: 200, parsed, stored ───────────────────────────────────
+(text, requested), stats = fetch("/etag")
+check("200 parsed", (text, requested), ("Jane Doe, CS Director", True))
+check("200 counted", stats["fetched"], 1)
+check("etag stored", page_cache.get(BASE + "/etag")["etag"], '"v1"')
+
+# ── Revalidation: 304 reuses text and never parses ─────────────────────
+real_bs = research_engine.BeautifulSoup
+research_engine.BeautifulSoup = lambda *a, **k: (_ for _ in ()).throw(AssertionError("parsed"))
+(text, requested), stats = fetch("/etag", hours=0)
+check("304 reuses text", (text, requested), ("Jane Doe, CS Director", True))
+check("304 counted", stats["revalidated"], 1)
+check("server saw 304", log[-1], ("/etag", 304))
+research_engine.BeautifulSoup = real_bs
+
+# ── Last-Modified revalidation ─────────────────────────────────────────
+fetch("/lastmod")
+(text, _), stats = fetch("/lastmod")
+check("If-Modified-Since → 304", (log[-1], stats["revalidated"], text),
+      (("/lastmod", 304), 1, "John Roe, CTE Coordinator"))
+
+# ── Freshness window: no request at all ────────────────────────────────
+n = len(log)
+(text, requested), stats = fetch("/etag", hours=24)
+check("fresh hit skips the network", (requested, len(log) - n, stats["fresh"]), (False, 0, 1))
+check("fresh hit returns text", text, "Jane Doe, CS Director")
+
+# ── Changed page: new ETag → 200 and new text stored ───────────────────
+pages["/etag"] = {"body": "<p>Ann Poe, CS Director</p>", "etag": '"v2"'}
+(text, _), stats = fetch("/etag", hours=0)
+check("changed page re-downloaded", (text, stats["fetched"]), ("Ann Poe, CS Director", 1))
+check("new etag stored", page_cache.get(BASE + "/etag")["etag"], '"v2"')
+
+# ── No validators: plain GET each time outside the window ─────────────
+fetch("/plain")
+(_, _), stats = fetch("/plain", hours=0)
+check("no validators → 200 again", (log[-1], stats["fetched"]), (("/plain", 200), 1))
+
+# ── Failures aren't cached ─────────────────────────────────────────────
+(text, requested), stats = fetch("/missing")
+check("404 → None", (text, stats["failed"], page_cache.get(BASE + "/missing")), (None, 1, None))
+
+# ── Old entries expire entirely ────────────────────────────────────────
+path = page_cache._path(BASE + "/etag")
+entry = json.loads(Path(path).read_text())
+entry["fetched_at"] -= page_cache.PAGE_CACHE_MAX_AGE_DAYS * 86400 + 1
+Path(path).write_text(json.dumps(entry))
+check("entry past max age ignored", page_cache.get(BASE + "/etag"), None)
+
+# ── prune(): age, size cap, in-flight temp files ─────────────────────
+check("prune drops the aged-out entry", (page_cache.prune(), os.path.exists(path)), (1, False))
+for i in range(3):
+    page_cache.put(f"{BASE}/p{i}", "x" * 1000)
+    p = page_cache._path(f"{BASE}/p{i}")
+    entry = json.loads(Path(p).read_text())
+    entry["validated_at"] -= 100 - i  # p0 least recently validated
+    Path(p).write_text(json.dumps(entry))
+tmp = page_cache._path(BASE + "/p0") + ".123.456.tmp"
+Path(tmp).write_text("{")
+check("prune under the cap removes nothing", page_cache.prune(), 0)
+check("in-flight tmp kept", os.path.exists(tmp), True)
+sizes = {u: os.path.getsize(page_cache._path(u)) for u in (BASE + "/lastmod", BASE + "/plain")}
+cap = sum(sizes.values()) + os.path.getsize(page_cache._path(BASE + "/p2"))
+check("size cap evicts least recently validated", page_cache.prune(max_bytes=cap), 2)
+check("oldest pages evicted", [page_cache.get(f"{BASE}/p{i}") for i in (0, 1)], [None, None])
+check("recently validated pages kept",
+      [page_cache.get(f"{BASE}/{k}") is not None for k in ("p2", "lastmod", "plain")], [True] * 3)
+os.utime(tmp, (0, 0))
+check("abandoned tmp removed", (page_cache.prune(), os.path.exists(tmp)), (1, False))
+
+server.shutdown()
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
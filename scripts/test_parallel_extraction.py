@@ -0,0 +1,133 @@
+"""
+Unit tests for contact_extractor.extract_from_multiple_async — concurrent L9/L15
+Claude extraction.
+
+extract_contacts is replaced with a fake that sleeps a random amount, so pages
+complete out of order. The async merge must match extract_from_multiple
+exactly, stay under the concurrency cap, and honour the token budget.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_parallel_extraction.py
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.contact_extractor as ce  # noqa: E402
+import tools.csv_importer as csv_importer  # noqa: E402
+from tools.research_http import TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+DISTRICT = "Test ISD"
+ce.anthropic_limiter = TokenBucket(0)  # rate limiting covered in test_research_http
+ce._known_contacts_cache[csv_importer.normalize_name(DISTRICT)] = ""  # no Sheets access
+
+# Page i returns a few people; the same people recur across pages with
+# progressively better emails/titles so merge order matters.
+PEOPLE = ["Ann Lee", "Bo Diaz", "Cy Park", "Di Shah"]
+CONF = ["UNKNOWN", "INFERRED", "LIKELY", "VERIFIED"]
+
+_live = 0
+_peak = 0
+_calls: list[str] = []
+_lock = threading.Lock()
+
+
+def fake_extract_contacts(raw_content, source_url, district_name):
+    global _live, _peak
+    with _lock:
+        _live += 1
+        _peak = max(_peak, _live)
+        _calls.append(source_url)
+    time.sleep(random.random() / 100)
+    i = int(source_url.rsplit("/", 1)[1])
+    out = []
+    for j, name in enumerate(PEOPLE):
+        if (i + j) % 3 == 0:
+            continue
+        first, last = name.split()
+        conf = CONF[(i * 7 + j) % 4]
+        out.append({
+            "first_name": first, "last_name": last,
+            "title": f"Title {i}" if i % 2 else "",
+            "email": "" if conf == "UNKNOWN" else f"{first.lower()}{i}@test.edu",
+            "email_confidence": conf,
+            "district_name": district_name,
+            "source_url": source_url,
+        })
+    with _lock:
+        _live -= 1
+    return out
+
+
+ce.extract_contacts = fake_extract_contacts
+pages = [(f"https://test.edu/{i}", "staff directory " * 20) for i in range(20)]
+
+random.seed(19)
+serial = ce.extract_from_multiple(pages, DISTRICT)
+
+for trial in range(3):
+    _peak = 0
+    out = asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, concurrency=5, pack_ceiling=0))
+    check(f"trial {trial}: identical to serial merge", out, serial)
+check("ran concurrently", _peak > 1, True)
+check("never above the cap", _peak <= 5, True)
+
+_peak = 0
+check("concurrency=1 matches", asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, concurrency=1, pack_ceiling=0)), serial)
+check("concurrency=1 is serial", _peak, 1)
+
+# ── Token budget: a page-order prefix is admitted ──────────────────────
+per_page = ce.estimate_input_tokens(pages[0][1], DISTRICT)
+_calls.clear()
+out = asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, token_budget=per_page * 3 + 1, pack_ceiling=0))
+check("budget admits 3 pages", sorted(_calls), sorted(u for u, _ in pages[:3]))
+check("budget result = serial over prefix", out, ce.extract_from_multiple(pages[:3], DISTRICT))
+
+_calls.clear()
+asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, token_budget=0, pack_ceiling=0))
+check("budget 0 → unlimited", len(_calls), 20)
+
+check("no pages → []", asyncio.run(ce.extract_from_multiple_async([], DISTRICT)), [])
+
+# ── Shared pool: grown on demand, the replaced pool is shut down ───────
+small = ce._get_extract_pool(5)
+check("same size reuses the pool", ce._get_extract_pool(3) is small, True)
+grown = ce._get_extract_pool(8)
+check("larger request grows the pool", (grown is not small, ce._extract_pool_size), (True, 8))
+try:
+    small.submit(int)
+    rejected = False
+except RuntimeError:
+    rejected = True
+check("replaced pool shut down", rejected, True)
+check("grown pool still serves", asyncio.run(ce.extract_from_multiple_async(pages, DISTRICT, concurrency=8, pack_ceiling=0)), serial)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
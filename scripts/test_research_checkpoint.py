@@ -0,0 +1,194 @@
+"""
+Unit tests for research job checkpoint/resume (tools/research_checkpoint.py +
+ResearchJob / ResearchQueue wiring).
+
+Phase methods are replaced with fakes that record calls and mutate job state,
+so the tests check that a crash after phase C resumes at D with every
+accumulated field restored, and that the queue clears checkpoints once a job
+completes or fails.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_research_checkpoint.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["RESEARCH_CHECKPOINT_DIR"] = tempfile.mkdtemp(prefix="research_checkpoint_test_")
+os.environ["RESEARCH_TRACE_DIR"] = tempfile.mkdtemp(prefix="research_checkpoint_traces_")
+os.environ["EMAIL_PATTERN_DIR"] = tempfile.mkdtemp(prefix="research_checkpoint_patterns_")
+
+import tools.research_checkpoint as research_checkpoint  # noqa: E402
+import tools.research_engine as research_engine  # noqa: E402
+from tools.research_engine import ResearchJob, ResearchQueue  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+calls: list[str] = []
+crash_in: set[str] = set()
+
+
+class Crash(BaseException):
+    """Stands in for process death: not an Exception, so nothing cleans up."""
+
+
+async def _phase(job, name):
+    calls.append(name)
+    await asyncio.sleep(0)  # let queued jobs interleave
+    if name in crash_in:
+        raise Crash(name)
+    job.raw_pages.append((f"https://d.org/{name}", f"page {name}"))
+    job._serper_count += 10
+    job.seen_keys.add(name.lower())
+    job._url_to_layer[f"https://d.org/{name}"] = f"L-{name}"
+    if name == "B":
+        job.district_domain = "d.org"
+    if name == "D":
+        job.email_pattern = "{first}.{last}@{domain}"
+    if name == "E":
+        job.all_contacts.append({"first_name": "Ann", "last_name": "Lee", "source_url": "https://d.org/E"})
+
+
+for name, method in zip("ABCDE", ("_phase_a_independent_searches", "_phase_b_domain_discovery",
+                                  "_phase_c_domain_layers", "_phase_d_crawl_and_patterns",
+                                  "_phase_e_extract_and_verify")):
+    setattr(ResearchJob, method, lambda self, n=name: _phase(self, n))
+
+JID = research_checkpoint.job_id("Dallas ISD", "TX")
+PARAMS = {"district_name": "Dallas ISD", "state": "TX", "priority": 1, "context": {"prospect": {"Name Key": "dallas"}}}
+
+# ── Crash after C: checkpoint holds A–C ────────────────────────────────
+crash_in = {"D"}
+job = ResearchJob("Dallas ISD", "TX", checkpoint={"job_id": JID, "params": PARAMS})
+try:
+    asyncio.run(job.run())
+except Crash:
+    pass
+cp = research_checkpoint.load(JID)
+check("phases run before crash", calls, ["A", "B", "C", "D"])
+check("checkpoint phases", cp["completed_phases"], ["A", "B", "C"])
+check("checkpoint params", cp["params"], PARAMS)
+check("checkpoint state", (cp["state"]["district_domain"], cp["state"]["_serper_count"],
+                           len(cp["state"]["raw_pages"])), ("d.org", 30, 3))
+check("listed as pending", [c["job_id"] for c in research_checkpoint.pending()], [JID])
+
+# ── Resume: D and E only, state restored ───────────────────────────────
+calls.clear()
+crash_in = set()
+job = ResearchJob("Dallas ISD", "TX", checkpoint=cp)
+check("restored types", (type(job.raw_pages[0]), type(job.seen_keys)), (tuple, set))
+result = asyncio.run(job.run())
+check("only remaining phases run", calls, ["D", "E"])
+check("resumed_from", result["resumed_from"], "C")
+check("Serper count carried over", result["queries_used"], 50)
+check("pages + layer map carried over", (len(job.raw_pages), result["layer_contact_counts"]),
+      (5, {"L-E": 1}))
+check("domain + pattern", (job.district_domain, job.email_pattern), ("d.org", "{first}.{last}@{domain}"))
+check("fresh job: resumed_from None", asyncio.run(ResearchJob("X ISD", "TX").run())["resumed_from"], None)
+
+# No checkpoint arg (scripts, tests) → nothing written
+check("direct runs write no checkpoint", research_checkpoint.load(research_checkpoint.job_id("X ISD", "TX")), None)
+
+# ── Queue: resume_interrupted re-enqueues with the saved context ───────
+research_engine.ResearchJob = ResearchJob
+
+
+async def queue_resume():
+    queue = ResearchQueue(workers=1)
+    done: list[tuple] = []
+
+    def completion_for(context):
+        async def _done(result):
+            done.append((result["district_name"], result["resumed_from"], context))
+        return _done
+
+    calls.clear()
+    resumed = await queue.resume_interrupted(None, completion_for)
+    again = await queue.resume_interrupted(None, completion_for)  # already queued → skipped
+    while queue.is_busy or queue.queue_size:
+        await asyncio.sleep(0.01)
+    return resumed, again, done
+
+
+research_checkpoint.save(JID, cp)
+resumed, again, done = asyncio.run(queue_resume())
+check("resumed districts", resumed, ["Dallas ISD"])
+check("not resumed twice", again, [])
+check("completed with saved context", done, [("Dallas ISD", "C", PARAMS["context"])])
+check("queue resumed at D", calls, ["D", "E"])
+check("checkpoint cleared after completion", research_checkpoint.load(JID), None)
+
+
+# ── Two queued runs for one district keep separate checkpoints + traces ──
+async def duplicate_runs():
+    queue = ResearchQueue(workers=2)
+    pending_at_completion: list[int] = []
+
+    async def done(_):
+        pending_at_completion.append(len(research_checkpoint.pending()))
+    await queue.enqueue("Dallas ISD", "TX", None, done)
+    await queue.enqueue("Dallas ISD", "TX", None, done)
+    while queue.is_busy or queue.queue_size:
+        await asyncio.sleep(0.01)
+    return pending_at_completion
+
+
+traces_before = len(os.listdir(os.environ["RESEARCH_TRACE_DIR"]))
+check("each run sees its own + the other's checkpoint", asyncio.run(duplicate_runs()), [2, 1])
+check("both checkpoints cleared", research_checkpoint.pending(), [])
+check("one trace file per run", len(os.listdir(os.environ["RESEARCH_TRACE_DIR"])) - traces_before, 2)
+
+
+# Failed (not crashed) jobs don't leave a checkpoint to retry forever
+async def failing():
+    queue = ResearchQueue(workers=1)
+    ResearchJob._phase_e_extract_and_verify = lambda self: (_ for _ in ()).throw(RuntimeError("bad"))
+
+    async def noop(_):
+        pass
+    await queue.enqueue("Fail ISD", "TX", None, noop)
+    while queue.is_busy or queue.queue_size:
+        await asyncio.sleep(0.01)
+
+asyncio.run(failing())
+check("failed job checkpoint cleared", research_checkpoint.pending(), [])
+
+# ── Staleness + kill switch ────────────────────────────────────────────
+research_checkpoint.save(JID, cp)
+path = Path(research_checkpoint._path(JID))
+stale = json.loads(path.read_text())
+stale["saved_at"] -= research_checkpoint.RESEARCH_CHECKPOINT_MAX_AGE_HOURS * 3600 + 1
+path.write_text(json.dumps(stale))
+check("stale checkpoint dropped", (research_checkpoint.pending(), path.exists()), ([], False))
+
+research_checkpoint.ENABLE_RESEARCH_CHECKPOINTS = False
+research_checkpoint.save(JID, cp)
+check("kill switch: nothing written", path.exists(), False)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,195 @@
+"""
+Unit tests for tools/research_http.py — pooled research HTTP client.
+
+Runs a keep-alive HTTP/1.1 server on localhost and checks that requests reuse
+pooled connections, that the per-host cap bounds in-flight requests, and that
+ResearchJob attributes requests to its own ConnectionStats. Serper dispatch
+is driven through an httpx.MockTransport: concurrent, ordered, capped.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_research_http.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["SERPER_CACHE_DIR"] = tempfile.mkdtemp(prefix="research_http_test_")
+os.environ["PAGE_CACHE_DIR"] = tempfile.mkdtemp(prefix="research_http_pages_")
+
+import httpx  # noqa: E402
+
+import tools.research_engine as research_engine  # noqa: E402
+from tools.research_engine import ResearchJob  # noqa: E402
+from tools.research_http import ConnectionStats, ResearchHTTP, TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+_in_flight = 0
+_peak = 0
+_lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        global _in_flight, _peak
+        with _lock:
+            _in_flight += 1
+            _peak = max(_peak, _in_flight)
+        if self.path.startswith("/slow"):
+            time.sleep(0.05)
+        body = b"<html><body><nav>menu</nav><p>Jane Doe, Director</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with _lock:
+            _in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+BASE = f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def sequential():
+    http = ResearchHTTP()
+    stats = ConnectionStats()
+    for i in range(5):
+        resp = await http.get(f"{BASE}/page{i}", stats=stats)
+        resp.raise_for_status()
+    await http.aclose()
+    return stats.as_dict(), http.is_closed
+
+
+async def concurrent():
+    http = ResearchHTTP(per_host=2)
+    await asyncio.gather(*(http.get(f"{BASE}/slow{i}") for i in range(8)))
+    await http.aclose()
+    return http.totals.requests
+
+
+async def job_fetch():
+    job = ResearchJob("Test ISD", "TX")
+
+    async def fake_phases():
+        text = await job._fetch_page(f"{BASE}/staff")
+        await job._fetch_page(f"{BASE}/contact")
+        return {"text": text, "http_connections": job._conn_stats.as_dict()}
+
+    job._run_phases = fake_phases
+    result = await job.run()
+    return result, job._http
+
+
+stats, closed = asyncio.run(sequential())
+check("5 requests counted", stats["requests"], 5)
+check("one TCP connection opened", stats["new_connections"], 1)
+check("4 requests reused it", stats["reused_connections"], 4)
+check("aclose closes pool", closed, True)
+
+check("8 concurrent requests", asyncio.run(concurrent()), 8)
+check("per-host cap bounds in-flight", _peak <= 2, True)
+
+result, leftover = asyncio.run(job_fetch())
+check("fetch strips nav noise", result["text"], "Jane Doe, Director")
+check("job stats", (result["http_connections"]["requests"],
+                    result["http_connections"]["reused_connections"]), (2, 1))
+check("job-owned pool closed after run", leftover, None)
+
+shared = ResearchHTTP()
+check("queue-provided pool is used", ResearchJob("X ISD", "TX", http=shared)._client() is shared, True)
+
+server.shutdown()
+
+# ── Token bucket ───────────────────────────────────────────────────────
+now = [0.0]
+bucket = TokenBucket(60, burst=3, clock=lambda: now[0])
+check("burst available at once", [bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+check("then one per second, in call order", [bucket.reserve() for _ in range(3)], [1.0, 2.0, 3.0])
+now[0] = 10.0
+check("refills to burst, not beyond", [bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.0, 1.0])
+check("rate 0 disables limiting", TokenBucket(0).reserve(), 0.0)
+
+# ── Concurrent Serper dispatch ─────────────────────────────────────────
+_serper_live = 0
+_serper_peak = 0
+
+
+async def _serper_handler(request: httpx.Request) -> httpx.Response:
+    global _serper_live, _serper_peak
+    q = json.loads(request.content)["q"]
+    _serper_live += 1
+    _serper_peak = max(_serper_peak, _serper_live)
+    await asyncio.sleep(random.random() / 50)  # complete out of order
+    _serper_live -= 1
+    if q == "boom":
+        return httpx.Response(500)
+    return httpx.Response(200, json={"q": q})
+
+
+async def serper(queries, cap=None):
+    http = ResearchHTTP(transport=httpx.MockTransport(_serper_handler))
+    job = ResearchJob("Test ISD", "TX", serper_cap_override=cap, http=http)
+    out = await job._serper_batch(queries)
+    await http.aclose()
+    return out, job
+
+
+research_engine.SERPER_API_KEY = "test-key"
+research_engine.serper_limiter = TokenBucket(0)
+random.seed(16)
+queries = [f"q{i}" for i in range(12)]
+out, job = asyncio.run(serper(queries))
+check("results in query order", [r.get("q") for r in out], queries)
+check("dispatched concurrently", _serper_peak > 1, True)
+check("queries counted", job._serper_count, 12)
+
+out, job = asyncio.run(serper(["a", "boom", "c"]))
+check("failure → {} in place", out, [{"q": "a"}, {}, {"q": "c"}])
+check("failed query refunds budget", job._serper_count, 2)
+
+out, job = asyncio.run(serper(["w", "x", "y", "z"], cap=2))
+check("cap: first N dispatched, rest {}", out, [{"q": "w"}, {"q": "x"}, {}, {}])
+check("cap_hit set", job._cap_hit, True)
+
+out, job = asyncio.run(serper(["boom", "m", "n"], cap=2))
+check("refunded budget goes to a capped query", out, [{}, {"q": "m"}, {"q": "n"}])
+check("cap not hit when refunds leave room", (job._cap_hit, job._serper_count), (False, 2))
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
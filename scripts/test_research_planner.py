@@ -0,0 +1,172 @@
+"""
+Unit tests for tools/research_planner.py — layer plans learned from traces.
+
+Synthetic job traces (written with research_trace.write into a temp dir) give
+a low-yield board-agenda layer, a marginal state-DOE layer and a productive
+title-search layer. The tests check the features, the backoff to coarser
+keys, skip / reduce / explore decisions, that core layers and force_all are
+never planned away, ResearchJob's skip and Serper cap, and the replayed
+savings report.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_research_planner.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["RESEARCH_TRACE_DIR"] = tempfile.mkdtemp(prefix="research_planner_test_")
+os.environ["SERPER_CACHE_DIR"] = tempfile.mkdtemp(prefix="research_planner_serper_")
+os.environ["TERRITORY_SNAPSHOT_DIR"] = tempfile.mkdtemp(prefix="research_planner_snapshot_")
+
+import httpx  # noqa: E402
+
+import tools.research_engine as research_engine  # noqa: E402
+import tools.research_planner as research_planner  # noqa: E402
+import tools.research_trace as research_trace  # noqa: E402
+import tools.territory_data as territory_data  # noqa: E402
+import tools.territory_snapshot as territory_snapshot  # noqa: E402
+from tools.research_engine import ResearchJob  # noqa: E402
+from tools.research_http import ResearchHTTP, TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+# ── Features ───────────────────────────────────────────────────────────
+check("k12 domain", research_planner.domain_type("www.austin.k12.tx.us"), "k12")
+check("k12.us root", research_planner.domain_type("k12.mn.us"), "k12")
+check("org domain", research_planner.domain_type("www.austinisd.org"), "org")
+check(".net counts as com", research_planner.domain_type("district.net"), "com")
+check("no domain", research_planner.domain_type(""), "none")
+check("size buckets", [research_planner.size_bucket(n) for n in (0, 900, 8000, 80000)],
+      ["unknown", "small", "medium", "large"])
+check("no snapshot → size and type left out of the key",
+      research_planner.features("Plan ISD", "tx"), {"size": "*", "state": "TX", "domain_type": "*"})
+territory_snapshot.write_dict_rows("districts", territory_data.DISTRICT_COLUMNS, [
+    {"State": "TX", "District Name": "Plan ISD", "Name Key": "plan", "Enrollment": "12000"},
+    {"State": "TX", "District Name": "Tiny ISD", "Enrollment": "300"},
+    {"State": "OK", "District Name": "Plan ISD", "Name Key": "plan", "Enrollment": "900"},
+])
+check("enrollment read from the snapshot partition",
+      [research_planner.district_enrollment(n, s) for n, s in
+       (("Plan ISD", "tx"), ("Plan ISD", "OK"), ("Tiny ISD", "TX"), ("Nowhere ISD", "TX"), ("Plan ISD", ""))],
+      [12000, 900, 300, 0, 0])
+check("snapshot size bucket in the key", research_planner.features("Plan ISD", "TX", "plan.k12.tx.us"),
+      {"size": "medium", "state": "TX", "domain_type": "k12"})
+territory_snapshot.clear()
+
+
+# ── Synthetic history ──────────────────────────────────────────────────
+def span(layer, phase, contacts, serper=0, wall_ms=1000, cost=None):
+    s = research_trace.new_span(layer, phase)
+    s.update(runs=1, serper=serper, wall_ms=wall_ms, contacts=contacts)
+    s["cost_usd"] = serper * research_trace.SERPER_PER_QUERY if cost is None else cost
+    return s
+
+
+for i in range(10):
+    research_trace.write(f"job-{i}", {"size": "unknown", "state": "TX", "domain_type": "k12", "total": 5}, [
+        span("L1:direct-title", "A", 2, serper=4, wall_ms=3000),
+        span("L12:board-agendas", "C", 0, serper=6, wall_ms=9000),
+        span("L13:state-doe", "C", 1 if i < 3 else 0, serper=4, wall_ms=2000),
+        span("L9:claude-extract", "E", 0, wall_ms=20000, cost=0.2),
+    ])
+research_planner.invalidate()
+check("model built from traces", len(research_planner.get_model()["unknown|TX|k12"]), 4)
+feats = {"size": "unknown", "state": "TX", "domain_type": "k12"}
+p = research_planner.plan(feats, rng=lambda: 1.0)
+check("zero-yield layer skipped", sorted(p["skip"]), ["L12"])
+check("marginal layer Serper-capped at half", {k: v["serper_budget"] for k, v in p["reduce"].items()}, {"L13": 2})
+check("core layer never planned", "L9" in p["skip"] or "L9" in p["reduce"], False)
+check("skip basis is the exact key", p["skip"]["L12"]["basis"], "unknown|TX|k12")
+check("projected savings", p["projected_savings"],
+      {"cost_usd": 0.008, "wall_seconds": 7.0, "contacts_at_risk": 0.0})
+
+p = research_planner.plan({"size": "unknown", "state": "CA", "domain_type": "k12"}, rng=lambda: 1.0)
+check("other state backs off to (size, type)", p["skip"]["L12"]["basis"], "unknown|*|k12")
+check("exploration runs a skipped layer", research_planner.plan(feats, rng=lambda: 0.0)["explore"], ["L12"])
+check("force_all → fixed pipeline", research_planner.plan(feats, force_all=True)["skip"], {})
+few = research_planner.build_model(research_trace.load_recent(research_planner.PLANNER_MIN_SAMPLES - 1))
+check("too little history → no plan", research_planner.plan(feats, model=few)["skip"], {})
+
+
+# ── ResearchJob: skip and Serper cap ───────────────────────────────────
+served: list[str] = []
+
+
+def _serper(request: httpx.Request) -> httpx.Response:
+    served.append(json.loads(request.content)["q"])
+    return httpx.Response(200, json={})
+
+
+research_engine.SERPER_API_KEY = "test-key"
+research_engine.serper_limiter = TokenBucket(0)
+research_planner.PLANNER_EXPLORE_RATE = 0.0
+
+
+async def planned_job(force_all):
+    http = ResearchHTTP(transport=httpx.MockTransport(_serper))
+    job = ResearchJob("Plan ISD", "TX", http=http, force_all_layers=force_all)
+    job.district_domain = "www.plan.k12.tx.us"
+    job._make_plan(domain_known=True)
+    ran = []
+
+    async def board_layer():
+        ran.append("L12")
+
+    async def doe_layer():
+        await job._serper_batch([f"doe {i}" for i in range(4)])
+
+    await job._traced("L12:board-agendas", "C", board_layer())
+    await job._traced("L13:state-doe", "C", doe_layer())
+    await http.aclose()
+    return job, ran
+
+
+job, ran = asyncio.run(planned_job(False))
+check("planned job: skipped layer not run", ran, [])
+check("planned job: skip reported", job._skipped_layers, ["L12:board-agendas (planner: ~0.00 contacts/run)"])
+check("planned job: reduced layer stops at its budget", (len(served), job._serper_count), (2, 2))
+result = job._build_result()
+check("result plan", (result["plan"]["skipped"], result["plan"]["reduced"]), (["L12"], {"L13": 2}))
+
+served.clear()
+job, ran = asyncio.run(planned_job(True))
+check("force_all job runs everything", (ran, len(served), job._skipped_layers), (["L12"], 4, []))
+
+
+# ── Replay report ──────────────────────────────────────────────────────
+savings = research_planner.projected_savings()
+check("replay: jobs", savings["jobs"], 10)
+check("replay: L12 skipped in every job", savings["layers_skipped"], {"L12": 10})
+check("replay: cost saved (L12 + L13 overflow)", savings["cost_saved_usd"], 0.08)
+check("replay: phase C wall drops from 9s to 2s", savings["wall_saved_seconds"], 70.0)
+check("replay: no contacts lost", savings["contacts_at_risk"], 0)
+check("report renders", "Skips: L12×10" in research_planner.format_projected_savings(savings), True)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,169 @@
+"""
+Unit tests for the multi-worker ResearchQueue in tools/research_engine.py.
+
+ResearchJob is swapped for a fake that just sleeps, so the tests cover the
+queue itself: N jobs in flight, the interactive lane jumping bulk batches,
+status/ETA reporting, and the shared HTTP pool's lifetime.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_research_queue.py
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.research_engine as research_engine  # noqa: E402
+from tools.research_engine import PRIORITY_BULK, ResearchQueue  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+started: list[str] = []
+pools: set[int] = set()
+live = {"n": 0, "peak": 0}
+
+
+class FakeJob:
+    def __init__(self, district_name, state, http=None, **kwargs):
+        self.district_name = district_name
+        self.http = http
+
+    async def run(self):
+        started.append(self.district_name)
+        pools.add(id(self.http))
+        live["n"] += 1
+        live["peak"] = max(live["peak"], live["n"])
+        await asyncio.sleep(0.05)
+        live["n"] -= 1
+        if self.district_name == "Broken ISD":
+            raise RuntimeError("boom")
+        return {"district": self.district_name}
+
+
+research_engine.ResearchJob = FakeJob
+
+
+async def scenario():
+    queue = ResearchQueue(workers=2)
+    done: list[str] = []
+    errors: list[str] = []
+
+    async def on_done(result):
+        done.append(result["district"])
+
+    async def on_progress(msg):
+        errors.append(msg)
+
+    check("idle status", queue.status(), {"workers": 2, "in_flight": [], "queued": 0, "eta_seconds": 0})
+
+    await queue.enqueue_batch([{"district_name": f"Bulk {i}", "state": "TX"} for i in range(5)],
+                              on_progress, on_done)
+    await queue.enqueue("Urgent ISD", "TX", on_progress, on_done)
+    await queue.enqueue("Broken ISD", "TX", on_progress, on_done)
+    await asyncio.sleep(0.01)
+
+    status = queue.status()
+    check("two jobs in flight", len(status["in_flight"]), 2)
+    check("current_job lists all in flight", queue.current_job, "Urgent ISD, Broken ISD")
+    check("queue depth", status["queued"], 5)
+    # 7 jobs at the default 7 min each over 2 workers → 4 rounds
+    check("ETA before any history", status["eta_seconds"] // 60, 28)
+
+    while queue.is_busy or queue.queue_size:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.01)
+
+    check("interactive lane ran first", started[:2], ["Urgent ISD", "Broken ISD"])
+    check("bulk lane FIFO", started[2:], [f"Bulk {i}" for i in range(5)])
+    check("peak concurrency = workers", live["peak"], 2)
+    check("completions", sorted(done), sorted(["Urgent ISD"] + [f"Bulk {i}" for i in range(5)]))
+    check("failure reported, queue continued", any("Broken ISD" in e for e in errors), True)
+    check("one shared pool", len(pools), 1)
+    check("pool closed when drained", (queue._http, len(queue._workers)), (None, 0))
+    check("ETA uses observed durations", queue._durations and max(queue._durations) < 1, True)
+    return queue
+
+
+asyncio.run(scenario())
+
+# Later batch reopens a pool; workers=1 is strictly sequential
+live["peak"] = 0
+started.clear()
+
+
+async def sequential():
+    queue = ResearchQueue(workers=1)
+
+    async def noop(_):
+        pass
+
+    for i in range(3):
+        await queue.enqueue(f"Seq {i}", "TX", None, noop, priority=PRIORITY_BULK)
+    while queue.is_busy or queue.queue_size:
+        await asyncio.sleep(0.01)
+
+
+asyncio.run(sequential())
+check("workers=1 never overlaps", live["peak"], 1)
+check("workers=1 keeps order", started, ["Seq 0", "Seq 1", "Seq 2"])
+
+# Workers that finish in the same tick still close the pool exactly once
+opened: list["FakeHTTP"] = []
+
+
+class FakeHTTP:
+    def __init__(self):
+        self.closed = 0
+        opened.append(self)
+
+    async def aclose(self):
+        self.closed += 1
+
+
+real_http = research_engine.ResearchHTTP
+research_engine.ResearchHTTP = FakeHTTP
+
+
+async def simultaneous():
+    queue = ResearchQueue(workers=2)
+
+    async def noop(_):
+        pass
+
+    for round_ in range(2):
+        await queue.enqueue(f"A{round_}", "TX", None, noop)
+        await queue.enqueue(f"B{round_}", "TX", None, noop)
+        while queue.is_busy or queue.queue_size or queue._workers:
+            await asyncio.sleep(0.01)
+    return queue
+
+
+queue = asyncio.run(simultaneous())
+research_engine.ResearchHTTP = real_http
+check("one pool per busy period", len(opened), 2)
+check("every pool closed once", [p.closed for p in opened], [1, 1])
+check("no live workers left", (queue._live_workers, queue._http), (0, None))
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
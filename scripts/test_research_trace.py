@@ -0,0 +1,151 @@
+"""
+Unit tests for tools/research_trace.py — per-layer spans, JSONL traces and the
+/research_stats aggregation.
+
+Layers are fakes run through ResearchJob._traced, so the tests check that
+counts land in the right span when layers run concurrently, across
+ResearchHTTP requests and contact_extractor's executor threads, and that the
+job result and trace file carry pages/contacts/cost per layer.
+
+Zero API calls. Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_research_trace.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["RESEARCH_TRACE_DIR"] = tempfile.mkdtemp(prefix="research_trace_test_")
+os.environ["EMAIL_PATTERN_DIR"] = tempfile.mkdtemp(prefix="research_trace_patterns_")
+
+import httpx  # noqa: E402
+
+import tools.contact_extractor as ce  # noqa: E402
+import tools.csv_importer as csv_importer  # noqa: E402
+import tools.research_trace as research_trace  # noqa: E402
+from tools.research_engine import ResearchJob  # noqa: E402
+from tools.research_http import ResearchHTTP, TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+# ── Fakes: Claude replies with token usage; HTTP returns 1 KB ──────────
+ce._known_contacts_cache[csv_importer.normalize_name("Trace ISD")] = ""
+ce.anthropic_limiter = TokenBucket(0)
+
+
+def _create(model, max_tokens, system, messages):
+    return SimpleNamespace(content=[SimpleNamespace(text='[{"first_name": "Ann", "last_name": "Lee"}]')],
+                           usage=SimpleNamespace(input_tokens=1000, output_tokens=100))
+
+
+ce.client = SimpleNamespace(messages=SimpleNamespace(create=_create))
+http = ResearchHTTP(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 1024)))
+
+
+async def scenario():
+    job = ResearchJob("Trace ISD", "TX", http=http)
+
+    async def search_layer(tag, n):
+        for i in range(n):
+            research_trace.record(serper=1)
+            await asyncio.sleep(0)  # interleave with the other layer
+            url = f"https://trace.org/{tag}/{i}"
+            job.raw_pages.append((url, "staff directory director email@trace.org phone " * 5))
+            job._url_to_layer.setdefault(url, tag)
+
+    async def fetch_layer():
+        await http.get("https://trace.org/a")
+        await http.get("https://trace.org/b")
+
+    async def extract_layer():
+        job._count_layer_pages(job.raw_pages, "pages")
+        pages = [p for p in job.raw_pages if "/L1:" in p[0]]
+        job._count_layer_pages(pages, "kept")
+        job.all_contacts = await ce.extract_from_multiple_async(pages, "Trace ISD", pack_ceiling=0)
+
+    await asyncio.gather(
+        job._traced("L1:direct-title", "A", search_layer("L1:direct-title", 3)),
+        job._traced("L2:title-variations", "A", search_layer("L2:title-variations", 2)),
+        job._traced("L6:scrape", "C", fetch_layer()),
+    )
+    research_trace.record(serper=99)  # outside any layer → dropped
+    await job._traced("L9:claude-extract", "E", extract_layer())
+    await job._traced("L10:dedup-score", "E", asyncio.sleep(0))
+    await job._traced("L10:dedup-score", "E", asyncio.sleep(0))
+    return job
+
+
+job = asyncio.run(scenario())
+spans = job._spans
+check("concurrent layers keep their own counts", (spans["L1:direct-title"]["serper"],
+                                                  spans["L2:title-variations"]["serper"]), (3, 2))
+check("HTTP bytes attributed to the fetching layer", spans["L6:scrape"]["bytes_fetched"], 2048)
+check("Claude tokens from executor threads", (spans["L9:claude-extract"]["claude_calls"],
+                                              spans["L9:claude-extract"]["claude_input_tokens"]), (3, 3000))
+check("repeat layer runs accumulate", spans["L10:dedup-score"]["runs"], 2)
+check("no span leakage outside layers", sum(s["serper"] for s in spans.values()), 5)
+
+for c in job.all_contacts:
+    c["source_url"] = "https://trace.org/L1:direct-title/0"
+result = job._build_result()
+trace = {s["layer"]: s for s in result["trace"]}
+check("pages per layer", (trace["L1:direct-title"]["pages"], trace["L1:direct-title"]["pages_kept"],
+                          trace["L2:title-variations"]["pages_dropped"]), (3, 3, 2))
+check("contacts per layer", trace["L1:direct-title"]["contacts"], 1)
+check("span cost", trace["L9:claude-extract"]["cost_usd"], round(3000 * 3e-6 + 300 * 15e-6, 5))
+check("provider totals", (result["provider_calls"]["serper"], result["provider_calls"]["claude_calls"]), (5, 3))
+check("job cost", result["cost_usd"], round(0.005 + 3000 * 3e-6 + 300 * 15e-6, 4))
+
+# ── Trace file + stats ─────────────────────────────────────────────────
+path = research_trace.write("trace-isd", {"district_name": "Trace ISD", "total": 1}, result["trace"])
+lines = [json.loads(line) for line in Path(path).read_text().splitlines()]
+check("trace: header + one line per span", ([l["type"] for l in lines][:2], len(lines)),
+      (["job", "span"], 1 + len(result["trace"])))
+
+# Two more synthetic jobs with known L1 latencies → p50 / p95
+for i, wall in enumerate((100, 900)):
+    span = dict(research_trace.new_span("L1:direct-title", "A"), wall_ms=wall, serper=10, contacts=2,
+                cost_usd=0.01)
+    research_trace.write(f"job-{i}", {"total": 2}, [span])
+stats = research_trace.research_stats()
+l1 = stats["layers"]["L1:direct-title"]
+check("stats: jobs", stats["jobs"], 3)
+check("stats: p50 / p95", (l1["p50_ms"], l1["p95_ms"]), (sorted([100, 900, trace["L1:direct-title"]["wall_ms"]])[1], 900))
+check("stats: yield per dollar", l1["contacts_per_dollar"], round(5 / (0.02 + 0.003), 1))
+check("stats: layers ordered numerically", list(stats["layers"])[:3],
+      ["L1:direct-title", "L2:title-variations", "L6:scrape"])
+check("stats: free layer", stats["layers"]["L10:dedup-score"]["contacts_per_dollar"], None)
+report = research_trace.format_research_stats(stats)
+check("report mentions layers", ("L1:direct-t" in report, "last 3 job" in report), (True, True))
+check("empty report", research_trace.format_research_stats({"jobs": 0}).startswith("📊 No research traces"), True)
+
+research_trace.ENABLE_RESEARCH_TRACES = False
+check("kill switch: no file", research_trace.write("off", {}, []), "")
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
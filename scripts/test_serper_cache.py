@@ -0,0 +1,169 @@
+"""
+Unit tests for tools/serper_cache.py — persistent Serper response cache.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_serper_cache.py
+
+Uses a throwaway SERPER_CACHE_DIR and an httpx.MockTransport; no network I/O.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["SERPER_CACHE_DIR"] = tempfile.mkdtemp(prefix="serper_cache_test_")
+
+import httpx  # noqa: E402
+
+import tools.research_engine as research_engine  # noqa: E402
+import tools.serper_cache as serper_cache  # noqa: E402
+from tools.research_http import ResearchHTTP, TokenBucket  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+calls: list[dict] = []
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    calls.append(body)
+    if body["q"] == "boom":
+        return httpx.Response(500)
+    if body["q"].startswith('"nobody@'):
+        return httpx.Response(200, json={"organic": [], "searchParameters": {"q": body["q"]}})
+    return httpx.Response(200, json={"organic": [{"title": body["q"], "link": "https://x.org"}]})
+
+
+client = httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def search(q, caller="test", **kw):
+    return serper_cache.search(q, caller, api_key="k", client=client, **kw)
+
+
+# ── Keys + families ────────────────────────────────────────────────────
+check("case/whitespace share a key",
+      serper_cache.cache_key('"Austin ISD"  STEM', {"num": 10}),
+      serper_cache.cache_key('"austin isd" stem', {"num": 10}))
+check("params split keys",
+      serper_cache.cache_key("q", {"num": 10}) == serper_cache.cache_key("q", {"num": 5}), False)
+check("family recent", serper_cache.query_family("x", {"tbs": "qdr:m"}), "recent")
+check("family qdr:y is web", serper_cache.query_family("x", {"tbs": "qdr:y"}), "web")
+check("family email", serper_cache.query_family('"jane.doe@austinisd.org"'), "email")
+check("family linkedin", serper_cache.query_family('site:linkedin.com "Austin ISD"'), "linkedin")
+check("family site", serper_cache.query_family('site:austinisd.org staff'), "site")
+check("-site: exclusion is not site", serper_cache.query_family('school -site:yelp.com'), "web")
+
+# ── search: miss → network + store, hit → disk ─────────────────────────
+first = search("Austin ISD staff", caller="a", num=10)
+again = search("austin isd   STAFF", caller="b", num=10)
+check("miss went to network", (first.from_cache, len(calls)), (False, 1))
+check("hit served from disk", (again.from_cache, len(calls)), (True, 1))
+check("same payload", dict(again), dict(first))
+check("request carried params", calls[0], {"q": "Austin ISD staff", "num": 10})
+search("Austin ISD staff", num=5)
+check("different num is a miss", len(calls), 2)
+check("stats per caller", (serper_cache.stats()["a"], serper_cache.stats()["b"]),
+      ({"hits": 0, "misses": 1, "stores": 1}, {"hits": 1, "misses": 0, "stores": 0}))
+report = serper_cache.format_stats(serper_cache.stats())
+check("stats report lists callers", ("`a " in report, "`b " in report, "100%" in report), (True, True, True))
+check("no stats → no report", serper_cache.format_stats({}), "")
+
+# ── Errors are not cached ──────────────────────────────────────────────
+for _ in range(2):
+    try:
+        search("boom")
+    except httpx.HTTPStatusError:
+        pass
+check("errors always refetch", sum(c["q"] == "boom" for c in calls), 2)
+
+# ── TTL per family ─────────────────────────────────────────────────────
+search("news scan", tbs="qdr:m")
+path = serper_cache._path(serper_cache.cache_key("news scan", {"num": 10, "tbs": "qdr:m"}))
+entry = json.loads(Path(path).read_text())
+check("stored family", entry["family"], "recent")
+entry["stored_at"] -= serper_cache.FAMILY_TTL_SECONDS["recent"] + 1
+Path(path).write_text(json.dumps(entry))
+n = len(calls)
+check("expired entry refetched", (search("news scan", tbs="qdr:m").from_cache, len(calls)), (False, n + 1))
+Path(path).write_text(json.dumps(entry))
+check("prune drops expired only", serper_cache.prune(), 1)
+check("fresh entries survive prune", search("Austin ISD staff", num=10).from_cache, True)
+tmp = f"{path}.999.1.tmp"
+Path(tmp).write_text("{")  # another writer's in-flight put()
+check("in-flight temp file survives prune", (serper_cache.prune(), os.path.exists(tmp)), (0, True))
+os.utime(tmp, (time.time() - 2 * 3600,) * 2)
+check("abandoned temp file pruned", (serper_cache.prune(), os.path.exists(tmp)), (1, False))
+
+# ── Negative results: short TTL whatever the family ────────────────────
+miss = '"nobody@austinisd.org"'
+search(miss)
+path = serper_cache._path(serper_cache.cache_key(miss, {"num": 10}))
+entry = json.loads(Path(path).read_text())
+check("no organic → negative entry", (entry["family"], entry["negative"]), ("email", True))
+check("negative entry served while fresh", search(miss).from_cache, True)
+entry["stored_at"] -= serper_cache.NEGATIVE_TTL_SECONDS + 1
+Path(path).write_text(json.dumps(entry))
+check("negative entry expires long before the email TTL", search(miss).from_cache, False)
+
+# ── Kill switch ────────────────────────────────────────────────────────
+serper_cache.ENABLE_SERPER_CACHE = False
+n = len(calls)
+check("disabled → always network", search("Austin ISD staff", num=10).from_cache, False)
+check("disabled → one call", len(calls), n + 1)
+serper_cache.ENABLE_SERPER_CACHE = True
+
+# ── ResearchJob: cached queries skip the network and the cap ───────────
+serper_calls: list[str] = []
+
+
+def serper_handler(request: httpx.Request) -> httpx.Response:
+    q = json.loads(request.content)["q"]
+    serper_calls.append(q)
+    return httpx.Response(200, json={"organic": [{"link": f"https://{q}.org", "snippet": q}]})
+
+
+async def job_batch(queries, cap):
+    http = ResearchHTTP(transport=httpx.MockTransport(serper_handler))
+    job = research_engine.ResearchJob("Test ISD", "TX", serper_cap_override=cap, http=http)
+    out = await job._serper_batch(queries)
+    await http.aclose()
+    return out, job
+
+
+research_engine.SERPER_API_KEY = "test-key"
+research_engine.serper_limiter = TokenBucket(0)
+out1, job1 = asyncio.run(job_batch(["r1", "r2"], cap=5))
+out2, job2 = asyncio.run(job_batch(["r1", "r2", "r3"], cap=1))
+check("second job: only the new query hits the network", serper_calls, ["r1", "r2", "r3"])
+check("cache hits don't consume the cap", (job2._serper_count, job2._cap_hit), (1, False))
+check("cached results in order", [r["organic"][0]["snippet"] for r in out2], ["r1", "r2", "r3"])
+check("job counts cache hits", job2._serper_cache_hits, 2)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,137 @@
+"""
+Unit tests for tools/spatial_index.py — lat/lon grid for proximity queries.
+
+Every grid query and nearest_each() call (NumPy and pure-Python fallback) is
+checked against a brute-force haversine scan: same hits, same distances, same
+order, same nearest-point tie-breaking.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_spatial_index.py
+"""
+from __future__ import annotations
+
+import math
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import tools.spatial_index as spatial_index  # noqa: E402
+from tools.spatial_index import GeoGridIndex, PointArray, haversine_miles, nearest_each  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+def scan_within(points, lat, lon, radius):
+    out = []
+    for i, (plat, plon) in enumerate(points):
+        if plat is None or plon is None:
+            continue
+        d = haversine_miles(lat, lon, plat, plon)
+        if d <= radius:
+            out.append((i, d))
+    return out
+
+
+def scan_nearest(points, lat, lon, max_miles=None):
+    best, best_i = float("inf"), None
+    for i, (plat, plon) in enumerate(points):
+        if plat is None or plon is None:
+            continue
+        d = haversine_miles(lat, lon, plat, plon)
+        if d < best:
+            best, best_i = d, i
+    if best_i is None or (max_miles is not None and best > max_miles):
+        return None
+    return best_i, best
+
+
+# ── Basics ─────────────────────────────────────────────────────────────
+austin = (30.2672, -97.7431)
+grid = GeoGridIndex([austin, (None, None), (30.5083, -97.6789), (float("nan"), -97.0)])
+check("len skips missing / NaN coords", len(grid), 2)
+check("zero radius hits self", grid.within(*austin, 0), [(0, 0.0)])
+check("within index order", [i for i, _ in grid.within(*austin, 50)], [0, 2])
+check("NaN query → nothing", grid.within(float("nan"), -97.0, 50), [])
+check("nearest", grid.nearest(30.5, -97.68)[0], 2)
+check("nearest beyond max_miles", grid.nearest(40.0, -97.7, max_miles=30), None)
+check("empty grid nearest", GeoGridIndex([]).nearest(*austin), None)
+
+# ── Ties: duplicate coordinates → lowest index, like a linear scan ────
+dupes = [(31.0, -98.0), (30.0, -97.0), (31.0, -98.0), (30.0, -97.0)]
+check("tie → first index", GeoGridIndex(dupes).nearest(30.0, -97.0), (1, 0.0))
+
+# ── Randomized parity: Texas-scale data ───────────────────────────────
+rng = random.Random(11)
+pts = [(26 + rng.random() * 10, -106 + rng.random() * 12) for _ in range(3000)]
+pts += [pts[i] for i in range(0, 300, 3)]  # exact duplicates
+grid = GeoGridIndex(pts)
+within_bad = nearest_bad = 0
+for _ in range(300):
+    lat, lon = 25 + rng.random() * 12, -107 + rng.random() * 14
+    r = rng.choice([0.5, 5, 15, 30, 50, 250])
+    within_bad += grid.within(lat, lon, r) != scan_within(pts, lat, lon, r)
+    m = rng.choice([None, 5, 30])
+    nearest_bad += grid.nearest(lat, lon, max_miles=m) != scan_nearest(pts, lat, lon, m)
+check("random within == scan", within_bad, 0)
+check("random nearest == scan", nearest_bad, 0)
+
+# ── Randomized parity: poles and the antimeridian ─────────────────────
+pts = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(1500)]
+pts += [(89.9, 10.0), (-89.95, -170.0), (10.0, 179.99), (10.0, -179.99)]
+grid = GeoGridIndex(pts)
+bad = 0
+for lat, lon in [(89.8, 0.0), (-89.9, 100.0), (10.0, 179.9), (10.0, -179.9), (0.0, 0.0)]:
+    for r in (10, 100, 1000, 8000):
+        bad += grid.within(lat, lon, r) != scan_within(pts, lat, lon, r)
+    bad += grid.nearest(lat, lon) != scan_nearest(pts, lat, lon)
+check("edge-of-map parity", bad, 0)
+check("antimeridian neighbour found",
+      [i for i, _ in grid.within(10.0, 179.99, 5)], [len(pts) - 2, len(pts) - 1])
+check("distance formula", round(haversine_miles(*austin, 30.5083, -97.6789), 3),
+      round(3958.8 * 2 * math.asin(math.sqrt(
+          math.sin(math.radians(30.5083 - 30.2672) / 2) ** 2
+          + math.cos(math.radians(30.2672)) * math.cos(math.radians(30.5083))
+          * math.sin(math.radians(-97.6789 + 97.7431) / 2) ** 2)), 3))
+
+# ── nearest_each: vectorized (NumPy) and fallback both match the scan ─
+sources = [(26 + rng.random() * 10, -106 + rng.random() * 12) for _ in range(700)]
+sources += [(None, None), (float("nan"), -97.0)]
+targets = [(26 + rng.random() * 10, -106 + rng.random() * 12) for _ in range(120)]
+targets += [targets[5], (None, None)]  # duplicate of index 5 never wins the tie
+for max_miles in (None, 25):
+    expected = [scan_nearest(targets, lat if lat is not None else float("nan"),
+                             lon if lon is not None else float("nan"), max_miles)
+                for lat, lon in sources]
+    spatial_index._MATRIX_CHUNK_CELLS = 5000  # force several chunks
+    check(f"nearest_each vector (max {max_miles})",
+          nearest_each(PointArray(sources), PointArray(targets), max_miles=max_miles), expected)
+    saved, spatial_index._numpy = spatial_index._numpy, lambda: None
+    check(f"nearest_each fallback (max {max_miles})",
+          nearest_each(PointArray(sources), PointArray(targets), max_miles=max_miles), expected)
+    spatial_index._numpy = saved
+check("nearest_each rows subset order",
+      nearest_each(PointArray(sources), PointArray(targets), rows=[3, 1]),
+      [scan_nearest(targets, *sources[3]), scan_nearest(targets, *sources[1])])
+check("nearest_each no targets", nearest_each(PointArray(sources[:2]), PointArray([])), [None, None])
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,117 @@
+"""
+Unit tests for tools/territory_map.py — cached GeoJSON layer rendering.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_territory_map.py
+
+Seeds a throwaway TERRITORY_SNAPSHOT_DIR and stubs the Sheets-backed loaders
+(active accounts, pipeline, prospects, signals); no network I/O.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["TERRITORY_SNAPSHOT_DIR"] = tempfile.mkdtemp(prefix="territory_map_test_")
+
+import tools.csv_importer as csv_importer  # noqa: E402
+import tools.district_prospector as district_prospector  # noqa: E402
+import tools.pipeline_tracker as pipeline_tracker  # noqa: E402
+import tools.signal_processor as signal_processor  # noqa: E402
+import tools.territory_map as territory_map  # noqa: E402
+import tools.territory_snapshot as territory_snapshot  # noqa: E402
+from tools.territory_data import DISTRICT_COLUMNS  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+def district(state, name, agency, lat, lon, enrollment=1200):
+    row = dict.fromkeys(DISTRICT_COLUMNS, "")
+    row.update({"State": state, "District Name": name, "Agency Type": agency,
+                "Lat": lat, "Lon": lon, "Enrollment": enrollment, "School Count": 4,
+                "City": "Austin", "Name Key": csv_importer.normalize_name(name)})
+    return [row[c] for c in DISTRICT_COLUMNS]
+
+
+REGULAR = "Regular local school district"
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, [
+    district("TX", "Austin ISD", REGULAR, 30.27, -97.74, 73000),
+    district("TX", "Round Rock ISD", REGULAR, 30.51, -97.68),
+    district("TX", "Leander ISD", REGULAR, 30.58, -97.85),
+    district("TX", "Georgetown ISD", REGULAR, 30.63, -97.68),
+    district("TX", "Region 13 ESC", "Regional education service agency", 30.2, -97.7, 0),
+    district("TX", "No Coords ISD", REGULAR, "", ""),
+    district("NV", "Clark County School District", REGULAR, 36.17, -115.14),
+], complete=True)
+
+accounts = [{"Active Account Name": "Austin ISD", "State": "TX", "Account Type": "district"}]
+prospects = [{"Account Name": "Round Rock ISD", "State": "TX", "Status": "pending"}]
+csv_importer.get_active_accounts = lambda state_filter="": [
+    a for a in accounts if not state_filter or a["State"] == state_filter.upper()]
+district_prospector.get_all_prospects = lambda status_filter="": list(prospects)
+pipeline_tracker.get_open_opps = lambda: [
+    {"Account Name": "Leander Independent School District", "State": "TX"}]
+signal_processor.get_active_signals = lambda state_filter="", **kw: []
+
+
+def counts(html: str) -> dict:
+    return {k: int(v) for k, v in re.findall(r"&#9679;</span> (\w+) \((\d+)\)", html)}
+
+
+# ── Layer counts ───────────────────────────────────────────────────────
+html = territory_map.generate_territory_map("TX")
+check("TX counts", counts(html),
+      {"Active": 1, "Pipeline": 1, "Prospects": 1, "ESAs": 1, "Districts": 1})
+check("standalone page, not an iframe", html.lstrip().startswith("<!DOCTYPE html>"), True)
+check("popups inlined as GeoJSON", html.count('"type":"Feature"'), 5)
+check("no raw </ inside script data", "<b>Leander ISD</b>" in html, False)
+check("all states", counts(territory_map.generate_territory_map(""))["Districts"], 2)
+
+# ── Caches ─────────────────────────────────────────────────────────────
+check("unchanged inputs → cached HTML", territory_map.generate_territory_map("TX") is html, True)
+check("district base persisted", territory_snapshot.read_derived("map_districts", "TX") is not None, True)
+prospects.append({"Account Name": "Leander ISD", "State": "TX", "Status": "pending"})
+check("prospect change re-renders", counts(territory_map.generate_territory_map("TX"))["Prospects"], 2)
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, [
+    district("TX", "Austin ISD", REGULAR, 30.27, -97.74),
+], states=["TX"])
+check("territory resync rebuilds base", counts(territory_map.generate_territory_map("TX"))["ESAs"], 0)
+
+# ── Coordinate lookup: exact first usable row, then fuzzy (last row per key) ──
+base = territory_map._build_district_base([
+    {"Name Key": "oak", "Lat": "", "Lon": ""},
+    {"Name Key": "oak", "Lat": "31", "Lon": "-97"},
+    {"Name Key": "pine valley", "Lat": "32", "Lon": "-98"},
+    {"Name Key": "pine valley", "Lat": "33", "Lon": "-99"},
+])
+lookup = territory_map._CoordLookup(json.loads(json.dumps(base)))
+check("exact first usable", lookup.find("oak"), (31.0, -97.0))
+check("exact first of dupes", lookup.find("pine valley"), (32.0, -98.0))
+check("fuzzy → last row", lookup.find("pine valley cusd"), (33.0, -99.0))
+check("no match", lookup.find("zzz"), None)
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,164 @@
+"""
+Unit tests for tools/territory_snapshot.py — columnar territory snapshot store —
+and the territory_index warm-start file that sits next to it.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_territory_snapshot.py
+
+Writes into a throwaway TERRITORY_SNAPSHOT_DIR; no Sheets or network I/O.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["TERRITORY_SNAPSHOT_DIR"] = tempfile.mkdtemp(prefix="territory_snapshot_test_")
+
+import tools.territory_snapshot as territory_snapshot  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+COLUMNS = ["State", "District Name", "LEAID", "Enrollment", "School Count",
+           "Lat", "Lon", "Name Key"]
+
+ROWS = [
+    ["TX", "Austin ISD", "4808940", 73000, 120, 30.2672, -97.7431, "austin"],
+    ["TX", "Leander ISD", "4826910", "", "", "", "", "leander"],
+    ["NV", "Clark County School District", "3200060", 309000, 380, 36.17, -115.14, "clark county"],
+    ["NV", "Señora Charter", "3200999", "12", "1", "39.5", "-119.8", "señora charter"],
+]
+
+# ── Empty snapshot ─────────────────────────────────────────────────────
+check("no snapshot → None (unfiltered)", territory_snapshot.load_rows("districts"), None)
+check("no snapshot → None (filtered)", territory_snapshot.load_rows("districts", "TX"), None)
+check("generation starts at 0", territory_snapshot.get_generation(), 0)
+
+# ── Partial write (one synced state) ───────────────────────────────────
+gen1 = territory_snapshot.write_states("districts", COLUMNS, ROWS, states=["TX"])
+check("generation bumped", gen1, 1)
+tx = territory_snapshot.load_rows("districts", "tx")
+check("TX rows", len(tx), 2)
+check("TX str column", tx[0]["District Name"], "Austin ISD")
+check("TX int column → str", tx[0]["Enrollment"], "73000")
+check("TX float column → str", tx[0]["Lat"], "30.2672")
+check("TX blank int → ''", tx[1]["Enrollment"], "")
+check("TX blank float → ''", tx[1]["Lon"], "")
+check("partial: unfiltered falls back", territory_snapshot.load_rows("districts"), None)
+check("partial: unknown state falls back", territory_snapshot.load_rows("districts", "NV"), None)
+
+# ── Full seed ──────────────────────────────────────────────────────────
+territory_snapshot.write_states("districts", COLUMNS, ROWS, complete=True)
+check("complete flag", territory_snapshot.is_complete("districts"), True)
+all_rows = territory_snapshot.load_rows("districts")
+check("all rows", len(all_rows), 4)
+check("states", territory_snapshot.snapshot_states("districts"), ["NV", "TX"])
+nv = territory_snapshot.load_rows("districts", "NV")
+check("unicode round-trip", nv[1]["District Name"], "Señora Charter")
+check("string-typed numbers parsed", nv[1]["Enrollment"], "12")
+check("complete: missing state → []", territory_snapshot.load_rows("districts", "OH"), [])
+check("schools kind untouched", territory_snapshot.load_rows("schools"), None)
+
+# ── Typed column access ────────────────────────────────────────────────
+table = territory_snapshot.read_table("districts", "TX")
+check("table len", len(table), 2)
+check("typed enrollment", table.column("Enrollment"), [73000, None])
+check("typed lat", table.column("Lat"), [30.2672, None])
+check("table reused while unchanged", territory_snapshot.read_table("districts", "TX") is table, True)
+
+# ── State resync replaces only that partition ─────────────────────────
+territory_snapshot.write_states(
+    "districts", COLUMNS, [["TX", "Round Rock ISD", "4838730", 47000, 55, 30.5, -97.6, "round rock"]],
+    states=["TX"],
+)
+tx2 = territory_snapshot.load_rows("districts", "TX")
+check("resync TX rows", [r["Name Key"] for r in tx2], ["round rock"])
+check("resync keeps NV", len(territory_snapshot.load_rows("districts", "NV")), 2)
+check("resync keeps complete", territory_snapshot.is_complete("districts"), True)
+
+# ── Empty partition write (state synced to zero rows) ─────────────────
+territory_snapshot.write_states("districts", COLUMNS, [], states=["NE"])
+check("empty partition", territory_snapshot.load_rows("districts", "NE"), [])
+
+# ── Derived tables (stamped with their source partition's generation) ──
+tx_gen = territory_snapshot.partition_generation("districts", "TX")
+territory_snapshot.write_derived("esa", "tx", {"assignments": {"round rock": "Region 13"}}, tx_gen)
+check("derived round-trip", territory_snapshot.read_derived("esa", "TX"),
+      {"assignments": {"round rock": "Region 13"}})
+check("derived missing partition", territory_snapshot.read_derived("esa", "OH"), None)
+territory_snapshot.write_states(  # same rows, new partition generation
+    "districts", COLUMNS, [["TX", "Round Rock ISD", "4838730", 47000, 55, 30.5, -97.6, "round rock"]],
+    states=["TX"],
+)
+check("derived stale after resync", territory_snapshot.read_derived("esa", "TX"), None)
+territory_snapshot.write_derived("esa", "NV", [1, 2],
+                                 territory_snapshot.partition_generation("districts", "NV"))
+
+# ── Warm-start index file (territory_index) ───────────────────────────
+import tools.territory_index as territory_index  # noqa: E402
+
+gen = territory_snapshot.get_generation()
+idx = territory_index.TerritoryIndex([], territory_snapshot.load_rows("districts"), gen)
+idx.geo_for_state("TX")  # lazy caches: must not be persisted
+idx.points_for_state("districts", "TX")
+territory_index._save_persisted(idx)
+warm = territory_index._load_persisted(gen)
+check("warm start loads", warm is not None, True)
+check("warm start districts_by_key", sorted(warm.districts_by_key), sorted(idx.districts_by_key))
+check("warm start domain roots", warm.by_domain_root.keys() == idx.by_domain_root.keys(), True)
+check("warm start drops lazy caches", warm._geo_by_state, {})
+check("warm start drops point grids", warm._points_by_state, {})
+check("state points rebuild", warm.points_for_state("districts", "tx").lats, [30.5])
+check("warm start lazy rebuilds", warm.geo_for_state("TX"), idx.geo_for_state("TX"))
+check("stale generation ignored", territory_index._load_persisted(gen + 1), None)
+territory_index._save_persisted(territory_index.TerritoryIndex([], [], gen))
+check("empty index never warm-starts", territory_index._load_persisted(gen), None)
+territory_index._save_persisted(idx)
+
+# ── NCES email-domain → state (territory_matcher on the shared index) ──
+import tools.territory_matcher as territory_matcher  # noqa: E402
+
+territory_matcher._cache = territory_index.TerritoryIndex([], [
+    {"District Name": "Orleans Parish", "State": "LA", "City": "New Orleans", "Name Key": "orleans parish"},
+    {"District Name": "Lakeland ISD", "State": "FL", "City": "Lakeland", "Name Key": "lakeland"},
+    {"District Name": "Lakeland USD", "State": "CA", "City": "Lakeland", "Name Key": "lakeland"},
+    {"District Name": "Round Rock ISD", "State": "TX", "City": "Round Rock", "Name Key": "round rock"},
+], 1)
+check("city contained in domain", territory_matcher.lookup_state_from_nces("a@kippneworleans.org"), "LA")
+check("multi-state city skipped", territory_matcher.lookup_state_from_nces("a@greaterlakeland.org"), "")
+check("spaced city via no-space key", territory_matcher.lookup_state_from_nces("a@roundrockisd.org"), "TX")
+check("batch lookup", territory_matcher.lookup_states_from_nces(
+    ["a@kippneworleans.org", "", "b@kippneworleans.org", "c@gmail.com"]), ["LA", "", "LA", ""])
+territory_matcher._cache = None
+
+# ── Clear ──────────────────────────────────────────────────────────────
+gen_before = territory_snapshot.get_generation()
+territory_snapshot.clear()
+check("clear → fallback", territory_snapshot.load_rows("districts", "TX"), None)
+check("clear bumps generation", territory_snapshot.get_generation(), gen_before + 1)
+check("clear removes derived tables",
+      [f for f in os.listdir(territory_snapshot.SNAPSHOT_DIR) if f.endswith(".derived.json")], [])
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -0,0 +1,291 @@
+"""
+Unit tests for the incremental (diff-based) territory sync in tools/territory_data.py.
+
+Runs as a script (no pytest dependency):
+    .venv/bin/python scripts/test_territory_sync_diff.py
+
+Drives _sync_state_incremental against an in-memory stand-in for the Sheets
+API and checks the tab ends up holding exactly the new rows, with only the
+changed rows written. Uses a throwaway TERRITORY_SNAPSHOT_DIR.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+os.environ["TERRITORY_SNAPSHOT_DIR"] = tempfile.mkdtemp(prefix="territory_sync_test_")
+
+import tools.territory_data as territory_data  # noqa: E402
+import tools.territory_snapshot as territory_snapshot  # noqa: E402
+from tools.territory_data import DISTRICT_COLUMNS, SCHOOL_COLUMNS  # noqa: E402
+
+_passed = 0
+_failed: list[str] = []
+
+
+def check(label: str, got, expected) -> None:
+    global _passed
+    if got == expected:
+        _passed += 1
+    else:
+        _failed.append(f"FAIL {label}: got {got!r}, expected {expected!r}")
+
+
+# ── In-memory Sheets stand-in (one tab, values stored as strings) ──────
+class _Call:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeSheet:
+    def __init__(self, rows: list[list]):
+        self.rows = [[str(v) for v in r] for r in rows]  # data rows, sheet row 2 onward
+        self.fail_updates = 0  # next N value batchUpdates raise
+        self.calls = {"batchGet": 0, "valuesBatchUpdate": 0, "updatedRows": 0,
+                      "deleteRequests": 0, "append": 0, "appendedRows": 0}
+
+    # service.spreadsheets()
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _Values(self)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            for req in body["requests"]:
+                rng = req["deleteDimension"]["range"]
+                # startIndex is 0-based over the whole grid (header = 0)
+                del self.rows[rng["startIndex"] - 1:rng["endIndex"] - 1]
+                self.calls["deleteRequests"] += 1
+            return {}
+        return _Call(run)
+
+
+class _Values:
+    def __init__(self, sheet: FakeSheet):
+        self.sheet = sheet
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension):
+        def run():
+            self.sheet.calls["batchGet"] += 1
+            out = []
+            for rng in ranges:
+                letter = re.search(r"!([A-Z]+)2:", rng).group(1)
+                col = ord(letter) - ord("A")
+                vals = [r[col] if col < len(r) else "" for r in self.sheet.rows]
+                out.append({"values": [vals]} if vals else {})
+            return {"valueRanges": out}
+        return _Call(run)
+
+    def batchUpdate(self, spreadsheetId, body):
+        def run():
+            if self.sheet.fail_updates:
+                self.sheet.fail_updates -= 1
+                raise RuntimeError("503 backend error")
+            self.sheet.calls["valuesBatchUpdate"] += 1
+            for item in body["data"]:
+                n = int(re.search(r"!A(\d+)$", item["range"]).group(1))
+                self.sheet.rows[n - 2] = [str(v) for v in item["values"][0]]
+                self.sheet.calls["updatedRows"] += 1
+            return {}
+        return _Call(run)
+
+    def get(self, spreadsheetId, range):
+        return _Call(lambda: {"values": [list(r) for r in self.sheet.rows]} if self.sheet.rows else {})
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        def run():
+            self.sheet.calls["append"] += 1
+            self.sheet.rows.extend([str(v) for v in r] for r in body["values"])
+            self.sheet.calls["appendedRows"] += len(body["values"])
+            return {}
+        return _Call(run)
+
+
+def district(leaid: str, name: str, enrollment, state: str = "TX", date: str = "2025-01-01") -> list:
+    return [state, name, leaid, "Austin", "", "", "", "", "", enrollment, "", "", "",
+            30.25, -97.75, date, name.lower()]
+
+
+def sheet_view(rows: list[list]) -> list[tuple]:
+    """Comparable view: (leaid, name, enrollment) sorted, ignoring Date Synced."""
+    return sorted((r[2], r[1], str(r[9])) for r in rows)
+
+
+# ── Existing sheet + snapshot ──────────────────────────────────────────
+old_tx = [
+    district("100", "Austin ISD", 73000),
+    district("200", "Leander ISD", 40000),
+    district("300", "Closed ISD", 100),
+    district("400", "Dup ISD", 500),
+]
+other = [district("900", "Clark County SD", 309000, state="NV")]
+sheet = FakeSheet([old_tx[0], other[0], old_tx[1], old_tx[2], old_tx[3], old_tx[3]])
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, old_tx + other, complete=True)
+
+# ── New NCES pull: one update, one delete, one insert, one unchanged ───
+new_tx = [
+    district("100", "Austin ISD", 73000, date="2026-10-17"),   # unchanged
+    district("200", "Leander ISD", 41234, date="2026-10-17"),  # enrollment changed
+    district("400", "Dup ISD", 500, date="2026-10-17"),        # unchanged, duplicate row in sheet
+    district("500", "New Charter", 250, date="2026-10-17"),    # insert
+]
+errors: list[str] = []
+summary = territory_data._sync_state_incremental(
+    sheet, "sheet", "Territory Districts", 0, "districts", DISTRICT_COLUMNS, "TX",
+    new_tx, errors,
+)
+check("no errors", errors, [])
+check("summary", summary, {"inserted": 1, "updated": 1, "deleted": 2, "unchanged": 2})
+check("sheet holds new TX rows + NV", sheet_view(sheet.rows), sheet_view(new_tx + other))
+check("one position read", sheet.calls["batchGet"], 1)
+check("only changed rows rewritten", sheet.calls["updatedRows"], 1)
+check("only new rows appended", sheet.calls["appendedRows"], 1)
+check("unchanged row keeps Date Synced", new_tx[0][15], "2025-01-01")
+check("updated row gets new Date Synced", new_tx[1][15], "2026-10-17")
+check("other state untouched", [r for r in sheet.rows if r[0] == "NV"], [[str(v) for v in other[0]]])
+
+# ── Re-running with identical data writes nothing ──────────────────────
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, new_tx, states=["TX"])
+before = dict(sheet.calls)
+again = [list(r) for r in new_tx]
+summary = territory_data._sync_state_incremental(
+    sheet, "sheet", "Territory Districts", 0, "districts", DISTRICT_COLUMNS, "TX",
+    again, errors,
+)
+check("no-op summary", summary, {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 4})
+check("no-op writes nothing",
+      (sheet.calls["updatedRows"], sheet.calls["appendedRows"], sheet.calls["deleteRequests"]),
+      (before["updatedRows"], before["appendedRows"], before["deleteRequests"]))
+
+# ── No snapshot for the state: existing rows are rewritten, not duplicated ──
+territory_snapshot.clear()
+summary = territory_data._sync_state_incremental(
+    sheet, "sheet", "Territory Districts", 0, "districts", DISTRICT_COLUMNS, "TX",
+    [list(r) for r in new_tx], errors,
+)
+check("no snapshot → updates", summary, {"inserted": 0, "updated": 4, "deleted": 0, "unchanged": 0})
+check("no snapshot → same rows", sheet_view(sheet.rows), sheet_view(new_tx + other))
+
+# ── Pure diff: contiguous deletes and blank ids ────────────────────────
+diff = territory_data._diff_state_rows(
+    DISTRICT_COLUMNS, "LEAID",
+    [district("", "No Id", 1)],
+    [],
+    {"1": [2], "2": [3], "": [5]},
+)
+check("blank id inserted", len(diff["inserts"]), 1)
+check("unclaimed rows deleted", diff["deletes"], [2, 3, 5])
+
+# ── Manual edits: a removed row forces a full diff that also fixes edited cells ──
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, new_tx, states=["TX"])
+sheet.rows = [r for r in sheet.rows if r[2] != "500"]
+edited = next(r for r in sheet.rows if r[2] == "100")
+edited[1] = "Hand Edited ISD"
+summary = territory_data._sync_state_incremental(
+    sheet, "sheet", "Territory Districts", 0, "districts", DISTRICT_COLUMNS, "TX",
+    [list(r) for r in new_tx], errors,
+)
+check("ids differ → full diff", summary, {"inserted": 1, "updated": 3, "deleted": 0, "unchanged": 0})
+check("manual edit corrected", sheet_view(sheet.rows), sheet_view(new_tx + other))
+
+
+# ── sync_territory: failed writes leave the snapshot so the next run retries ──
+class TwoTabs:
+    """Routes Sheets calls to one FakeSheet per tab (by range prefix / sheetId)."""
+
+    def __init__(self, tabs: dict[str, FakeSheet], ids: dict[int, str]):
+        self.tabs, self.ids = tabs, ids
+
+    def _tab(self, rng: str) -> FakeSheet:
+        return self.tabs[re.match(r"'([^']+)'", rng).group(1)]
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension):
+        return _Values(self._tab(ranges[0])).batchGet(spreadsheetId, ranges, majorDimension)
+
+    def append(self, spreadsheetId, range, **kwargs):
+        return _Values(self._tab(range)).append(spreadsheetId, range, **kwargs)
+
+    def get(self, spreadsheetId, range):
+        return _Values(self._tab(range)).get(spreadsheetId, range)
+
+    def batchUpdate(self, spreadsheetId, body):
+        if "data" in body:
+            return _Values(self._tab(body["data"][0]["range"])).batchUpdate(spreadsheetId, body)
+        tab_id = body["requests"][0]["deleteDimension"]["range"]["sheetId"]
+        return self.tabs[self.ids[tab_id]].batchUpdate(spreadsheetId, body)
+
+
+territory_snapshot.clear()
+d_sheet = FakeSheet([district("100", "Austin ISD", 73000)])
+service = TwoTabs({"Territory Districts": d_sheet, "Territory Schools": FakeSheet([])},
+                  {1: "Territory Districts", 2: "Territory Schools"})
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, [district("100", "Austin ISD", 73000)],
+                                states=["TX"])
+territory_snapshot.write_states("schools", SCHOOL_COLUMNS, [], states=["TX"])
+pulled = [district("100", "Austin ISD", 75000, date="2026-10-17")]
+territory_data._get_service = lambda: service
+territory_data._get_territory_sheet_id = lambda: "sheet"
+territory_data._ensure_tab = lambda tab, cols: (service, "sheet", 1 if tab == "Territory Districts" else 2)
+territory_data._format_tab = lambda *args: None
+territory_data._iter_state_rows = lambda states, concurrent: iter(
+    [("TX", [list(r) for r in pulled], [], None)])
+territory_data.time = SimpleNamespace(sleep=lambda s: None, time=time.time)
+
+d_sheet.fail_updates = 3
+result = territory_data.sync_territory(["TX"])
+check("failed update batch reported", (result["states_completed"], len(result["errors"])), ([], 2))
+check("sheet still stale", d_sheet.rows[0][9], "73000")
+check("snapshot left at the old value",
+      territory_snapshot.load_rows("districts", "TX")[0]["Enrollment"] in (73000, "73000"), True)
+
+result = territory_data.sync_territory(["TX"])
+check("next sync re-issues the update", (result["states_completed"], result["changes"]["TX"]["districts"]["updated"]),
+      (["TX"], 1))
+check("sheet now current", d_sheet.rows[0][9], "75000")
+
+
+# ── Sheet re-check: hand edits reach the snapshot without a sync ───────
+territory_snapshot.write_states("districts", DISTRICT_COLUMNS, [list(r) for r in d_sheet.rows], complete=True)
+territory_snapshot.write_states("schools", SCHOOL_COLUMNS, [], complete=True)
+check("re-check: unchanged sheet rewrites nothing", territory_data.refresh_snapshot_from_sheet(), [])
+gen = territory_snapshot.get_generation()
+d_sheet.rows[0][1] = "Austin Independent SD"
+d_sheet.rows.append([str(v) for v in district("901", "Pasted SD", 10, state="NV")])
+check("re-check: edited and new partitions rewritten", territory_data.refresh_snapshot_from_sheet(),
+      ["districts:NV", "districts:TX"])
+check("re-check: generation moved", territory_snapshot.get_generation() > gen, True)
+check("re-check: edit visible in snapshot",
+      [r["District Name"] for r in territory_snapshot.load_rows("districts", "TX")], ["Austin Independent SD"])
+saved = d_sheet.rows
+d_sheet.rows = []
+check("re-check: empty read changes nothing", territory_data.refresh_snapshot_from_sheet(), [])
+d_sheet.rows = saved
+
+
+# ── Report ─────────────────────────────────────────────────────────────
+print(f"Passed: {_passed}")
+if _failed:
+    for line in _failed:
+        print(line)
+    print(f"Failed: {len(_failed)}")
+    sys.exit(1)
+print("All tests passed.")
@@ -131,20 +131,16 @@ def _serper_pdf_urls(state: str, max_per_query: int = 8) -> list[dict]:
     if not queries:
         return []
 
-    import httpx
+    import tools.serper_cache as serper_cache
 
     hits = []
     seen = set()
     for q in queries:
         try:
-            resp = httpx.post(
-                SERPER_URL,
-                headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": q, "num": max_per_query},
-                timeout=15.0,
+            data = serper_cache.search(
+                q, "compliance_gap_scanner._serper_pdf_urls", api_key=SERPER_API_KEY,
+                num=max_per_query,
             )
-            resp.raise_for_status()
-            data = resp.json()
             for item in data.get("organic", [])[:max_per_query]:
                 url = item.get("link", "")
                 if not url or url in seen:
@@ -157,7 +153,8 @@ def _serper_pdf_urls(state: str, max_per_query: int = 8) -> list[dict]:
                     "title": item.get("title", ""),
                     "snippet": item.get("snippet", ""),
                 })
-            time.sleep(0.3)
+            if not data.from_cache:
+                time.sleep(0.3)
         except Exception as e:
             logger.warning(f"Serper compliance query failed for {state}: {e}")
     return hits
@@ -4,11 +4,18 @@ from raw HTML, text blobs, LinkedIn snippets, and search result content.
 """
 
 import re
+import os
 import json
+import asyncio
 import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from anthropic import Anthropic
 
+import tools.research_trace as research_trace
+from tools.research_http import anthropic_limiter
+
 import tools.sheets_writer as sheets_writer
 import tools.csv_importer as csv_importer
 
@@ -19,6 +26,26 @@ client = Anthropic()
 # Module-level cache: district_key → formatted known-contacts string
 _known_contacts_cache: dict[str, str] = {}
 
+# Concurrent extraction (extract_from_multiple_async): pages in flight to Claude
+# at once, and an estimated input-token budget per call (0 → unlimited).
+EXTRACT_CONCURRENCY = int(os.environ.get("CLAUDE_EXTRACT_CONCURRENCY", "4"))
+EXTRACT_TOKEN_BUDGET = int(os.environ.get("CLAUDE_EXTRACT_TOKEN_BUDGET", "0"))
+
+# Same truncation extract_contacts applies before prompting
+_CONTENT_CHARS = 20000
+
+# Packed extraction (extract_contacts_packed): short pages — search snippets,
+# contact blurbs — share one request up to this many estimated content tokens.
+# 0 disables packing (one request per page, the pre-packing behavior).
+EXTRACT_PACK_TOKEN_CEILING = int(os.environ.get("CLAUDE_EXTRACT_PACK_TOKENS", "6000"))
+EXTRACT_PACK_PAGE_MAX_CHARS = 4000
+EXTRACT_PACK_MAX_PAGES = 10
+_PACK_MAX_OUTPUT_TOKENS = 8000
+
+# Dedicated pool so concurrent extraction doesn't starve the loop's default executor
+_extract_pool: ThreadPoolExecutor | None = None
+_extract_pool_size = 0
+
 # ─────────────────────────────────────────────
 # Round 1 Flag C: Claude API usage capture
 # ─────────────────────────────────────────────
@@ -26,8 +53,9 @@ _known_contacts_cache: dict[str, str] = {}
 # analysis. Module-level state is safe because:
 #   (a) CPython GIL makes list.append atomic, so cross-thread writes from
 #       run_in_executor workers don't corrupt the buffer
-#   (b) ResearchQueue processes jobs strictly one at a time, so there's no
-#       cross-job contamination of the flag or buffer
+#   (b) only single-job callers (scripts/ab_research_engine.py) enable it; a
+#       multi-worker ResearchQueue never sets log_claude_usage, so concurrent
+#       queue jobs can't contaminate the flag or buffer
 # Caller owns start/stop balance via try/finally so the flag never leaks.
 
 _capture_usage_enabled: bool = False
@@ -51,7 +79,15 @@ def stop_usage_capture() -> list[dict]:
 
 
 def _log_usage(response, source_url: str, model: str = "claude-sonnet-4-6") -> None:
-    """Append one Claude call's token usage to the capture buffer if enabled. No-op otherwise."""
+    """Attribute one Claude call's tokens to the active research_trace span, and
+    append them to the capture buffer if enabled."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        research_trace.record(
+            claude_calls=1,
+            claude_input_tokens=getattr(usage, "input_tokens", 0) or 0,
+            claude_output_tokens=getattr(usage, "output_tokens", 0) or 0,
+        )
     if not _capture_usage_enabled:
         return
     try:
@@ -161,19 +197,11 @@ def extract_contacts(raw_content: str, source_url: str, district_name: str) -> l
         return []
 
     # Truncate to avoid token limits — 20k chars covers longer staff directories
-    content_chunk = raw_content[:20000]
-
-    known = _get_known_contacts_for_district(district_name)
-    dedup_note = ""
-    if known:
-        dedup_note = (
-            f"\n\nAlready known contacts for this district (DO NOT re-extract these people):\n"
-            f"{known}\n"
-        )
+    content_chunk = raw_content[:_CONTENT_CHARS]
 
     prompt = f"""District: {district_name}
 Source URL: {source_url}
-{dedup_note}
+{_dedup_note(district_name)}
 Raw content to extract contacts from:
 ---
 {content_chunk}
@@ -181,6 +209,7 @@ Raw content to extract contacts from:
 
 Extract all CS/STEM/CTE/EdTech contacts. Return JSON array only."""
 
+    raw = ""
     try:
         response = client.messages.create(
             model="claude-sonnet-4-6",
@@ -191,61 +220,13 @@ Extract all CS/STEM/CTE/EdTech contacts. Return JSON array only."""
         _log_usage(response, source_url)  # no-op unless capture is enabled
 
         raw = response.content[0].text.strip()
-
-        # Strip any accidental markdown fences
-        raw = re.sub(r"^```json\s*", "", raw)
-        raw = re.sub(r"^```\s*", "", raw)
-        raw = re.sub(r"\s*```$", "", raw)
-
-        # Strip text before first [ and after last ] (Claude sometimes adds preamble)
-        bracket_start = raw.find("[")
-        bracket_end = raw.rfind("]")
-        if bracket_start >= 0 and bracket_end > bracket_start:
-            raw = raw[bracket_start:bracket_end + 1]
-
-        contacts = json.loads(raw)
+        contacts = _parse_json_array(raw)
 
         if not isinstance(contacts, list):
             logger.warning(f"Extractor returned non-list: {type(contacts)}")
             return []
 
-        # Normalize + stamp each contact
-        today = date.today().isoformat()
-        cleaned = []
-        for c in contacts:
-            contact = {
-                "first_name": str(c.get("first_name", "")).strip(),
-                "last_name": str(c.get("last_name", "")).strip(),
-                "title": str(c.get("title", "")).strip(),
-                "email": str(c.get("email", "")).strip().lower(),
-                "work_phone": str(c.get("work_phone", "")).strip(),
-                "account": str(c.get("account", district_name)).strip(),
-                "district_name": district_name,
-                "source_url": str(c.get("source_url", source_url)).strip(),
-                "email_confidence": str(c.get("email_confidence", "UNKNOWN")).strip().upper(),
-                "notes": str(c.get("notes", "")).strip(),
-                "date_found": today,
-            }
-
-            # Skip contacts with no name
-            if not contact["first_name"] and not contact["last_name"]:
-                continue
-
-            # Skip if email_confidence is invalid
-            if contact["email_confidence"] not in ("VERIFIED", "LIKELY", "INFERRED", "UNKNOWN"):
-                contact["email_confidence"] = "UNKNOWN"
-
-            # Post-extraction CTE filter: drop irrelevant trades
-            try:
-                from agent.target_roles import is_relevant_cte_role
-                if not is_relevant_cte_role(contact["title"]):
-                    logger.debug(f"Filtered irrelevant CTE: {contact['first_name']} {contact['last_name']} — {contact['title']}")
-                    continue
-            except ImportError:
-                pass  # target_roles not available, skip filter
-
-            cleaned.append(contact)
-
+        cleaned = _clean_contacts(contacts, source_url, district_name)
         logger.info(f"Extracted {len(cleaned)} contacts from {source_url}")
         return cleaned
 
@@ -257,6 +238,183 @@ Extract all CS/STEM/CTE/EdTech contacts. Return JSON array only."""
         return []
 
 
+def extract_contacts_packed(pages: list[tuple[str, str]], district_name: str) -> list[list[dict]]:
+    """
+    Packed extraction: one Claude request for several short (url, content) pages.
+
+    The instructions and known-contacts preamble are sent once instead of per
+    page. Claude tags each contact with the Source URL of the page it came from;
+    contacts are bucketed back to their page and cleaned exactly as
+    extract_contacts would. Returns one contact list per input page, aligned
+    with `pages`.
+
+    If the reply can't be parsed or attributes a contact to a URL that isn't in
+    the pack, the pack is re-extracted page by page — never a silent loss.
+    """
+    results: list[list[dict]] = [[] for _ in pages]
+    live = [i for i, (_, content) in enumerate(pages) if content and len(content.strip()) >= 50]
+    if len(live) <= 1:
+        for i in live:
+            results[i] = extract_contacts(pages[i][1], pages[i][0], district_name)
+        return results
+
+    sections = []
+    for n, i in enumerate(live, 1):
+        url, content = pages[i]
+        sections.append(f"=== PAGE {n} ===\nSource URL: {url}\n---\n{content[:_CONTENT_CHARS]}\n---")
+    joined = "\n\n".join(sections)
+
+    prompt = f"""District: {district_name}
+{_dedup_note(district_name)}
+The content below comes from {len(live)} separate pages. Extract each page on its own,
+and set every contact's source_url to the exact Source URL of the page it came from.
+
+{joined}
+
+Extract all CS/STEM/CTE/EdTech contacts from every page. Return one JSON array only."""
+
+    urls = [pages[i][0] for i in live]
+    raw = ""
+    try:
+        response = client.messages.create(
+            model="claude-sonnet-4-6",
+            max_tokens=_PACK_MAX_OUTPUT_TOKENS,
+            system=EXTRACT_SYSTEM,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        _log_usage(response, f"packed:{len(live)}:{urls[0]}")  # no-op unless capture is enabled
+
+        raw = response.content[0].text.strip()
+        contacts = _parse_json_array(raw)
+        if not isinstance(contacts, list):
+            raise ValueError(f"non-list reply: {type(contacts)}")
+
+        by_url = {_normalize_url(pages[i][0]): i for i in live}
+        buckets: dict[int, list[dict]] = {i: [] for i in live}
+        for c in contacts:
+            i = by_url.get(_normalize_url(str(c.get("source_url", ""))))
+            if i is None:
+                raise ValueError(f"contact attributed to unknown URL {c.get('source_url')!r}")
+            buckets[i].append(dict(c, source_url=pages[i][0]))
+        for i in live:
+            results[i] = _clean_contacts(buckets[i], pages[i][0], district_name)
+
+        logger.info(f"Extracted {sum(len(r) for r in results)} contacts from {len(live)} packed pages")
+        return results
+
+    except Exception as e:
+        logger.warning(
+            f"Packed extraction failed for {len(live)} pages ({e}); "
+            f"falling back to per-page. Raw: {raw[:200]}"
+        )
+        for i in live:
+            results[i] = extract_contacts(pages[i][1], pages[i][0], district_name)
+        return results
+
+
+def _dedup_note(district_name: str) -> str:
+    known = _get_known_contacts_for_district(district_name)
+    if not known:
+        return ""
+    return (
+        f"\n\nAlready known contacts for this district (DO NOT re-extract these people):\n"
+        f"{known}\n"
+    )
+
+
+def _normalize_url(url: str) -> str:
+    return (url or "").strip().rstrip("/").lower()
+
+
+def plan_packs(pages: list[tuple[str, str]], ceiling: int = EXTRACT_PACK_TOKEN_CEILING) -> list[list[int]]:
+    """
+    Group page indices into extraction units, preserving page order.
+
+    Short pages (≤ EXTRACT_PACK_PAGE_MAX_CHARS) are packed greedily while their
+    estimated content tokens stay under `ceiling` (at most EXTRACT_PACK_MAX_PAGES
+    per pack, never the same URL twice in one pack). Longer pages, and every
+    page when ceiling is 0, are single-page units.
+    """
+    units: list[list[int]] = []
+    pack: list[int] = []
+    pack_tokens = 0
+    pack_urls: set[str] = set()
+    for i, (url, content) in enumerate(pages):
+        size = len(content or "")
+        tokens = size // 4
+        if ceiling <= 0 or size > EXTRACT_PACK_PAGE_MAX_CHARS:
+            units.append([i])
+            continue
+        norm = _normalize_url(url)
+        if pack and (pack_tokens + tokens > ceiling or len(pack) >= EXTRACT_PACK_MAX_PAGES
+                     or norm in pack_urls):
+            units.append(pack)
+            pack, pack_tokens, pack_urls = [], 0, set()
+        pack.append(i)
+        pack_tokens += tokens
+        pack_urls.add(norm)
+    if pack:
+        units.append(pack)
+    return units
+
+
+def _parse_json_array(raw: str):
+    """json.loads Claude's reply after stripping markdown fences and preamble."""
+    # Strip any accidental markdown fences
+    raw = re.sub(r"^```json\s*", "", raw)
+    raw = re.sub(r"^```\s*", "", raw)
+    raw = re.sub(r"\s*```$", "", raw)
+
+    # Strip text before first [ and after last ] (Claude sometimes adds preamble)
+    bracket_start = raw.find("[")
+    bracket_end = raw.rfind("]")
+    if bracket_start >= 0 and bracket_end > bracket_start:
+        raw = raw[bracket_start:bracket_end + 1]
+
+    return json.loads(raw)
+
+
+def _clean_contacts(contacts: list, source_url: str, district_name: str) -> list[dict]:
+    """Normalize + stamp raw contact objects from one page; drop unusable ones."""
+    today = date.today().isoformat()
+    cleaned = []
+    for c in contacts:
+        contact = {
+            "first_name": str(c.get("first_name", "")).strip(),
+            "last_name": str(c.get("last_name", "")).strip(),
+            "title": str(c.get("title", "")).strip(),
+            "email": str(c.get("email", "")).strip().lower(),
+            "work_phone": str(c.get("work_phone", "")).strip(),
+            "account": str(c.get("account", district_name)).strip(),
+            "district_name": district_name,
+            "source_url": str(c.get("source_url", source_url)).strip(),
+            "email_confidence": str(c.get("email_confidence", "UNKNOWN")).strip().upper(),
+            "notes": str(c.get("notes", "")).strip(),
+            "date_found": today,
+        }
+
+        # Skip contacts with no name
+        if not contact["first_name"] and not contact["last_name"]:
+            continue
+
+        # Skip if email_confidence is invalid
+        if contact["email_confidence"] not in ("VERIFIED", "LIKELY", "INFERRED", "UNKNOWN"):
+            contact["email_confidence"] = "UNKNOWN"
+
+        # Post-extraction CTE filter: drop irrelevant trades
+        try:
+            from agent.target_roles import is_relevant_cte_role
+            if not is_relevant_cte_role(contact["title"]):
+                logger.debug(f"Filtered irrelevant CTE: {contact['first_name']} {contact['last_name']} — {contact['title']}")
+                continue
+        except ImportError:
+            pass  # target_roles not available, skip filter
+
+        cleaned.append(contact)
+
+    return cleaned
+
+
 # ─────────────────────────────────────────────
 # Shared dedup upgrade helper (Round 1 Part 0)
 # ─────────────────────────────────────────────
@@ -311,11 +469,17 @@ def extract_from_multiple(pages: list[tuple[str, str]], district_name: str) -> l
     Deduplicates by (first_name, last_name, district_name) and upgrades
     existing entries on collision so richer info from later pages wins.
     """
+    return _merge_page_results(
+        extract_contacts(content, url, district_name) for url, content in pages
+    )
+
+
+def _merge_page_results(per_page) -> list[dict]:
+    """Dedup + upgrade-merge per-page contact lists, in the order given."""
     all_contacts: list[dict] = []
     index: dict[tuple[str, str, str], dict] = {}
 
-    for url, content in pages:
-        contacts = extract_contacts(content, url, district_name)
+    for contacts in per_page:
         for c in contacts:
             key = (
                 c["first_name"].lower(),
@@ -332,6 +496,99 @@ def extract_from_multiple(pages: list[tuple[str, str]], district_name: str) -> l
     return all_contacts
 
 
+def estimate_input_tokens(content: str, district_name: str) -> int:
+    """Rough input tokens for one extract_contacts call (~4 chars per token)."""
+    chars = (len(EXTRACT_SYSTEM) + len(_get_known_contacts_for_district(district_name))
+             + len((content or "")[:_CONTENT_CHARS]) + 200)
+    return chars // 4
+
+
+def _get_extract_pool(workers: int) -> ThreadPoolExecutor:
+    """Shared extraction pool, grown (never shrunk) to at least `workers` threads.
+    A replaced pool is shut down without waiting: calls already submitted to it
+    finish on its threads, which then exit."""
+    global _extract_pool, _extract_pool_size
+    if _extract_pool is None or _extract_pool_size < workers:
+        old = _extract_pool
+        _extract_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="claude-extract")
+        _extract_pool_size = workers
+        if old is not None:
+            old.shutdown(wait=False)
+    return _extract_pool
+
+
+async def extract_from_multiple_async(
+    pages: list[tuple[str, str]],
+    district_name: str,
+    concurrency: int = EXTRACT_CONCURRENCY,
+    token_budget: int = EXTRACT_TOKEN_BUDGET,
+    pack_ceiling: int = EXTRACT_PACK_TOKEN_CEILING,
+) -> list[dict]:
+    """
+    Async extract_from_multiple: up to `concurrency` pages are sent to Claude at
+    once (blocking SDK calls run on a dedicated thread pool, inside a copy of
+    the caller's context so token usage lands in the caller's trace span).
+
+    Results are merged in page order, not completion order, so the output —
+    including which copy of a duplicated person wins each field under
+    _merge_contact_upgrade — is identical to extract_from_multiple.
+
+    token_budget caps the estimated input tokens spent on this call: pages are
+    admitted in order until the next one would exceed it; the rest are skipped
+    and logged. 0 means no budget.
+
+    Short pages are grouped by plan_packs and sent through
+    extract_contacts_packed (pack_ceiling=0 → one request per page); their
+    contacts are still merged at their own page's position.
+    """
+    if not pages:
+        return []
+    concurrency = max(1, concurrency)
+    loop = asyncio.get_running_loop()
+    pool = _get_extract_pool(concurrency)
+
+    # Warm the known-contacts cache once, before pages race to load it
+    await loop.run_in_executor(pool, _get_known_contacts_for_district, district_name)
+
+    admitted = pages
+    if token_budget > 0:
+        spent = 0
+        admitted = []
+        for url, content in pages:
+            cost = estimate_input_tokens(content, district_name)
+            if spent + cost > token_budget:
+                break
+            spent += cost
+            admitted.append((url, content))
+        if len(admitted) < len(pages):
+            logger.info(
+                f"Extraction token budget ({token_budget}) reached: "
+                f"{len(admitted)}/{len(pages)} pages sent to Claude"
+            )
+
+    sem = asyncio.Semaphore(concurrency)
+    per_page: list[list[dict]] = [[] for _ in admitted]
+
+    async def _unit(indices: list[int]):
+        async with sem:
+            await anthropic_limiter.acquire()
+            if len(indices) == 1:
+                url, content = admitted[indices[0]]
+                per_page[indices[0]] = await loop.run_in_executor(
+                    pool, contextvars.copy_context().run, extract_contacts, content, url, district_name
+                )
+                return
+            packed = await loop.run_in_executor(
+                pool, contextvars.copy_context().run, extract_contacts_packed,
+                [admitted[i] for i in indices], district_name
+            )
+            for i, contacts in zip(indices, packed):
+                per_page[i] = contacts
+
+    await asyncio.gather(*(_unit(unit) for unit in plan_packs(admitted, pack_ceiling)))
+    return _merge_page_results(per_page)
+
+
 def infer_email(first: str, last: str, domain: str, pattern: str) -> str:
     """
     Construct an email address from a pattern template.
@@ -30,6 +30,7 @@ Usage (module-level, not a class):
 """
 
 import csv
+import functools
 import io
 import json
 import logging
@@ -257,6 +258,25 @@ _KNOWN_ABBREVIATIONS: dict[str, str] = {
 _PAREN_DISTRICT_RE = re.compile(r"^(.+?)\s*\(([^)]+)\)\s*$")
 
 
+# Compiled once. Each suffix pattern keeps its own re.sub pass, in list order:
+# stripping is order-dependent ("school district" runs before "community
+# school district"), so one combined alternation would change keys.
+_SUFFIX_RES = [re.compile(p, re.IGNORECASE) for p in _SUFFIX_PATTERNS]
+# Literal each suffix pattern needs to match, for a cheap `in` pre-check.
+# Only trusted on ASCII keys: IGNORECASE also matches e.g. "ſ" (long s)
+# against "s", which a plain substring test would miss.
+_SUFFIX_TRIGGERS = [
+    re.sub(r"\\b", "", p) if re.fullmatch(r"\\b[a-z ]+\\b", p) else None
+    for p in _SUFFIX_PATTERNS
+]
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Bounded memo for normalize_name; names repeat heavily across matching,
+# dedup and signal cross-referencing within one process.
+_NORMALIZE_CACHE_SIZE = 65536
+
+
 def normalize_name(name: str) -> str:
     """
     Return a normalized lowercase key for matching.
@@ -272,7 +292,20 @@ def normalize_name(name: str) -> str:
       "Los Angeles Unified"                      → "los angeles"
       "LAUSD"                                    → "los angeles"
       "Jefferson Elementary (Medina Valley ISD)" → "jefferson elementary"
+
+    Results are memoized (LRU, _NORMALIZE_CACHE_SIZE entries).
     """
+    return _normalize_name_cached(name)
+
+
+def normalize_names(names) -> list[str]:
+    """normalize_name over an iterable of names, in order."""
+    cached = _normalize_name_cached
+    return [cached(n) for n in names]
+
+
+@functools.lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def _normalize_name_cached(name: str) -> str:
     key = name.strip()
     # Strip parenthetical district tag before normalizing
     m = _PAREN_DISTRICT_RE.match(key)
@@ -280,19 +313,47 @@ def normalize_name(name: str) -> str:
         key = m.group(1).strip()
     key = key.lower()
     # Expand known abbreviations (e.g. "lausd" → full name, then strip suffixes)
-    key_clean = re.sub(r"[^\w\s]", "", key).strip()
+    key_clean = _PUNCT_RE.sub("", key).strip()
     if key_clean in _KNOWN_ABBREVIATIONS:
         key = _KNOWN_ABBREVIATIONS[key_clean]
-    for pattern in _SUFFIX_PATTERNS:
-        key = re.sub(pattern, "", key, flags=re.IGNORECASE)
+    prefilter = key.isascii()
+    for pattern, trigger in zip(_SUFFIX_RES, _SUFFIX_TRIGGERS):
+        if prefilter and trigger is not None and trigger not in key:
+            continue
+        key = pattern.sub("", key)
     # Remove punctuation except spaces
-    key = re.sub(r"[^\w\s]", "", key)
+    key = _PUNCT_RE.sub("", key)
     # Collapse whitespace
-    key = re.sub(r"\s+", " ", key).strip()
+    key = _WHITESPACE_RE.sub(" ", key).strip()
     return key
 
 
-def fuzzy_match_name(query_key: str, candidate_keys: dict, threshold: float = 0.7) -> str | None:
+def _fuzzy_score(query_key: str, query_tokens: set, cand_key: str, cand_tokens) -> float:
+    """Score one candidate for fuzzy_match_name (shared by the linear scan and FuzzyNameIndex)."""
+    # Token subset: all tokens of the shorter name appear in the longer
+    # e.g., {"huntington", "beach"} ⊂ {"huntington", "beach", "senior"}
+    shorter_tokens = query_tokens if len(query_tokens) <= len(cand_tokens) else cand_tokens
+    longer_tokens = cand_tokens if len(query_tokens) <= len(cand_tokens) else query_tokens
+    if shorter_tokens and len(shorter_tokens) >= 2 and shorter_tokens <= longer_tokens:
+        # Full token containment with 2+ tokens — strong match
+        return 0.95
+
+    # Single-token containment: one name starts with or contains the other
+    if len(query_tokens) == 1 and len(cand_tokens) == 1:
+        if query_key in cand_key or cand_key in query_key:
+            shorter = min(len(query_key), len(cand_key))
+            longer = max(len(query_key), len(cand_key))
+            return shorter / longer if longer > 0 else 0
+
+    # Token overlap (Jaccard similarity)
+    intersection = query_tokens & cand_tokens
+    union = query_tokens | cand_tokens
+    if not union:
+        return 0.0
+    return len(intersection) / len(union)
+
+
+def fuzzy_match_name(query_key: str, candidate_keys, threshold: float = 0.7) -> str | None:
     """
     Fuzzy match a normalized name key against a dict of {name_key: value}.
     Uses token overlap scoring. Returns best matching key or None.
@@ -304,11 +365,16 @@ def fuzzy_match_name(query_key: str, candidate_keys: dict, threshold: float = 0.
 
     Args:
         query_key: Normalized name to search for
-        candidate_keys: Dict of {normalized_key: any_value}
+        candidate_keys: Dict of {normalized_key: any_value} (or any iterable of
+            keys), or a prebuilt FuzzyNameIndex — use the index when matching
+            many queries against the same candidates.
         threshold: Minimum similarity score (0-1). Default 0.7.
 
     Returns: Best matching key from candidate_keys, or None
     """
+    if isinstance(candidate_keys, FuzzyNameIndex):
+        return candidate_keys.match(query_key, threshold=threshold)
+
     if not query_key or not candidate_keys:
         return None
 
@@ -330,40 +396,108 @@ def fuzzy_match_name(query_key: str, candidate_keys: dict, threshold: float = 0.
         if not cand_tokens:
             continue
 
-        # Token subset: all tokens of the shorter name appear in the longer
-        # e.g., {"huntington", "beach"} ⊂ {"huntington", "beach", "senior"}
-        shorter_tokens = query_tokens if len(query_tokens) <= len(cand_tokens) else cand_tokens
-        longer_tokens = cand_tokens if len(query_tokens) <= len(cand_tokens) else query_tokens
-        if shorter_tokens and len(shorter_tokens) >= 2 and shorter_tokens <= longer_tokens:
-            # Full token containment with 2+ tokens — strong match
-            score = 0.95
+        score = _fuzzy_score(query_key, query_tokens, cand_key, cand_tokens)
+        if score > best_score:
+            best_score = score
+            best_key = cand_key
+
+    return best_key if best_score >= threshold else None
+
+
+class FuzzyNameIndex:
+    """
+    Reusable candidate index for fuzzy_match_name.
+
+    Maps each token to the candidates containing it (with token sets
+    precomputed), so a query only scores candidates that share a token with
+    it. Single-token candidates are also bucketed by length for the
+    single-token containment rule ("carlinville" vs "carlinvillecusd"),
+    which needs no shared token. Candidates are scored in their original
+    order with the same scoring function, so results are identical to
+    fuzzy_match_name over the same keys.
+
+    Usage:
+      idx = csv_importer.FuzzyNameIndex(school_to_district)
+      for key in queries:
+          hit = idx.match(key, threshold=0.7)   # or fuzzy_match_name(key, idx)
+    """
+
+    def __init__(self, candidate_keys):
+        self._keys: list[str] = []
+        self._token_sets: list[frozenset] = []
+        self._key_set: set[str] = set()
+        self._by_token: dict[str, list[int]] = {}
+        self._single_by_len: dict[int, list[int]] = {}
+        for cand_key in candidate_keys:
+            if cand_key in self._key_set:
+                continue
+            self._key_set.add(cand_key)
+            if not cand_key:
+                continue
+            tokens = frozenset(cand_key.split())
+            if not tokens:
+                continue
+            pos = len(self._keys)
+            self._keys.append(cand_key)
+            self._token_sets.append(tokens)
+            for tok in tokens:
+                self._by_token.setdefault(tok, []).append(pos)
+            if len(tokens) == 1:
+                self._single_by_len.setdefault(len(cand_key), []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self._key_set)
+
+    def __contains__(self, key) -> bool:
+        return key in self._key_set
+
+    def _containment_positions(self, query_key: str, threshold: float) -> list[int]:
+        """Single-token candidates that contain, or are contained in, query_key.
+
+        A containment score is shorter/longer, so candidates whose length ratio
+        is below threshold can never be the returned match and are skipped.
+        """
+        qlen = len(query_key)
+        ratio = threshold if threshold > 0 else 0.0
+        positions = []
+        for clen, bucket in self._single_by_len.items():
+            shorter, longer = min(qlen, clen), max(qlen, clen)
+            if ratio and longer and shorter / longer < ratio:
+                continue
+            for pos in bucket:
+                cand_key = self._keys[pos]
+                if query_key in cand_key or cand_key in query_key:
+                    positions.append(pos)
+        return positions
+
+    def match(self, query_key: str, threshold: float = 0.7) -> str | None:
+        """Same contract and scores as fuzzy_match_name(query_key, <candidates>, threshold)."""
+        if not query_key or not self._key_set:
+            return None
+
+        if query_key in self._key_set:
+            return query_key
+
+        query_tokens = set(query_key.split())
+        if not query_tokens:
+            return None
+
+        positions = set()
+        for tok in query_tokens:
+            positions.update(self._by_token.get(tok, ()))
+        if len(query_tokens) == 1:
+            positions.update(self._containment_positions(query_key, threshold))
+
+        best_key = None
+        best_score = 0.0
+        for pos in sorted(positions):
+            cand_key = self._keys[pos]
+            score = _fuzzy_score(query_key, query_tokens, cand_key, self._token_sets[pos])
             if score > best_score:
                 best_score = score
                 best_key = cand_key
-            continue
-
-        # Single-token containment: one name starts with or contains the other
-        if len(query_tokens) == 1 and len(cand_tokens) == 1:
-            if query_key in cand_key or cand_key in query_key:
-                shorter = min(len(query_key), len(cand_key))
-                longer = max(len(query_key), len(cand_key))
-                score = shorter / longer if longer > 0 else 0
-                if score > best_score:
-                    best_score = score
-                    best_key = cand_key
-                continue
 
-        # Token overlap (Jaccard similarity)
-        intersection = query_tokens & cand_tokens
-        union = query_tokens | cand_tokens
-        if not union:
-            continue
-        jaccard = len(intersection) / len(union)
-        if jaccard > best_score:
-            best_score = jaccard
-            best_key = cand_key
-
-    return best_key if best_score >= threshold else None
+        return best_key if best_score >= threshold else None
 
 
 # ─────────────────────────────────────────────
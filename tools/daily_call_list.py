@@ -120,6 +120,10 @@ def _match_leads_to_districts(leads: list[dict], districts: list[dict]) -> list[
             if school_key:
                 school_to_district[school_key] = d
 
+    # Both lookups are queried once per lead — index them once up front
+    district_fuzzy_index = csv_importer.FuzzyNameIndex(district_by_key)
+    school_fuzzy_index = csv_importer.FuzzyNameIndex(school_to_district)
+
     matched = []
     seen_emails = set()
 
@@ -140,7 +144,7 @@ def _match_leads_to_districts(leads: list[dict], districts: list[dict]) -> list[
                 district_info = district_by_key[lead_district_key]
             else:
                 fuzzy_key = csv_importer.fuzzy_match_name(
-                    lead_district_key, district_by_key, threshold=0.7
+                    lead_district_key, district_fuzzy_index, threshold=0.7
                 )
                 if fuzzy_key:
                     district_info = district_by_key[fuzzy_key]
@@ -154,7 +158,7 @@ def _match_leads_to_districts(leads: list[dict], districts: list[dict]) -> list[
                     district_info = school_to_district[account_key]
                 else:
                     fuzzy_key = csv_importer.fuzzy_match_name(
-                        account_key, school_to_district, threshold=0.7
+                        account_key, school_fuzzy_index, threshold=0.7
                     )
                     if fuzzy_key:
                         district_info = school_to_district[fuzzy_key]
@@ -24,6 +24,7 @@ import httpx
 
 import tools.csv_importer as csv_importer
 import tools.pipeline_tracker as pipeline_tracker
+import tools.serper_cache as serper_cache
 import tools.sheets_writer as sheets_writer
 import tools.territory_data as territory_data
 
@@ -702,7 +703,6 @@ def _scrape_resolve_locations(unknowns: list[dict], claude_batch_size: int = 25)
                 f"({len(unknowns)} prospects, {len(generic_prospects)} generic skipped)")
 
     # Parallel Serper searches — 20 concurrent
-    serper_headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
     domain_content = {}  # domain → search result text
     prospect_extra = {}  # email → additional per-prospect search results
     generic_content = {}  # company → search results for generic email prospects
@@ -716,27 +716,24 @@ def _scrape_resolve_locations(unknowns: list[dict], claude_batch_size: int = 25)
                 domain_to_company[domain] = company
                 break
 
-    _serper_hdrs = dict(serper_headers)  # copy for thread safety
-
     def _serper_search(query):
         """Run a single Serper search. Returns snippet text."""
         try:
-            with httpx.Client(timeout=10.0) as http:
-                resp = http.post(SERPER_URL, headers=_serper_hdrs,
-                                 json={"q": query, "num": 3})
-                if resp.status_code != 200:
-                    logger.warning(f"C4 Serper: HTTP {resp.status_code} for query: {query[:50]}")
-                    return ""
-                data = resp.json()
-                parts = []
-                for item in data.get("organic", [])[:3]:
-                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                kg = data.get("knowledgeGraph", {})
-                if kg:
-                    attrs = kg.get("attributes", {})
-                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                return "\n".join(parts) if parts else ""
+            data = serper_cache.search(
+                query, "district_prospector._scrape_resolve_locations",
+                api_key=SERPER_API_KEY, num=3, timeout=10.0,
+            )
+            parts = []
+            for item in data.get("organic", [])[:3]:
+                parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+            kg = data.get("knowledgeGraph", {})
+            if kg:
+                attrs = kg.get("attributes", {})
+                addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+            return "\n".join(parts) if parts else ""
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"C4 Serper: HTTP {e.response.status_code} for query: {query[:50]}")
         except Exception as e:
             logger.warning(f"C4 Serper search error for '{query[:50]}': {e}")
         return ""
@@ -796,20 +793,19 @@ def _scrape_resolve_locations(unknowns: list[dict], claude_batch_size: int = 25)
     if SERPER_API_KEY and generic_prospects:
         def _search_company(company):
             try:
-                with httpx.Client(timeout=10.0) as http:
-                    resp = http.post(SERPER_URL, headers=serper_headers,
-                                     json={"q": f'"{company}" school', "num": 3})
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        parts = []
-                        for item in data.get("organic", [])[:3]:
-                            parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
-                        kg = data.get("knowledgeGraph", {})
-                        if kg:
-                            attrs = kg.get("attributes", {})
-                            addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
-                            parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
-                        return "\n".join(parts) if parts else ""
+                data = serper_cache.search(
+                    f'"{company}" school', "district_prospector._scrape_resolve_locations",
+                    api_key=SERPER_API_KEY, num=3, timeout=10.0,
+                )
+                parts = []
+                for item in data.get("organic", [])[:3]:
+                    parts.append(f"{item.get('title','')} | {item.get('snippet','')} | {item.get('link','')}")
+                kg = data.get("knowledgeGraph", {})
+                if kg:
+                    attrs = kg.get("attributes", {})
+                    addr = attrs.get("Address", "") or attrs.get("Headquarters", "")
+                    parts.append(f"[KG] {kg.get('title','')} | {kg.get('description','')} | {addr}")
+                return "\n".join(parts) if parts else ""
             except Exception:
                 pass
             return ""
@@ -991,24 +987,18 @@ def _search_districts_serper(state: str) -> list[dict]:
     ]
 
     all_results = []
-    headers = {
-        "X-API-KEY": SERPER_API_KEY,
-        "Content-Type": "application/json",
-    }
-
     with httpx.Client(timeout=15.0) as client:
         for query in queries:
             try:
-                resp = client.post(
-                    SERPER_URL,
-                    headers=headers,
-                    json={"q": query, "num": 10},
+                data = serper_cache.search(
+                    query, "district_prospector._search_districts_serper",
+                    api_key=SERPER_API_KEY, num=10, client=client,
                 )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    all_results.extend(data.get("organic", []))
-                else:
-                    logger.warning(f"Serper query failed ({resp.status_code}): {query}")
+                all_results.extend(data.get("organic", []))
+                if data.from_cache:
+                    continue
+            except httpx.HTTPStatusError as e:
+                logger.warning(f"Serper query failed ({e.response.status_code}): {query}")
             except Exception as e:
                 logger.warning(f"Serper request error: {e}")
             time.sleep(0.3)
@@ -1595,6 +1585,7 @@ def suggest_closed_lost_targets(buffer_months: int = 6, lookback_months: int = 1
         account_opps: dict[str, list[dict]] = {}
         territory_resolved = 0
         territory_fuzzy_resolved = 0
+        territory_fuzzy_index = None
         for opp in closed_lost:
             account = opp.get("Account Name", "").strip()
             if not account:
@@ -1606,8 +1597,10 @@ def suggest_closed_lost_targets(buffer_months: int = 6, lookback_months: int = 1
                 acct_key = csv_importer.normalize_name(account).lower()
                 matched_district = territory_school_to_district.get(acct_key)
                 if not matched_district:
+                    if territory_fuzzy_index is None:
+                        territory_fuzzy_index = csv_importer.FuzzyNameIndex(territory_school_to_district)
                     fuzzy_key = csv_importer.fuzzy_match_name(
-                        acct_key, territory_school_to_district, threshold=0.7
+                        acct_key, territory_fuzzy_index, threshold=0.7
                     )
                     if fuzzy_key:
                         matched_district = territory_school_to_district[fuzzy_key]
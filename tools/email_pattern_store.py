@@ -0,0 +1,208 @@
+"""
+tools/email_pattern_store.py — Persistent domain → email pattern knowledge.
+
+Every verified (name, email) pair is evidence for how a domain builds its
+addresses: jane.doe@austinisd.org supports "{first}.{last}@{domain}". This
+module keeps that evidence per domain — the distinct evidence emails and the
+EMAIL_PATTERNS template each one matches ("other" if none) — so the pattern
+is known the next time the domain comes up instead of being rediscovered:
+
+  ResearchJob L8   uses a solved domain's pattern instead of detecting one
+  ResearchJob L15  skips the Serper verification queries for a solved domain
+                   (inferred emails are marked LIKELY directly)
+  ResearchJob      records the job's VERIFIED contacts when it finishes
+  sheets_writer    records VERIFIED contacts written to the Master Sheet
+  lead_importer    records Salesforce lead/contact emails on import
+
+A domain is solved once it has EMAIL_PATTERN_MIN_EVIDENCE distinct emails and
+its best pattern explains at least EMAIL_PATTERN_MIN_CONFIDENCE of them.
+Evidence is keyed by email, so the same contact seen by research, the sheet
+and an import counts once; at most EMAIL_PATTERN_MAX_EVIDENCE emails are kept
+per domain.
+
+Layout: {EMAIL_PATTERN_DIR}/<domain>.json, one file per email domain, written
+atomically. EMAIL_PATTERN_DIR defaults to the persistent data volume
+(agent.config.DATA_DIR), so learned patterns survive redeploys.
+
+Usage (module-level, not a class):
+  import tools.email_pattern_store as email_pattern_store
+  entry = email_pattern_store.lookup("www.austinisd.org")   # None if nothing known
+  if entry and entry["solved"]: pattern = entry["pattern"]
+  email_pattern_store.observe(contacts, source="research")
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from agent.config import DATA_DIR
+from agent.keywords import EMAIL_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+EMAIL_PATTERN_DIR = os.environ.get("EMAIL_PATTERN_DIR", os.path.join(DATA_DIR, "email_patterns"))
+
+# Kill switch — set EMAIL_PATTERN_STORE=0 to neither consult nor record patterns
+ENABLE_EMAIL_PATTERN_STORE = os.environ.get("EMAIL_PATTERN_STORE", "1") != "0"
+
+EMAIL_PATTERN_MIN_EVIDENCE = 3
+EMAIL_PATTERN_MIN_CONFIDENCE = 0.8
+EMAIL_PATTERN_MAX_EVIDENCE = 50
+
+OTHER = "other"
+
+# Webmail domains say nothing about a district's format
+_GENERIC_DOMAINS = frozenset({
+    "gmail.com", "yahoo.com", "hotmail.com", "outlook.com", "aol.com", "icloud.com",
+    "comcast.net", "msn.com", "live.com", "me.com",
+})
+
+_lock = threading.Lock()
+
+
+def normalize_domain(domain: str) -> str:
+    """Bare lowercase host: 'https://www.AustinISD.org/staff' / '@austinisd.org' → 'austinisd.org'."""
+    host = (domain or "").strip().lower()
+    host = host.split("://", 1)[-1].split("/", 1)[0].split("@")[-1].split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return host if re.fullmatch(r"[a-z0-9.-]+\.[a-z]{2,}", host) else ""
+
+
+def _path(domain: str) -> str:
+    return os.path.join(EMAIL_PATTERN_DIR, f"{domain}.json")
+
+
+def _name_forms(name: str) -> set[str]:
+    name = (name or "").lower().strip()
+    return {form for form in (name, re.sub(r"[^a-z]", "", name)) if form}
+
+
+def match_pattern(first: str, last: str, email: str) -> str:
+    """EMAIL_PATTERNS template that builds email from the name ("other" if none does;
+    "" if there's nothing to match)."""
+    email = (email or "").lower().strip()
+    if "@" not in email:
+        return ""
+    domain = email.split("@", 1)[1]
+    firsts, lasts = _name_forms(first), _name_forms(last)
+    if not firsts or not lasts:
+        return ""
+    for pattern in EMAIL_PATTERNS:
+        for f in firsts:
+            for l in lasts:
+                if pattern.format(first=f, last=l, f=f[0], domain=domain) == email:
+                    return pattern
+    return OTHER
+
+
+# ─────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────
+
+def _load(domain: str) -> dict | None:
+    try:
+        with open(_path(domain), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(domain: str, entry: dict):
+    path = _path(domain)
+    try:
+        os.makedirs(EMAIL_PATTERN_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Email pattern store write failed for {domain}: {e}")
+
+
+def summarize(entry: dict) -> dict:
+    """Best pattern, confidence and evidence counts for a stored entry."""
+    counts: dict[str, int] = {}
+    for pattern in entry.get("emails", {}).values():
+        counts[pattern] = counts.get(pattern, 0) + 1
+    total = sum(counts.values())
+    known = {p: n for p, n in counts.items() if p != OTHER}
+    pattern = max(known, key=lambda p: (known[p], -EMAIL_PATTERNS.index(p)), default="")
+    confidence = known.get(pattern, 0) / total if total else 0.0
+    return {
+        "domain": entry.get("domain", ""),
+        "pattern": pattern,
+        "confidence": round(confidence, 3),
+        "evidence": total,
+        "counts": counts,
+        "sources": entry.get("sources", {}),
+        "updated_at": entry.get("updated_at", 0),
+        "solved": bool(pattern) and total >= EMAIL_PATTERN_MIN_EVIDENCE
+                  and confidence >= EMAIL_PATTERN_MIN_CONFIDENCE,
+    }
+
+
+def lookup(domain: str) -> dict | None:
+    """summarize() of what's known about domain, or None if nothing is."""
+    domain = normalize_domain(domain)
+    if not ENABLE_EMAIL_PATTERN_STORE or not domain:
+        return None
+    entry = _load(domain)
+    return summarize(entry) if entry else None
+
+
+def solved_pattern(domain: str) -> str:
+    """The domain's pattern if it is solved, else ""."""
+    entry = lookup(domain)
+    return entry["pattern"] if entry and entry["solved"] else ""
+
+
+def observe(contacts: list[dict], source: str = "research", trusted: bool = False) -> int:
+    """
+    Record (first_name, last_name, email) evidence from contact dicts, grouped
+    by email domain. Untrusted sources (research results) only contribute
+    VERIFIED emails — INFERRED ones were built from a pattern and would just
+    confirm it. trusted=True (CRM imports) counts every email. Returns the
+    number of new evidence emails recorded.
+    """
+    if not ENABLE_EMAIL_PATTERN_STORE or not contacts:
+        return 0
+    by_domain: dict[str, dict[str, str]] = {}
+    for c in contacts:
+        if not trusted and (c.get("email_confidence") or "").upper() != "VERIFIED":
+            continue
+        email = (c.get("email") or "").lower().strip()
+        domain = normalize_domain(email.split("@", 1)[1]) if "@" in email else ""
+        if not domain or domain in _GENERIC_DOMAINS:
+            continue
+        pattern = match_pattern(c.get("first_name", ""), c.get("last_name", ""), email)
+        if pattern:
+            by_domain.setdefault(domain, {})[email] = pattern
+
+    added = 0
+    with _lock:
+        for domain, emails in by_domain.items():
+            entry = _load(domain) or {"domain": domain, "emails": {}, "sources": {}}
+            new = 0
+            for email, pattern in emails.items():
+                if email in entry["emails"] or len(entry["emails"]) >= EMAIL_PATTERN_MAX_EVIDENCE:
+                    continue
+                entry["emails"][email] = pattern
+                new += 1
+            if not new:
+                continue
+            entry["sources"][source] = entry["sources"].get(source, 0) + new
+            entry["updated_at"] = time.time()
+            _write(domain, entry)
+            added += new
+    if added:
+        logger.info(f"Email pattern store: {added} new evidence email(s) from {source} "
+                    f"across {len(by_domain)} domain(s)")
+    return added
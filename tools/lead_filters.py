@@ -158,10 +158,20 @@ SF_LEADS_TAB = "SF Leads"
 
 
 def build_territory_index_stateaware(svc) -> TerritoryIndex:
-    """Read Territory Schools columns A/B/C/L and build the 7-way state-aware index.
+    """Return the 7-way state-aware index over Territory Schools.
 
-    Columns: A=State, B=School Name, C=District Name, L=Grade Span.
+    Served from the process-wide territory index (tools.territory_index) when
+    the local territory snapshot holds the whole Schools tab; otherwise reads
+    columns A/B/C/L (State, School Name, District Name, Grade Span) via ``svc``.
     """
+    try:
+        import tools.territory_index as territory_index
+        import tools.territory_snapshot as territory_snapshot
+        if territory_snapshot.is_complete("schools"):
+            return territory_index.get_index().grade_span_index
+    except Exception as e:
+        logger.warning("Shared territory index unavailable, reading Sheets: %s", e)
+
     ranges = [
         f"'{TERRITORY_TAB}'!A2:A",
         f"'{TERRITORY_TAB}'!B2:B",
@@ -178,10 +188,20 @@ def build_territory_index_stateaware(svc) -> TerritoryIndex:
         for vr in resp["valueRanges"]
     ]
     states, names, districts, spans = cols
+    return index_from_columns(states, names, districts, spans)
+
+
+def index_from_columns(
+    states: list[str],
+    names: list[str],
+    districts: list[str],
+    spans: list[str],
+) -> TerritoryIndex:
+    """Build the 7-way state-aware index from parallel Territory Schools columns."""
     n = max(len(states), len(names), len(districts), len(spans))
 
     def pad(xs: list[str]) -> list[str]:
-        return xs + [""] * (n - len(xs))
+        return list(xs) + [""] * (n - len(xs))
 
     states, names, districts, spans = pad(states), pad(names), pad(districts), pad(spans)
 
@@ -20,6 +20,7 @@ Enrichment (async, background):
   - Web search to verify current role/school
   - Cross-check email domain against known domains
   - Update confidence + notes
+  - Record every email as evidence in email_pattern_store (domain → pattern)
 
 Usage (module-level, not a class):
   import tools.lead_importer as lead_importer
@@ -38,6 +39,8 @@ from datetime import datetime
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 
+import tools.email_pattern_store as email_pattern_store
+
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
@@ -814,6 +817,9 @@ def import_leads(csv_text: str) -> dict:
         return {"imported": 0, "duplicates_skipped": 0, "cross_checked": 0,
                 "errors": ["No records found in CSV"]}
 
+    # CRM emails are real addresses — evidence for each domain's email pattern
+    email_pattern_store.observe(records, source="sf_leads", trusted=True)
+
     # Build full header list (base + extra CSV columns)
     headers = list(SF_LEADS_COLUMNS)
     for ec in extra_cols:
@@ -955,6 +961,9 @@ def import_contacts(csv_text: str) -> dict:
         return {"imported": 0, "duplicates_skipped": 0, "cross_checked": 0,
                 "errors": ["No records found in CSV"]}
 
+    # CRM emails are real addresses — evidence for each domain's email pattern
+    email_pattern_store.observe(records, source="sf_contacts", trusted=True)
+
     # Build full header list (base + extra CSV columns)
     headers = list(SF_CONTACTS_COLUMNS)
     for ec in extra_cols:
@@ -1252,7 +1261,7 @@ def enrich_record_via_serper(record: dict, tab_type: str) -> dict:
 
     Uses SERPER_API_KEY for web search (same as research engine).
     """
-    import httpx
+    import tools.serper_cache as serper_cache
 
     serper_key = os.environ.get("SERPER_API_KEY", "")
     if not serper_key:
@@ -1277,14 +1286,9 @@ def enrich_record_via_serper(record: dict, tab_type: str) -> dict:
     query = " ".join(query_parts)
 
     try:
-        resp = httpx.post(
-            "https://google.serper.dev/search",
-            headers={"X-API-KEY": serper_key, "Content-Type": "application/json"},
-            json={"q": query, "num": 5},
-            timeout=15.0,
+        data = serper_cache.search(
+            query, "lead_importer.enrich_record_via_serper", api_key=serper_key, num=5,
         )
-        resp.raise_for_status()
-        data = resp.json()
     except Exception as e:
         return {"enrichment_status": "error", "enrichment_notes": f"Search failed: {e}"}
 
@@ -0,0 +1,194 @@
+"""
+tools/page_cache.py — Disk cache of crawled district pages for conditional GETs.
+
+Research layers L6/L7 fetch the same district staff/contact pages every time a
+district is researched. This module keeps the extracted text of each page with
+the validators the server sent (ETag, Last-Modified) so the next fetch can be:
+
+  fresh        validated within the job's freshness window → no request at all
+  revalidated  conditional GET (If-None-Match / If-Modified-Since) → 304, reuse
+               the stored text without downloading or re-parsing the HTML
+  fetched      200 → caller parses and stores the new text + validators
+
+Entries older than PAGE_CACHE_MAX_AGE_DAYS are ignored (full re-download).
+
+Layout: {PAGE_CACHE_DIR}/ab/abcdef….json, one file per URL (sha256), written
+atomically. Safe to share between processes; delete the directory to flush.
+PAGE_CACHE_DIR defaults to the persistent data volume (agent.config.DATA_DIR).
+
+prune() deletes entries past PAGE_CACHE_MAX_AGE_DAYS, then the least recently
+validated ones until the directory is under PAGE_CACHE_MAX_MB — the bot runs
+it at startup and once a day, alongside serper_cache.prune().
+
+Usage (module-level, not a class):
+  import tools.page_cache as page_cache
+  entry = page_cache.get(url)
+  headers = page_cache.conditional_headers(entry)
+  ... 304 → page_cache.touch(url, entry); 200 → page_cache.put(url, text, resp.headers)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from agent.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+PAGE_CACHE_DIR = os.environ.get("PAGE_CACHE_DIR", os.path.join(DATA_DIR, "page_cache"))
+
+# Kill switch — set PAGE_CACHE=0 to always download (and store nothing)
+ENABLE_PAGE_CACHE = os.environ.get("PAGE_CACHE", "1") != "0"
+
+# Default per-job freshness window: pages validated this recently are reused
+# without any request. ResearchJob(page_freshness_hours=...) overrides it.
+PAGE_CACHE_FRESHNESS_HOURS = float(os.environ.get("PAGE_CACHE_FRESHNESS_HOURS", "24"))
+
+PAGE_CACHE_MAX_AGE_DAYS = 30
+
+# Size cap enforced by prune() (least recently validated entries go first)
+PAGE_CACHE_MAX_MB = float(os.environ.get("PAGE_CACHE_MAX_MB", "500"))
+
+# A *.tmp older than this belongs to a writer that died before os.replace()
+_STALE_TMP_SECONDS = 3600
+
+
+def _path(url: str) -> str:
+    key = hashlib.sha256(url.split("#", 1)[0].encode()).hexdigest()
+    return os.path.join(PAGE_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _write(path: str, entry: dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Page cache write failed for {entry.get('url', '')[:80]}: {e}")
+
+
+# ─────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────
+
+def get(url: str) -> dict | None:
+    """Stored entry {url, text, etag, last_modified, fetched_at, validated_at} or None."""
+    if not ENABLE_PAGE_CACHE:
+        return None
+    try:
+        with open(_path(url), "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("fetched_at", 0) > PAGE_CACHE_MAX_AGE_DAYS * 86400:
+        return None
+    return entry
+
+
+def is_fresh(entry: dict | None, freshness_seconds: float) -> bool:
+    """True if entry was validated within freshness_seconds (0 → never fresh)."""
+    if not entry or freshness_seconds <= 0:
+        return False
+    return time.time() - entry.get("validated_at", 0) <= freshness_seconds
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    """If-None-Match / If-Modified-Since for a stored entry ({} if it has no validators)."""
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def put(url: str, text: str, headers=None) -> None:
+    """Store a freshly downloaded page's extracted text and its validators."""
+    if not ENABLE_PAGE_CACHE or not text:
+        return
+    headers = headers or {}
+    now = time.time()
+    _write(_path(url), {
+        "url": url,
+        "text": text,
+        "etag": headers.get("etag", ""),
+        "last_modified": headers.get("last-modified", ""),
+        "fetched_at": now,
+        "validated_at": now,
+    })
+
+
+def touch(url: str, entry: dict) -> None:
+    """Record a successful 304 revalidation (restarts the freshness window)."""
+    if not ENABLE_PAGE_CACHE:
+        return
+    entry = dict(entry, validated_at=time.time())
+    _write(_path(url), entry)
+
+
+def prune(max_bytes: int | None = None) -> int:
+    """Delete entries past PAGE_CACHE_MAX_AGE_DAYS and abandoned temp files, then
+    the least recently validated entries until the cache fits in max_bytes
+    (default PAGE_CACHE_MAX_MB). Returns the number removed."""
+    if max_bytes is None:
+        max_bytes = int(PAGE_CACHE_MAX_MB * 1024 * 1024)
+    removed = 0
+    now = time.time()
+    kept = []  # (validated_at, size, path)
+    try:
+        shards = os.listdir(PAGE_CACHE_DIR)
+    except OSError:
+        return 0
+    for shard in shards:
+        shard_dir = os.path.join(PAGE_CACHE_DIR, shard)
+        if not os.path.isdir(shard_dir):
+            continue
+        try:
+            names = os.listdir(shard_dir)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(shard_dir, name)
+            try:
+                size = os.path.getsize(path)
+                if name.endswith(".tmp"):
+                    # Another writer's _write() may be about to os.replace() it
+                    expired = now - os.path.getmtime(path) > _STALE_TMP_SECONDS
+                    if not expired:
+                        continue
+                else:
+                    with open(path, "r") as f:
+                        entry = json.load(f)
+                    expired = now - entry.get("fetched_at", 0) > PAGE_CACHE_MAX_AGE_DAYS * 86400
+                    if not expired:
+                        kept.append((entry.get("validated_at", 0), size, path))
+            except (OSError, ValueError):
+                expired = True
+            if expired:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+    total = sum(size for _, size, _ in kept)
+    kept.sort()
+    for _, size, path in kept:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+        total -= size
+    return removed
@@ -142,7 +142,7 @@ def discover_private_schools(state: str, max_results: int = 25) -> dict:
         }
     state_name = _STATE_NAMES.get(state_abbr, state_abbr)
 
-    import httpx
+    import tools.serper_cache as serper_cache
 
     exclusions = (
         "-site:facebook.com -site:yelp.com -site:niche.com -site:greatschools.org "
@@ -161,14 +161,9 @@ def discover_private_schools(state: str, max_results: int = 25) -> dict:
 
     for q in queries:
         try:
-            resp = httpx.post(
-                SERPER_URL,
-                headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": q, "num": 10},
-                timeout=15.0,
+            data = serper_cache.search(
+                q, "private_schools.discover_private_schools", api_key=SERPER_API_KEY, num=10,
             )
-            resp.raise_for_status()
-            data = resp.json()
             for item in data.get("organic", [])[:10]:
                 url = item.get("link", "")
                 if not url or url in seen_urls:
@@ -227,7 +222,8 @@ def discover_private_schools(state: str, max_results: int = 25) -> dict:
                 })
                 if len(schools) >= max_results:
                     break
-            time.sleep(0.3)
+            if not data.from_cache:
+                time.sleep(0.3)
             if len(schools) >= max_results:
                 break
         except Exception as e:
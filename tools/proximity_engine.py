@@ -5,19 +5,27 @@ Finds districts/schools near a specific active account (name-drop/FOMO) and maps
 districts to their ESA (ESC/BOCES/IU/COE) for regional relationship leverage.
 
 Uses NCES territory data (lat/lon, Agency Type 4 = ESAs) — no external geocoding needed.
+Radius queries go through spatial_index.GeoGridIndex and state-wide nearest-account /
+nearest-ESA assignment through spatial_index.nearest_each (vectorized, NumPy when
+installed), both over per-state points cached on the shared territory index.
 
 Two modes:
   - Targeted (default): "proximity Leander ISD" → find what's near one account
   - State sweep: "proximity Texas all" → find nearby districts for ALL accounts in a state
 """
 
+import hashlib
+import json
 import logging
-import math
+import threading
 from datetime import datetime
 
 import tools.csv_importer as csv_importer
 import tools.territory_data as territory_data
+import tools.territory_index as territory_index
+import tools.territory_snapshot as territory_snapshot
 import tools.district_prospector as district_prospector
+from tools.spatial_index import PointArray, haversine_miles, nearest_each
 
 logger = logging.getLogger(__name__)
 
@@ -31,19 +39,12 @@ _PROSPECTABLE_AGENCY_TYPES = {
 
 _ESA_AGENCY_TYPE = "Regional education service agency"
 
-
-# ─────────────────────────────────────────────
-# HAVERSINE
-# ─────────────────────────────────────────────
-
-def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Great-circle distance between two points in miles."""
-    R = 3958.8  # Earth radius in miles
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    return R * 2 * math.asin(math.sqrt(a))
+# District → ESA assignment tables, {state: (districts partition generation, mapping)}
+# (a row digest instead of a generation when the state has no snapshot partition).
+# Persisted next to the snapshot as derived table "esa"; see _esa_mapping.
+_ESA_TABLE = "esa"
+_esa_cache: dict[str, tuple[int | str, dict]] = {}
+_esa_cache_lock = threading.Lock()
 
 
 # ─────────────────────────────────────────────
@@ -139,24 +140,7 @@ def _get_active_account_locations(state: str) -> list:
     if not accounts:
         return []
 
-    districts = territory_data._load_territory_districts(state)
-    schools = territory_data._load_territory_schools(state)
-
-    district_geo = {}
-    for d in districts:
-        nk = d.get("Name Key", "")
-        lat = _parse_float(d.get("Lat"))
-        lon = _parse_float(d.get("Lon"))
-        if nk and lat is not None and lon is not None:
-            district_geo[nk] = (lat, lon)
-
-    school_geo = {}
-    for s in schools:
-        nk = s.get("Name Key", "")
-        lat = _parse_float(s.get("Lat"))
-        lon = _parse_float(s.get("Lon"))
-        if nk and lat is not None and lon is not None:
-            school_geo[nk] = (lat, lon)
+    district_geo, school_geo = territory_index.get_index().geo_for_state(state)
 
     locations = []
     for acc in accounts:
@@ -214,74 +198,54 @@ def find_nearby_one(account_name: str, radius_miles: float = 15,
     origin_lat, origin_lon = loc["lat"], loc["lon"]
     active_keys, prospect_keys = _build_exclusion_sets(state)
 
-    # Find nearby districts
-    all_districts = territory_data._load_territory_districts(state)
+    idx = territory_index.get_index()
+
+    # Find nearby districts (grid hits come back in territory order, so the
+    # stable sort below breaks distance ties exactly as the old full scan did)
+    pts = idx.points_for_state("districts", state)
     nearby_districts = []
-    for dist in all_districts:
+    for i, d in pts.grid.within(origin_lat, origin_lon, radius_miles):
+        dist = pts.rows[i]
         agency_type = dist.get("Agency Type", "")
         if agency_type not in _PROSPECTABLE_AGENCY_TYPES:
             continue
         name_key = dist.get("Name Key", "")
         if not name_key or name_key in active_keys:
             continue
-
-        lat = _parse_float(dist.get("Lat"))
-        lon = _parse_float(dist.get("Lon"))
-        if lat is None or lon is None:
-            continue
-
-        enrollment = 0
-        try:
-            enrollment = int(dist.get("Enrollment", 0) or 0)
-        except (ValueError, TypeError):
-            pass
+        enrollment = pts.enrollments[i]
         if enrollment < min_enrollment:
             continue
 
-        d = haversine_miles(origin_lat, origin_lon, lat, lon)
-        if d <= radius_miles:
-            in_queue = name_key in prospect_keys
-            nearby_districts.append({
-                "name": dist.get("District Name", ""),
-                "name_key": name_key,
-                "enrollment": enrollment,
-                "city": dist.get("City", ""),
-                "distance_miles": round(d, 1),
-                "agency_type": agency_type,
-                "in_queue": in_queue,
-            })
+        in_queue = name_key in prospect_keys
+        nearby_districts.append({
+            "name": dist.get("District Name", ""),
+            "name_key": name_key,
+            "enrollment": enrollment,
+            "city": dist.get("City", ""),
+            "distance_miles": round(d, 1),
+            "agency_type": agency_type,
+            "in_queue": in_queue,
+        })
 
     nearby_districts.sort(key=lambda x: x["distance_miles"])
 
     # Find nearby schools (from other districts, not the origin's own schools)
-    all_schools = territory_data._load_territory_schools(state)
+    pts = idx.points_for_state("schools", state)
     nearby_schools = []
-    for sch in all_schools:
+    for i, d in pts.grid.within(origin_lat, origin_lon, radius_miles):
+        sch = pts.rows[i]
         nk = sch.get("Name Key", "")
         if not nk or nk in active_keys:
             continue
-
-        lat = _parse_float(sch.get("Lat"))
-        lon = _parse_float(sch.get("Lon"))
-        if lat is None or lon is None:
-            continue
-
-        enrollment = 0
-        try:
-            enrollment = int(sch.get("Enrollment", 0) or 0)
-        except (ValueError, TypeError):
-            pass
-
-        d = haversine_miles(origin_lat, origin_lon, lat, lon)
-        if d <= radius_miles:
-            nearby_schools.append({
-                "name": sch.get("School Name", ""),
-                "name_key": nk,
-                "district_name": sch.get("District Name", ""),
-                "enrollment": enrollment,
-                "city": sch.get("City", ""),
-                "distance_miles": round(d, 1),
-            })
+        enrollment = pts.enrollments[i]
+        nearby_schools.append({
+            "name": sch.get("School Name", ""),
+            "name_key": nk,
+            "district_name": sch.get("District Name", ""),
+            "enrollment": enrollment,
+            "city": sch.get("City", ""),
+            "distance_miles": round(d, 1),
+        })
 
     nearby_schools.sort(key=lambda x: x["distance_miles"])
 
@@ -332,46 +296,41 @@ def find_nearby_state(state: str, radius_miles: float = 30,
     if not account_locs:
         return {"success": False, "error": f"No active accounts matched NCES data in {state}."}
 
-    all_districts = territory_data._load_territory_districts(state)
+    pts = territory_index.get_index().points_for_state("districts", state)
     active_keys, prospect_keys = _build_exclusion_sets(state)
 
-    nearby = []
-    for dist in all_districts:
+    candidates = []
+    for i, dist in enumerate(pts.rows):
         agency_type = dist.get("Agency Type", "")
         if agency_type not in _PROSPECTABLE_AGENCY_TYPES:
             continue
         name_key = dist.get("Name Key", "")
         if not name_key or name_key in active_keys or name_key in prospect_keys:
             continue
-
-        enrollment = 0
-        try:
-            enrollment = int(dist.get("Enrollment", 0) or 0)
-        except (ValueError, TypeError):
-            pass
-        if enrollment < min_enrollment:
+        if pts.enrollments[i] < min_enrollment:
             continue
-
-        lat = _parse_float(dist.get("Lat"))
-        lon = _parse_float(dist.get("Lon"))
-        if lat is None or lon is None:
+        if pts.lats[i] is None or pts.lons[i] is None:
             continue
+        candidates.append(i)
 
-        min_dist = float("inf")
-        nearest_name = ""
-        for acc in account_locs:
-            d = haversine_miles(lat, lon, acc["lat"], acc["lon"])
-            if d < min_dist:
-                min_dist = d
-                nearest_name = acc["name"]
+    # Nearest account per candidate district in one vectorized pass; ties go to
+    # the earliest account, as in a linear scan
+    accounts = PointArray((acc["lat"], acc["lon"]) for acc in account_locs)
+    hits = nearest_each(pts.array, accounts, max_miles=radius_miles, rows=candidates)
 
-        if min_dist <= radius_miles:
+    nearby = []
+    for i, hit in zip(candidates, hits):
+        if hit is not None:
+            dist = pts.rows[i]
+            enrollment = pts.enrollments[i]
+            min_dist = hit[1]
+            nearest_name = account_locs[hit[0]]["name"]
             dist_score = max(0, 100 * (1 - min_dist / radius_miles))
             enroll_score = min(100, enrollment / 250)
             score = dist_score * 0.6 + enroll_score * 0.4
             nearby.append({
                 "name": dist.get("District Name", ""),
-                "name_key": name_key,
+                "name_key": dist.get("Name Key", ""),
                 "enrollment": enrollment,
                 "city": dist.get("City", ""),
                 "nearest_account": nearest_name,
@@ -479,8 +438,10 @@ def get_esa_districts(state: str) -> list:
     state = _normalize_state(state)
     if not state:
         return []
+    return _esa_entries(state, territory_data._load_territory_districts(state))
+
 
-    all_districts = territory_data._load_territory_districts(state)
+def _esa_entries(state: str, all_districts: list) -> list:
     esas = []
     for d in all_districts:
         if d.get("Agency Type", "") == _ESA_AGENCY_TYPE:
@@ -516,6 +477,9 @@ def map_districts_to_esa(state: str) -> dict:
     """
     Map each regular district to its nearest ESA.
     Algorithm: county_code match first, then haversine fallback.
+
+    Served from the precomputed assignment table (recomputed only after the
+    state's territory data changes). Treat the returned dict as read-only.
     """
     state = _normalize_state(state)
     if not state:
@@ -530,10 +494,78 @@ def map_districts_to_esa(state: str) -> dict:
             "error": f"No ESA system established by law in {state}.",
         }
 
-    all_esas = get_esa_districts(state)
+    return _esa_mapping(state)
+
+
+def esa_for_district(name_key: str, state: str) -> str:
+    """Name of the ESA serving a district (by Name Key), or "" if unmapped.
+
+    O(1) per call while the state's districts are in the territory snapshot
+    (the table is cached per partition generation). Without a partition each
+    call reloads the state's rows from Sheets — O(rows) — but the table is
+    still built only once per distinct content.
+    """
+    state = _normalize_state(state)
+    if not state:
+        return ""
+    return map_districts_to_esa(state).get("assignments", {}).get(name_key, "")
+
+
+def rebuild_esa_assignments(state: str) -> dict:
+    """Recompute and persist a state's district → ESA table. Called after territory sync."""
+    state = _normalize_state(state)
+    if not state:
+        return {"success": False, "error": "Unknown state."}
+    return _esa_mapping(state, force=True)
+
+
+def _esa_mapping(state: str, force: bool = False) -> dict:
+    """Assignment table for a state: memory → derived snapshot table → rebuild.
+
+    Keyed by the districts partition generation, so a sync or clear of the
+    state invalidates it. A first load without a partition seeds one from
+    Sheets and is keyed on that; if none gets written (empty tab, seed
+    failure) the table is memoized by a digest of the rows instead.
+    """
+    generation = territory_snapshot.partition_generation("districts", state)
+    if not force and generation is not None:
+        hit = _esa_cache.get(state)
+        if hit is not None and hit[0] == generation:
+            return hit[1]
+        mapping = territory_snapshot.read_derived(_ESA_TABLE, state)
+        if mapping is not None:
+            with _esa_cache_lock:
+                _esa_cache[state] = (generation, mapping)
+            return mapping
+
+    districts = territory_data._load_territory_districts(state)
+    if generation is None:
+        # The Sheets fallback seeds the partition; key on the one it wrote
+        generation = territory_snapshot.partition_generation("districts", state)
+    if generation is None:
+        digest = hashlib.sha1(json.dumps(districts, sort_keys=True).encode("utf-8")).hexdigest()
+        hit = _esa_cache.get(state)
+        if not force and hit is not None and hit[0] == digest:
+            return hit[1]
+        mapping = _build_esa_mapping(state, districts)
+        with _esa_cache_lock:
+            _esa_cache[state] = (digest, mapping)
+        return mapping
+
+    mapping = _build_esa_mapping(state, districts)
+    try:
+        territory_snapshot.write_derived(_ESA_TABLE, state, mapping, generation)
+    except OSError as e:
+        logger.warning(f"ESA table write failed for {state}: {e}")
+    with _esa_cache_lock:
+        _esa_cache[state] = (generation, mapping)
+    return mapping
+
+
+def _build_esa_mapping(state: str, all_districts: list) -> dict:
+    all_esas = _esa_entries(state, all_districts)
     esas = [e for e in all_esas if e["entity_type"] == "esc"]
     career_tech = [e for e in all_esas if e["entity_type"] == "career_tech"]
-    all_districts = territory_data._load_territory_districts(state)
     regular = [d for d in all_districts if d.get("Agency Type", "") in _PROSPECTABLE_AGENCY_TYPES]
 
     if not esas:
@@ -558,8 +590,17 @@ def map_districts_to_esa(state: str) -> dict:
         if cc:
             county_to_esa[cc] = esa["name"]
 
+    # Nearest-ESA fallback for districts without a county match, vectorized
+    esa_points = PointArray((esa["lat"], esa["lon"]) for esa in esas)
+    regular_points = PointArray((_parse_float(d.get("Lat")), _parse_float(d.get("Lon")))
+                                for d in regular)
+    fallback_rows = [i for i, d in enumerate(regular)
+                     if not county_to_esa.get(d.get("County Code", ""))]
+    nearest_esa = dict(zip(fallback_rows, nearest_each(regular_points, esa_points, rows=fallback_rows)))
+
     unmapped = 0
-    for dist in regular:
+    assignments = {}
+    for i, dist in enumerate(regular):
         name = dist.get("District Name", "")
         enrollment = 0
         try:
@@ -573,14 +614,8 @@ def map_districts_to_esa(state: str) -> dict:
         city = dist.get("City", "")
 
         assigned_esa = county_to_esa.get(cc)
-        if not assigned_esa and lat is not None and lon is not None:
-            min_d = float("inf")
-            for esa in esas:
-                if esa["lat"] is not None and esa["lon"] is not None:
-                    d = haversine_miles(lat, lon, esa["lat"], esa["lon"])
-                    if d < min_d:
-                        min_d = d
-                        assigned_esa = esa["name"]
+        if not assigned_esa and nearest_esa.get(i):
+            assigned_esa = esas[nearest_esa[i][0]]["name"]
 
         if assigned_esa and assigned_esa in esa_map:
             distance = 0.0
@@ -588,10 +623,12 @@ def map_districts_to_esa(state: str) -> dict:
                 ei = esa_map[assigned_esa]
                 if ei["lat"] is not None and ei["lon"] is not None:
                     distance = haversine_miles(lat, lon, ei["lat"], ei["lon"])
+            name_key = csv_importer.normalize_name(name)
             esa_map[assigned_esa]["districts"].append({
-                "name": name, "enrollment": enrollment,
+                "name": name, "name_key": name_key, "enrollment": enrollment,
                 "distance_miles": round(distance, 1), "city": city,
             })
+            assignments[dist.get("Name Key", "") or name_key] = assigned_esa
             esa_map[assigned_esa]["total_enrollment"] += enrollment
             esa_map[assigned_esa]["district_count"] += 1
         else:
@@ -601,6 +638,7 @@ def map_districts_to_esa(state: str) -> dict:
         "success": True, "state": state, "esa_count": len(esas),
         "career_tech_count": len(career_tech), "career_tech": career_tech,
         "district_count": len(regular), "esa_map": esa_map, "unmapped_count": unmapped,
+        "assignments": assignments,
     }
 
 
@@ -635,7 +673,7 @@ def find_esa_opportunities(state: str) -> dict:
         active_in_region = []
         uncovered = []
         for d in esa_info["districts"]:
-            dk = csv_importer.normalize_name(d["name"])
+            dk = d["name_key"]
             if dk in active_keys:
                 active_in_region.append(active_keys[dk])
             elif dk not in prospect_keys:
@@ -0,0 +1,129 @@
+"""
+tools/research_checkpoint.py — On-disk checkpoints for queued research jobs.
+
+A ResearchJob run by ResearchQueue writes a checkpoint after each completed
+phase (A–E of _run_phases): the job's parameters plus everything it has
+accumulated so far (raw_pages, all_contacts, district_domain, email_pattern,
+Serper count, layer bookkeeping). If the process dies mid-job — Railway
+redeploy, crash — ResearchQueue.resume_interrupted() re-enqueues the job on
+startup and it continues from the next phase, without re-spending the Serper,
+Exa, Firecrawl and Claude calls of the phases already done.
+
+The checkpoint is deleted once the job's completion callback has run.
+Checkpoints older than RESEARCH_CHECKPOINT_MAX_AGE_HOURS are ignored.
+
+Each enqueue gets its own run id (kept in the checkpoint params), so two
+queued jobs for the same district checkpoint, resume and clear separately.
+
+Layout: {RESEARCH_CHECKPOINT_DIR}/<job_id>.json, written atomically. The
+directory defaults to the persistent data volume (agent.config.DATA_DIR) —
+a checkpoint under /tmp would be wiped by the very redeploy it exists for.
+
+Usage (module-level, not a class):
+  import tools.research_checkpoint as research_checkpoint
+  research_checkpoint.save(job_id, {"params": ..., "completed_phases": [...], "state": ...})
+  for cp in research_checkpoint.pending(): ...
+  research_checkpoint.clear(job_id)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+from agent.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+RESEARCH_CHECKPOINT_DIR = os.environ.get("RESEARCH_CHECKPOINT_DIR",
+                                         os.path.join(DATA_DIR, "research_checkpoints"))
+
+# Kill switch — set RESEARCH_CHECKPOINTS=0 to never write or resume checkpoints
+ENABLE_RESEARCH_CHECKPOINTS = os.environ.get("RESEARCH_CHECKPOINTS", "1") != "0"
+
+RESEARCH_CHECKPOINT_MAX_AGE_HOURS = 72
+
+
+def new_run_id() -> str:
+    """Per-enqueue id: two queued jobs for the same district never share a checkpoint."""
+    return uuid.uuid4().hex[:8]
+
+
+def job_id(district_name: str, state: str, run_id: str = "") -> str:
+    """Checkpoint / trace id for one job run — readable slug + short hash, then
+    the run id (new_run_id()) so concurrent runs for a district stay apart."""
+    raw = f"{(district_name or '').strip().lower()}|{(state or '').strip().lower()}"
+    slug = re.sub(r"[^a-z0-9]+", "-", raw).strip("-")[:60]
+    jid = f"{slug}-{hashlib.sha256(raw.encode()).hexdigest()[:10]}"
+    return f"{jid}-{run_id}" if run_id else jid
+
+
+def _path(jid: str) -> str:
+    return os.path.join(RESEARCH_CHECKPOINT_DIR, f"{jid}.json")
+
+
+# ─────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────
+
+def save(jid: str, checkpoint: dict) -> None:
+    """Atomically write a checkpoint (stamped with saved_at)."""
+    if not ENABLE_RESEARCH_CHECKPOINTS:
+        return
+    path = _path(jid)
+    try:
+        os.makedirs(RESEARCH_CHECKPOINT_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({**checkpoint, "job_id": jid, "saved_at": time.time()}, f)
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Research checkpoint write failed for {jid}: {e}")
+
+
+def load(jid: str) -> dict | None:
+    """Checkpoint for jid, or None if missing, unreadable or too old."""
+    if not ENABLE_RESEARCH_CHECKPOINTS:
+        return None
+    try:
+        with open(_path(jid), "r") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - checkpoint.get("saved_at", 0) > RESEARCH_CHECKPOINT_MAX_AGE_HOURS * 3600:
+        return None
+    return checkpoint
+
+
+def clear(jid: str) -> None:
+    try:
+        os.remove(_path(jid))
+    except OSError:
+        pass
+
+
+def pending() -> list[dict]:
+    """All resumable checkpoints, oldest first. Stale ones are deleted."""
+    if not ENABLE_RESEARCH_CHECKPOINTS:
+        return []
+    try:
+        names = [n for n in os.listdir(RESEARCH_CHECKPOINT_DIR) if n.endswith(".json")]
+    except OSError:
+        return []
+    out = []
+    for name in names:
+        jid = name[:-len(".json")]
+        checkpoint = load(jid)
+        if checkpoint is None:
+            clear(jid)
+            continue
+        out.append(checkpoint)
+    return sorted(out, key=lambda c: c.get("saved_at", 0))
@@ -34,12 +34,15 @@ Parallelization:
 
 import os
 import re
+import time
+import heapq
 import logging
 import asyncio
-import httpx
+import itertools
+import collections
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from agent.keywords import (
     SERPER_PRIORITY_TITLES,
@@ -53,11 +56,27 @@ from agent.keywords import (
     STATE_ABBREVIATIONS,
 )
 from tools.contact_extractor import (
+    EXTRACT_CONCURRENCY,
+    EXTRACT_TOKEN_BUDGET,
     extract_contacts,
-    extract_from_multiple,
+    extract_from_multiple_async,
     infer_email,
     detect_email_pattern,
 )
+from tools.research_http import (
+    ConnectionStats,
+    ResearchHTTP,
+    brave_limiter,
+    exa_limiter,
+    firecrawl_limiter,
+    serper_limiter,
+)
+import tools.email_pattern_store as email_pattern_store
+import tools.page_cache as page_cache
+import tools.research_checkpoint as research_checkpoint
+import tools.research_planner as research_planner
+import tools.research_trace as research_trace
+import tools.serper_cache as serper_cache
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +91,13 @@ MAX_CRAWL_PAGES = 30          # max pages to crawl on district site
 CRAWL_DELAY = 0.5             # seconds between requests (be polite)
 SERPER_REQUESTS_PER_JOB = int(os.environ.get("SERPER_REQUESTS_PER_JOB", "100"))  # safety cap; ~57 used in normal 15-layer run (L15 adds up to 30)
 
+# ResearchQueue: jobs run side by side (provider limiters in research_http keep
+# the combined rate in bounds). 1 → strictly one job at a time.
+RESEARCH_QUEUE_WORKERS = int(os.environ.get("RESEARCH_QUEUE_WORKERS", "3"))
+RESEARCH_JOB_ETA_SECONDS = 420  # ETA per job until real durations are observed
+PRIORITY_INTERACTIVE = 0      # ad-hoc Telegram research — always dequeued first
+PRIORITY_BULK = 1             # batches, prospect approvals
+
 # BUG 5 cross-district contamination filter kill switch. Set to False to disable
 # both the page-level and contact-level filters and fall back to L10's built-in
 # cross-district email check only. See Session 55 plan + feedback_kill_switches.
@@ -159,6 +185,12 @@ class ResearchJob:
         enable_url_dedup: bool = False,
         l15_step5_skip_threshold: int | None = None,
         log_claude_usage: bool = False,
+        http: ResearchHTTP | None = None,
+        page_freshness_hours: float | None = None,
+        extract_concurrency: int | None = None,
+        extract_token_budget: int | None = None,
+        checkpoint: dict | None = None,
+        force_all_layers: bool = False,
     ):
         self.district_name = district_name
         self.state = state
@@ -176,17 +208,48 @@ class ResearchJob:
         self.district_domain: str = ""
         self.known_emails: list[str] = []
         self.email_pattern: str = ""
+        self._email_pattern_source: str = ""  # "store" (solved domain) / "detected"
 
         # Serper safety cap
         self._serper_cap = serper_cap_override if serper_cap_override is not None else SERPER_REQUESTS_PER_JOB
         self._serper_count = 0
         self._cap_hit = False
+        self._serper_cache_hits = 0
         self._skipped_layers: list[str] = []
 
+        # Pooled HTTP client — shared across jobs when run from ResearchQueue,
+        # otherwise opened on first use and closed at the end of run()
+        self._http = http
+        self._owns_http = False
+        self._conn_stats = ConnectionStats()
+
+        # District page cache (L6/L7): pages validated within this window are
+        # reused without a request; older ones are revalidated with a conditional GET
+        hours = page_cache.PAGE_CACHE_FRESHNESS_HOURS if page_freshness_hours is None else page_freshness_hours
+        self._page_freshness_seconds = max(0.0, hours) * 3600
+        self._page_stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "failed": 0}
+
+        # L9/L15 Claude extraction: pages in flight at once, and L9's estimated
+        # input-token budget (0 → unlimited)
+        self._extract_concurrency = (EXTRACT_CONCURRENCY if extract_concurrency is None
+                                     else extract_concurrency)
+        self._extract_token_budget = (EXTRACT_TOKEN_BUDGET if extract_token_budget is None
+                                      else extract_token_budget)
+
         # Layer effectiveness tracking
         self._url_to_layer: dict[str, str] = {}  # url → layer tag
+        self._spans: dict[str, dict] = {}        # layer tag → research_trace span
+        self._layer_pages: dict[str, dict] = {}  # "L<n>" → {pages, kept} at L9
         self._start_time: datetime = datetime.now()
 
+        # Layer planner (research_planner): skips / Serper-caps layers whose
+        # historical yield for districts like this one is too low.
+        # force_all_layers → fixed pipeline.
+        self._force_all_layers = force_all_layers
+        self._plan_features: dict = {}
+        self._plan: dict = research_planner.plan({}, force_all=True)
+        self._layer_serper_left: dict[str, int] = {}  # "L<n>" → Serper queries left (reduced layers)
+
         # BUG 5 cross-district contamination counters (Session 55)
         self._contam_pages_filtered: int = 0
         self._contam_contacts_filtered: int = 0
@@ -206,6 +269,18 @@ class ResearchJob:
                 f"domain={diocesan_domain} filter_base={self._diocesan_filter_base}"
             )
 
+        # Checkpoint/resume (ResearchQueue jobs only): {"job_id", "params"} turns
+        # on a checkpoint after every phase; one that also carries
+        # completed_phases + state (from research_checkpoint) resumes after them.
+        self._checkpoint = checkpoint
+        # Names this run's trace file (and checkpoint, when queued)
+        self._job_id = (checkpoint["job_id"] if checkpoint else
+                        research_checkpoint.job_id(district_name, state, research_checkpoint.new_run_id()))
+        self._completed_phases: list[str] = []
+        self._resumed_from: str | None = None
+        if checkpoint and checkpoint.get("completed_phases"):
+            self._restore(checkpoint)
+
     # ─────────────────────────────────────────────
     # BUG 5 shared matching helpers (Session 55)
     # Single source of truth for cross-district filtering. Used by the stage-1
@@ -330,62 +405,143 @@ class ResearchJob:
         # Round 1 Flag C: start module-level Claude usage capture. The
         # try/except below guarantees the capture flag never leaks even on
         # exception paths so the next job starts clean.
-        if self.log_claude_usage:
-            from tools.contact_extractor import start_usage_capture, stop_usage_capture
-            start_usage_capture()
-            try:
-                result = await self._run_phases()
-            except Exception:
-                stop_usage_capture()  # discard records, clean the flag
-                raise
-            result["claude_usage"] = stop_usage_capture()
-            return result
-        return await self._run_phases()
+        try:
+            if self.log_claude_usage:
+                from tools.contact_extractor import start_usage_capture, stop_usage_capture
+                start_usage_capture()
+                try:
+                    result = await self._run_phases()
+                except Exception:
+                    stop_usage_capture()  # discard records, clean the flag
+                    raise
+                result["claude_usage"] = stop_usage_capture()
+                return result
+            return await self._run_phases()
+        finally:
+            if self._owns_http and self._http is not None:
+                await self._http.aclose()
+                self._http = None
+                self._owns_http = False
 
     async def _run_phases(self) -> dict:
+        if self._resumed_from:
+            await self._progress(
+                f"♻️ Resuming *{self.district_name}* after phase {self._resumed_from} "
+                f"({len(self.raw_pages)} pages, {self._serper_count} queries already done)..."
+            )
+        for phase, run_phase in (
+            ("A", self._phase_a_independent_searches),
+            ("B", self._phase_b_domain_discovery),
+            ("C", self._phase_c_domain_layers),
+            ("D", self._phase_d_crawl_and_patterns),
+            ("E", self._phase_e_extract_and_verify),
+        ):
+            if phase in self._completed_phases:
+                continue
+            if phase in ("A", "C"):
+                # Re-plan once the domain (and so its type) is known
+                self._make_plan(domain_known=phase == "C")
+            await run_phase()
+            self._completed_phases.append(phase)
+            self._save_checkpoint()
+        # Verified addresses become evidence for the next job on this domain
+        email_pattern_store.observe(self.all_contacts, source="research")
+        result = self._build_result()
+        result["trace_path"] = research_trace.write(
+            self._job_id,
+            {key: result[key] for key in (
+                "district_name", "state", "total", "with_email", "verified", "queries_used",
+                "elapsed_seconds", "resumed_from", "provider_calls", "cost_usd",
+            )} | {**self._plan_features, "plan_skipped": sorted(self._plan["skip"])},
+            result["trace"],
+        )
+        return result
+
+    def _make_plan(self, domain_known: bool):
+        self._plan_features = research_planner.features(
+            self.district_name, self.state, self.district_domain if domain_known else None)
+        self._plan = research_planner.plan(self._plan_features, force_all=self._force_all_layers)
+        self._layer_serper_left = {
+            prefix: est["serper_budget"] for prefix, est in self._plan["reduce"].items()
+        }
+        if self._plan["skip"] or self._plan["reduce"]:
+            logger.info(
+                f"Layer plan for {self.district_name} {self._plan_features}: "
+                f"skip {sorted(self._plan['skip'])}, reduce {self._layer_serper_left}, "
+                f"projected savings {self._plan['projected_savings']}"
+            )
+
+    async def _traced(self, layer: str, phase: str, coro):
+        """Run one layer under its span (repeat runs, e.g. L10, accumulate).
+        Layers the planner skips are not run and get no span."""
+        skip = self._plan["skip"].get(layer.split(":")[0])
+        if skip is not None:
+            coro.close()
+            self._skipped_layers.append(
+                f"{layer} (planner: ~{skip['expected_contacts']:.2f} contacts/run)"
+            )
+            return None
+        span = self._spans.get(layer)
+        if span is None:
+            span = self._spans[layer] = research_trace.new_span(layer, phase)
+        token = research_trace.activate(span)
+        start = time.monotonic()
+        try:
+            return await coro
+        finally:
+            span["runs"] += 1
+            span["wall_ms"] += int((time.monotonic() - start) * 1000)
+            research_trace.deactivate(token)
+
+    async def _phase_a_independent_searches(self):
         # ── Phase A: Independent searches (run in parallel across 3 indices) ──
         await self._progress(f"🔎 Searching across Serper + Exa + Brave...")
         await asyncio.gather(
-            self._layer1_direct_title_search(),
-            self._layer2_title_variation_sweep(),
-            self._layer3_linkedin_search(),
-            self._layer5_news_grants_search(),
-            self._layer16_exa_broad_search(),
-            self._layer20_brave_search(),
+            self._traced("L1:direct-title", "A", self._layer1_direct_title_search()),
+            self._traced("L2:title-variations", "A", self._layer2_title_variation_sweep()),
+            self._traced("L3:linkedin", "A", self._layer3_linkedin_search()),
+            self._traced("L5:news-grants", "A", self._layer5_news_grants_search()),
+            self._traced("L16:exa-broad", "A", self._layer16_exa_broad_search()),
+            self._traced("L20:brave", "A", self._layer20_brave_search()),
         )
 
+    async def _phase_b_domain_discovery(self):
         # ── Phase B: Domain discovery (must complete before domain-dependent layers) ──
-        await self._layer4_district_site_search()
+        await self._traced("L4:district-site", "B", self._layer4_district_site_search())
 
+    async def _phase_c_domain_layers(self):
         # ── Phase C: Domain-dependent searches + scraping (run in parallel) ──
         await self._progress(f"🔎 Deep search: district site + expanded layers...")
         await asyncio.gather(
-            self._layer6_direct_scrape(),
-            self._layer11_school_staff_search(),
-            self._layer12_board_agenda_search(),
-            self._layer13_state_doe_search(),
-            self._layer14_conference_presenter_search(),
-            self._layer17_exa_domain_search(),
-            self._layer18_firecrawl_extract(),
-            self._layer19_firecrawl_site_map(),
+            self._traced("L6:scrape", "C", self._layer6_direct_scrape()),
+            self._traced("L11:school-staff", "C", self._layer11_school_staff_search()),
+            self._traced("L12:board-agendas", "C", self._layer12_board_agenda_search()),
+            self._traced("L13:state-doe", "C", self._layer13_state_doe_search()),
+            self._traced("L14:conference", "C", self._layer14_conference_presenter_search()),
+            self._traced("L17:exa-domain", "C", self._layer17_exa_domain_search()),
+            self._traced("L18:fc-extract", "C", self._layer18_firecrawl_extract()),
+            self._traced("L19:fc-sitemap", "C", self._layer19_firecrawl_site_map()),
         )
 
+    async def _phase_d_crawl_and_patterns(self):
         # ── Phase D: Sequential layers that depend on Phase C pages ──
-        await self._layer7_keyword_crawl()
-        await self._layer8_email_inference()
+        await self._traced("L7:deep-crawl", "D", self._layer7_keyword_crawl())
+        await self._traced("L8:email-inference", "D", self._layer8_email_inference())
 
+    async def _phase_e_extract_and_verify(self):
         # ── Phase E: Claude extraction (all raw pages, with two-pass filter) ──
-        await self._layer9_claude_extraction()
+        await self._traced("L9:claude-extract", "E", self._layer9_claude_extraction())
 
         # Layer 10: Dedup + confidence scoring
-        await self._layer10_dedup_and_score()
+        await self._traced("L10:dedup-score", "E", self._layer10_dedup_and_score())
 
         # Layer 15: Email verification & discovery (operates on cleaned L10 list)
-        await self._layer15_email_verification()
+        await self._traced("L15:email-verify", "E", self._layer15_email_verification())
 
         # Re-run dedup + scoring to incorporate any new contacts from L15
-        await self._layer10_dedup_and_score()
+        await self._traced("L10:dedup-score", "E", self._layer10_dedup_and_score())
 
+    def _build_result(self) -> dict:
         layers_str = ", ".join(self.layers_used)
         total = len(self.all_contacts)
         with_email = sum(1 for c in self.all_contacts if c.get("email"))
@@ -400,6 +556,22 @@ class ResearchJob:
             layer = self._url_to_layer.get(src, "unknown")
             layer_contact_counts[layer] = layer_contact_counts.get(layer, 0) + 1
 
+        # Finish per-layer spans: contacts, pages and cost, joined on the L<n> prefix
+        by_prefix = lambda counts: {k.split(":")[0]: v for k, v in counts.items()}  # noqa: E731
+        contacts_by_layer = by_prefix(layer_contact_counts)
+        trace = []
+        for layer, span in self._spans.items():
+            prefix = layer.split(":")[0]
+            pages = self._layer_pages.get(prefix, {})
+            trace.append({
+                **span,
+                "pages": pages.get("pages", 0),
+                "pages_kept": pages.get("kept", 0),
+                "pages_dropped": pages.get("pages", 0) - pages.get("kept", 0),
+                "contacts": contacts_by_layer.get(prefix, 0),
+                "cost_usd": round(research_trace.span_cost(span), 5),
+            })
+
         return {
             "district_name": self.district_name,
             "state": self.state,
@@ -411,6 +583,7 @@ class ResearchJob:
             "layers_used": layers_str,
             "cap_hit": self._cap_hit,
             "queries_used": self._serper_count,
+            "serper_cache_hits": self._serper_cache_hits,
             "skipped_layers": self._skipped_layers,
             "elapsed_seconds": elapsed_seconds,
             "layer_contact_counts": layer_contact_counts,
@@ -419,8 +592,76 @@ class ResearchJob:
             "contacts_filtered": self._contam_contacts_filtered,
             "l10_cleared": self._contam_l10_cleared,
             "cross_contam_dropped": self._contam_pages_filtered + self._contam_contacts_filtered,
+            # Pooled HTTP client: requests that reused a warm connection
+            "http_connections": self._conn_stats.as_dict(),
+            # District page cache: fresh (no request) / revalidated (304) / fetched (200)
+            "page_cache": dict(self._page_stats),
+            # Email pattern used for inference and where it came from
+            # ("store" → solved domain, L15 verification queries skipped)
+            "email_pattern": self.email_pattern,
+            "email_pattern_source": self._email_pattern_source,
+            # Phase this run resumed after (None → ran from scratch)
+            "resumed_from": self._resumed_from,
+            # Per-layer spans (wall time, provider calls, bytes, tokens, pages,
+            # contacts, cost) and their exact totals
+            "trace": trace,
+            "provider_calls": research_trace.provider_totals(trace),
+            "cost_usd": round(sum(span["cost_usd"] for span in trace), 4),
+            # Layer planner: district features, skipped / Serper-capped layers
+            # and the projected savings against the fixed pipeline
+            "plan": {
+                "features": self._plan_features,
+                "skipped": sorted(self._plan["skip"], key=research_trace._layer_sort_key),
+                "reduced": {prefix: est["serper_budget"] for prefix, est in self._plan["reduce"].items()},
+                "explored": self._plan["explore"],
+                "projected_savings": self._plan["projected_savings"],
+            },
         }
 
+    # ─────────────────────────────────────────────
+    # Checkpoint / resume
+    # ─────────────────────────────────────────────
+
+    # Accumulated job state persisted after each phase (JSON-safe after _snapshot)
+    _CHECKPOINT_FIELDS = (
+        "raw_pages", "all_contacts", "seen_keys", "layers_used", "district_domain",
+        "known_emails", "email_pattern", "_email_pattern_source", "_serper_count", "_cap_hit", "_serper_cache_hits",
+        "_skipped_layers", "_url_to_layer", "_page_stats", "_contam_pages_filtered",
+        "_contam_contacts_filtered", "_contam_l10_cleared", "_spans", "_layer_pages",
+        "_plan_features", "_plan", "_layer_serper_left",
+    )
+
+    def _snapshot(self) -> dict:
+        state = {name: getattr(self, name) for name in self._CHECKPOINT_FIELDS}
+        state["seen_keys"] = sorted(self.seen_keys)
+        state["elapsed_seconds"] = (datetime.now() - self._start_time).total_seconds()
+        return state
+
+    def _restore(self, checkpoint: dict):
+        state = checkpoint.get("state") or {}
+        for name in self._CHECKPOINT_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+        self.raw_pages = [tuple(page) for page in self.raw_pages]
+        self.seen_keys = set(self.seen_keys)
+        self._start_time = datetime.now() - timedelta(seconds=state.get("elapsed_seconds", 0))
+        self._completed_phases = list(checkpoint["completed_phases"])
+        self._resumed_from = self._completed_phases[-1]
+        logger.info(
+            f"Resuming research for {self.district_name} after phase {self._resumed_from} "
+            f"({len(self.raw_pages)} pages, {len(self.all_contacts)} contacts, "
+            f"{self._serper_count} Serper queries restored)"
+        )
+
+    def _save_checkpoint(self):
+        if not self._checkpoint:
+            return
+        research_checkpoint.save(self._checkpoint["job_id"], {
+            "params": self._checkpoint.get("params", {}),
+            "completed_phases": self._completed_phases,
+            "state": self._snapshot(),
+        })
+
     # ─────────────────────────────────────────────
     # LAYER 1: Direct Serper title search
     # ─────────────────────────────────────────────
@@ -557,7 +798,7 @@ class ResearchJob:
         for url in seed_urls:
             if url in crawled:
                 continue
-            content = await self._fetch_page(url)
+            content, requested = await self._fetch_page_cached(url)
             if content:
                 self.raw_pages.append((url, content))
                 self._url_to_layer.setdefault(url, "L6:scrape")
@@ -565,7 +806,8 @@ class ResearchJob:
                 # Extract links for Layer 7
                 soup = BeautifulSoup(content, "html.parser")
                 self._discover_links(soup, url, crawled)
-            await asyncio.sleep(CRAWL_DELAY)
+            if requested:
+                await asyncio.sleep(CRAWL_DELAY)
 
     # ─────────────────────────────────────────────
     # LAYER 7: Keyword deep crawl
@@ -599,11 +841,12 @@ class ResearchJob:
         new_targets = [u for u in dict.fromkeys(crawl_targets) if u not in existing_urls]
 
         for url in new_targets[:MAX_CRAWL_PAGES]:
-            content = await self._fetch_page(url)
+            content, requested = await self._fetch_page_cached(url)
             if content:
                 self.raw_pages.append((url, content))
                 self._url_to_layer.setdefault(url, "L7:deep-crawl")
-            await asyncio.sleep(CRAWL_DELAY)
+            if requested:
+                await asyncio.sleep(CRAWL_DELAY)
 
     # ─────────────────────────────────────────────
     # LAYER 8: Email pattern inference
@@ -627,9 +870,24 @@ class ResearchJob:
 
         self.known_emails = list(dict.fromkeys(self.known_emails))
 
-        if self.known_emails and self.district_domain:
-            domain = self.district_domain.replace("www.", "")
-            self.email_pattern = detect_email_pattern(self.known_emails, domain) or EMAIL_PATTERNS[0]
+        if not self.district_domain:
+            return
+        domain = self.district_domain.replace("www.", "")
+
+        # A domain solved by earlier jobs / imports needs no detection (and
+        # L15 skips its verification queries)
+        stored = email_pattern_store.lookup(domain)
+        if stored and stored["solved"]:
+            self.email_pattern = stored["pattern"]
+            self._email_pattern_source = "store"
+            logger.info(
+                f"Stored email pattern: {self.email_pattern} for {domain} "
+                f"({stored['evidence']} emails, confidence {stored['confidence']:.0%})"
+            )
+        elif self.known_emails or (stored and stored["pattern"]):
+            self.email_pattern = (detect_email_pattern(self.known_emails, domain)
+                                  or (stored or {}).get("pattern") or EMAIL_PATTERNS[0])
+            self._email_pattern_source = "detected"
             logger.info(f"Detected email pattern: {self.email_pattern} for {domain}")
 
     # ─────────────────────────────────────────────
@@ -689,6 +947,9 @@ class ResearchJob:
             logger.warning(f"No raw pages to extract from for {self.district_name}")
             return
 
+        # Trace: pages each layer contributed (before dedup/filters drop any)
+        self._count_layer_pages(self.raw_pages, "pages")
+
         # Round 1 Flag A: URL dedup with longest-content-wins.
         # Serper snippets get appended per-query with different snippet text
         # for the same URL, and direct-scrape / Firecrawl / Exa layers append
@@ -755,14 +1016,15 @@ class ResearchJob:
             logger.info(f"L9 two-pass filter: {len(filtered_pages)}/{len(self.raw_pages)} pages "
                         f"have contact signals ({skipped} skipped)")
 
+        self._count_layer_pages(filtered_pages, "kept")
         await self._progress(f"🤖 Extracting contacts from {len(filtered_pages)} pages...")
 
-        # Run synchronous Claude extraction in a thread pool so it doesn't block the event loop.
-        # extract_from_multiple makes one blocking Claude API call per page — without run_in_executor
-        # it freezes asyncio entirely, preventing heartbeats and Telegram messages from processing.
-        loop = asyncio.get_running_loop()
-        contacts = await loop.run_in_executor(
-            None, extract_from_multiple, filtered_pages, self.district_name
+        # Claude calls are blocking; extract_from_multiple_async runs up to
+        # extract_concurrency of them on worker threads so the event loop
+        # (heartbeats, Telegram) stays free, then merges results in page order.
+        contacts = await extract_from_multiple_async(
+            filtered_pages, self.district_name,
+            concurrency=self._extract_concurrency, token_budget=self._extract_token_budget,
         )
 
         # Apply email inference to contacts that have name but no email
@@ -1086,11 +1348,14 @@ class ResearchJob:
             f"{self.district_name} CTE curriculum technology coordinator contact email",
         ]
 
+        loop = asyncio.get_running_loop()
         for query in queries:
             try:
-                results = exa.search_and_contents(
-                    query=query, type="auto", num_results=10, text=True,
-                )
+                await exa_limiter.acquire()
+                results = await loop.run_in_executor(None, lambda q=query: exa.search_and_contents(
+                    query=q, type="auto", num_results=10, text=True,
+                ))
+                research_trace.record(exa=1, bytes_fetched=sum(len(r.text or "") for r in results.results))
                 for r in results.results:
                     if r.url and r.text:
                         content = r.text[:15000]
@@ -1128,12 +1393,15 @@ class ResearchJob:
             "computer science technology CTE department",
         ]
 
+        loop = asyncio.get_running_loop()
         for query in queries:
             try:
-                results = exa.search_and_contents(
-                    query=query, type="auto", num_results=10, text=True,
+                await exa_limiter.acquire()
+                results = await loop.run_in_executor(None, lambda q=query: exa.search_and_contents(
+                    query=q, type="auto", num_results=10, text=True,
                     include_domains=[domain],
-                )
+                ))
+                research_trace.record(exa=1, bytes_fetched=sum(len(r.text or "") for r in results.results))
                 for r in results.results:
                     if r.url and r.text:
                         content = r.text[:15000]
@@ -1205,6 +1473,8 @@ class ResearchJob:
                     timeout=120,
                 )
 
+            await firecrawl_limiter.acquire()
+            research_trace.record(firecrawl=1)
             result = await loop.run_in_executor(None, _do_extract)
 
             # Parse and merge contacts
@@ -1272,6 +1542,8 @@ class ResearchJob:
             loop = asyncio.get_running_loop()
 
             # Map the site
+            await firecrawl_limiter.acquire()
+            research_trace.record(firecrawl=1)
             map_result = await loop.run_in_executor(None, fc.map, f"https://{domain}")
 
             # Normalize links
@@ -1306,10 +1578,13 @@ class ResearchJob:
             # Scrape with Firecrawl (handles JS)
             for url in new_staff_urls:
                 try:
+                    await firecrawl_limiter.acquire()
+                    research_trace.record(firecrawl=1)
                     doc = await loop.run_in_executor(
                         None, lambda u=url: fc.scrape(u, formats=["markdown"])
                     )
                     markdown = getattr(doc, 'markdown', '') or ''
+                    research_trace.record(bytes_fetched=len(markdown))
                     if markdown and len(markdown) > 200:
                         self.raw_pages.append((url, str(markdown)[:15000]))
                         self._url_to_layer.setdefault(url, "L19:fc-sitemap")
@@ -1337,26 +1612,29 @@ class ResearchJob:
             f"{self.district_name} technology coordinator curriculum director contact",
         ]
 
-        async with httpx.AsyncClient(timeout=15) as client:
-            for query in queries:
-                try:
-                    resp = await client.get(
-                        "https://api.search.brave.com/res/v1/web/search",
-                        headers={"X-Subscription-Token": brave_key, "Accept": "application/json"},
-                        params={"q": query, "count": 10},
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    for item in data.get("web", {}).get("results", []):
-                        url = item.get("url", "")
-                        desc = item.get("description", "")
-                        title = item.get("title", "")
-                        if url and desc:
-                            self.raw_pages.append((url, f"Title: {title}\nURL: {url}\n{desc}"))
-                            self._url_to_layer.setdefault(url, "L20:brave")
-                    await asyncio.sleep(0.5)
-                except Exception as e:
-                    logger.debug(f"Brave search failed: {e}")
+        client = self._client()
+        for query in queries:
+            try:
+                await brave_limiter.acquire()
+                research_trace.record(brave=1)
+                resp = await client.get(
+                    "https://api.search.brave.com/res/v1/web/search",
+                    stats=self._conn_stats,
+                    headers={"X-Subscription-Token": brave_key, "Accept": "application/json"},
+                    params={"q": query, "count": 10},
+                    timeout=15,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                for item in data.get("web", {}).get("results", []):
+                    url = item.get("url", "")
+                    desc = item.get("description", "")
+                    title = item.get("title", "")
+                    if url and desc:
+                        self.raw_pages.append((url, f"Title: {title}\nURL: {url}\n{desc}"))
+                        self._url_to_layer.setdefault(url, "L20:brave")
+            except Exception as e:
+                logger.debug(f"Brave search failed: {e}")
 
     # ─────────────────────────────────────────────
     # LAYER 15: Email verification & discovery
@@ -1371,7 +1649,9 @@ class ResearchJob:
         Steps:
           1. Identify candidates: contacts with INFERRED/UNKNOWN confidence or no email
           2. Generate candidate emails from the L8-detected pattern
-          3. Verify by searching the quoted email string in Serper
+          3. Verify by searching the quoted email string in Serper — skipped
+             for a domain solved in email_pattern_store (candidates are
+             marked LIKELY without a query)
           4. Enrich high-priority contacts via name+district search
           5. Discovery: search @domain to find new contacts we missed
         """
@@ -1422,8 +1702,39 @@ class ResearchJob:
         ]
         candidates.sort(key=_priority, reverse=True)
 
+        def _candidate_emails(first: str, last: str) -> list[str]:
+            """Pattern emails for a name; handles hyphenated last names, drops student-style addresses."""
+            candidate_emails = []
+            primary = infer_email(first, last, domain, self.email_pattern)
+            if primary:
+                candidate_emails.append(primary)
+            if "-" in last:
+                for variant_last in [last.replace("-", ""), last.split("-")[0]]:
+                    v = infer_email(first, variant_last, domain, self.email_pattern)
+                    if v and v not in candidate_emails:
+                        candidate_emails.append(v)
+            return [
+                e for e in candidate_emails
+                if not any(s in e for s in ("students.", "stu.", "student."))
+                and not re.search(r'\d{4}@', e)
+            ]
+
+        # ── Steps 2+3 (solved domain): pattern is already proven, no queries ──
+        if self.email_pattern and domain and self._email_pattern_source == "store":
+            for contact in candidates:
+                first = contact.get("first_name", "").lower().strip()
+                last = contact.get("last_name", "").lower().strip()
+                candidate_emails = _candidate_emails(first, last) if first and last else []
+                if not candidate_emails:
+                    continue
+                if not contact.get("email"):
+                    contact["email"] = candidate_emails[0]
+                    contact["email_confidence"] = "LIKELY"
+                elif contact["email"].lower() in candidate_emails:
+                    _upgrade_confidence(contact, "LIKELY")
+
         # ── Steps 2+3: Generate candidate emails + verify via search ──────────
-        if self.email_pattern and domain:
+        elif self.email_pattern and domain:
             for contact in candidates:
                 # Reserve 5 queries for discovery (Step 5)
                 if _l15_used >= _L15_MAX - 5 or self._serper_count >= self._serper_cap:
@@ -1434,23 +1745,8 @@ class ResearchJob:
                 if not first or not last:
                     continue
 
-                # Build candidate email variants; handle hyphenated last names
-                candidate_emails = []
-                primary = infer_email(first, last, domain, self.email_pattern)
-                if primary:
-                    candidate_emails.append(primary)
-                if "-" in last:
-                    for variant_last in [last.replace("-", ""), last.split("-")[0]]:
-                        v = infer_email(first, variant_last, domain, self.email_pattern)
-                        if v and v not in candidate_emails:
-                            candidate_emails.append(v)
-
-                # Filter student-address patterns
-                candidate_emails = [
-                    e for e in candidate_emails
-                    if not any(s in e for s in ("students.", "stu.", "student."))
-                    and not re.search(r'\d{4}@', e)
-                ]
+                # Build candidate email variants (filtered)
+                candidate_emails = _candidate_emails(first, last)
                 if not candidate_emails:
                     continue
 
@@ -1526,9 +1822,9 @@ class ResearchJob:
 
             if enrichment_raw:
                 self.raw_pages.extend(enrichment_raw)
-                loop = asyncio.get_running_loop()
-                new_contacts = await loop.run_in_executor(
-                    None, extract_from_multiple, enrichment_raw, self.district_name
+                self._count_layer_pages(enrichment_raw, "pages", "kept")
+                new_contacts = await extract_from_multiple_async(
+                    enrichment_raw, self.district_name, concurrency=self._extract_concurrency,
                 )
                 self._merge_contacts(new_contacts)
                 # BUG 5: run Stage 2 over L15 additions so they get the
@@ -1582,9 +1878,9 @@ class ResearchJob:
 
             if discovery_raw:
                 self.raw_pages.extend(discovery_raw)
-                loop = asyncio.get_running_loop()
-                new_contacts = await loop.run_in_executor(
-                    None, extract_from_multiple, discovery_raw, self.district_name
+                self._count_layer_pages(discovery_raw, "pages", "kept")
+                new_contacts = await extract_from_multiple_async(
+                    discovery_raw, self.district_name, concurrency=self._extract_concurrency,
                 )
                 self._merge_contacts(new_contacts)
                 # BUG 5: run Stage 2 over L15 discovery additions too
@@ -1600,41 +1896,100 @@ class ResearchJob:
     # ─────────────────────────────────────────────
 
     async def _serper_batch(self, queries: list[str]) -> list[dict]:
-        """Run a batch of Serper queries. Returns list of result dicts. Enforces per-job safety cap."""
+        """Run a batch of Serper queries concurrently. Returns one result dict per
+        query, in query order ({} for skipped/failed). Enforces per-job safety cap.
+
+        Queries answered by the shared serper_cache cost nothing and don't
+        count toward the cap. Budget is reserved in query order before dispatch
+        (so concurrent layers can't overshoot the cap) and refunded if the
+        request fails; queries that found the cap full are retried with the
+        refunded budget, and _cap_hit is set only if some are still left
+        over. Pacing is the process-wide serper_limiter token bucket,
+        shared with other jobs. A layer the planner down-budgeted stops after
+        its serper_budget dispatches.
+        """
         if not SERPER_API_KEY:
             logger.error("SERPER_API_KEY not set")
             return []
 
-        results = []
-        for query in queries:
-            # Safety cap — stop if budget exhausted
-            if self._serper_count >= self._serper_cap:
-                if not self._cap_hit:
-                    self._cap_hit = True
-                    logger.warning(f"Serper cap hit ({self._serper_cap}) for {self.district_name} — remaining queries skipped")
-                results.append({})
+        results: list[dict] = [{} for _ in queries]
+        pending = []
+        span = research_trace.current()
+        layer = span["layer"].split(":")[0] if span else ""
+        for i, query in enumerate(queries):
+            cached = serper_cache.get(query, "research_engine", num=10)
+            if cached is not None:
+                results[i] = cached
+                self._serper_cache_hits += 1
+                research_trace.record(serper_cache_hits=1)
                 continue
+            pending.append((i, query))
+
+        # Queries over the cap get another round if failures in this one were
+        # refunded; the cap only counts as hit once refunds have settled
+        capped = []
+        while pending:
+            dispatch = []
+            capped = []
+            for i, query in pending:
+                # Safety cap — stop if budget exhausted
+                if self._serper_count >= self._serper_cap:
+                    capped.append((i, query))
+                    continue
+                # Layer planner: down-budgeted layer has used its share
+                if layer in self._layer_serper_left:
+                    if self._layer_serper_left[layer] <= 0:
+                        continue
+                    self._layer_serper_left[layer] -= 1
+                self._serper_count += 1
+                dispatch.append(self._serper_one(i, query, results))
+            if not dispatch:
+                break
+            await asyncio.gather(*dispatch)
+            pending = capped
 
-            try:
-                async with httpx.AsyncClient(timeout=10) as client:
-                    response = await client.post(
-                        SERPER_URL,
-                        headers={
-                            "X-API-KEY": SERPER_API_KEY,
-                            "Content-Type": "application/json"
-                        },
-                        json={"q": query, "num": 10},
-                    )
-                    response.raise_for_status()
-                    results.append(response.json())
-                    self._serper_count += 1
-                await asyncio.sleep(0.3)  # rate limit courtesy — non-blocking
-            except Exception as e:
-                logger.error(f"Serper query failed: '{query}' — {e}")
-                results.append({})
-
+        if capped and not self._cap_hit:
+            self._cap_hit = True
+            logger.warning(f"Serper cap hit ({self._serper_cap}) for {self.district_name} — remaining queries skipped")
         return results
 
+    async def _serper_one(self, i: int, query: str, results: list[dict]):
+        """Send one budgeted Serper query into results[i]; refund the budget on failure."""
+        try:
+            await serper_limiter.acquire()
+            response = await self._client().post(
+                SERPER_URL,
+                stats=self._conn_stats,
+                headers={
+                    "X-API-KEY": SERPER_API_KEY,
+                    "Content-Type": "application/json"
+                },
+                json={"q": query, "num": 10},
+                timeout=10,
+            )
+            response.raise_for_status()
+            research_trace.record(serper=1)
+            results[i] = response.json()
+            serper_cache.put(query, results[i], "research_engine", num=10)
+        except Exception as e:
+            self._serper_count -= 1
+            logger.error(f"Serper query failed: '{query}' — {e}")
+
+    def _client(self) -> ResearchHTTP:
+        """Shared pooled client; opens a job-owned one when run outside the queue."""
+        if self._http is None:
+            self._http = ResearchHTTP()
+            self._owns_http = True
+        return self._http
+
+    def _count_layer_pages(self, pages: list[tuple[str, str]], *fields: str):
+        """Trace bookkeeping: add each page to its layer's counters (by L<n> prefix)."""
+        for url, _ in pages:
+            prefix = self._url_to_layer.get(url, "unknown").split(":")[0]
+            counts = self._layer_pages.setdefault(prefix, {"pages": 0, "kept": 0})
+            for field in fields:
+                counts[field] += 1
+
     def _add_raw_from_serper(self, results: list[dict], layer_tag: str = ""):
         """Extract snippet text from Serper results and add to raw_pages."""
         for result in results:
@@ -1650,21 +2005,44 @@ class ResearchJob:
 
     async def _fetch_page(self, url: str) -> str | None:
         """Fetch a web page and return its text content."""
-        try:
-            async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-                response = await client.get(url, headers=HEADERS)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, "html.parser")
+        content, _ = await self._fetch_page_cached(url)
+        return content
 
-                # Remove nav/footer/script noise
-                for tag in soup(["script", "style", "nav", "footer", "header"]):
-                    tag.decompose()
+    async def _fetch_page_cached(self, url: str) -> tuple[str | None, bool]:
+        """Page text via the shared page cache. Returns (text, made_request).
 
-                text = soup.get_text(separator="\n", strip=True)
-                return text[:15000]  # cap per page
+        Within the job's freshness window the stored text is returned with no
+        request. Otherwise a stored page is revalidated with a conditional GET;
+        on 304 the stored text is reused without parsing. Only a 200 is parsed.
+        """
+        entry = page_cache.get(url)
+        if page_cache.is_fresh(entry, self._page_freshness_seconds):
+            self._page_stats["fresh"] += 1
+            return entry["text"], False
+        try:
+            response = await self._client().get(
+                url, stats=self._conn_stats, timeout=10, follow_redirects=True,
+                headers={**HEADERS, **page_cache.conditional_headers(entry)},
+            )
+            if response.status_code == 304 and entry:
+                page_cache.touch(url, entry)
+                self._page_stats["revalidated"] += 1
+                return entry["text"], True
+            response.raise_for_status()
+            soup = BeautifulSoup(response.text, "html.parser")
+
+            # Remove nav/footer/script noise
+            for tag in soup(["script", "style", "nav", "footer", "header"]):
+                tag.decompose()
+
+            text = soup.get_text(separator="\n", strip=True)[:15000]  # cap per page
+            page_cache.put(url, text, response.headers)
+            self._page_stats["fetched"] += 1
+            return text, True
         except Exception as e:
             logger.debug(f"Fetch failed for {url}: {e}")
-            return None
+            self._page_stats["failed"] += 1
+            return None, True
 
     def _discover_links(self, soup: BeautifulSoup, base_url: str, crawled: set):
         """Find same-domain links in a page and add to crawled tracking."""
@@ -1747,18 +2125,41 @@ class ResearchJob:
 
 class ResearchQueue:
     """
-    Single-job-at-a-time queue for research jobs.
-    Prevents parallel jobs from hammering Serper API and ensures maximum depth.
+    Multi-worker queue for research jobs.
+
+    Up to RESEARCH_QUEUE_WORKERS jobs run at once. Provider spend and rate are
+    governed globally by the per-provider limiters in tools/research_http
+    (Serper, Exa, Firecrawl, Brave, Anthropic) and each job's Serper cap, so
+    running jobs side by side overlaps their network wait without exceeding
+    any API's limits. RESEARCH_QUEUE_WORKERS=1 restores one-at-a-time.
+
+    Two lanes: PRIORITY_INTERACTIVE (ad-hoc Telegram research, the default)
+    is always dequeued before PRIORITY_BULK (batches, prospect approvals);
+    FIFO within a lane.
+
+    The workers share one pooled ResearchHTTP client, opened by the first
+    worker to start and closed by the last one out, so consecutive and
+    concurrent jobs reuse warm Serper / district-site connections.
+
+    Every job checkpoints after each phase (tools/research_checkpoint); call
+    resume_interrupted() at startup to re-enqueue jobs a crash or redeploy cut
+    short. They continue from their last completed phase.
     """
 
-    def __init__(self):
-        self._queue: asyncio.Queue = asyncio.Queue()
-        self._current_job: str | None = None
-        self._running = False
+    def __init__(self, workers: int = RESEARCH_QUEUE_WORKERS):
+        self.workers = max(1, workers)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._in_flight: dict[int, dict] = {}  # seq → {district_name, state, priority, started}
+        self._workers: set[asyncio.Task] = set()  # strong refs to running worker tasks
+        self._live_workers = 0  # workers not yet past their drain loop
+        self._durations: collections.deque = collections.deque(maxlen=20)
+        self._active_ids: set[str] = set()  # checkpoint job_ids queued or running
+        self._http: ResearchHTTP | None = None
 
     @property
     def is_busy(self) -> bool:
-        return self._current_job is not None
+        return bool(self._in_flight)
 
     @property
     def queue_size(self) -> int:
@@ -1766,7 +2167,48 @@ class ResearchQueue:
 
     @property
     def current_job(self) -> str | None:
-        return self._current_job
+        """In-flight district names, comma-joined (None when idle)."""
+        names = [j["district_name"] for j in self._in_flight.values()]
+        return ", ".join(names) if names else None
+
+    @property
+    def in_flight(self) -> list[dict]:
+        """Running jobs, oldest first: {district_name, state, priority, elapsed_seconds}."""
+        now = time.monotonic()
+        return [
+            {
+                "district_name": j["district_name"],
+                "state": j["state"],
+                "priority": j["priority"],
+                "elapsed_seconds": int(now - j["started"]),
+            }
+            for j in self._in_flight.values()
+        ]
+
+    @property
+    def eta_seconds(self) -> int:
+        """Estimated seconds until every running and queued job is done.
+
+        Uses the mean duration of recent jobs (RESEARCH_JOB_ETA_SECONDS until
+        one has finished), assigning queued jobs to whichever worker frees up
+        first.
+        """
+        avg = (sum(self._durations) / len(self._durations)) if self._durations else RESEARCH_JOB_ETA_SECONDS
+        free_at = [max(0.0, avg - j["elapsed_seconds"]) for j in self.in_flight]
+        free_at += [0.0] * max(0, self.workers - len(free_at))
+        heapq.heapify(free_at)
+        for _ in range(self.queue_size):
+            heapq.heappush(free_at, heapq.heappop(free_at) + avg)
+        return int(max(free_at)) if (self._in_flight or self.queue_size) else 0
+
+    def status(self) -> dict:
+        """Snapshot for /research status: in-flight jobs, queue depth, ETA."""
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queue_size,
+            "eta_seconds": self.eta_seconds,
+        }
 
     async def enqueue(
         self,
@@ -1775,11 +2217,21 @@ class ResearchQueue:
         progress_callback,
         completion_callback,
         serper_cap_override: int = None,
+        page_freshness_hours: float | None = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        context: dict | None = None,
+        force_all_layers: bool = False,
     ):
         """
         Add a job to the queue.
         completion_callback(result: dict) is called when done.
         serper_cap_override: if set, overrides SERPER_REQUESTS_PER_JOB for this job.
+        page_freshness_hours: if set, overrides PAGE_CACHE_FRESHNESS_HOURS for this
+        job (0 → revalidate every cached district page).
+        force_all_layers: run every layer, ignoring the research_planner's skips.
+        priority: PRIORITY_INTERACTIVE (default) jumps ahead of PRIORITY_BULK.
+        context: JSON-safe caller data kept in the job's checkpoint, so
+        resume_interrupted() can rebuild the right completion callback.
 
         BUG 4 Session 56: if district_name canonicalizes into DIOCESAN_DOMAIN_MAP,
         the job automatically activates the diocesan research playbook. Lazy
@@ -1793,25 +2245,84 @@ class ResearchQueue:
         except Exception as e:
             logger.debug(f"DIOCESAN_DOMAIN_MAP lookup failed for {district_name!r}: {e}")
 
-        await self._queue.put({
+        await self._submit({
             "district_name": district_name,
             "state": state,
-            "progress_callback": progress_callback,
-            "completion_callback": completion_callback,
             "serper_cap_override": serper_cap_override,
+            "page_freshness_hours": page_freshness_hours,
+            "force_all_layers": force_all_layers,
             "diocesan_domain": diocesan_domain,
             "diocesan_playbook": bool(diocesan_domain),
-        })
+            "priority": priority,
+            "context": context,
+        }, progress_callback, completion_callback)
+
+    async def resume_interrupted(self, progress_callback, completion_for) -> list[str]:
+        """
+        Re-enqueue every job with a checkpoint on disk (interrupted by a crash
+        or redeploy). Each resumes after its last completed phase.
+        completion_for(context) returns the completion callback for a job's
+        saved context. Returns the resumed district names.
+        """
+        resumed = []
+        for checkpoint in research_checkpoint.pending():
+            params = checkpoint.get("params") or {}
+            if checkpoint["job_id"] in self._active_ids or not params.get("district_name"):
+                continue
+            await self._submit(params, progress_callback, completion_for(params.get("context")),
+                               resume=checkpoint)
+            resumed.append(params["district_name"])
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} interrupted research jobs: {', '.join(resumed)}")
+        return resumed
+
+    async def _submit(self, params: dict, progress_callback, completion_callback, resume: dict | None = None):
+        """Queue a job built from JSON-safe params (+ its callbacks) and start a worker if needed."""
+        if resume is None:
+            params["run_id"] = params.get("run_id") or research_checkpoint.new_run_id()
+        jid = resume["job_id"] if resume else research_checkpoint.job_id(
+            params["district_name"], params["state"], params["run_id"])
+        priority = params.get("priority", PRIORITY_INTERACTIVE)
+        self._active_ids.add(jid)
+        await self._queue.put((priority, next(self._seq), {
+            **params,
+            "progress_callback": progress_callback,
+            "completion_callback": completion_callback,
+            "checkpoint": resume or {"job_id": jid, "params": params},
+        }))
 
-        if not self._running:
-            asyncio.create_task(self._worker())
+        if self._live_workers < self.workers:
+            self._live_workers += 1
+            task = asyncio.create_task(self._worker())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
 
     async def _worker(self):
-        """Process jobs one at a time."""
-        self._running = True
+        """Drain the queue; the first worker opens the shared pool, the last closes it.
+
+        _live_workers (incremented by _submit) is decremented here, before the
+        close check — the task set is only updated by a done-callback, after
+        this returns, so it can't tell which worker is last out."""
+        if self._http is None:
+            self._http = ResearchHTTP()
+        try:
+            await self._drain()
+        finally:
+            self._live_workers -= 1
+            if self._live_workers == 0 and self._http is not None:
+                http, self._http = self._http, None
+                await http.aclose()
+
+    async def _drain(self):
+        """Take jobs (interactive lane first) until the queue is empty."""
         while not self._queue.empty():
-            job = await self._queue.get()
-            self._current_job = job["district_name"]
+            _, seq, job = self._queue.get_nowait()
+            self._in_flight[seq] = {
+                "district_name": job["district_name"],
+                "state": job["state"],
+                "priority": job["priority"],
+                "started": time.monotonic(),
+            }
             start_time = asyncio.get_running_loop().time()
 
             # Heartbeat: send a "still working" ping every 60 seconds
@@ -1839,10 +2350,18 @@ class ResearchQueue:
                     serper_cap_override=job.get("serper_cap_override"),
                     diocesan_domain=job.get("diocesan_domain", ""),
                     diocesan_playbook=job.get("diocesan_playbook", False),
+                    http=self._http,
+                    page_freshness_hours=job.get("page_freshness_hours"),
+                    force_all_layers=job.get("force_all_layers", False),
+                    checkpoint=job["checkpoint"],
                 )
                 result = await engine.run()
                 await job["completion_callback"](result)
+                research_checkpoint.clear(job["checkpoint"]["job_id"])
             except Exception as e:
+                # A failed job is not resumed (it would fail again on every
+                # restart); only process death leaves a checkpoint behind.
+                research_checkpoint.clear(job["checkpoint"]["job_id"])
                 logger.error(f"Research job failed for {job['district_name']}: {e}")
                 if job["progress_callback"]:
                     await job["progress_callback"](
@@ -1850,11 +2369,12 @@ class ResearchQueue:
                     )
             finally:
                 heartbeat_task.cancel()
-                self._current_job = None
+                started = self._in_flight.pop(seq)["started"]
+                self._durations.append(time.monotonic() - started)
+                jid = job["checkpoint"]["job_id"]
+                self._active_ids.discard(jid)
                 self._queue.task_done()
 
-        self._running = False
-
 
     async def enqueue_batch(
         self,
@@ -1863,7 +2383,7 @@ class ResearchQueue:
         completion_callback,
     ):
         """
-        Queue multiple research jobs. Each processes sequentially.
+        Queue multiple research jobs in the bulk lane (behind any ad-hoc research).
         Each target dict: {district_name, state (optional)}
         """
         for target in targets:
@@ -1872,6 +2392,7 @@ class ResearchQueue:
                 state=target.get("state", ""),
                 progress_callback=progress_callback,
                 completion_callback=completion_callback,
+                priority=PRIORITY_BULK,
             )
 
 
@@ -0,0 +1,187 @@
+"""
+tools/research_http.py — Shared pooled async HTTP client for the research engine.
+
+One ResearchHTTP wraps one httpx.AsyncClient with keep-alive and a bounded
+connection pool, so Serper calls, district page fetches and Brave searches
+reuse warm TLS connections instead of handshaking per request. HTTP/2 is
+negotiated when the optional `h2` package is installed (httpx[http2]);
+otherwise the pool speaks HTTP/1.1 keep-alive.
+
+Per-host limit: at most RESEARCH_HTTP_PER_HOST requests in flight to any one
+host, so a deep crawl of a district site can't monopolize the pool (or the
+district's web server) while Serper traffic waits.
+
+Connection reuse is measured with httpcore's trace hook: a request that opens
+a TCP connection counts as "new", anything else rode an existing connection.
+Callers pass a ConnectionStats to attribute requests to a job. Response bytes
+go to the active research_trace span (the layer making the request).
+
+Rate limits: TokenBucket is a shared async limiter. One bucket per provider
+(serper_limiter, exa_limiter, firecrawl_limiter, brave_limiter,
+anthropic_limiter) paces every call from every concurrent layer and job to
+that provider's plan limit (<PROVIDER>_RATE_PER_MINUTE), with a small burst so
+a batch can start immediately. These — not one-job-at-a-time — are what keep a
+multi-worker ResearchQueue inside each API's limits.
+
+Lifetime: ResearchQueue opens one client when its worker starts and closes it
+when the queue drains. A ResearchJob run outside the queue (scripts, tests)
+opens its own and closes it at the end of run().
+
+Usage:
+  http = ResearchHTTP()
+  stats = ConnectionStats()
+  resp = await http.request("POST", SERPER_URL, stats=stats, json={...})
+  await http.aclose()
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import httpx
+
+import tools.research_trace as research_trace
+
+RESEARCH_HTTP_MAX_CONNECTIONS = int(os.environ.get("RESEARCH_HTTP_MAX_CONNECTIONS", "40"))
+RESEARCH_HTTP_PER_HOST = int(os.environ.get("RESEARCH_HTTP_PER_HOST", "6"))
+RESEARCH_HTTP_KEEPALIVE_SECONDS = 30.0
+RESEARCH_HTTP_TIMEOUT = 15.0
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+SERPER_RATE_PER_MINUTE = float(os.environ.get("SERPER_RATE_PER_MINUTE", "60"))
+SERPER_BURST = 10
+EXA_RATE_PER_MINUTE = float(os.environ.get("EXA_RATE_PER_MINUTE", "120"))
+FIRECRAWL_RATE_PER_MINUTE = float(os.environ.get("FIRECRAWL_RATE_PER_MINUTE", "60"))
+BRAVE_RATE_PER_MINUTE = float(os.environ.get("BRAVE_RATE_PER_MINUTE", "60"))
+ANTHROPIC_RATE_PER_MINUTE = float(os.environ.get("ANTHROPIC_RATE_PER_MINUTE", "50"))
+
+
+class TokenBucket:
+    """Token-bucket limiter: `rate_per_minute` sustained, up to `burst` at once.
+
+    acquire() reserves a token immediately (the balance may go negative) and
+    sleeps until that token would have accrued, so waiters are served in call
+    order. Holds no asyncio primitives, so one bucket can be shared across
+    event loops (queue worker, scripts, tests) and threads.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; return seconds to wait before using it (0 if available now)."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Shared by every ResearchJob in the process
+serper_limiter = TokenBucket(SERPER_RATE_PER_MINUTE, burst=SERPER_BURST)
+exa_limiter = TokenBucket(EXA_RATE_PER_MINUTE, burst=4)
+firecrawl_limiter = TokenBucket(FIRECRAWL_RATE_PER_MINUTE, burst=4)
+brave_limiter = TokenBucket(BRAVE_RATE_PER_MINUTE, burst=1)
+anthropic_limiter = TokenBucket(ANTHROPIC_RATE_PER_MINUTE, burst=5)
+
+
+class ConnectionStats:
+    """Per-job request counters: how many requests reused a pooled connection."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+
+    @property
+    def reused(self) -> int:
+        return self.requests - self.new_connections
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+
+class ResearchHTTP:
+    """Pooled httpx.AsyncClient with a per-host concurrency cap and reuse tracking."""
+
+    def __init__(self, max_connections: int = RESEARCH_HTTP_MAX_CONNECTIONS,
+                 per_host: int = RESEARCH_HTTP_PER_HOST,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=RESEARCH_HTTP_KEEPALIVE_SECONDS,
+        )
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE and transport is None,
+            limits=limits,
+            timeout=RESEARCH_HTTP_TIMEOUT,
+            transport=transport,
+        )
+        self._per_host = max(1, per_host)
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self.totals = ConnectionStats()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        sem = self._host_slots.get(host)
+        if sem is None:
+            sem = self._host_slots[host] = asyncio.Semaphore(self._per_host)
+        return sem
+
+    async def request(self, method: str, url: str, stats: ConnectionStats | None = None,
+                      **kwargs) -> httpx.Response:
+        """Send one request through the pool. Response body is read before returning."""
+        opened = False
+
+        async def _trace(event: str, info: dict):
+            nonlocal opened
+            if event == "connection.connect_tcp.started":
+                opened = True
+
+        extensions = dict(kwargs.pop("extensions", None) or {})
+        extensions["trace"] = _trace
+        async with self._slot(url):
+            try:
+                response = await self._client.request(method, url, extensions=extensions, **kwargs)
+                research_trace.record(bytes_fetched=len(response.content))
+                return response
+            finally:
+                for s in (self.totals, stats):
+                    if s is not None:
+                        s.requests += 1
+                        s.new_connections += opened
+
+    async def get(self, url: str, stats: ConnectionStats | None = None, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, stats=stats, **kwargs)
+
+    async def post(self, url: str, stats: ConnectionStats | None = None, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, stats=stats, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
@@ -0,0 +1,352 @@
+"""
+tools/research_planner.py — Per-district layer plan learned from past job traces.
+
+Every research job writes a trace (tools/research_trace) whose header carries
+the district's planner features — enrollment size bucket, state, domain type —
+and whose spans record how many final contacts each layer contributed. The
+planner turns recent traces into a per-layer expected marginal yield
+(mean contacts per run) for districts like this one, backing off from
+(size, state, domain type) to coarser keys until a key has at least
+PLANNER_MIN_SAMPLES runs of the layer:
+
+  expected < PLANNER_SKIP_BELOW     → skip the layer
+  expected < PLANNER_REDUCE_BELOW   → cap its Serper queries at
+                                      PLANNER_REDUCE_FACTOR × its usual count
+
+Core layers (domain discovery, pattern inference, extraction, dedup,
+verification) always run. A skipped layer still runs with probability
+PLANNER_EXPLORE_RATE so its yield keeps being measured. ResearchJob plans
+twice: before Phase A (domain type not yet known) and after Phase B.
+force_all=True (and the "keep digging" path) runs the fixed pipeline.
+
+projected_savings() replays the planner over recent traces and reports the
+cost, wall time and contacts it would have saved / lost against the fixed
+20-layer pipeline; /research_stats appends it.
+
+Usage (module-level, not a class):
+  import tools.research_planner as research_planner
+  feats = research_planner.features("Austin ISD", "TX", "www.austinisd.org")
+  p = research_planner.plan(feats)          # {"skip": {...}, "reduce": {...}, ...}
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+import tools.research_trace as research_trace
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Kill switch — set RESEARCH_PLANNER=0 to run every layer for every district
+# (features are still written to traces, so the planner can be re-enabled later)
+ENABLE_RESEARCH_PLANNER = os.environ.get("RESEARCH_PLANNER", "1") != "0"
+
+PLANNER_HISTORY_JOBS = 200            # traces the model is built from
+PLANNER_MIN_SAMPLES = int(os.environ.get("RESEARCH_PLANNER_MIN_SAMPLES", "8"))
+PLANNER_SKIP_BELOW = float(os.environ.get("RESEARCH_PLANNER_SKIP_BELOW", "0.1"))      # contacts/run
+PLANNER_REDUCE_BELOW = float(os.environ.get("RESEARCH_PLANNER_REDUCE_BELOW", "0.5"))  # contacts/run
+PLANNER_REDUCE_FACTOR = 0.5
+PLANNER_EXPLORE_RATE = 0.1
+PLANNER_MODEL_TTL_SECONDS = 600
+
+# Never skipped or down-budgeted: later layers depend on them, and their value
+# (domain, pattern, verification) isn't measured by the contacts they source
+CORE_LAYERS = frozenset({"L4", "L8", "L9", "L10", "L15"})
+
+# Phases whose layers run side by side (wall time = slowest layer)
+PARALLEL_PHASES = frozenset({"A", "C"})
+
+# Enrollment upper bounds for the size buckets; above the last → "large"
+SIZE_BUCKETS = ((2_500, "small"), (25_000, "medium"))
+
+ANY = "*"
+
+_model_lock = threading.Lock()
+_model_cache: dict = {"built_at": 0.0, "model": None}
+
+
+# ─────────────────────────────────────────────
+# FEATURES
+# ─────────────────────────────────────────────
+
+def size_bucket(enrollment: int) -> str:
+    if enrollment <= 0:
+        return "unknown"
+    for ceiling, bucket in SIZE_BUCKETS:
+        if enrollment < ceiling:
+            return bucket
+    return "large"
+
+
+def district_enrollment(district_name: str, state: str) -> int:
+    """NCES enrollment from the district's territory snapshot partition (0 if the
+    snapshot has no such district). Reads the persisted columns directly, so the
+    answer doesn't depend on whether this process has loaded the territory index
+    yet, and never falls back to Sheets — a research job must not pay for a
+    territory load."""
+    state = (state or "").strip().upper()
+    if not state:
+        return 0
+    try:
+        import tools.csv_importer as csv_importer
+        import tools.territory_snapshot as territory_snapshot
+        table = territory_snapshot.read_table("districts", state)
+        if table is None or not table.rows:
+            return 0
+        target = csv_importer.normalize_name(district_name)
+        names = table.strings("District Name")
+        keys = table.strings("Name Key") if "Name Key" in table.columns else [""] * table.rows
+        for i, key in enumerate(keys):
+            if (key.strip().lower() or csv_importer.normalize_name(names[i])) == target:
+                return table.column("Enrollment")[i] or 0
+    except Exception as e:
+        logger.debug(f"research_planner: enrollment lookup failed for {district_name!r}: {e}")
+    return 0
+
+
+def domain_type(domain: str) -> str:
+    """Coarse class of a district domain: k12 / us / edu / org / com / other / none."""
+    host = (domain or "").strip().lower().split(":")[0]
+    if not host:
+        return "none"
+    if ".k12." in f".{host}":
+        return "k12"
+    for suffix, kind in ((".us", "us"), (".edu", "edu"), (".org", "org"),
+                         (".com", "com"), (".net", "com")):
+        if host.endswith(suffix):
+            return kind
+    return "other"
+
+
+def features(district_name: str, state: str, domain: str | None = None) -> dict:
+    """Planner key for a district. domain=None → not discovered yet (wildcard);
+    enrollment not in the snapshot → size left out of the key (wildcard)."""
+    enrollment = district_enrollment(district_name, state)
+    return {
+        "size": size_bucket(enrollment) if enrollment > 0 else ANY,
+        "state": (state or "").strip().upper() or ANY,
+        "domain_type": ANY if domain is None else domain_type(domain),
+    }
+
+
+def _keys(feats: dict) -> list[str]:
+    """Backoff order, most specific first: (size, state, type) → (size, type) → (size) → all."""
+    size = feats.get("size", ANY)
+    state = feats.get("state", ANY)
+    dtype = feats.get("domain_type", ANY)
+    keys = []
+    for key in ((size, state, dtype), (size, ANY, dtype), (size, ANY, ANY), (ANY, ANY, ANY)):
+        key = "|".join(key)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+# ─────────────────────────────────────────────
+# MODEL
+# ─────────────────────────────────────────────
+
+def build_model(traces: list[dict]) -> dict:
+    """
+    {key: {"L<n>": {runs, contacts, cost_usd, wall_ms, serper, phase}}} summed over
+    traces. Each trace counts toward every generalization of its features
+    (8 keys), so any backoff level can be looked up directly. Traces written
+    before features were recorded only count toward the global key.
+    """
+    model: dict[str, dict] = {}
+    for trace in traces:
+        job = trace.get("job") or {}
+        size, state, dtype = (job.get(f) for f in ("size", "state", "domain_type"))
+        if size and state and dtype:
+            keys = {"|".join((a, b, c)) for a in (size, ANY) for b in (state, ANY) for c in (dtype, ANY)}
+        else:
+            keys = {"|".join((ANY, ANY, ANY))}
+        for span in trace.get("spans", []):
+            prefix = span.get("layer", "").split(":")[0]
+            if not prefix:
+                continue
+            for key in keys:
+                row = model.setdefault(key, {}).setdefault(prefix, {
+                    "runs": 0, "contacts": 0, "cost_usd": 0.0, "wall_ms": 0, "serper": 0,
+                    "phase": span.get("phase", ""),
+                })
+                row["runs"] += 1
+                row["contacts"] += span.get("contacts", 0)
+                row["cost_usd"] += span.get("cost_usd", research_trace.span_cost(span))
+                row["wall_ms"] += span.get("wall_ms", 0)
+                row["serper"] += span.get("serper", 0)
+    return model
+
+
+def get_model() -> dict:
+    """Model over the most recent PLANNER_HISTORY_JOBS traces, rebuilt every PLANNER_MODEL_TTL_SECONDS."""
+    with _model_lock:
+        if (_model_cache["model"] is None
+                or time.time() - _model_cache["built_at"] > PLANNER_MODEL_TTL_SECONDS):
+            _model_cache["model"] = build_model(research_trace.load_recent(PLANNER_HISTORY_JOBS))
+            _model_cache["built_at"] = time.time()
+        return _model_cache["model"]
+
+
+def invalidate():
+    """Drop the cached model (next plan() re-reads the traces)."""
+    with _model_lock:
+        _model_cache["model"] = None
+
+
+def layer_estimate(model: dict, feats: dict, prefix: str) -> dict | None:
+    """Per-run means for one layer at the most specific key with enough runs, else None."""
+    for key in _keys(feats):
+        row = model.get(key, {}).get(prefix)
+        if row and row["runs"] >= PLANNER_MIN_SAMPLES:
+            runs = row["runs"]
+            return {
+                "basis": key,
+                "samples": runs,
+                "expected_contacts": row["contacts"] / runs,
+                "cost_usd": row["cost_usd"] / runs,
+                "wall_ms": row["wall_ms"] / runs,
+                "serper": row["serper"] / runs,
+                "phase": row["phase"],
+            }
+    return None
+
+
+# ─────────────────────────────────────────────
+# PLANNING
+# ─────────────────────────────────────────────
+
+def plan(feats: dict, force_all: bool = False, model: dict | None = None, rng=random.random) -> dict:
+    """
+    Layer plan for one district:
+      {"skip": {prefix: estimate}, "reduce": {prefix: estimate + serper_budget},
+       "explore": [prefix, ...], "projected_savings": {cost_usd, wall_seconds, contacts_at_risk}}
+    Empty (fixed pipeline) when disabled, forced, or no layer has enough history.
+    """
+    empty = {"skip": {}, "reduce": {}, "explore": [],
+             "projected_savings": {"cost_usd": 0.0, "wall_seconds": 0.0, "contacts_at_risk": 0.0}}
+    if force_all or not ENABLE_RESEARCH_PLANNER:
+        return empty
+    model = get_model() if model is None else model
+    prefixes = {p for rows in model.values() for p in rows} - CORE_LAYERS
+
+    skip, reduce, explore = {}, {}, []
+    estimates = {}
+    for prefix in sorted(prefixes, key=research_trace._layer_sort_key):
+        est = layer_estimate(model, feats, prefix)
+        if est is None:
+            continue
+        estimates[prefix] = est
+        if est["expected_contacts"] < PLANNER_SKIP_BELOW:
+            if rng() < PLANNER_EXPLORE_RATE:
+                explore.append(prefix)
+            else:
+                skip[prefix] = est
+        elif est["expected_contacts"] < PLANNER_REDUCE_BELOW:
+            budget = max(1, int(est["serper"] * PLANNER_REDUCE_FACTOR))
+            if budget < est["serper"]:
+                reduce[prefix] = {**est, "serper_budget": budget}
+
+    # Wall time: parallel phases only get faster if their slowest layer goes
+    by_phase: dict[str, list[tuple[str, float]]] = {}
+    for prefix, est in estimates.items():
+        by_phase.setdefault(est["phase"], []).append((prefix, est["wall_ms"]))
+    wall_saved = sum(_phase_wall(phase, rows) - _phase_wall(phase, [r for r in rows if r[0] not in skip])
+                     for phase, rows in by_phase.items())
+    cost_saved = (sum(est["cost_usd"] for est in skip.values())
+                  + sum((est["serper"] - est["serper_budget"]) * research_trace.SERPER_PER_QUERY
+                        for est in reduce.values()))
+    return {
+        "skip": skip,
+        "reduce": reduce,
+        "explore": explore,
+        "projected_savings": {
+            "cost_usd": round(cost_saved, 4),
+            "wall_seconds": round(wall_saved / 1000, 1),
+            "contacts_at_risk": round(sum(est["expected_contacts"] for est in skip.values()), 2),
+        },
+    }
+
+
+def _phase_wall(phase: str, rows: list[tuple[str, float]]) -> float:
+    walls = [wall for _, wall in rows]
+    if not walls:
+        return 0.0
+    return max(walls) if phase in PARALLEL_PHASES else sum(walls)
+
+
+# ─────────────────────────────────────────────
+# REPORTING
+# ─────────────────────────────────────────────
+
+def projected_savings(limit: int = PLANNER_HISTORY_JOBS) -> dict:
+    """
+    Replay the planner (no exploration) over the most recent `limit` traces
+    against the fixed pipeline each of them ran: {"jobs", "baseline_cost_usd",
+    "cost_saved_usd", "baseline_wall_seconds", "wall_saved_seconds",
+    "contacts", "contacts_at_risk", "layers_skipped": {prefix: jobs}}.
+    In-sample: the model is built from the same traces it is replayed on.
+    Jobs the planner already trimmed are compared as run (their savings are
+    not counted again).
+    """
+    traces = research_trace.load_recent(limit)
+    model = build_model(traces)
+    out = {"jobs": len(traces), "baseline_cost_usd": 0.0, "cost_saved_usd": 0.0,
+           "baseline_wall_seconds": 0.0, "wall_saved_seconds": 0.0,
+           "contacts": 0, "contacts_at_risk": 0, "layers_skipped": {}}
+    if not ENABLE_RESEARCH_PLANNER:
+        return {**out, "jobs": 0}
+    for trace in traces:
+        job = trace.get("job") or {}
+        feats = {f: job.get(f) or ANY for f in ("size", "state", "domain_type")}
+        decided = plan(feats, model=model, rng=lambda: 1.0)
+
+        by_phase: dict[str, list[tuple[str, float]]] = {}
+        for span in trace["spans"]:
+            prefix = span.get("layer", "").split(":")[0]
+            cost = span.get("cost_usd", research_trace.span_cost(span))
+            by_phase.setdefault(span.get("phase", ""), []).append((prefix, span.get("wall_ms", 0)))
+            out["baseline_cost_usd"] += cost
+            out["contacts"] += span.get("contacts", 0)
+            if prefix in decided["skip"]:
+                out["cost_saved_usd"] += cost
+                out["contacts_at_risk"] += span.get("contacts", 0)
+                out["layers_skipped"][prefix] = out["layers_skipped"].get(prefix, 0) + 1
+            elif prefix in decided["reduce"]:
+                over = span.get("serper", 0) - decided["reduce"][prefix]["serper_budget"]
+                out["cost_saved_usd"] += max(0, over) * research_trace.SERPER_PER_QUERY
+        for phase, rows in by_phase.items():
+            full = _phase_wall(phase, rows)
+            out["baseline_wall_seconds"] += full / 1000
+            out["wall_saved_seconds"] += (full - _phase_wall(
+                phase, [r for r in rows if r[0] not in decided["skip"]])) / 1000
+    for key in ("baseline_cost_usd", "cost_saved_usd", "baseline_wall_seconds", "wall_saved_seconds"):
+        out[key] = round(out[key], 4)
+    return out
+
+
+def format_projected_savings(savings: dict) -> str:
+    """Telegram-ready planner section for /research_stats ("" when there's nothing to report)."""
+    jobs = savings.get("jobs", 0)
+    if not jobs:
+        return ""
+    pct = lambda part, whole: f"{100 * part / whole:.0f}%" if whole else "0%"  # noqa: E731
+    lines = [
+        f"🧭 *Layer planner* — replayed on {jobs} job(s)",
+        f"Cost ${savings['cost_saved_usd']:.2f} of ${savings['baseline_cost_usd']:.2f} saved "
+        f"({pct(savings['cost_saved_usd'], savings['baseline_cost_usd'])}), "
+        f"${savings['cost_saved_usd'] / jobs:.3f}/job",
+        f"Time {savings['wall_saved_seconds'] / jobs:.0f}s/job saved "
+        f"({pct(savings['wall_saved_seconds'], savings['baseline_wall_seconds'])})",
+        f"Contacts at risk: {savings['contacts_at_risk']} of {savings['contacts']}",
+    ]
+    if savings["layers_skipped"]:
+        skipped = sorted(savings["layers_skipped"].items(), key=lambda kv: research_trace._layer_sort_key(kv[0]))
+        lines.append("Skips: " + ", ".join(f"{prefix}×{n}" for prefix, n in skipped))
+    return "\n".join(lines)
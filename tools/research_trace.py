@@ -0,0 +1,233 @@
+"""
+tools/research_trace.py — Per-layer latency/cost spans for research jobs.
+
+ResearchJob wraps every layer in a span (_traced) and activates it in a
+contextvar, so the code doing the work — Serper dispatch, ResearchHTTP, Exa /
+Firecrawl / Brave call sites, contact_extractor's Claude calls (also on
+executor threads) — attributes its counts with record() without knowing which
+layer it runs under. Layers in one phase run concurrently; each gets its own
+span because asyncio.gather gives each its own task context.
+
+Span fields:
+  layer, phase, runs, wall_ms
+  serper, serper_cache_hits, exa, brave, firecrawl   (provider calls)
+  bytes_fetched
+  claude_calls, claude_input_tokens, claude_output_tokens
+  pages, pages_kept, pages_dropped   (raw pages the layer contributed / sent to Claude)
+  contacts                           (final contacts whose source page came from the layer)
+  cost_usd
+
+At the end of a job the spans are written as one JSONL trace:
+{RESEARCH_TRACE_DIR}/<YYYYMMDD-HHMMSS>_<job_id>.jsonl — a {"type": "job"}
+header line followed by one {"type": "span"} line per layer.
+
+research_stats() aggregates the most recent traces per layer (p50/p95
+latency, cost, contacts, yield per dollar); format_research_stats() renders
+it for the /research_stats Telegram command.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+RESEARCH_TRACE_DIR = os.environ.get("RESEARCH_TRACE_DIR", "/tmp/research_traces")
+
+# Kill switch — set RESEARCH_TRACES=0 to stop writing trace files (spans are
+# still collected and returned in the job result)
+ENABLE_RESEARCH_TRACES = os.environ.get("RESEARCH_TRACES", "1") != "0"
+
+RESEARCH_STATS_RECENT_JOBS = 50
+
+# Pricing (2026 rates). Claude Sonnet 4.6: $3/M input, $15/M output.
+CLAUDE_INPUT_PER_TOKEN = 3.0 / 1_000_000
+CLAUDE_OUTPUT_PER_TOKEN = 15.0 / 1_000_000
+SERPER_PER_QUERY = 0.001
+EXA_PER_QUERY = 0.005
+BRAVE_PER_QUERY = 0.005
+FIRECRAWL_PER_CALL = 0.01
+
+_COUNTERS = (
+    "serper", "serper_cache_hits", "exa", "brave", "firecrawl", "bytes_fetched",
+    "claude_calls", "claude_input_tokens", "claude_output_tokens",
+)
+
+_current: contextvars.ContextVar[dict | None] = contextvars.ContextVar("research_span", default=None)
+_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+# SPANS
+# ─────────────────────────────────────────────
+
+def new_span(layer: str, phase: str = "") -> dict:
+    span = {"layer": layer, "phase": phase, "runs": 0, "wall_ms": 0}
+    span.update({k: 0 for k in _COUNTERS})
+    return span
+
+
+def activate(span: dict) -> contextvars.Token:
+    return _current.set(span)
+
+
+def deactivate(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def current() -> dict | None:
+    """The active span (None outside a traced layer)."""
+    return _current.get()
+
+
+def record(**counts) -> None:
+    """Add counts to the active span (no-op outside a traced layer). Thread-safe."""
+    span = _current.get()
+    if span is None:
+        return
+    with _lock:
+        for key, value in counts.items():
+            span[key] = span.get(key, 0) + value
+
+
+def span_cost(span: dict) -> float:
+    return (
+        span.get("serper", 0) * SERPER_PER_QUERY
+        + span.get("exa", 0) * EXA_PER_QUERY
+        + span.get("brave", 0) * BRAVE_PER_QUERY
+        + span.get("firecrawl", 0) * FIRECRAWL_PER_CALL
+        + span.get("claude_input_tokens", 0) * CLAUDE_INPUT_PER_TOKEN
+        + span.get("claude_output_tokens", 0) * CLAUDE_OUTPUT_PER_TOKEN
+    )
+
+
+def provider_totals(spans: list[dict]) -> dict:
+    """Summed provider calls / tokens across spans (exact counts for cost reports)."""
+    return {k: sum(s.get(k, 0) for s in spans) for k in _COUNTERS}
+
+
+# ─────────────────────────────────────────────
+# TRACE FILES
+# ─────────────────────────────────────────────
+
+def write(job_id: str, header: dict, spans: list[dict]) -> str:
+    """Write one job's trace. Returns the path ("" if disabled or the write failed)."""
+    if not ENABLE_RESEARCH_TRACES:
+        return ""
+    path = os.path.join(RESEARCH_TRACE_DIR, f"{datetime.now():%Y%m%d-%H%M%S}_{job_id}.jsonl")
+    try:
+        os.makedirs(RESEARCH_TRACE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps({"type": "job", "written_at": time.time(), **header}) + "\n")
+            for span in spans:
+                f.write(json.dumps({"type": "span", **span}) + "\n")
+        os.replace(tmp, path)
+        return path
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Research trace write failed for {job_id}: {e}")
+        return ""
+
+
+def load_recent(limit: int = RESEARCH_STATS_RECENT_JOBS) -> list[dict]:
+    """Most recent traces, newest first: [{"job": header, "spans": [...]}]."""
+    try:
+        names = sorted((n for n in os.listdir(RESEARCH_TRACE_DIR) if n.endswith(".jsonl")), reverse=True)
+    except OSError:
+        return []
+    traces = []
+    for name in names[:limit]:
+        job, spans = {}, []
+        try:
+            with open(os.path.join(RESEARCH_TRACE_DIR, name), "r") as f:
+                for line in f:
+                    row = json.loads(line)
+                    if row.get("type") == "job":
+                        job = row
+                    elif row.get("type") == "span":
+                        spans.append(row)
+        except (OSError, ValueError):
+            continue
+        traces.append({"job": job, "spans": spans})
+    return traces
+
+
+# ─────────────────────────────────────────────
+# AGGREGATION
+# ─────────────────────────────────────────────
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _layer_sort_key(layer: str):
+    digits = "".join(ch for ch in layer.split(":")[0] if ch.isdigit())
+    return (int(digits) if digits else 999, layer)
+
+
+def research_stats(limit: int = RESEARCH_STATS_RECENT_JOBS) -> dict:
+    """
+    Per-layer aggregates over the most recent `limit` job traces:
+    {"jobs": N, "layers": {layer: {runs, p50_ms, p95_ms, cost_usd, contacts,
+    contacts_per_dollar, queries, pages, pages_kept}}, "total_cost_usd", "total_contacts"}.
+    """
+    traces = load_recent(limit)
+    by_layer: dict[str, list[dict]] = {}
+    for trace in traces:
+        for span in trace["spans"]:
+            by_layer.setdefault(span["layer"], []).append(span)
+
+    layers = {}
+    for layer in sorted(by_layer, key=_layer_sort_key):
+        spans = by_layer[layer]
+        walls = [s.get("wall_ms", 0) for s in spans]
+        cost = sum(s.get("cost_usd", span_cost(s)) for s in spans)
+        contacts = sum(s.get("contacts", 0) for s in spans)
+        layers[layer] = {
+            "runs": len(spans),
+            "p50_ms": _percentile(walls, 50),
+            "p95_ms": _percentile(walls, 95),
+            "cost_usd": round(cost, 4),
+            "contacts": contacts,
+            "contacts_per_dollar": round(contacts / cost, 1) if cost > 0 else None,
+            "queries": sum(s.get("serper", 0) + s.get("exa", 0) + s.get("brave", 0)
+                           + s.get("firecrawl", 0) for s in spans),
+            "pages": sum(s.get("pages", 0) for s in spans),
+            "pages_kept": sum(s.get("pages_kept", 0) for s in spans),
+        }
+    return {
+        "jobs": len(traces),
+        "layers": layers,
+        "total_cost_usd": round(sum(l["cost_usd"] for l in layers.values()), 4),
+        "total_contacts": sum(t["job"].get("total", 0) for t in traces),
+    }
+
+
+def format_research_stats(stats: dict) -> str:
+    """Telegram-ready /research_stats report."""
+    if not stats.get("jobs"):
+        return "📊 No research traces yet — stats appear after the next research job."
+    lines = [
+        f"📊 *Research layer stats* — last {stats['jobs']} job(s)",
+        f"Total cost ${stats['total_cost_usd']:.2f} · {stats['total_contacts']} contacts",
+        "",
+        "`layer        p50s  p95s   cost  cont  c/$`",
+    ]
+    for layer, row in stats["layers"].items():
+        per_dollar = "free" if row["contacts_per_dollar"] is None else f"{row['contacts_per_dollar']:.0f}"
+        lines.append(
+            f"`{layer[:11]:<11} {row['p50_ms'] / 1000:5.1f} {row['p95_ms'] / 1000:5.1f} "
+            f"{row['cost_usd']:6.2f} {row['contacts']:5d} {per_dollar:>4}`"
+        )
+    return "\n".join(lines)
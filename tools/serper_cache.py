@@ -0,0 +1,275 @@
+"""
+tools/serper_cache.py — Persistent, TTL-governed cache for Serper /search calls.
+
+Research jobs, signal scans, district discovery, call recaps and the enrichment
+scripts each hit Serper on their own, and many of their queries repeat across
+runs and days (the same state scans weekly, the same district re-researched).
+Every Serper call site goes through this module so a repeat query within its
+TTL is answered from disk: no spend, no network latency.
+
+Key: sha256 of the normalized query (lowercased, whitespace collapsed) plus the
+request params (num, tbs, gl, ...) — `"Austin ISD"  STEM` and `"austin isd" stem`
+share an entry; the same query with a different `num` or `tbs` does not.
+
+TTL is per query family (FAMILY_TTL_SECONDS), classified from the query:
+  recent    tbs=qdr:h|d|w|m date-restricted scans (RFP, leadership, ...)
+  email     a quoted email address (L15 verification)
+  linkedin  site:linkedin.com profile lookups
+  site      other site: searches (district staff pages)
+  web       everything else
+Callers may pass family= explicitly. Only successful responses are stored;
+errors are never cached. A response with no organic results (an email
+verification miss, a scan with nothing new) is a negative entry: it is kept
+for at most NEGATIVE_TTL_SECONDS whatever its family, so a contact or page
+that later becomes findable isn't hidden for the family's full TTL.
+
+Layout: {SERPER_CACHE_DIR}/ab/abcdef….json, one file per key, written
+atomically. Safe to share between processes; delete the directory to flush.
+SERPER_CACHE_DIR defaults to the persistent data volume (agent.config.DATA_DIR).
+
+Stats: hits / misses / stores per caller, in-process (stats()); shown in the
+/research_stats report (format_stats()) and logged by the bot's daily prune().
+prune() deletes expired entries — the bot runs it at startup and once a day.
+
+Usage (module-level, not a class):
+  import tools.serper_cache as serper_cache
+  data = serper_cache.search(query, "signal_processor.scan_rfp_opportunities",
+                             api_key=SERPER_API_KEY, num=10, tbs="qdr:m")
+  if not data.from_cache:
+      time.sleep(0.5)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import httpx
+
+from agent.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+SERPER_URL = "https://google.serper.dev/search"
+
+SERPER_CACHE_DIR = os.environ.get("SERPER_CACHE_DIR", os.path.join(DATA_DIR, "serper_cache"))
+
+# Kill switch — set SERPER_CACHE=0 to always go to the network (and store nothing)
+ENABLE_SERPER_CACHE = os.environ.get("SERPER_CACHE", "1") != "0"
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+FAMILY_TTL_SECONDS = {
+    "recent": 12 * _HOUR,   # date-restricted news scans: new results daily
+    "email": 30 * _DAY,     # a published address rarely disappears
+    "linkedin": 14 * _DAY,
+    "site": 7 * _DAY,       # district staff pages change a few times a year
+    "web": 3 * _DAY,
+}
+
+# Cap for responses with no organic results (see module docstring)
+NEGATIVE_TTL_SECONDS = 1 * _DAY
+
+# prune() leaves in-flight *.tmp writes alone; older ones are from dead writers
+_STALE_TMP_SECONDS = _HOUR
+
+_EMAIL_QUERY_RE = re.compile(r'"[^"\s@]+@[^"\s@]+\.[a-z]{2,}"', re.I)
+_SITE_RE = re.compile(r"(?:^|[\s(])site:(\S+)")  # positive site: only, not -site:
+
+_stats: dict[str, dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+class SerperResponse(dict):
+    """Serper JSON response; from_cache tells callers whether to pace the next call."""
+
+    from_cache = False
+
+
+# ─────────────────────────────────────────────
+# KEYS + POLICY
+# ─────────────────────────────────────────────
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").split()).lower()
+
+
+def query_family(query: str, params: dict | None = None) -> str:
+    """TTL family for a query (see module docstring)."""
+    q = normalize_query(query)
+    tbs = str((params or {}).get("tbs", ""))
+    if tbs.startswith("qdr:") and tbs != "qdr:y":
+        return "recent"
+    if _EMAIL_QUERY_RE.search(q):
+        return "email"
+    sites = _SITE_RE.findall(q)
+    if any(s.startswith("linkedin.com") for s in sites):
+        return "linkedin"
+    if sites:
+        return "site"
+    return "web"
+
+
+def cache_key(query: str, params: dict | None = None) -> str:
+    payload = {"q": normalize_query(query), **{k: v for k, v in (params or {}).items() if v is not None}}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(SERPER_CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _entry_ttl(entry: dict, family: str | None = None) -> float:
+    ttl = FAMILY_TTL_SECONDS.get(family or entry.get("family"), FAMILY_TTL_SECONDS["web"])
+    return min(ttl, NEGATIVE_TTL_SECONDS) if entry.get("negative") else ttl
+
+
+def _count(caller: str, field: str):
+    with _stats_lock:
+        entry = _stats.setdefault(caller or "unknown", {"hits": 0, "misses": 0, "stores": 0})
+        entry[field] += 1
+
+
+# ─────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────
+
+def get(query: str, caller: str, family: str | None = None, **params) -> SerperResponse | None:
+    """Cached response for (query, params) if present and within its family TTL."""
+    if not ENABLE_SERPER_CACHE:
+        return None
+    family = family or query_family(query, params)
+    try:
+        with open(_path(cache_key(query, params)), "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        _count(caller, "misses")
+        return None
+    if time.time() - entry.get("stored_at", 0) > _entry_ttl(entry, family):
+        _count(caller, "misses")
+        return None
+    _count(caller, "hits")
+    data = SerperResponse(entry.get("response") or {})
+    data.from_cache = True
+    return data
+
+
+def put(query: str, response: dict, caller: str, family: str | None = None, **params) -> None:
+    """Store a successful response. Empty responses are ignored; ones with no
+    organic results are stored as negative entries (short TTL)."""
+    if not ENABLE_SERPER_CACHE or not response:
+        return
+    key = cache_key(query, params)
+    path = _path(key)
+    entry = {
+        "stored_at": time.time(),
+        "family": family or query_family(query, params),
+        "query": normalize_query(query),
+        "params": params,
+        "caller": caller,
+        "negative": not response.get("organic"),
+        "response": response,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Serper cache write failed for {key[:12]}: {e}")
+        return
+    _count(caller, "stores")
+
+
+def search(query: str, caller: str, *, api_key: str, num: int = 10, timeout: float = 15.0,
+           family: str | None = None, client: httpx.Client | None = None,
+           **params) -> SerperResponse:
+    """Serper /search for query, from cache when fresh. Raises like httpx on HTTP errors.
+
+    params are extra Serper request fields (tbs, gl, page, ...).
+    """
+    params = {"num": num, **params}
+    cached = get(query, caller, family, **params)
+    if cached is not None:
+        return cached
+    post = client.post if client is not None else httpx.post
+    resp = post(
+        SERPER_URL,
+        headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+        json={"q": query, **params},
+        timeout=timeout,
+    )
+    resp.raise_for_status()
+    data = SerperResponse(resp.json())
+    put(query, data, caller, family, **params)
+    return data
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """{caller: {hits, misses, stores}} since process start (or reset_stats)."""
+    with _stats_lock:
+        return {caller: dict(entry) for caller, entry in _stats.items()}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def format_stats(entries: dict[str, dict[str, int]]) -> str:
+    """Telegram-ready per-caller hit rates ("" before the first Serper call)."""
+    if not entries:
+        return ""
+    lines = ["🗄 *Serper cache* — since restart", "`caller                 hits  miss  rate`"]
+    for caller, entry in sorted(entries.items(), key=lambda kv: -(kv[1]["hits"] + kv[1]["misses"])):
+        total = entry["hits"] + entry["misses"]
+        rate = f"{100 * entry['hits'] / total:.0f}%" if total else "-"
+        lines.append(f"`{caller[-22:]:<22} {entry['hits']:5d} {entry['misses']:5d} {rate:>5}`")
+    return "\n".join(lines)
+
+
+def prune() -> int:
+    """Delete entries past their TTL (and temp files abandoned by dead writers).
+    Returns the number removed."""
+    removed = 0
+    now = time.time()
+    try:
+        shards = os.listdir(SERPER_CACHE_DIR)
+    except OSError:
+        return 0
+    for shard in shards:
+        shard_dir = os.path.join(SERPER_CACHE_DIR, shard)
+        if not os.path.isdir(shard_dir):
+            continue
+        try:
+            names = os.listdir(shard_dir)
+        except OSError:
+            continue
+        for name in names:
+            path = os.path.join(shard_dir, name)
+            try:
+                if name.endswith(".tmp"):
+                    # Another writer's put() may be about to os.replace() it
+                    expired = now - os.path.getmtime(path) > _STALE_TMP_SECONDS
+                else:
+                    with open(path, "r") as f:
+                        entry = json.load(f)
+                    expired = now - entry.get("stored_at", 0) > _entry_ttl(entry)
+            except (OSError, ValueError):
+                expired = True
+            if expired:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
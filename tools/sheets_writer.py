@@ -20,6 +20,8 @@ from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+import tools.email_pattern_store as email_pattern_store
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────
@@ -419,6 +421,9 @@ def write_contacts(contacts: list[dict], state: str = "") -> dict:
         ).execute()
         logger.info(f"Appended {len(no_email_rows)} rows to No Email tab")
 
+    # Verified addresses teach the shared domain → email pattern store
+    email_pattern_store.observe(contacts, source="sheets")
+
     # Color-code newly appended lead rows by confidence
     if leads_rows:
         try:
@@ -32,7 +32,9 @@ from googleapiclient.discovery import build
 
 import tools.csv_importer as csv_importer
 import tools.district_prospector as district_prospector
+import tools.serper_cache as serper_cache
 import tools.territory_data as territory_data
+import tools.territory_index as territory_index
 
 logger = logging.getLogger(__name__)
 
@@ -271,41 +273,21 @@ def _col_letter(idx: int) -> str:
 # ──────────────────────────────────────���──────
 
 def _load_nces_lookup():
-    """Build district→state and city→states dicts from NCES territory data."""
+    """Bind district→state and city→states dicts from the shared NCES territory index."""
     global _nces_district_to_state, _nces_city_to_states
 
-    if _nces_district_to_state is not None:
-        return
-
-    _nces_district_to_state = {}
-    _nces_city_to_states = defaultdict(set)
-
     try:
-        districts = territory_data._load_territory_districts()
-        for d in districts:
-            name = d.get("District Name", "")
-            state = d.get("State", "")
-            city = d.get("City", "")
-            if name and state:
-                key = csv_importer.normalize_name(name)
-                _nces_district_to_state[key] = state
-                # Also store by shortened names (without suffix)
-                short = re.sub(
-                    r"\s*(independent school district|unified school district|"
-                    r"school district|public schools|city schools|county schools)\s*$",
-                    "", key, flags=re.IGNORECASE
-                ).strip()
-                if short and short != key:
-                    _nces_district_to_state[short] = state
-            if city and state:
-                _nces_city_to_states[city.lower()].add(state)
-
-        logger.info(f"NCES lookup loaded: {len(_nces_district_to_state)} district names, "
-                    f"{len(_nces_city_to_states)} cities")
+        idx = territory_index.get_index()
+        if _nces_district_to_state is not idx.district_to_state:
+            _nces_district_to_state = idx.district_to_state
+            _nces_city_to_states = idx.district_city_to_states
+            logger.info(f"NCES lookup loaded: {len(_nces_district_to_state)} district names, "
+                        f"{len(_nces_city_to_states)} cities")
     except Exception as e:
         logger.warning(f"Failed to load NCES lookup: {e}")
-        _nces_district_to_state = {}
-        _nces_city_to_states = defaultdict(set)
+        if _nces_district_to_state is None:
+            _nces_district_to_state = {}
+            _nces_city_to_states = defaultdict(set)
 
 
 def lookup_district_state(district_name: str) -> str:
@@ -1304,8 +1286,6 @@ def _search_signal_context(district: str, state: str, sig_type: str,
         logger.warning("SERPER_API_KEY not set — cannot enrich signals")
         return ""
 
-    import httpx
-
     # Build targeted search queries based on signal type
     queries = []
     if sig_type in ("bond", "Bond"):
@@ -1324,19 +1304,15 @@ def _search_signal_context(district: str, state: str, sig_type: str,
     combined_text = ""
     for query in queries[:2]:  # Max 2 searches per signal
         try:
-            resp = httpx.post(
-                SERPER_URL,
-                headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": query, "num": 5},
-                timeout=15.0,
+            data = serper_cache.search(
+                query, "signal_processor._search_signal_context", api_key=SERPER_API_KEY, num=5,
             )
-            resp.raise_for_status()
-            data = resp.json()
             for item in data.get("organic", [])[:5]:
                 title = item.get("title", "")
                 snippet = item.get("snippet", "")
                 combined_text += f"\n{title}\n{snippet}\n"
-            time.sleep(0.5)
+            if not data.from_cache:
+                time.sleep(0.5)
         except Exception as e:
             logger.warning(f"Serper search failed for '{query}': {e}")
 
@@ -2247,8 +2223,6 @@ def scan_leadership_changes(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan leadership changes")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -2267,14 +2241,10 @@ def scan_leadership_changes(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_leadership_changes",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -2285,7 +2255,8 @@ def scan_leadership_changes(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper leadership search failed for {state_abbr}: {e}")
 
@@ -2467,8 +2438,6 @@ def scan_rfp_opportunities(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan RFP opportunities")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -2497,14 +2466,10 @@ def scan_rfp_opportunities(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_rfp_opportunities",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -2515,7 +2480,8 @@ def scan_rfp_opportunities(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper RFP search failed for {state_abbr}: {e}")
 
@@ -2702,8 +2668,6 @@ def scan_legislative_signals(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan legislative signals")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -2724,14 +2688,10 @@ def scan_legislative_signals(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_legislative_signals",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -2742,7 +2702,8 @@ def scan_legislative_signals(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper legislative search failed for {state_abbr}: {e}")
 
@@ -2913,8 +2874,6 @@ def scan_grant_opportunities(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan grants")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -2933,14 +2892,10 @@ def scan_grant_opportunities(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_grant_opportunities",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -2951,7 +2906,8 @@ def scan_grant_opportunities(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper grant scan failed for {state_abbr}: {e}")
 
@@ -3305,8 +3261,6 @@ def discover_homeschool_coops(state: str, max_results: int = 25) -> dict:
             "error": f"{state_abbr} not in territory — pass a territory state",
         }
 
-    import httpx
-
     # Three queries. Union of results, dedup by URL.
     # Global exclusions: social media, national orgs, generic directories.
     _exclusions = "-site:facebook.com -site:hslda.org -site:reddit.com"
@@ -3320,14 +3274,9 @@ def discover_homeschool_coops(state: str, max_results: int = 25) -> dict:
     seen_urls = set()
     for q in queries:
         try:
-            resp = httpx.post(
-                SERPER_URL,
-                headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": q, "num": 10},
-                timeout=15.0,
+            data = serper_cache.search(
+                q, "signal_processor.discover_homeschool_coops", api_key=SERPER_API_KEY, num=10,
             )
-            resp.raise_for_status()
-            data = resp.json()
             for item in data.get("organic", [])[:10]:
                 url = item.get("link", "")
                 if not url or url in seen_urls:
@@ -3376,7 +3325,8 @@ def discover_homeschool_coops(state: str, max_results: int = 25) -> dict:
                 })
                 if len(all_hits) >= max_results:
                     break
-            time.sleep(0.3)
+            if not data.from_cache:
+                time.sleep(0.3)
             if len(all_hits) >= max_results:
                 break
         except Exception as e:
@@ -3449,8 +3399,6 @@ def scan_cs_funding_awards(states=None, progress_callback=None) -> dict:
         logger.warning("SERPER_API_KEY not set — cannot scan CS funding")
         return {"signals": [], "queued": [], "customer_intel": [], "raw_count": 0}
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -3471,14 +3419,10 @@ def scan_cs_funding_awards(states=None, progress_callback=None) -> dict:
 
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:y"},  # 1-year window
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_cs_funding_awards",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:y",  # 1-year window
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -3489,7 +3433,8 @@ def scan_cs_funding_awards(states=None, progress_callback=None) -> dict:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper CS funding scan failed for {state_abbr}: {e}")
 
@@ -3697,8 +3642,6 @@ def scan_competitor_displacement(states=None, progress_callback=None) -> dict:
         logger.warning("SERPER_API_KEY not set — cannot scan competitor displacement")
         return {"signals": [], "queued": [], "customer_intel": [], "raw_count": 0}
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -3736,14 +3679,10 @@ def scan_competitor_displacement(states=None, progress_callback=None) -> dict:
 
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10},  # no tbs — full time window
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_competitor_displacement",
+                    api_key=SERPER_API_KEY, num=10,  # no tbs — full time window
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -3754,7 +3693,8 @@ def scan_competitor_displacement(states=None, progress_callback=None) -> dict:
                             "url": url,
                             "searched_competitor": comp["key"],
                         })
-                time.sleep(0.3)  # ~18 queries (6 comp × 3 queries) ≈ 6s scan time
+                if not data.from_cache:
+                    time.sleep(0.3)  # ~18 queries (6 comp × 3 queries) ≈ 6s scan time
             except Exception as e:
                 logger.warning(
                     f"Serper competitor scan failed for {comp['key']}: {e}"
@@ -4056,8 +3996,6 @@ def scan_budget_cycle_signals(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan budget cycles")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -4076,14 +4014,10 @@ def scan_budget_cycle_signals(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_budget_cycle_signals",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -4094,7 +4028,8 @@ def scan_budget_cycle_signals(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper budget scan failed for {state_abbr}: {e}")
 
@@ -4264,8 +4199,6 @@ def scan_algebra_targets(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan algebra targets")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -4285,14 +4218,10 @@ def scan_algebra_targets(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:m"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_algebra_targets",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:m",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -4303,7 +4232,8 @@ def scan_algebra_targets(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper algebra scan failed for {state_abbr}: {e}")
 
@@ -4454,8 +4384,6 @@ def scan_cybersecurity_targets(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan cybersecurity targets")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -4475,14 +4403,10 @@ def scan_cybersecurity_targets(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:y"},  # Wider window — pre-launch research
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_cybersecurity_targets",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:y",  # Wider window — pre-launch research
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -4493,7 +4417,8 @@ def scan_cybersecurity_targets(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper cybersecurity scan failed for {state_abbr}: {e}")
 
@@ -4645,8 +4570,6 @@ def scan_role_targets(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan role targets")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -4667,14 +4590,10 @@ def scan_role_targets(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:y"},  # Last year — roles persist
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_role_targets",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:y",  # Last year — roles persist
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -4685,7 +4604,8 @@ def scan_role_targets(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper role scan failed for {state_abbr}: {e}")
 
@@ -4837,8 +4757,6 @@ def scan_csta_chapters(states=None, progress_callback=None) -> list:
         logger.warning("SERPER_API_KEY not set — cannot scan CSTA chapters")
         return []
 
-    import httpx
-
     _load_nces_lookup()
     _load_cross_references()
 
@@ -4857,14 +4775,10 @@ def scan_csta_chapters(states=None, progress_callback=None) -> list:
         ]
         for query in queries:
             try:
-                resp = httpx.post(
-                    SERPER_URL,
-                    headers={"X-API-Key": SERPER_API_KEY, "Content-Type": "application/json"},
-                    json={"q": query, "num": 10, "tbs": "qdr:y"},
-                    timeout=15.0,
+                data = serper_cache.search(
+                    query, "signal_processor.scan_csta_chapters",
+                    api_key=SERPER_API_KEY, num=10, tbs="qdr:y",
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 for item in data.get("organic", [])[:10]:
                     url = item.get("link", "")
                     if url and url not in seen_urls:
@@ -4875,7 +4789,8 @@ def scan_csta_chapters(states=None, progress_callback=None) -> list:
                             "url": url,
                             "searched_state": state_abbr,
                         })
-                time.sleep(0.5)
+                if not data.from_cache:
+                    time.sleep(0.5)
             except Exception as e:
                 logger.warning(f"Serper CSTA scan failed for {state_abbr}: {e}")
 
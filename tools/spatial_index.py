@@ -0,0 +1,255 @@
+"""
+tools/spatial_index.py — Lat/lon grid index for radius and nearest-point queries.
+
+Points are bucketed into fixed-size lat/lon cells. A radius query visits only
+the cells overlapping a conservative bounding box of the circle, then applies
+the exact haversine test, so it returns exactly what a full scan with
+haversine_miles(...) <= radius would — same distances, same index order.
+
+  within(lat, lon, r)   → [(i, miles)] for every point with distance <= r,
+                          ascending i (original insertion order)
+  nearest(lat, lon)     → (i, miles) of the closest point, lowest i on ties
+                          (the first minimum a linear scan would keep)
+
+Distances are always haversine_miles(query_lat, query_lon, point_lat, point_lon).
+
+Many-to-many (state sweeps, nearest-ESA assignment) goes through PointArray +
+nearest_each(): a vectorized NumPy haversine over source-chunk × target
+distance matrices, at most _MATRIX_CHUNK_CELLS pairs in memory at a time.
+NumPy's sin/cos may differ from libm in the last ulp, so the few targets within
+_VECTOR_SLACK_MILES of each row's minimum are re-scored with haversine_miles —
+results (index, distance, tie-break) are identical to a linear scan. NumPy is
+optional: without it nearest_each() answers from a GeoGridIndex per target set.
+
+Usage:
+  from tools.spatial_index import GeoGridIndex, PointArray, nearest_each
+  grid = GeoGridIndex([(30.27, -97.74), (30.51, -97.68)])
+  for i, miles in grid.within(30.3, -97.7, 15):
+      ...
+  hits = nearest_each(PointArray(districts), PointArray(accounts), max_miles=30)
+"""
+
+import math
+
+EARTH_RADIUS_MILES = 3958.8
+
+# ~17 miles of latitude per cell: proximity radii are 15–50 miles
+_DEFAULT_CELL_DEGREES = 0.25
+
+# Vectorized path: max source × target pairs per distance matrix (8 bytes each,
+# a handful of temporaries → tens of MB peak), and the window around each row's
+# minimum that gets re-scored exactly
+_MATRIX_CHUNK_CELLS = 1_000_000
+_VECTOR_SLACK_MILES = 1e-6
+
+
+def _numpy():
+    """numpy module, or None when not installed (callers fall back to the grid)."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in miles."""
+    R = EARTH_RADIUS_MILES
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return R * 2 * math.asin(math.sqrt(a))
+
+
+class GeoGridIndex:
+    """Read-only grid over (lat, lon) points. Points with None/NaN coordinates are skipped."""
+
+    def __init__(self, points, cell_degrees: float = _DEFAULT_CELL_DEGREES):
+        self.cell = cell_degrees
+        self.lats: list[float | None] = []
+        self.lons: list[float | None] = []
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for i, (lat, lon) in enumerate(points):
+            self.lats.append(lat)
+            self.lons.append(lon)
+            if lat is None or lon is None or not (math.isfinite(lat) and math.isfinite(lon)):
+                continue
+            self._cells.setdefault(self._cell_of(lat, lon), []).append(i)
+        self._size = sum(len(v) for v in self._cells.values())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def _candidates(self, lat: float, lon: float, radius_miles: float) -> list[int]:
+        """Indices of points in cells overlapping the circle's bounding box, sorted."""
+        ang = radius_miles / EARTH_RADIUS_MILES  # angular radius (radians)
+        if ang >= math.pi / 2:
+            return sorted(i for cell in self._cells.values() for i in cell)
+        # Latitude: great-circle distance is never less than the latitude gap
+        dlat = math.degrees(ang)
+        lat_lo, lat_hi = lat - dlat, lat + dlat
+        # Longitude: max Δλ for points within ang of the query (tangent bound);
+        # near a pole or across the antimeridian just take every longitude
+        sin_ang = math.sin(ang)
+        cos_lat = math.cos(math.radians(lat))
+        if lat_lo <= -90 or lat_hi >= 90 or cos_lat <= sin_ang:
+            lon_range = None
+        else:
+            dlon = math.degrees(math.asin(sin_ang / cos_lat))
+            lon_lo, lon_hi = lon - dlon, lon + dlon
+            lon_range = None if lon_lo < -180 or lon_hi > 180 else (lon_lo, lon_hi)
+
+        # Pad one cell each side so float rounding at cell edges can't drop a point
+        r0, r1 = math.floor(lat_lo / self.cell) - 1, math.floor(lat_hi / self.cell) + 1
+        out = []
+        if lon_range is None:
+            for (r, _c), idxs in self._cells.items():
+                if r0 <= r <= r1:
+                    out.extend(idxs)
+        else:
+            c0 = math.floor(lon_range[0] / self.cell) - 1
+            c1 = math.floor(lon_range[1] / self.cell) + 1
+            if (r1 - r0 + 1) * (c1 - c0 + 1) > len(self._cells):
+                # Box covers more cells than exist: filter the occupied ones
+                for (r, c), idxs in self._cells.items():
+                    if r0 <= r <= r1 and c0 <= c <= c1:
+                        out.extend(idxs)
+            else:
+                cells = self._cells
+                for r in range(r0, r1 + 1):
+                    for c in range(c0, c1 + 1):
+                        idxs = cells.get((r, c))
+                        if idxs:
+                            out.extend(idxs)
+        out.sort()
+        return out
+
+    def within(self, lat: float, lon: float, radius_miles: float) -> list[tuple[int, float]]:
+        """[(index, miles)] for points within radius_miles, in index order."""
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return []  # a scan would find nothing: NaN compares false
+        lats, lons = self.lats, self.lons
+        hits = []
+        for i in self._candidates(lat, lon, radius_miles):
+            d = haversine_miles(lat, lon, lats[i], lons[i])
+            if d <= radius_miles:
+                hits.append((i, d))
+        return hits
+
+    def nearest(self, lat: float, lon: float,
+                max_miles: float | None = None) -> tuple[int, float] | None:
+        """(index, miles) of the nearest point, or None (empty / nothing within max_miles).
+
+        Searches doubling radii: the closest point inside a radius is the closest
+        overall. Ties go to the lowest index.
+        """
+        if not self._size or not (math.isfinite(lat) and math.isfinite(lon)):
+            return None
+        radius = self.cell * 69.0
+        if max_miles is not None:
+            radius = min(radius, max_miles)
+        while True:
+            best = None
+            for i, d in self.within(lat, lon, radius):
+                if best is None or d < best[1]:
+                    best = (i, d)
+            if best is not None:
+                return best
+            if max_miles is not None and radius >= max_miles:
+                return None
+            if radius >= math.pi * EARTH_RADIUS_MILES:
+                return None  # whole sphere searched
+            radius *= 2
+            if max_miles is not None:
+                radius = min(radius, max_miles)
+
+
+class PointArray:
+    """Fixed list of (lat, lon) points with radian arrays for vectorized haversine.
+
+    Points with None/NaN coordinates are kept (indices stay aligned) but never
+    match. The GeoGridIndex used by the no-NumPy fallback is built on demand.
+    """
+
+    def __init__(self, points):
+        pairs = [(lat, lon) for lat, lon in points]
+        self.lats = [p[0] for p in pairs]
+        self.lons = [p[1] for p in pairs]
+        self._grid = None
+        self._vectors = None
+        np = _numpy()
+        if np is not None:
+            lat = np.array([_nan_if_none(v) for v in self.lats], dtype=np.float64)
+            lon = np.array([_nan_if_none(v) for v in self.lons], dtype=np.float64)
+            valid = np.isfinite(lat) & np.isfinite(lon)
+            rlat, rlon = np.radians(lat), np.radians(lon)
+            self._vectors = (rlat, rlon, np.cos(rlat), valid)
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    @property
+    def grid(self) -> GeoGridIndex:
+        if self._grid is None:
+            self._grid = GeoGridIndex(zip(self.lats, self.lons))
+        return self._grid
+
+
+def nearest_each(sources: PointArray, targets: PointArray, max_miles: float | None = None,
+                 rows: list[int] | None = None) -> list[tuple[int, float] | None]:
+    """Nearest target for each source point (or each index in rows, in that order).
+
+    Returns one (target_index, miles) or None per source — None when the source
+    has no coordinates, targets is empty, or the nearest is beyond max_miles.
+    miles is haversine_miles(source, target); ties go to the lowest target index.
+    """
+    if rows is None:
+        rows = list(range(len(sources)))
+    if not rows:
+        return []
+    if sources._vectors is None or targets._vectors is None:
+        grid = targets.grid
+        return [grid.nearest(_nan_if_none(sources.lats[r]), _nan_if_none(sources.lons[r]),
+                             max_miles=max_miles)
+                for r in rows]
+
+    np = _numpy()
+    t_lat, t_lon, t_cos, t_valid = targets._vectors
+    out: list[tuple[int, float] | None] = [None] * len(rows)
+    if not t_valid.any():
+        return out
+    s_lat, s_lon, s_cos, s_valid = sources._vectors
+    row_idx = np.asarray(rows, dtype=np.intp)
+    chunk = max(1, _MATRIX_CHUNK_CELLS // len(targets))
+    for start in range(0, len(rows), chunk):
+        idx = row_idx[start:start + chunk]
+        lat1 = s_lat[idx][:, None]
+        a = (np.sin((t_lat[None, :] - lat1) / 2) ** 2
+             + s_cos[idx][:, None] * t_cos[None, :]
+             * np.sin((t_lon[None, :] - s_lon[idx][:, None]) / 2) ** 2)
+        d = EARTH_RADIUS_MILES * 2 * np.arcsin(np.sqrt(a))
+        d[:, ~t_valid] = np.inf
+        d[~s_valid[idx], :] = np.inf
+        best = d.min(axis=1)
+        limit = np.inf if max_miles is None else max_miles + _VECTOR_SLACK_MILES
+        live = np.nonzero(np.isfinite(best) & (best <= limit))[0]
+        close = d[live] <= (best[live] + _VECTOR_SLACK_MILES)[:, None]
+        for k, cand in zip(live.tolist(), close):
+            r = rows[start + k]
+            lat, lon = sources.lats[r], sources.lons[r]
+            hit = None
+            for j in np.flatnonzero(cand).tolist():
+                dist = haversine_miles(lat, lon, targets.lats[j], targets.lons[j])
+                if hit is None or dist < hit[1]:
+                    hit = (j, dist)
+            if max_miles is None or hit[1] <= max_miles:
+                out[start + k] = hit
+    return out
+
+
+def _nan_if_none(val):
+    return math.nan if val is None else val
@@ -0,0 +1,131 @@
+"""
+tools/substring_index.py — Substring containment index over a fixed key set.
+
+Answers "which keys are contained in this text?" and "which keys contain this
+text?" without scanning every key. Used by territory_matcher's Tier 5
+containment match and its NCES city-in-email-domain lookup.
+
+  keys inside text  → probe every substring of text whose length some key has
+                      (within the allowed window) against a hash of the keys.
+                      Cost depends only on len(text): at most len(text) probes
+                      per distinct key length, ~len(text)² / 2 in the worst
+                      case. Queries are names and domain roots (tens of
+                      characters); an Aho-Corasick automaton would make this
+                      linear but needs a trie node per key character, which
+                      for the territory's ~100k keys is far more memory than
+                      the probes cost in time.
+  keys around text  → q-gram postings (q=4). Candidates come from the rarest
+                      gram of text, then get a real `in` check. Cost is bounded
+                      by that one posting list, never the whole key set.
+
+Results are key positions (insertion order), so callers can keep the
+"first key in dict order wins" semantics of the loops this replaces.
+
+Usage:
+  from tools.substring_index import SubstringIndex
+  idx = SubstringIndex(stripped_names.keys(), min_key_len=6)
+  for pos in idx.containment_candidates("lincoln park", min_ratio=0.5):
+      key = idx.key(pos)
+"""
+
+from array import array
+
+_GRAM = 4
+
+
+class SubstringIndex:
+    """Containment lookups over keys (strings), in original key order."""
+
+    def __init__(self, keys, min_key_len: int = 1):
+        self.min_key_len = min_key_len
+        self._keys: list[str] = []
+        self._pos: dict[str, int] = {}
+        self._grams: dict[str, array] = {}
+        self._short: list[int] = []  # keys shorter than a gram (checked directly)
+        lengths = set()
+        for key in keys:
+            if not key or len(key) < min_key_len or key in self._pos:
+                continue
+            pos = len(self._keys)
+            self._keys.append(key)
+            self._pos[key] = pos
+            lengths.add(len(key))
+            if len(key) < _GRAM:
+                self._short.append(pos)
+                continue
+            for gram in {key[i:i + _GRAM] for i in range(len(key) - _GRAM + 1)}:
+                postings = self._grams.get(gram)
+                if postings is None:
+                    postings = self._grams[gram] = array("I")
+                postings.append(pos)
+        self._lengths = sorted(lengths)  # keys_in only probes these substring lengths
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def key(self, pos: int) -> str:
+        return self._keys[pos]
+
+    def keys_in(self, text: str, min_len: int = 1, max_len: int | None = None) -> list[int]:
+        """Positions of keys that occur as substrings of text, sorted."""
+        n = len(text)
+        lo = max(min_len, self.min_key_len, 1)
+        hi = n if max_len is None else min(max_len, n)
+        found = set()
+        pos_of = self._pos
+        for length in self._lengths:
+            if length < lo:
+                continue
+            if length > hi:
+                break
+            for start in range(0, n - length + 1):
+                pos = pos_of.get(text[start:start + length])
+                if pos is not None:
+                    found.add(pos)
+        return sorted(found)
+
+    def keys_containing(self, text: str, max_len: int | None = None) -> list[int]:
+        """Positions of keys that contain text as a substring, sorted."""
+        if not text:
+            return [p for p in range(len(self._keys))
+                    if max_len is None or len(self._keys[p]) <= max_len]
+        keys = self._keys
+        if len(text) < _GRAM:
+            # Too short for grams: scan (short queries are rare on hot paths)
+            return [p for p, k in enumerate(keys)
+                    if text in k and (max_len is None or len(k) <= max_len)]
+
+        rarest = None
+        for i in range(len(text) - _GRAM + 1):
+            postings = self._grams.get(text[i:i + _GRAM])
+            if postings is None:
+                return []  # some gram occurs in no key
+            if rarest is None or len(postings) < len(rarest):
+                rarest = postings
+        out = []
+        for pos in rarest:
+            k = keys[pos]
+            if (max_len is None or len(k) <= max_len) and text in k:
+                out.append(pos)
+        return out  # postings are appended in key order → already sorted
+
+    def containment_candidates(self, text: str, min_ratio: float = 0.0) -> list[int]:
+        """Keys k with `k in text or text in k`, sorted by key order.
+
+        min_ratio prunes by length (shorter / longer ≥ min_ratio) — pass the
+        caller's own ratio cut-off; callers should still apply their full test.
+        """
+        n = len(text)
+        if not n:
+            return []
+        if min_ratio > 0:
+            inside = self.keys_in(text, min_len=int(n * min_ratio) or 1)
+            around = self.keys_containing(text, max_len=int(n / min_ratio))
+        else:
+            inside = self.keys_in(text)
+            around = self.keys_containing(text)
+        if not around:
+            return inside
+        if not inside:
+            return around
+        return sorted(set(inside) | set(around))
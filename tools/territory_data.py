@@ -14,10 +14,12 @@ Usage (module-level, not a class):
   gaps = territory_data.get_territory_gaps("NV")
 """
 
+import gzip
 import json
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 import httpx
@@ -27,6 +29,8 @@ from googleapiclient.discovery import build
 
 import tools.csv_importer as csv_importer
 import tools.district_prospector as district_prospector
+import tools.territory_index as territory_index
+import tools.territory_snapshot as territory_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +127,27 @@ _SCHOOL_TYPE_MAP = {
 # Cache TTL: 7 days in seconds
 _CACHE_TTL = 7 * 24 * 3600
 
+# Concurrent sync: Urban API connections (and fetch threads) shared by all states
+_SYNC_MAX_CONNECTIONS = 8
+
+# Incremental sync: NCES identifier each tab is keyed on, and columns that
+# don't count as a change (Date Synced moves on every run)
+_SYNC_KEY_COLUMN = {"districts": "LEAID", "schools": "NCESSCH"}
+_SYNC_IGNORED_COLUMNS = {"Date Synced"}
+
+# Ranges per values().batchUpdate call when writing changed rows
+_UPDATE_BATCH_SIZE = 500
+
+# How often territory_index re-reads the tabs for edits made in the sheet
+# itself (refresh_snapshot_from_sheet) — the matcher's old cache TTL
+SHEET_RECHECK_SECONDS = 3600
+
+# Urban API directory endpoint per kind
+_URBAN_ENDPOINTS = {
+    "districts": "school-districts/ccd/directory",
+    "schools": "schools/ccd/directory",
+}
+
 
 # ─────────────────────────────────────────────
 # HELPERS
@@ -323,8 +348,8 @@ def _to_title_case(name: str) -> str:
 
 
 def _cache_path(kind: str, state: str) -> str:
-    """Return /tmp cache file path for a given kind+state."""
-    return f"/tmp/territory_{kind}_{state}.json"
+    """Return /tmp cache file path (gzipped JSON) for a given kind+state."""
+    return f"/tmp/territory_{kind}_{state}.json.gz"
 
 
 def _read_cache(path: str) -> list | None:
@@ -335,42 +360,61 @@ def _read_cache(path: str) -> list | None:
         age = time.time() - os.path.getmtime(path)
         if age > _CACHE_TTL:
             return None
-        with open(path, "r") as f:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
             return json.load(f)
     except Exception:
         return None
 
 
 def _write_cache(path: str, data: list):
-    """Write API response to cache."""
+    """Write API response to cache (temp file + rename, safe with concurrent fetches)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
     try:
-        with open(path, "w") as f:
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
             json.dump(data, f)
+        os.replace(tmp, path)
     except Exception as e:
         logger.warning(f"Failed to write cache {path}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
 
 
 # ─────────────────────────────────────────────
 # API FETCH
 # ─────────────────────────────────────────────
 
-def _fetch_districts_for_state(state_abbr: str) -> list[dict]:
-    """Fetch district data from Urban API for one state. Uses /tmp cache with 7-day TTL."""
+def _fetch_records(kind: str, state_abbr: str, client: httpx.Client | None = None,
+                   on_page=None) -> list[dict]:
+    """Fetch one kind ("districts"/"schools") for one state from the Urban API.
+
+    Follows `next` links page by page; each page's records (CA already filtered
+    to SoCal) are handed to on_page as they arrive, so callers can build rows
+    while later pages are still downloading. Uses the /tmp cache with 7-day TTL.
+    Pass a shared client to reuse pooled connections across states.
+    """
     fips = STATE_TO_FIPS.get(state_abbr)
     if not fips:
         raise ValueError(f"Unknown state: {state_abbr}")
 
-    cache = _cache_path("districts", state_abbr)
+    cache = _cache_path(kind, state_abbr)
     cached = _read_cache(cache)
     if cached is not None:
-        logger.info(f"Using cached districts for {state_abbr} ({len(cached)} records)")
+        logger.info(f"Using cached {kind} for {state_abbr} ({len(cached)} records)")
+        if on_page is not None:
+            on_page(cached)
         return cached
 
-    url = f"{URBAN_API_BASE}/school-districts/ccd/directory/{NCES_YEAR}/?fips={fips}"
-    logger.info(f"Fetching districts for {state_abbr} from Urban API...")
+    url = f"{URBAN_API_BASE}/{_URBAN_ENDPOINTS[kind]}/{NCES_YEAR}/?fips={fips}"
+    logger.info(f"Fetching {kind} for {state_abbr} from Urban API...")
 
     all_results = []
-    with httpx.Client(timeout=120.0) as client:
+    fetched = 0
+    own_client = client is None
+    if own_client:
+        client = httpx.Client(timeout=120.0)
+    try:
         # API may paginate — follow next links
         page_url = url
         while page_url:
@@ -378,55 +422,85 @@ def _fetch_districts_for_state(state_abbr: str) -> list[dict]:
             resp.raise_for_status()
             data = resp.json()
             results = data.get("results", [])
+            fetched += len(results)
+            # Filter CA to SoCal only
+            if state_abbr == "CA":
+                results = [r for r in results if r.get("county_code") in SOCAL_COUNTY_CODES]
             all_results.extend(results)
+            if on_page is not None:
+                on_page(results)
             page_url = data.get("next")
+    finally:
+        if own_client:
+            client.close()
 
-    # Filter CA to SoCal only
     if state_abbr == "CA":
-        before = len(all_results)
-        all_results = [d for d in all_results if d.get("county_code") in SOCAL_COUNTY_CODES]
-        logger.info(f"CA districts: {before} total → {len(all_results)} SoCal only")
+        logger.info(f"CA {kind}: {fetched} total → {len(all_results)} SoCal only")
 
     _write_cache(cache, all_results)
-    logger.info(f"Fetched {len(all_results)} districts for {state_abbr}")
+    logger.info(f"Fetched {len(all_results)} {kind} for {state_abbr}")
     return all_results
 
 
-def _fetch_schools_for_state(state_abbr: str) -> list[dict]:
+def _fetch_districts_for_state(state_abbr: str, client: httpx.Client | None = None) -> list[dict]:
+    """Fetch district data from Urban API for one state. Uses /tmp cache with 7-day TTL."""
+    return _fetch_records("districts", state_abbr, client)
+
+
+def _fetch_schools_for_state(state_abbr: str, client: httpx.Client | None = None) -> list[dict]:
     """Fetch school data from Urban API for one state. Uses /tmp cache with 7-day TTL."""
-    fips = STATE_TO_FIPS.get(state_abbr)
-    if not fips:
-        raise ValueError(f"Unknown state: {state_abbr}")
+    return _fetch_records("schools", state_abbr, client)
 
-    cache = _cache_path("schools", state_abbr)
-    cached = _read_cache(cache)
-    if cached is not None:
-        logger.info(f"Using cached schools for {state_abbr} ({len(cached)} records)")
-        return cached
 
-    url = f"{URBAN_API_BASE}/schools/ccd/directory/{NCES_YEAR}/?fips={fips}"
-    logger.info(f"Fetching schools for {state_abbr} from Urban API...")
+def _fetch_state_rows(kind: str, state_abbr: str, client: httpx.Client | None = None) -> list[list]:
+    """Fetch one kind for one state and return sheet rows, built page by page."""
+    build = _build_district_row if kind == "districts" else _build_school_row
+    rows = []
+    _fetch_records(kind, state_abbr, client,
+                   on_page=lambda records: rows.extend(build(r, state_abbr) for r in records))
+    return rows
 
-    all_results = []
-    with httpx.Client(timeout=120.0) as client:
-        page_url = url
-        while page_url:
-            resp = client.get(page_url)
-            resp.raise_for_status()
-            data = resp.json()
-            results = data.get("results", [])
-            all_results.extend(results)
-            page_url = data.get("next")
 
-    # Filter CA to SoCal only
-    if state_abbr == "CA":
-        before = len(all_results)
-        all_results = [s for s in all_results if s.get("county_code") in SOCAL_COUNTY_CODES]
-        logger.info(f"CA schools: {before} total → {len(all_results)} SoCal only")
+def _iter_state_rows(states: list[str], concurrent: bool):
+    """Yield (state, district_rows, school_rows, error) for each state.
 
-    _write_cache(cache, all_results)
-    logger.info(f"Fetched {len(all_results)} schools for {state_abbr}")
-    return all_results
+    Serial: one state at a time, in order. Concurrent: every state's district
+    and school fetches run at once over one pooled httpx.Client (at most
+    _SYNC_MAX_CONNECTIONS connections); states are yielded as soon as both
+    kinds are in, so the caller's Sheets writes overlap the remaining fetches.
+    """
+    if not concurrent:
+        for state in states:
+            try:
+                yield (state, _fetch_state_rows("districts", state),
+                       _fetch_state_rows("schools", state), None)
+            except Exception as e:
+                yield state, None, None, e
+        return
+
+    limits = httpx.Limits(max_connections=_SYNC_MAX_CONNECTIONS,
+                          max_keepalive_connections=_SYNC_MAX_CONNECTIONS)
+    with httpx.Client(timeout=120.0, limits=limits) as client, \
+            ThreadPoolExecutor(max_workers=_SYNC_MAX_CONNECTIONS) as pool:
+        futures = {
+            pool.submit(_fetch_state_rows, kind, state, client): (state, kind)
+            for state in states
+            for kind in ("districts", "schools")
+        }
+        fetched: dict[str, dict] = {state: {} for state in states}
+        for future in as_completed(futures):
+            state, kind = futures[future]
+            if state not in fetched:
+                continue  # other kind already failed
+            try:
+                fetched[state][kind] = future.result()
+            except Exception as e:
+                del fetched[state]
+                yield state, None, None, e
+                continue
+            if len(fetched[state]) == 2:
+                rows = fetched.pop(state)
+                yield state, rows["districts"], rows["schools"], None
 
 
 # ─────────────────────────────────────────────
@@ -539,15 +613,40 @@ def _load_tab_rows(tab_name: str, columns: list[str]) -> list[dict]:
         return []
 
 
-def _load_territory_districts(state_filter: str = "") -> list[dict]:
-    """Load districts from the Territory Districts tab."""
-    rows = _load_tab_rows(TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS)
+def _load_territory_rows(kind: str, tab_name: str, columns: list[str],
+                         state_filter: str = "") -> list[dict]:
+    """Load territory rows from the local snapshot, falling back to Sheets.
+
+    A Sheets read seeds the snapshot so the next call (from any consumer)
+    is served from disk: a full read seeds every state, a filtered read
+    seeds just that state.
+    """
+    snap = territory_snapshot.load_rows(kind, state_filter)
+    if snap is not None:
+        return snap
+
+    rows = _load_tab_rows(tab_name, columns)
     if state_filter:
         sf = state_filter.strip().upper()
         rows = [r for r in rows if r.get("State", "").upper() == sf]
+    if rows:
+        try:
+            if state_filter:
+                territory_snapshot.write_dict_rows(
+                    kind, columns, rows, states=[state_filter.strip().upper()])
+            else:
+                territory_snapshot.write_dict_rows(kind, columns, rows, complete=True)
+        except Exception as e:
+            logger.warning(f"Territory snapshot seed failed for {kind}: {e}")
     return rows
 
 
+def _load_territory_districts(state_filter: str = "") -> list[dict]:
+    """Load districts from the Territory Districts tab (via the local snapshot)."""
+    return _load_territory_rows("districts", TAB_TERRITORY_DISTRICTS,
+                                DISTRICT_COLUMNS, state_filter)
+
+
 def lookup_district_enrollment(name: str, state: str) -> int:
     """
     Look up a district's enrollment from NCES territory data.
@@ -619,12 +718,80 @@ def lookup_district_enrollment(name: str, state: str) -> int:
 
 
 def _load_territory_schools(state_filter: str = "") -> list[dict]:
-    """Load schools from the Territory Schools tab."""
-    rows = _load_tab_rows(TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS)
-    if state_filter:
-        sf = state_filter.strip().upper()
-        rows = [r for r in rows if r.get("State", "").upper() == sf]
-    return rows
+    """Load schools from the Territory Schools tab (via the local snapshot)."""
+    return _load_territory_rows("schools", TAB_TERRITORY_SCHOOLS,
+                                SCHOOL_COLUMNS, state_filter)
+
+
+def refresh_snapshot_from_sheet() -> list[str]:
+    """Re-read both territory tabs and rewrite every snapshot partition that no
+    longer matches the sheet — cells edited by hand, rows pasted in or deleted.
+
+    territory_index runs this in the background every SHEET_RECHECK_SECONDS
+    (what the matcher's hourly cache TTL used to pick up). Rows are compared
+    as sets, ignoring Date Synced. Only complete snapshots are checked — a
+    partial one still falls back to Sheets for unknown states. A failed or
+    empty read changes nothing, and a partition rewritten by a sync while the
+    tab was being read is left to that sync.
+
+    Returns the rewritten partitions as "kind:STATE". Never raises.
+    """
+    changed = []
+    try:
+        service = _get_service()
+        sheet_id = _get_territory_sheet_id()
+    except Exception as e:
+        logger.warning(f"Territory sheet re-check skipped: {e}")
+        return changed
+
+    for kind, tab_name, columns in (("districts", TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS),
+                                    ("schools", TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS)):
+        if not territory_snapshot.is_complete(kind):
+            continue
+        states = territory_snapshot.snapshot_states(kind)
+        generations = {st: territory_snapshot.partition_generation(kind, st) for st in states}
+        try:
+            last_col = _col_to_letter(len(columns) - 1)
+            values = service.spreadsheets().values().get(
+                spreadsheetId=sheet_id,
+                range=f"'{tab_name}'!A2:{last_col}",
+            ).execute().get("values", [])
+        except Exception as e:
+            logger.warning(f"Territory sheet re-check failed for {tab_name}: {e}")
+            continue
+        if not values:
+            continue
+
+        compared = [i for i, col in enumerate(columns) if col not in _SYNC_IGNORED_COLUMNS]
+        state_idx = columns.index("State")
+
+        def _row_set(rows: list[list]) -> list[tuple]:
+            return sorted(tuple(r[i] for i in compared) for r in rows)
+
+        sheet_rows = [territory_snapshot.normalize_row(columns, row) for row in values]
+        by_state: dict[str, list[list]] = {}
+        for row in sheet_rows:
+            st = row[state_idx].strip().upper()
+            if st:
+                by_state.setdefault(st, []).append(row)
+
+        stale = []
+        for st in sorted(set(states) | set(by_state)):
+            snap = territory_snapshot.load_rows(kind, st) or []
+            snap_rows = [territory_snapshot.normalize_row(columns, [r.get(c, "") for c in columns])
+                         for r in snap]
+            if _row_set(snap_rows) == _row_set(by_state.get(st, [])):
+                continue
+            if territory_snapshot.partition_generation(kind, st) != generations.get(st):
+                continue  # a sync rewrote it while we were reading
+            stale.append(st)
+        if stale:
+            territory_snapshot.write_states(kind, columns, sheet_rows, states=stale)
+            changed.extend(f"{kind}:{st}" for st in stale)
+
+    if changed:
+        logger.info(f"Territory sheet re-check: snapshot refreshed for {', '.join(changed)}")
+    return changed
 
 
 def _clear_state_rows(service, sheet_id: str, tab_name: str, columns: list[str], state: str):
@@ -666,6 +833,162 @@ def _clear_state_rows(service, sheet_id: str, tab_name: str, columns: list[str],
     return deleted
 
 
+def _read_state_positions(service, sheet_id: str, tab_name: str, columns: list[str],
+                          key_col: str, state: str) -> dict[str, list[int]]:
+    """Map NCES id → sheet row numbers (1-based) for one state's rows in a tab.
+
+    Reads only the State and id columns. Rows with a blank id are keyed "".
+    """
+    state_letter = _col_to_letter(columns.index("State"))
+    key_letter = _col_to_letter(columns.index(key_col))
+    resp = service.spreadsheets().values().batchGet(
+        spreadsheetId=sheet_id,
+        ranges=[f"'{tab_name}'!{state_letter}2:{state_letter}",
+                f"'{tab_name}'!{key_letter}2:{key_letter}"],
+        majorDimension="COLUMNS",
+    ).execute()
+    state_vals, key_vals = [
+        vr["values"][0] if vr.get("values") else []
+        for vr in resp["valueRanges"]
+    ]
+    positions: dict[str, list[int]] = {}
+    for i, row_state in enumerate(state_vals):
+        if (row_state or "").strip().upper() != state.upper():
+            continue
+        key = (key_vals[i] if i < len(key_vals) else "").strip()
+        positions.setdefault(key, []).append(i + 2)
+    return positions
+
+
+def _diff_state_rows(columns: list[str], key_col: str, new_rows: list[list],
+                     old_records: list[dict] | None,
+                     positions: dict[str, list[int]]) -> dict:
+    """Diff one state's freshly built rows against what the sheet holds.
+
+    Args:
+        new_rows: rows from the row builders (order kept for inserts).
+        old_records: the state's snapshot rows (territory_snapshot.load_rows),
+            used to tell unchanged rows from updated ones. None = no snapshot,
+            so every row already in the sheet is rewritten.
+        positions: _read_state_positions() for the same state — the sheet, not
+            the snapshot, decides which rows exist and where.
+
+    Returns {"inserts": [row], "updates": [(row_number, row)], "deletes":
+    [row_number], "unchanged": int}. Unchanged rows keep their old Date Synced
+    in new_rows (mutated in place) so the snapshot matches the sheet.
+    """
+    key_idx = columns.index(key_col)
+    compare_idx = [i for i, c in enumerate(columns) if c not in _SYNC_IGNORED_COLUMNS]
+    kept_idx = [i for i, c in enumerate(columns) if c in _SYNC_IGNORED_COLUMNS]
+    old_by_key = {}
+    for rec in old_records or []:
+        k = (rec.get(key_col) or "").strip()
+        if k:
+            old_by_key.setdefault(k, [rec.get(c, "") for c in columns])
+
+    remaining = {k: list(v) for k, v in positions.items()}
+    inserts, updates, unchanged = [], [], 0
+    for row in new_rows:
+        key = str(row[key_idx]).strip()
+        slots = remaining.get(key) if key else None
+        if not slots:
+            inserts.append(row)
+            continue
+        row_number = slots.pop(0)
+        old = old_by_key.get(key)
+        if old is not None:
+            norm = territory_snapshot.normalize_row(columns, row)
+            if all(norm[i] == old[i] for i in compare_idx):
+                for i in kept_idx:
+                    row[i] = old[i]
+                unchanged += 1
+                continue
+        updates.append((row_number, row))
+
+    # Sheet rows nobody claimed: dropped from NCES, duplicates, or blank ids
+    deletes = sorted(n for slots in remaining.values() for n in slots)
+    return {"inserts": inserts, "updates": updates, "deletes": deletes, "unchanged": unchanged}
+
+
+def _apply_state_diff(service, sheet_id: str, tab_name: str, tab_id: int,
+                      columns: list[str], diff: dict, errors: list):
+    """Write one state's diff: batched value updates, then row deletes, then appends."""
+    updates = diff["updates"]
+    for i in range(0, len(updates), _UPDATE_BATCH_SIZE):
+        data = [{"range": f"'{tab_name}'!A{n}", "values": [row]}
+                for n, row in updates[i:i + _UPDATE_BATCH_SIZE]]
+        for attempt in range(3):
+            try:
+                service.spreadsheets().values().batchUpdate(
+                    spreadsheetId=sheet_id,
+                    body={"valueInputOption": "RAW", "data": data},
+                ).execute()
+                break
+            except Exception as e:
+                logger.warning(f"{tab_name} update batch attempt {attempt + 1} failed: {e}")
+                if attempt < 2:
+                    time.sleep(2 * (attempt + 1))
+                else:
+                    errors.append(f"{tab_name} update batch: {e}")
+
+    # Delete bottom-up in contiguous runs so earlier row numbers stay valid
+    runs = []
+    for n in sorted(diff["deletes"], reverse=True):
+        if runs and runs[-1][0] == n + 1:
+            runs[-1][0] = n
+        else:
+            runs.append([n, n])
+    if runs:
+        service.spreadsheets().batchUpdate(
+            spreadsheetId=sheet_id,
+            body={"requests": [{
+                "deleteDimension": {
+                    "range": {"sheetId": tab_id, "dimension": "ROWS",
+                              "startIndex": start - 1, "endIndex": end},
+                }
+            } for start, end in runs]},
+        ).execute()
+
+    if diff["inserts"]:
+        _append_in_chunks(service, sheet_id, tab_name, diff["inserts"], errors,
+                          num_cols=len(columns))
+
+
+def _sync_state_incremental(service, sheet_id: str, tab_name: str, tab_id: int,
+                            kind: str, columns: list[str], state: str,
+                            new_rows: list[list], errors: list) -> dict:
+    """Diff-sync one kind for one state. Returns the change counts.
+
+    Cell values are compared against the local snapshot, not read back from
+    the sheet: the snapshot is the record of what the last sync wrote, so a
+    manual edit to a territory row is only corrected by a full diff. A full
+    diff (every existing row rewritten) runs when the state has no snapshot
+    partition or when the ids in the sheet for the state differ from the
+    snapshot's — rows added or removed by hand, or a previous sync whose
+    writes failed.
+    """
+    key_col = _SYNC_KEY_COLUMN[kind]
+    positions = _read_state_positions(service, sheet_id, tab_name, columns, key_col, state)
+    old_records = None
+    if state in territory_snapshot.snapshot_states(kind):
+        old_records = territory_snapshot.load_rows(kind, state)
+    if old_records is not None:
+        sheet_keys = {k for k in positions if k}
+        snapshot_keys = {(rec.get(key_col) or "").strip() for rec in old_records} - {""}
+        if sheet_keys != snapshot_keys:
+            logger.info(f"{tab_name} {state}: sheet ids differ from the snapshot "
+                        f"({len(sheet_keys)} vs {len(snapshot_keys)}) — full diff")
+            old_records = None
+    diff = _diff_state_rows(columns, key_col, new_rows, old_records, positions)
+    _apply_state_diff(service, sheet_id, tab_name, tab_id, columns, diff, errors)
+    return {
+        "inserted": len(diff["inserts"]),
+        "updated": len(diff["updates"]),
+        "deleted": len(diff["deletes"]),
+        "unchanged": diff["unchanged"],
+    }
+
+
 # ─────────────────────────────────────────────
 # PUBLIC FUNCTIONS
 # ─────────────────────────────────────────────
@@ -697,19 +1020,37 @@ def clear_territory() -> dict:
                 cleared["errors"].append(f"{tab_name}: {e}")
     except Exception as e:
         cleared["errors"].append(str(e))
+    try:
+        territory_snapshot.clear()
+    except Exception as e:
+        logger.warning(f"Territory snapshot clear failed: {e}")
+    territory_index.invalidate()
     cleared["success"] = True
     return cleared
 
 
-def sync_territory(states: list[str] | None = None) -> dict:
+def sync_territory(states: list[str] | None = None, concurrent: bool = True,
+                   incremental: bool = True) -> dict:
     """Download NCES data and write to Territory sheet.
 
     Args:
         states: list of state abbreviations. None = all territory states + CA.
+        concurrent: fetch all states in parallel (see _iter_state_rows). Sheets
+            writes stay sequential either way. False = one state at a time.
+        incremental: diff each state against the sheet by LEAID / NCESSCH and
+            write only inserted, updated and deleted rows (cell values are
+            compared with the snapshot — see _sync_state_incremental). False =
+            clear the state's rows and re-append everything.
+
+    A state whose sheet writes fail is reported in errors and its snapshot
+    partition is left as it was, so the next incremental sync still sees the
+    difference and re-issues the writes.
 
     Returns dict with keys: success, districts_synced, schools_synced,
-    states_completed, errors.
+    states_completed, errors, elapsed_seconds, and (incremental) changes —
+    {state: {"districts": {inserted, updated, deleted, unchanged}, "schools": {...}}}.
     """
+    t0 = time.time()
     if states is None:
         states = sorted(TERRITORY_STATES | {"CA"})
     else:
@@ -730,47 +1071,80 @@ def sync_territory(states: list[str] | None = None) -> dict:
     total_districts = 0
     total_schools = 0
     states_done = []
+    changes = {}
 
     # Ensure tabs exist
-    d_service, d_sheet_id, _ = _ensure_tab(TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS)
-    _ensure_tab(TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS)
+    d_service, d_sheet_id, d_tab_id = _ensure_tab(TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS)
+    _, _, s_tab_id = _ensure_tab(TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS)
 
-    for state in states:
-        logger.info(f"Syncing territory data for {state}...")
+    logger.info(f"Syncing territory data for {', '.join(states)} "
+                f"({'concurrent' if concurrent else 'serial'} fetch)...")
+    for state, district_rows, school_rows, fetch_error in _iter_state_rows(states, concurrent):
         try:
-            # Fetch from API (with caching)
-            districts = _fetch_districts_for_state(state)
-            schools = _fetch_schools_for_state(state)
-
-            # Build rows
-            district_rows = [_build_district_row(d, state) for d in districts]
-            school_rows = [_build_school_row(s, state) for s in schools]
+            if fetch_error is not None:
+                raise fetch_error
 
-            # Clear existing rows for this state before writing new ones
             service = _get_service()
             sheet_id = _get_territory_sheet_id()
-            _clear_state_rows(service, sheet_id, TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS, state)
-            _clear_state_rows(service, sheet_id, TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS, state)
-
-            # Append new rows
-            if district_rows:
-                _append_in_chunks(service, sheet_id, TAB_TERRITORY_DISTRICTS,
-                                  district_rows, errors, num_cols=len(DISTRICT_COLUMNS))
-                total_districts += len(district_rows)
+            errors_before = len(errors)
+            if incremental:
+                # Write only what changed since the last sync
+                changes[state] = {
+                    "districts": _sync_state_incremental(
+                        service, sheet_id, TAB_TERRITORY_DISTRICTS, d_tab_id, "districts",
+                        DISTRICT_COLUMNS, state, district_rows, errors),
+                    "schools": _sync_state_incremental(
+                        service, sheet_id, TAB_TERRITORY_SCHOOLS, s_tab_id, "schools",
+                        SCHOOL_COLUMNS, state, school_rows, errors),
+                }
+            else:
+                # Clear existing rows for this state before writing new ones
+                _clear_state_rows(service, sheet_id, TAB_TERRITORY_DISTRICTS, DISTRICT_COLUMNS, state)
+                _clear_state_rows(service, sheet_id, TAB_TERRITORY_SCHOOLS, SCHOOL_COLUMNS, state)
+
+                # Append new rows
+                if district_rows:
+                    _append_in_chunks(service, sheet_id, TAB_TERRITORY_DISTRICTS,
+                                      district_rows, errors, num_cols=len(DISTRICT_COLUMNS))
+                if school_rows:
+                    _append_in_chunks(service, sheet_id, TAB_TERRITORY_SCHOOLS,
+                                      school_rows, errors, num_cols=len(SCHOOL_COLUMNS))
+            if len(errors) > errors_before:
+                # Keep the old snapshot so the failed rows still differ next run
+                raise RuntimeError("sheet writes failed; snapshot not updated, next sync retries")
+            total_districts += len(district_rows)
+            total_schools += len(school_rows)
+
+            # Refresh the local snapshot partitions so readers skip Sheets
+            try:
+                territory_snapshot.write_states("districts", DISTRICT_COLUMNS,
+                                                district_rows, states=[state])
+                territory_snapshot.write_states("schools", SCHOOL_COLUMNS,
+                                                school_rows, states=[state])
+            except Exception as e:
+                logger.warning(f"Territory snapshot write failed for {state}: {e}")
 
-            if school_rows:
-                _append_in_chunks(service, sheet_id, TAB_TERRITORY_SCHOOLS,
-                                  school_rows, errors, num_cols=len(SCHOOL_COLUMNS))
-                total_schools += len(school_rows)
+            # Precompute the district → ESA assignment table from the new partition
+            try:
+                from tools.proximity_engine import rebuild_esa_assignments
+                rebuild_esa_assignments(state)
+            except Exception as e:
+                logger.warning(f"ESA assignment rebuild failed for {state}: {e}")
 
             states_done.append(state)
             logger.info(f"{state}: {len(district_rows)} districts, {len(school_rows)} schools synced")
+            if state in changes:
+                logger.info(f"{state} changes: {changes[state]}")
 
         except Exception as e:
             err_msg = f"{state}: {e}"
             logger.error(f"Sync failed for {state}: {e}")
             errors.append(err_msg)
 
+    # Shared matcher/proximity indexes rebuild from the new snapshot on next use
+    if states_done:
+        territory_index.invalidate()
+
     # Format tabs
     try:
         service = _get_service()
@@ -780,12 +1154,16 @@ def sync_territory(states: list[str] | None = None) -> dict:
     except Exception as e:
         logger.warning(f"Tab formatting failed: {e}")
 
+    # Concurrent fetches complete out of order; report in request order
+    states_done.sort(key=states.index)
     return {
         "success": len(states_done) > 0,
         "districts_synced": total_districts,
         "schools_synced": total_schools,
         "states_completed": states_done,
         "errors": errors,
+        "elapsed_seconds": round(time.time() - t0, 1),
+        "changes": changes,
     }
 
 
@@ -896,6 +1274,7 @@ def get_territory_gaps(state: str) -> dict:
         districts_with_active_schools = set()
         matched_schools = []
         unmatched_schools = []
+        school_fuzzy_index = csv_importer.FuzzyNameIndex(school_to_district_key)
         for school_key in active_school_keys:
             district_key = school_to_district_key.get(school_key.lower())
             if district_key:
@@ -904,7 +1283,7 @@ def get_territory_gaps(state: str) -> dict:
             else:
                 # Fuzzy match: try token overlap against NCES school names
                 fuzzy_key = csv_importer.fuzzy_match_name(
-                    school_key.lower(), school_to_district_key, threshold=0.7)
+                    school_key.lower(), school_fuzzy_index, threshold=0.7)
                 if fuzzy_key:
                     districts_with_active_schools.add(school_to_district_key[fuzzy_key])
                     matched_schools.append(school_key)
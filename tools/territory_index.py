@@ -0,0 +1,536 @@
+"""
+tools/territory_index.py — Process-wide NCES territory index.
+
+One set of in-memory indexes over the Territory Districts / Territory Schools
+data, shared by every matcher that used to build its own copy:
+
+  - territory_matcher  (name-key, suffix-stripped, domain-root, city+state,
+                        city → states, district-name root → states)
+  - signal_processor   (normalized district name → state, city → states)
+  - lead_filters       (state-aware grade-span TerritoryIndex)
+  - proximity_engine   (per-state Name Key → lat/lon, per-state lat/lon grid)
+
+The index is built once per territory snapshot generation (see
+territory_snapshot). sync_territory / clear_territory call invalidate(); other
+processes pick up a new generation within _GENERATION_CHECK_INTERVAL seconds.
+Edits made directly in the sheet don't move the generation, so every
+territory_data.SHEET_RECHECK_SECONDS get_index() also starts a background
+territory_data.refresh_snapshot_from_sheet(); a changed tab is rewritten into
+the snapshot, which bumps the generation like a sync does.
+Rebuilds construct a complete new TerritoryIndex and swap the module reference,
+so readers holding the old one are never handed a half-built index.
+
+Warm start: each non-empty build is also pickled to
+{TERRITORY_SNAPSHOT_DIR}/territory_index.bin, stamped with the snapshot
+generation. After a restart, get_index() unpickles that file (a plain, eager
+pickle.load — the whole index, minus its lazy per-state caches) instead of
+re-reading rows and rebuilding; it rebuilds only when the generation (or
+_PERSIST_VERSION) differs. agent/main.py calls warm_start() in the background
+at boot so the first command doesn't wait. The snapshot directory has to be
+on a persistent volume (see agent.config.DATA_DIR) for this to survive a
+redeploy.
+
+File format:
+  8 bytes  magic b"SCTIDX01"
+  4 bytes  uint32 header length (little-endian)
+  N bytes  JSON header: {version, generation, built_at, schools, districts}
+  rest     pickle of the TerritoryIndex (lazy per-state/consumer caches excluded)
+
+Usage (module-level, not a class):
+  import tools.territory_index as territory_index
+  idx = territory_index.get_index()
+  recs = idx.districts_by_key.get("austin", [])
+  geo = idx.geo_for_state("TX")
+"""
+
+import json
+import logging
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+from collections import defaultdict
+
+import tools.csv_importer as csv_importer
+
+logger = logging.getLogger(__name__)
+
+# How often get_index() re-reads the snapshot manifest for a newer generation
+_GENERATION_CHECK_INTERVAL = 30
+
+# signal_processor's short-name suffixes (applied to the normalized key)
+_SIGNAL_SHORT_RE = re.compile(
+    r"\s*(independent school district|unified school district|"
+    r"school district|public schools|city schools|county schools)\s*$",
+    re.IGNORECASE,
+)
+
+# Warm-start file: bump _PERSIST_VERSION whenever TerritoryIndex's fields change
+_PERSIST_MAGIC = b"SCTIDX01"
+_PERSIST_VERSION = 1
+_PERSIST_FILENAME = "territory_index.bin"
+
+_index = None
+_last_generation_check = 0.0
+_last_sheet_check = 0.0
+_build_lock = threading.Lock()
+
+
+class TerritoryIndex:
+    """All NCES territory indexes for one snapshot generation. Treat as read-only."""
+
+    def __init__(self, schools: list[dict], districts: list[dict], generation: int):
+        # Local import: territory_matcher owns the name/domain helpers and
+        # imports this module lazily from ensure_cache().
+        from tools.territory_matcher import _strip_school_suffixes, generate_domain_roots
+
+        t0 = time.time()
+        self.generation = generation
+        self.built_at = time.time()
+        self.schools = schools
+        self.districts = districts
+
+        schools_by_key = {}
+        schools_by_stripped = {}
+        districts_by_key = {}
+        districts_by_stripped = {}
+        by_domain_root = {}
+        by_city_state = {}
+
+        for s in schools:
+            nk = (s.get("Name Key") or "").strip().lower()
+            if nk:
+                schools_by_key.setdefault(nk, []).append(s)
+            sn = _strip_school_suffixes(s.get("School Name") or "")
+            if sn and len(sn) >= 3:
+                schools_by_stripped.setdefault(sn, []).append(s)
+            city = (s.get("City") or "").strip().lower()
+            state = (s.get("State") or "").strip().upper()
+            if city and state:
+                by_city_state.setdefault((city, state), []).append(s)
+
+        district_name_to_states = {}
+        district_to_state = {}
+        district_city_to_states = defaultdict(set)
+
+        for d in districts:
+            d_name = d.get("District Name") or ""
+            d_state = (d.get("State") or "").strip().upper()
+            nk = (d.get("Name Key") or "").strip().lower()
+            if nk:
+                districts_by_key.setdefault(nk, []).append(d)
+            dn = _strip_school_suffixes(d_name)
+            if dn and len(dn) >= 3:
+                districts_by_stripped.setdefault(dn, []).append(d)
+            for root in generate_domain_roots(d_name):
+                by_domain_root.setdefault(root, []).append(d)
+            city = (d.get("City") or "").strip().lower()
+            if city and d_state:
+                by_city_state.setdefault((city, d_state), []).append(d)
+
+            # District name root → states (domain matching: spaces stripped)
+            if d_name.strip() and d_state:
+                core = _strip_school_suffixes(d_name.strip().lower())
+                if core and len(core) >= 4:
+                    district_name_to_states.setdefault(core.replace(" ", ""), set()).add(d_state)
+
+            # signal_processor lookups (raw State / City values, as before)
+            raw_state = d.get("State", "")
+            raw_city = d.get("City", "")
+            if d_name and raw_state:
+                key = csv_importer.normalize_name(d_name)
+                district_to_state[key] = raw_state
+                short = _SIGNAL_SHORT_RE.sub("", key).strip()
+                if short and short != key:
+                    district_to_state[short] = raw_state
+            if raw_city and raw_state:
+                district_city_to_states[raw_city.lower()].add(raw_state)
+
+        # City → states (both spaced and space-stripped, for domain containment)
+        city_to_states = {}
+        for (city, state) in by_city_state:
+            city_to_states.setdefault(city, set()).add(state)
+            city_nospace = city.replace(" ", "")
+            if city_nospace != city:
+                city_to_states.setdefault(city_nospace, set()).add(state)
+
+        self.schools_by_key = schools_by_key
+        self.schools_by_stripped = schools_by_stripped
+        self.districts_by_key = districts_by_key
+        self.districts_by_stripped = districts_by_stripped
+        self.by_domain_root = by_domain_root
+        self.by_city_state = by_city_state
+        self.city_to_states = city_to_states
+        self.district_name_to_states = district_name_to_states
+        self.district_to_state = district_to_state
+        self.district_city_to_states = dict(district_city_to_states)
+
+        self._geo_by_state: dict[str, tuple[dict, dict]] = {}
+        self._points_by_state: dict[tuple[str, str], StatePoints] = {}
+        self._grade_span_index = None
+        self._substring_indexes: dict[str, object] = {}
+        self._lazy_lock = threading.Lock()
+        self.build_seconds = time.time() - t0
+
+    # ── lazily-built, per-state / per-consumer indexes ──
+
+    def geo_for_state(self, state: str) -> tuple[dict, dict]:
+        """Return ({district Name Key: (lat, lon)}, {school Name Key: (lat, lon)}) for a state.
+
+        Later rows win on duplicate Name Keys, matching the old per-call dicts
+        in proximity_engine._get_active_account_locations.
+        """
+        st = (state or "").strip().upper()
+        hit = self._geo_by_state.get(st)
+        if hit is not None:
+            return hit
+        with self._lazy_lock:
+            hit = self._geo_by_state.get(st)
+            if hit is not None:
+                return hit
+            district_geo = _geo_map(r for r in self.districts if (r.get("State", "") or "").upper() == st)
+            school_geo = _geo_map(r for r in self.schools if (r.get("State", "") or "").upper() == st)
+            self._geo_by_state[st] = (district_geo, school_geo)
+            return district_geo, school_geo
+
+    def points_for_state(self, kind: str, state: str) -> "StatePoints":
+        """StatePoints (rows + parsed Lat/Lon/Enrollment + GeoGridIndex) for one state.
+
+        kind is "districts" or "schools". Rows keep territory order.
+        """
+        st = (state or "").strip().upper()
+        key = (kind, st)
+        hit = self._points_by_state.get(key)
+        if hit is not None:
+            return hit
+        with self._lazy_lock:
+            hit = self._points_by_state.get(key)
+            if hit is None:
+                rows = self.districts if kind == "districts" else self.schools
+                hit = StatePoints([r for r in rows if (r.get("State", "") or "").upper() == st])
+                self._points_by_state[key] = hit
+            return hit
+
+    def stripped_substring_index(self, entity_type: str):
+        """SubstringIndex over schools_by_stripped / districts_by_stripped keys (6+ chars)."""
+        source = self.schools_by_stripped if entity_type == "school" else self.districts_by_stripped
+        return self._substring_index(entity_type, lambda: source.keys())
+
+    def unique_city_substring_index(self):
+        """SubstringIndex over city_to_states keys of 6+ chars that map to exactly one state.
+
+        Keys keep city_to_states order, for lookup_state_from_nces's
+        city-contained-in-domain step.
+        """
+        return self._substring_index("unique_city", lambda: (
+            city for city, states in self.city_to_states.items()
+            if len(city) >= 6 and len(states) == 1
+        ))
+
+    def _substring_index(self, name: str, keys):
+        hit = self._substring_indexes.get(name)
+        if hit is not None:
+            return hit
+        with self._lazy_lock:
+            if name not in self._substring_indexes:
+                from tools.substring_index import SubstringIndex
+                self._substring_indexes[name] = SubstringIndex(keys(), min_key_len=6)
+            return self._substring_indexes[name]
+
+    @property
+    def grade_span_index(self):
+        """lead_filters.TerritoryIndex (7-way, state-aware grade-span index) over Territory Schools."""
+        if self._grade_span_index is not None:
+            return self._grade_span_index
+        with self._lazy_lock:
+            if self._grade_span_index is None:
+                from tools.lead_filters import index_from_columns
+                self._grade_span_index = index_from_columns(
+                    [s.get("State", "") for s in self.schools],
+                    [s.get("School Name", "") for s in self.schools],
+                    [s.get("District Name", "") for s in self.schools],
+                    [s.get("Grade Span", "") for s in self.schools],
+                )
+            return self._grade_span_index
+
+    # ── pickling (warm-start file) ──
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for lazy in ("_geo_by_state", "_points_by_state", "_grade_span_index",
+                     "_substring_indexes", "_lazy_lock"):
+            state.pop(lazy, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._geo_by_state = {}
+        self._points_by_state = {}
+        self._grade_span_index = None
+        self._substring_indexes = {}
+        self._lazy_lock = threading.Lock()
+
+    def stats(self) -> dict:
+        return {
+            "generation": self.generation,
+            "schools": len(self.schools),
+            "districts": len(self.districts),
+            "school_keys": len(self.schools_by_key),
+            "district_keys": len(self.districts_by_key),
+            "domain_roots": len(self.by_domain_root),
+            "city_state_combos": len(self.by_city_state),
+            "unique_cities": len(self.city_to_states),
+            "district_name_roots": len(self.district_name_to_states),
+            "build_seconds": round(self.build_seconds, 2),
+            "age_seconds": int(time.time() - self.built_at),
+        }
+
+
+class StatePoints:
+    """One state's district or school rows with Lat/Lon/Enrollment parsed once.
+
+    lats/lons are None where unparseable; enrollments use proximity_engine's
+    int(x or 0) rule (0 on bad values). grid (radius queries) and array
+    (vectorized many-to-many) both index rows by position.
+    """
+
+    def __init__(self, rows: list[dict]):
+        from tools.spatial_index import GeoGridIndex
+
+        self.rows = rows
+        self.lats = [_parse_coord(r.get("Lat")) for r in rows]
+        self.lons = [_parse_coord(r.get("Lon")) for r in rows]
+        self.enrollments = [_parse_enrollment(r.get("Enrollment", 0)) for r in rows]
+        self.grid = GeoGridIndex(zip(self.lats, self.lons))
+        self._array = None
+
+    @property
+    def array(self):
+        """spatial_index.PointArray over these rows (built on first use)."""
+        if self._array is None:
+            from tools.spatial_index import PointArray
+            self._array = PointArray(zip(self.lats, self.lons))
+        return self._array
+
+
+def _parse_coord(val):
+    if val is None or val == "":
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_enrollment(val) -> int:
+    try:
+        return int(val or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _geo_map(rows) -> dict:
+    geo = {}
+    for r in rows:
+        nk = r.get("Name Key", "")
+        if not nk:
+            continue
+        try:
+            lat = float(r.get("Lat"))
+            lon = float(r.get("Lon"))
+        except (ValueError, TypeError):
+            continue
+        geo[nk] = (lat, lon)
+    return geo
+
+
+# ─────────────────────────────────────────────
+# WARM-START PERSISTENCE
+# ─────────────────────────────────────────────
+
+def _persist_path() -> str:
+    import tools.territory_snapshot as territory_snapshot
+    return os.path.join(territory_snapshot.SNAPSHOT_DIR, _PERSIST_FILENAME)
+
+
+def _save_persisted(idx: TerritoryIndex):
+    """Write idx to the warm-start file (temp file + rename). Never raises."""
+    path = _persist_path()
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        t0 = time.time()
+        header = json.dumps({
+            "version": _PERSIST_VERSION,
+            "generation": idx.generation,
+            "built_at": idx.built_at,
+            "schools": len(idx.schools),
+            "districts": len(idx.districts),
+        }).encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(_PERSIST_MAGIC + struct.pack("<I", len(header)) + header)
+            pickle.dump(idx, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        logger.info(f"territory_index: persisted generation {idx.generation} "
+                    f"({os.path.getsize(path) / 1e6:.1f} MB, {time.time() - t0:.1f}s)")
+    except Exception as e:
+        logger.warning(f"territory_index: persist failed: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _load_persisted(generation: int) -> TerritoryIndex | None:
+    """Load the warm-start file if it was written for this generation, else None."""
+    if generation <= 0:
+        return None
+    path = _persist_path()
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(_PERSIST_MAGIC)) != _PERSIST_MAGIC:
+                return None
+            (hlen,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(hlen))
+            if header.get("version") != _PERSIST_VERSION or header.get("generation") != generation:
+                logger.info(f"territory_index: warm-start file is stale "
+                            f"(generation {header.get('generation')}, want {generation})")
+                return None
+            if not header.get("schools") and not header.get("districts"):
+                return None
+            t0 = time.time()
+            idx = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"territory_index: warm-start load failed, rebuilding: {e}")
+        return None
+    if not isinstance(idx, TerritoryIndex):
+        return None
+    logger.info(f"territory_index: warm-started generation {generation} in "
+                f"{time.time() - t0:.2f}s — {len(idx.schools)} schools, {len(idx.districts)} districts")
+    return idx
+
+
+def ensure_persisted() -> bool:
+    """Write the warm-start file for the current index now, unless it's already on disk.
+
+    For processes that are about to spawn workers which load the index
+    themselves (territory_matcher.match_records(workers=...)): the build's own
+    persist runs in the background and may not have landed yet. Returns True
+    if the file matches the current index.
+    """
+    idx = _index
+    if idx is None or idx.generation <= 0:
+        return False
+    try:
+        with open(_persist_path(), "rb") as f:
+            if f.read(len(_PERSIST_MAGIC)) == _PERSIST_MAGIC:
+                (hlen,) = struct.unpack("<I", f.read(4))
+                header = json.loads(f.read(hlen))
+                if (header.get("version") == _PERSIST_VERSION
+                        and header.get("generation") == idx.generation):
+                    return True
+    except (OSError, ValueError, struct.error):
+        pass
+    _save_persisted(idx)
+    return os.path.exists(_persist_path())
+
+
+# ─────────────────────────────────────────────
+# BUILD / ACCESS
+# ─────────────────────────────────────────────
+
+def _build(allow_warm_start: bool = True) -> TerritoryIndex:
+    import tools.territory_data as territory_data
+    import tools.territory_snapshot as territory_snapshot
+
+    if allow_warm_start:
+        idx = _load_persisted(territory_snapshot.get_generation())
+        if idx is not None:
+            return idx
+
+    logger.info("territory_index: building shared NCES index...")
+    schools = territory_data._load_territory_schools()
+    districts = territory_data._load_territory_districts()
+    # Read the generation after loading: a Sheets fallback seeds the snapshot
+    generation = territory_snapshot.get_generation()
+    idx = TerritoryIndex(schools, districts, generation)
+    logger.info(
+        f"territory_index: built generation {generation} in {idx.build_seconds:.1f}s — "
+        f"{len(schools)} schools, {len(districts)} districts, "
+        f"{len(idx.by_domain_root)} domain roots, {len(idx.city_to_states)} unique cities"
+    )
+    if not schools and not districts:
+        # Nothing loaded (Sheets unreachable, empty tabs): don't persist it, and
+        # stamp a generation no snapshot has so the next generation check retries
+        logger.warning("territory_index: no territory rows loaded; will retry")
+        idx.generation = -1
+    elif generation > 0:
+        # Off the caller's path: the first command shouldn't wait on the write
+        threading.Thread(target=_save_persisted, args=(idx,), daemon=True,
+                         name="territory-index-persist").start()
+    return idx
+
+
+def get_index(force_rebuild: bool = False) -> TerritoryIndex:
+    """Return the shared index, building it on first use or when the snapshot generation moves."""
+    global _index, _last_generation_check, _last_sheet_check
+
+    idx = _index
+    if idx is not None and not force_rebuild:
+        now = time.time()
+        if now - _last_generation_check < _GENERATION_CHECK_INTERVAL:
+            return idx
+        import tools.territory_snapshot as territory_snapshot
+        _last_generation_check = now
+        _maybe_recheck_sheet(now)
+        if territory_snapshot.get_generation() == idx.generation:
+            return idx
+
+    with _build_lock:
+        # Another thread may have rebuilt while we waited
+        if _index is not None and _index is not idx and not force_rebuild:
+            return _index
+        new_idx = _build(allow_warm_start=not force_rebuild)
+        _index = new_idx
+        _last_generation_check = time.time()
+        if not _last_sheet_check:
+            _last_sheet_check = _last_generation_check
+        return new_idx
+
+
+def _maybe_recheck_sheet(now: float):
+    """Start a background sheet re-check if the last one is SHEET_RECHECK_SECONDS old."""
+    global _last_sheet_check
+    import tools.territory_data as territory_data
+
+    if now - _last_sheet_check < territory_data.SHEET_RECHECK_SECONDS:
+        return
+    _last_sheet_check = now
+    threading.Thread(target=territory_data.refresh_snapshot_from_sheet, daemon=True,
+                     name="territory-sheet-recheck").start()
+
+
+def warm_start():
+    """Load (or build) the shared index ahead of the first command. Never raises."""
+    try:
+        get_index()
+    except Exception as e:
+        logger.warning(f"territory_index: warm start failed: {e}")
+
+
+def peek_index() -> TerritoryIndex | None:
+    """Return the current index without building one."""
+    return _index
+
+
+def invalidate():
+    """Drop the shared index. Called by territory_data when the territory is re-synced."""
+    global _index, _last_generation_check
+    with _build_lock:
+        _index = None
+        _last_generation_check = 0.0
+    logger.info("territory_index: invalidated")
@@ -8,17 +8,104 @@ Layers:
   - ESAs (purple) — regional service centers (Agency Type 4)
   - All Districts (gray, clustered) — full NCES territory
 
+Rendering is cached at three levels, so a repeat request only re-reads the
+source tabs and compares fingerprints:
+  - District base (per state): popups, coordinates and the Name Key → lat/lon
+    lookup, persisted as territory_snapshot derived table "map_districts" and
+    rebuilt only when that state's partition changes.
+  - Layer GeoJSON: one compact FeatureCollection string per layer + state
+    filter, rebuilt only when the layer's source records change.
+  - HTML: the last rendered page per state filter, reused while every layer
+    fingerprint is unchanged.
+Each layer is emitted once as GeoJSON and turned into (clustered) markers in
+the browser, instead of one Folium object — and one block of JS — per marker.
+
 Usage:
   generate_territory_map() -> str  # returns HTML string
   generate_territory_map_file(output_path) -> str  # writes to file, returns path
 """
 
+import hashlib
+import json
 import logging
+import math
 import os
 import tempfile
+import threading
+
+from folium.plugins import MarkerCluster
+from folium.template import Template
+
+import tools.territory_snapshot as territory_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Agency Type values that go on the ESA layer (NCES code or its label)
+_ESA_AGENCY_TYPES = {"4", "Regional education service agency"}
+
+# Derived snapshot table holding the per-state district base (see _district_base)
+_MAP_TABLE = "map_districts"
+
+# GeoJSON coordinate precision: 5 decimals ≈ 1 m
+_COORD_DECIMALS = 5
+
+_cache_lock = threading.Lock()
+_base_cache: dict[str, tuple[int, dict]] = {}          # state → (partition generation, base)
+_layer_cache: dict[tuple, tuple[str, str, int]] = {}    # (layer, state) → (fingerprint, geojson, count)
+_html_cache: dict[str, tuple[tuple, str]] = {}          # state filter → (fingerprints, html)
+
+
+class _GeoJsonMarkers(MarkerCluster):
+    """A layer built in the browser from one GeoJSON string.
+
+    Every feature becomes a marker via the point_to_layer JS function and gets
+    its properties.p HTML as popup. clustered=True groups them with
+    Leaflet.markercluster; otherwise they sit in a plain feature group.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                var group = {% if this.clustered -%}
+                    L.markerClusterGroup({{ this.options|tojavascript }})
+                {%- else -%}
+                    L.featureGroup()
+                {%- endif %};
+                L.geoJSON({{ this.geojson }}, {
+                    pointToLayer: {{ this.point_to_layer }},
+                    onEachFeature: function (feature, layer) {
+                        layer.bindPopup(feature.properties.p, {maxWidth: 250});
+                    }
+                }).eachLayer(function (layer) { group.addLayer(layer); });
+                return group;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, geojson: str, point_to_layer: str, name: str,
+                 show: bool = True, clustered: bool = False):
+        super().__init__(name=name, show=show)
+        self._name = "GeoJsonMarkers"
+        self.geojson = geojson
+        self.point_to_layer = point_to_layer
+        self.clustered = clustered
+
+
+def _icon_marker_js(color: str, icon: str) -> str:
+    """pointToLayer for a folium.Icon-style AwesomeMarkers pin."""
+    return (
+        "function (feature, latlng) { return L.marker(latlng, {icon: L.AwesomeMarkers.icon("
+        f"{{markerColor: {json.dumps(color)}, icon: {json.dumps(icon)}, "
+        "iconColor: 'white', prefix: 'glyphicon'})}); }"
+    )
+
+
+_DISTRICT_MARKER_JS = (
+    "function (feature, latlng) { return L.circleMarker(latlng, {radius: 3, "
+    "color: '#999999', fill: true, fillColor: '#cccccc', fillOpacity: 0.5}); }"
+)
+
 
 def generate_territory_map(state_filter: str = "") -> str:
     """
@@ -27,13 +114,14 @@ def generate_territory_map(state_filter: str = "") -> str:
     Returns HTML string.
     """
     import folium
-    from folium.plugins import MarkerCluster, HeatMap
+    from folium.plugins import HeatMap
 
     import tools.csv_importer as csv_importer
-    import tools.territory_data as territory_data
     import tools.district_prospector as district_prospector
     import tools.pipeline_tracker as pipeline_tracker
 
+    sf = state_filter.strip().upper()
+
     # ── Load all data sources ──
     logger.info("Loading territory data for map...")
 
@@ -44,7 +132,6 @@ def generate_territory_map(state_filter: str = "") -> str:
         pipeline_opps = pipeline_tracker.get_open_opps()
         if state_filter:
             # Pipeline doesn't have a state filter param — filter manually
-            sf = state_filter.strip().upper()
             pipeline_opps = [o for o in pipeline_opps if sf in o.get("Account Name", "").upper()
                             or o.get("State", "").upper() == sf]
     except Exception:
@@ -54,21 +141,20 @@ def generate_territory_map(state_filter: str = "") -> str:
     try:
         prospects = district_prospector.get_all_prospects()
         if state_filter:
-            sf = state_filter.strip().upper()
             prospects = [p for p in prospects if p.get("State", "").upper() == sf]
     except Exception:
         prospects = []
     logger.info(f"Prospects: {len(prospects)}")
 
-    districts = territory_data._load_territory_districts(state_filter)
-    logger.info(f"Territory districts: {len(districts)}")
+    try:
+        import tools.signal_processor as signal_processor
+        active_signals = signal_processor.get_active_signals(state_filter=state_filter)
+    except Exception as e:
+        logger.warning(f"Signal load failed (non-fatal): {e}")
+        active_signals = []
 
-    # ── Build NCES lookup for enriching popups ──
-    nces_by_key = {}
-    for d in districts:
-        key = d.get("Name Key", "")
-        if key:
-            nces_by_key[key] = d
+    base, base_fp = _district_layers(sf)
+    logger.info(f"Territory districts: {base['district_rows']}")
 
     # ── Build lookup sets for classification ──
     active_keys = set()
@@ -90,22 +176,46 @@ def generate_territory_map(state_filter: str = "") -> str:
         if key:
             prospect_keys.add(key)
 
+    # ── Per-layer fingerprints: a layer is rebuilt only when its inputs change ──
+    excluded = active_keys | pipeline_keys | prospect_keys
+    fingerprints = {
+        "districts": _digest([base_fp, sorted(excluded)]),
+        "esas": base_fp,
+        "prospects": _digest([base_fp, prospects]),
+        "pipeline": _digest([base_fp, pipeline_opps]),
+        "active": _digest([base_fp, active_accounts]),
+        "signals": _digest([base_fp, active_signals]),
+    }
+    html_key = tuple(sorted(fingerprints.items()))
+    with _cache_lock:
+        hit = _html_cache.get(sf)
+    if hit is not None and hit[0] == html_key:
+        logger.info(f"Territory map{' ' + sf if sf else ''}: unchanged, serving cached HTML")
+        return hit[1]
+
+    coords = _CoordLookup(base)
+
+    districts_json, placed_districts = _layer("districts", sf, fingerprints["districts"], lambda: [
+        (lat, lon, popup) for key, lat, lon, popup in base["districts"] if key not in excluded
+    ])
+    esa_json, esa_count = _layer("esas", sf, fingerprints["esas"], lambda: base["esas"])
+    prospect_json, prospect_count = _layer(
+        "prospects", sf, fingerprints["prospects"],
+        lambda: _prospect_points(prospects, coords, base["enrollment"]))
+    pipeline_json, pipeline_count = _layer(
+        "pipeline", sf, fingerprints["pipeline"],
+        lambda: _pipeline_points(pipeline_opps, coords, base["enrollment"]))
+    active_json, active_count = _layer(
+        "active", sf, fingerprints["active"],
+        lambda: _active_points(active_accounts, coords, base["enrollment"]))
+    heat_data = _signal_heat(sf, fingerprints["signals"], active_signals, coords)
+
     # ── Create map centered on US ──
-    if state_filter:
+    center_lat, center_lon, zoom = 39.8, -98.5, 5
+    if state_filter and base["center"]:
         # Center on first district with lat/lon in the filtered state
-        center_lat, center_lon, zoom = 39.8, -98.5, 5
-        for d in districts:
-            try:
-                lat = float(d.get("Lat", 0))
-                lon = float(d.get("Lon", 0))
-                if lat and lon:
-                    center_lat, center_lon = lat, lon
-                    zoom = 7
-                    break
-            except (ValueError, TypeError):
-                continue
-    else:
-        center_lat, center_lon, zoom = 39.8, -98.5, 5
+        center_lat, center_lon = base["center"]
+        zoom = 7
 
     m = folium.Map(
         location=[center_lat, center_lon],
@@ -113,89 +223,83 @@ def generate_territory_map(state_filter: str = "") -> str:
         tiles="CartoDB positron",
     )
 
-    # ── Layer: All Districts (gray, clustered) ──
-    district_cluster = MarkerCluster(name="All Districts (gray)", show=False)
-    placed_districts = 0
-    for d in districts:
-        try:
-            lat = float(d.get("Lat", 0))
-            lon = float(d.get("Lon", 0))
-        except (ValueError, TypeError):
-            continue
-        if not lat or not lon:
-            continue
+    _GeoJsonMarkers(districts_json, _DISTRICT_MARKER_JS, "All Districts (gray)",
+                    show=False, clustered=True).add_to(m)
+    _GeoJsonMarkers(esa_json, _icon_marker_js("purple", "info-sign"),
+                    "ESAs / Service Centers (purple)").add_to(m)
+    _GeoJsonMarkers(prospect_json, _icon_marker_js("blue", "search"), "Prospects (blue)").add_to(m)
+    _GeoJsonMarkers(pipeline_json, _icon_marker_js("orange", "briefcase"), "Pipeline (orange)").add_to(m)
+    _GeoJsonMarkers(active_json, _icon_marker_js("green", "ok-sign"), "Active Accounts (green)").add_to(m)
 
-        name_key = d.get("Name Key", "")
-        # Skip if already in active/pipeline/prospect (those get their own layer)
-        if name_key in active_keys or name_key in pipeline_keys or name_key in prospect_keys:
-            continue
+    # ── Layer: Signal Heat Map ──
+    signal_heat_count = len(heat_data)
+    if heat_data:
+        HeatMap(
+            heat_data,
+            name=f"Signal Density ({len(heat_data)})",
+            show=False,
+            radius=25,
+            blur=20,
+            max_zoom=13,
+        ).add_to(m)
+        logger.info(f"Signal heatmap: {signal_heat_count} points")
 
-        name = d.get("District Name", "Unknown")
-        state = d.get("State", "")
-        enrollment = d.get("Enrollment", "")
-        school_count = d.get("School Count", "")
-        city = d.get("City", "")
-        agency_type = d.get("Agency Type", "")
+    # ── Layer control ──
+    folium.LayerControl(collapsed=False).add_to(m)
 
-        # ESAs get their own layer
-        if str(agency_type) == "4":
-            continue
+    # ── Title ──
+    title_html = f"""
+    <div style="position: fixed; top: 10px; left: 60px; z-index: 1000;
+         background-color: white; padding: 10px 15px; border-radius: 5px;
+         box-shadow: 0 2px 6px rgba(0,0,0,0.3); font-family: Arial;">
+        <b>Scout Territory Map</b>
+        {f' — {state_filter.upper()}' if state_filter else ''}<br>
+        <span style="color:green;">&#9679;</span> Active ({active_count})
+        <span style="color:orange;">&#9679;</span> Pipeline ({pipeline_count})
+        <span style="color:blue;">&#9679;</span> Prospects ({prospect_count})
+        <span style="color:purple;">&#9679;</span> ESAs ({esa_count})
+        <span style="color:gray;">&#9679;</span> Districts ({placed_districts})
+        {f'<br><span style="color:red;">&#9679;</span> Signals ({signal_heat_count})' if signal_heat_count else ''}
+    </div>
+    """
+    m.get_root().html.add_child(folium.Element(title_html))
 
-        enroll_str = f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else (enrollment or "—")
-        popup_html = (f"<b>{name}</b><br>"
-                     f"{city + ', ' if city else ''}{state}<br>"
-                     f"Enrollment: {enroll_str}"
-                     f"{f' | Schools: {school_count}' if school_count else ''}")
-        folium.CircleMarker(
-            location=[lat, lon],
-            radius=3,
-            color="#999999",
-            fill=True,
-            fill_color="#cccccc",
-            fill_opacity=0.5,
-            popup=folium.Popup(popup_html, max_width=250),
-        ).add_to(district_cluster)
-        placed_districts += 1
-
-    district_cluster.add_to(m)
-    logger.info(f"District markers: {placed_districts}")
-
-    # ── Layer: ESAs (purple) ──
-    esa_group = folium.FeatureGroup(name="ESAs / Service Centers (purple)", show=True)
-    esa_count = 0
-    for d in districts:
-        if str(d.get("Agency Type", "")) != "4":
-            continue
-        try:
-            lat = float(d.get("Lat", 0))
-            lon = float(d.get("Lon", 0))
-        except (ValueError, TypeError):
-            continue
-        if not lat or not lon:
-            continue
+    # Standalone page (not the notebook iframe wrapper, which escapes everything twice)
+    html = m.get_root().render()
+    with _cache_lock:
+        _html_cache[sf] = (html_key, html)
+    logger.info(f"Territory map generated: {active_count} active, {pipeline_count} pipeline, "
+                f"{prospect_count} prospects, {esa_count} ESAs, {placed_districts} districts "
+                f"({len(html) // 1024} KB)")
+    return html
 
-        name = d.get("District Name", "Unknown")
-        state = d.get("State", "")
-        city = d.get("City", "")
-        popup_html = (f"<b>{name}</b><br>"
-                     f"{city + ', ' if city else ''}{state}<br>"
-                     f"ESA / Service Center")
-        folium.Marker(
-            location=[lat, lon],
-            popup=folium.Popup(popup_html, max_width=250),
-            icon=folium.Icon(color="purple", icon="info-sign"),
-        ).add_to(esa_group)
-        esa_count += 1
-    esa_group.add_to(m)
-    logger.info(f"ESA markers: {esa_count}")
-
-    # ── Layer: Prospects (blue) ──
-    prospect_group = folium.FeatureGroup(name="Prospects (blue)", show=True)
-    prospect_count = 0
+
+def generate_territory_map_file(output_path: str = "", state_filter: str = "") -> str:
+    """Generate map and save to HTML file. Returns file path."""
+    html = generate_territory_map(state_filter)
+    if not output_path:
+        output_path = os.path.join(tempfile.gettempdir(), "scout_territory_map.html")
+    with open(output_path, "w") as f:
+        f.write(html)
+    logger.info(f"Territory map saved to {output_path}")
+    return output_path
+
+
+# ─────────────────────────────────────────────
+# LAYER BUILDERS
+# ─────────────────────────────────────────────
+
+def _enroll_str(enrollment) -> str:
+    return f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else ""
+
+
+def _prospect_points(prospects: list, coords: "_CoordLookup", nces_enrollment: dict) -> list:
+    import tools.csv_importer as csv_importer
+
+    points = []
     for p in prospects:
         name_key = p.get("Name Key", "") or csv_importer.normalize_name(p.get("Account Name", ""))
-        # Find lat/lon from NCES data
-        matched = _find_district_coords(districts, name_key)
+        matched = coords.find(name_key)
         if not matched:
             continue
 
@@ -206,10 +310,8 @@ def generate_territory_map(state_filter: str = "") -> str:
         priority = p.get("Priority", "")
         est_enrollment = p.get("Est. Enrollment", "")
         # Enrich from NCES
-        nces = nces_by_key.get(name_key, {})
-        enrollment = est_enrollment or nces.get("Enrollment", "")
-        enroll_str = f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else ""
-        school_count = nces.get("School Count", "")
+        nces_enroll, school_count = nces_enrollment.get(name_key, ("", ""))
+        enroll_str = _enroll_str(est_enrollment or nces_enroll)
 
         popup_parts = [f"<b>{name}</b>", f"{state} | {strategy}"]
         if enroll_str:
@@ -217,22 +319,17 @@ def generate_territory_map(state_filter: str = "") -> str:
         if school_count:
             popup_parts[-1] += f" | Schools: {school_count}"
         popup_parts.append(f"Status: {status}" + (f" | Priority: {priority}" if priority else ""))
-        popup_html = "<br>".join(popup_parts)
-        folium.Marker(
-            location=[matched["lat"], matched["lon"]],
-            popup=folium.Popup(popup_html, max_width=250),
-            icon=folium.Icon(color="blue", icon="search"),
-        ).add_to(prospect_group)
-        prospect_count += 1
-    prospect_group.add_to(m)
-    logger.info(f"Prospect markers: {prospect_count}")
-
-    # ── Layer: Pipeline (yellow/orange) ──
-    pipeline_group = folium.FeatureGroup(name="Pipeline (orange)", show=True)
-    pipeline_count = 0
+        points.append((matched[0], matched[1], "<br>".join(popup_parts)))
+    return points
+
+
+def _pipeline_points(pipeline_opps: list, coords: "_CoordLookup", nces_enrollment: dict) -> list:
+    import tools.csv_importer as csv_importer
+
+    points = []
     for opp in pipeline_opps:
         name_key = csv_importer.normalize_name(opp.get("Account Name", ""))
-        matched = _find_district_coords(districts, name_key)
+        matched = coords.find(name_key)
         if not matched:
             continue
 
@@ -242,9 +339,7 @@ def generate_territory_map(state_filter: str = "") -> str:
         close_date = opp.get("Close Date", "")
         opp_name = opp.get("Opportunity Name", "")
         # Enrich from NCES
-        nces = nces_by_key.get(name_key, {})
-        enrollment = nces.get("Enrollment", "")
-        enroll_str = f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else ""
+        enroll_str = _enroll_str(nces_enrollment.get(name_key, ("", ""))[0])
 
         popup_parts = [f"<b>{name}</b>"]
         if opp_name:
@@ -254,23 +349,18 @@ def generate_territory_map(state_filter: str = "") -> str:
             popup_parts.append(f"Close: {close_date}")
         if enroll_str:
             popup_parts.append(f"Enrollment: {enroll_str}")
-        popup_html = "<br>".join(popup_parts)
-        folium.Marker(
-            location=[matched["lat"], matched["lon"]],
-            popup=folium.Popup(popup_html, max_width=250),
-            icon=folium.Icon(color="orange", icon="briefcase"),
-        ).add_to(pipeline_group)
-        pipeline_count += 1
-    pipeline_group.add_to(m)
-    logger.info(f"Pipeline markers: {pipeline_count}")
-
-    # ── Layer: Active Accounts (green) ──
-    active_group = folium.FeatureGroup(name="Active Accounts (green)", show=True)
-    active_count = 0
+        points.append((matched[0], matched[1], "<br>".join(popup_parts)))
+    return points
+
+
+def _active_points(active_accounts: list, coords: "_CoordLookup", nces_enrollment: dict) -> list:
+    import tools.csv_importer as csv_importer
+
+    points = []
     for acc in active_accounts:
         name_key = acc.get("Name Key", "") or csv_importer.normalize_name(
             acc.get("Active Account Name", "") or acc.get("Display Name", ""))
-        matched = _find_district_coords(districts, name_key)
+        matched = coords.find(name_key)
         if not matched:
             continue
 
@@ -281,10 +371,8 @@ def generate_territory_map(state_filter: str = "") -> str:
         revenue = acc.get("Lifetime Revenue", "")
         open_renewal = acc.get("Open Renewal", "")
         # Enrich from NCES
-        nces = nces_by_key.get(name_key, {})
-        enrollment = nces.get("Enrollment", "")
-        enroll_str = f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else ""
-        school_count = nces.get("School Count", "")
+        nces_enroll, school_count = nces_enrollment.get(name_key, ("", ""))
+        enroll_str = _enroll_str(nces_enroll)
 
         popup_parts = [f"<b>{name}</b>", f"{state} | {acc_type}"]
         if licenses:
@@ -298,120 +386,223 @@ def generate_territory_map(state_filter: str = "") -> str:
             popup_parts.append(f"Lifetime Rev: {revenue}")
         if open_renewal:
             popup_parts.append(f"Open Renewal: {open_renewal}")
-        popup_html = "<br>".join(popup_parts)
-        folium.Marker(
-            location=[matched["lat"], matched["lon"]],
-            popup=folium.Popup(popup_html, max_width=250),
-            icon=folium.Icon(color="green", icon="ok-sign"),
-        ).add_to(active_group)
-        active_count += 1
-    active_group.add_to(m)
-    logger.info(f"Active account markers: {active_count}")
+        points.append((matched[0], matched[1], "<br>".join(popup_parts)))
+    return points
 
-    # ── Layer: Signal Heat Map ──
-    signal_heat_count = 0
-    try:
-        import tools.signal_processor as signal_processor
-        active_signals = signal_processor.get_active_signals(state_filter=state_filter)
-        heat_data = []
-        for sig in active_signals:
-            if sig.get("Scope", "").lower() != "district":
-                continue  # Skip state-level signals (legislation) — no lat/lon
-            district = sig.get("District", "")
-            if not district:
-                continue
-            sig_key = csv_importer.normalize_name(district)
-            matched = _find_district_coords(districts, sig_key)
-            if not matched:
-                continue
-            try:
-                heat = int(sig.get("Heat Score", 0)) / 100.0
-            except (ValueError, TypeError):
-                heat = 0.3
-            heat_data.append([matched["lat"], matched["lon"], max(heat, 0.1)])
-        if heat_data:
-            HeatMap(
-                heat_data,
-                name=f"Signal Density ({len(heat_data)})",
-                show=False,
-                radius=25,
-                blur=20,
-                max_zoom=13,
-            ).add_to(m)
-            signal_heat_count = len(heat_data)
-            logger.info(f"Signal heatmap: {signal_heat_count} points")
-    except Exception as e:
-        logger.warning(f"Signal heatmap failed (non-fatal): {e}")
 
-    # ── Layer control ──
-    folium.LayerControl(collapsed=False).add_to(m)
+def _signal_heat(sf: str, fingerprint: str, active_signals: list, coords: "_CoordLookup") -> list:
+    """[[lat, lon, weight]] for district-scope signals, cached like a layer."""
+    import tools.csv_importer as csv_importer
 
-    # ── Title ──
-    title_html = f"""
-    <div style="position: fixed; top: 10px; left: 60px; z-index: 1000;
-         background-color: white; padding: 10px 15px; border-radius: 5px;
-         box-shadow: 0 2px 6px rgba(0,0,0,0.3); font-family: Arial;">
-        <b>Scout Territory Map</b>
-        {f' — {state_filter.upper()}' if state_filter else ''}<br>
-        <span style="color:green;">&#9679;</span> Active ({active_count})
-        <span style="color:orange;">&#9679;</span> Pipeline ({pipeline_count})
-        <span style="color:blue;">&#9679;</span> Prospects ({prospect_count})
-        <span style="color:purple;">&#9679;</span> ESAs ({esa_count})
-        <span style="color:gray;">&#9679;</span> Districts ({placed_districts})
-        {f'<br><span style="color:red;">&#9679;</span> Signals ({signal_heat_count})' if signal_heat_count else ''}
-    </div>
-    """
-    m.get_root().html.add_child(folium.Element(title_html))
+    with _cache_lock:
+        hit = _layer_cache.get(("signals", sf))
+    if hit is not None and hit[0] == fingerprint:
+        return json.loads(hit[1])
+
+    heat_data = []
+    for sig in active_signals:
+        if sig.get("Scope", "").lower() != "district":
+            continue  # Skip state-level signals (legislation) — no lat/lon
+        district = sig.get("District", "")
+        if not district:
+            continue
+        matched = coords.find(csv_importer.normalize_name(district))
+        if not matched:
+            continue
+        try:
+            heat = int(sig.get("Heat Score", 0)) / 100.0
+        except (ValueError, TypeError):
+            heat = 0.3
+        heat_data.append([matched[0], matched[1], max(heat, 0.1)])
+    with _cache_lock:
+        _layer_cache[("signals", sf)] = (fingerprint, json.dumps(heat_data), len(heat_data))
+    return heat_data
 
-    html = m._repr_html_()
-    logger.info(f"Territory map generated: {active_count} active, {pipeline_count} pipeline, "
-                f"{prospect_count} prospects, {esa_count} ESAs, {placed_districts} districts")
-    return html
 
+def _layer(name: str, sf: str, fingerprint: str, build) -> tuple[str, int]:
+    """(GeoJSON string, feature count) for a layer, rebuilt only on a new fingerprint.
 
-def generate_territory_map_file(output_path: str = "", state_filter: str = "") -> str:
-    """Generate map and save to HTML file. Returns file path."""
-    html = generate_territory_map(state_filter)
-    if not output_path:
-        output_path = os.path.join(tempfile.gettempdir(), "scout_territory_map.html")
-    with open(output_path, "w") as f:
-        f.write(html)
-    logger.info(f"Territory map saved to {output_path}")
-    return output_path
+    build() returns [(lat, lon, popup_html)].
+    """
+    with _cache_lock:
+        hit = _layer_cache.get((name, sf))
+    if hit is not None and hit[0] == fingerprint:
+        return hit[1], hit[2]
+    points = build()
+    geojson = _to_geojson(points)
+    with _cache_lock:
+        _layer_cache[(name, sf)] = (fingerprint, geojson, len(points))
+    return geojson, len(points)
+
+
+def _to_geojson(points) -> str:
+    """Compact FeatureCollection ([lon, lat] + popup), safe to inline in <script>."""
+    features = [
+        {"type": "Feature",
+         "geometry": {"type": "Point",
+                      "coordinates": [round(lon, _COORD_DECIMALS), round(lat, _COORD_DECIMALS)]},
+         "properties": {"p": popup}}
+        for lat, lon, popup in points
+    ]
+    text = json.dumps({"type": "FeatureCollection", "features": features},
+                      separators=(",", ":"), ensure_ascii=False)
+    return text.replace("</", "<\\/")
+
+
+def _digest(obj) -> str:
+    return hashlib.sha1(
+        json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+
+
+# ─────────────────────────────────────────────
+# DISTRICT BASE
+# ─────────────────────────────────────────────
+
+def _parse_coords(d: dict):
+    """(lat, lon) when both parse to non-zero finite floats, else None."""
+    try:
+        lat = float(d.get("Lat", 0))
+        lon = float(d.get("Lon", 0))
+    except (ValueError, TypeError):
+        return None
+    if not lat or not lon or not (math.isfinite(lat) and math.isfinite(lon)):
+        return None
+    return lat, lon
 
 
-def _find_district_coords(districts: list, name_key: str) -> dict | None:
-    """Find lat/lon for a district by name key. Falls back to fuzzy match."""
-    if not name_key:
-        return None
+def _build_district_base(districts: list) -> dict:
+    """Everything the map needs from Territory Districts, JSON-serializable.
 
-    # Exact match first
+    districts: [[name_key, lat, lon, popup]] for non-ESA rows with coordinates
+    esas:      [[lat, lon, popup]]
+    coords:    {name_key: [lat, lon]} — first row with usable coordinates
+    last:      {name_key: [lat, lon] | None} — last row per key (fuzzy fallback)
+    enrollment:{name_key: [Enrollment, School Count]} — last row per key
+    center:    [lat, lon] of the first row with coordinates, or None
+    """
+    base = {"districts": [], "esas": [], "coords": {}, "last": {}, "enrollment": {},
+            "center": None, "district_rows": len(districts)}
     for d in districts:
-        if d.get("Name Key", "") == name_key:
+        name_key = d.get("Name Key", "")
+        ll = _parse_coords(d)
+        if name_key:
+            base["last"][name_key] = list(ll) if ll else None
+            base["enrollment"][name_key] = [d.get("Enrollment", ""), d.get("School Count", "")]
+        if ll is None:
+            continue
+        lat, lon = ll
+        if base["center"] is None:
+            base["center"] = [lat, lon]
+        if name_key:
+            base["coords"].setdefault(name_key, [lat, lon])
+
+        name = d.get("District Name", "Unknown")
+        state = d.get("State", "")
+        city = d.get("City", "")
+        if str(d.get("Agency Type", "")) in _ESA_AGENCY_TYPES:
+            popup_html = (f"<b>{name}</b><br>"
+                          f"{city + ', ' if city else ''}{state}<br>"
+                          f"ESA / Service Center")
+            base["esas"].append([lat, lon, popup_html])
+            continue
+
+        enrollment = d.get("Enrollment", "")
+        school_count = d.get("School Count", "")
+        enroll_str = f"{int(enrollment):,}" if enrollment and str(enrollment).isdigit() else (enrollment or "—")
+        popup_html = (f"<b>{name}</b><br>"
+                      f"{city + ', ' if city else ''}{state}<br>"
+                      f"Enrollment: {enroll_str}"
+                      f"{f' | Schools: {school_count}' if school_count else ''}")
+        base["districts"].append([name_key, lat, lon, popup_html])
+    return base
+
+
+def _district_base(state: str) -> tuple[dict, int | None]:
+    """(base, partition generation) for one state: memory → derived table → rebuild."""
+    import tools.territory_data as territory_data
+
+    generation = territory_snapshot.partition_generation("districts", state)
+    if generation is not None:
+        with _cache_lock:
+            hit = _base_cache.get(state)
+        if hit is not None and hit[0] == generation:
+            return hit[1], generation
+        base = territory_snapshot.read_derived(_MAP_TABLE, state)
+        if base is None:
+            base = _build_district_base(territory_data._load_territory_districts(state))
             try:
-                lat = float(d.get("Lat", 0))
-                lon = float(d.get("Lon", 0))
-                if lat and lon:
-                    return {"lat": lat, "lon": lon}
-            except (ValueError, TypeError):
-                continue
-
-    # Fuzzy match fallback
-    import tools.csv_importer as csv_importer
-    candidate_map = {}
-    for d in districts:
-        dk = d.get("Name Key", "")
-        if dk:
-            candidate_map[dk] = d
-    fuzzy_key = csv_importer.fuzzy_match_name(name_key, candidate_map, threshold=0.7)
-    if fuzzy_key:
-        d = candidate_map[fuzzy_key]
-        try:
-            lat = float(d.get("Lat", 0))
-            lon = float(d.get("Lon", 0))
-            if lat and lon:
-                return {"lat": lat, "lon": lon}
-        except (ValueError, TypeError):
-            pass
+                territory_snapshot.write_derived(_MAP_TABLE, state, base, generation)
+            except OSError as e:
+                logger.warning(f"Map district table write failed for {state}: {e}")
+        with _cache_lock:
+            _base_cache[state] = (generation, base)
+        return base, generation
+    return _build_district_base(territory_data._load_territory_districts(state)), None
+
+
+def _district_layers(sf: str) -> tuple[dict, str]:
+    """(base, fingerprint) for the map's scope — one state, or every state combined.
+
+    Unsnapshotted data is rebuilt per call (fingerprinted by content).
+    """
+    import tools.territory_data as territory_data
+
+    if sf:
+        base, generation = _district_base(sf)
+        fp = _digest(["state", sf, generation]) if generation is not None else _digest(base)
+        return base, fp
+
+    if not territory_snapshot.is_complete("districts"):
+        base = _build_district_base(territory_data._load_territory_districts(""))
+        return base, _digest(base)
+
+    # All states: concatenate per-state bases in snapshot (= load_rows) order
+    combined = {"districts": [], "esas": [], "coords": {}, "last": {}, "enrollment": {},
+                "center": None, "district_rows": 0}
+    stamps = []
+    for st in territory_snapshot.snapshot_states("districts"):
+        base, generation = _district_base(st)
+        stamps.append([st, generation])
+        combined["districts"].extend(base["districts"])
+        combined["esas"].extend(base["esas"])
+        for key, ll in base["coords"].items():
+            combined["coords"].setdefault(key, ll)
+        combined["last"].update(base["last"])
+        combined["enrollment"].update(base["enrollment"])
+        combined["district_rows"] += base["district_rows"]
+        if combined["center"] is None:
+            combined["center"] = base["center"]
+    return combined, _digest(["all", stamps])
+
+
+class _CoordLookup:
+    """Name Key → (lat, lon): exact (first usable row), then fuzzy over all keys.
+
+    Same answers as the old per-call scan — fuzzy hits take the last row with
+    the matched key — with the fuzzy index built once and results memoized.
+    """
 
-    return None
+    def __init__(self, base: dict):
+        self._exact = base["coords"]
+        self._last = base["last"]
+        self._fuzzy = None
+        self._memo: dict[str, tuple | None] = {}
+
+    def find(self, name_key: str):
+        if not name_key:
+            return None
+        ll = self._exact.get(name_key)
+        if ll:
+            return ll[0], ll[1]
+        if name_key in self._memo:
+            return self._memo[name_key]
+
+        import tools.csv_importer as csv_importer
+        if self._fuzzy is None:
+            self._fuzzy = csv_importer.FuzzyNameIndex(self._last)
+        fuzzy_key = csv_importer.fuzzy_match_name(name_key, self._fuzzy, threshold=0.7)
+        ll = self._last.get(fuzzy_key) if fuzzy_key else None
+        hit = (ll[0], ll[1]) if ll else None
+        self._memo[name_key] = hit
+        return hit
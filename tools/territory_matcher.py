@@ -435,110 +435,25 @@ def generate_domain_roots(name: str) -> set[str]:
 # CACHE
 # ─────────────────────────────────────────────
 
-_cache = None
-_cache_loaded_at = 0.0
-_CACHE_TTL = 3600  # 1 hour
+_cache = None  # territory_index.TerritoryIndex (shared with other matchers)
+_CACHE_TTL = 3600  # 1 hour — SF domain→state lookup refresh
 
 
 def ensure_cache(force_reload: bool = False):
-    """Load territory data into memory indexes if not already cached."""
-    global _cache, _cache_loaded_at
+    """Bind the shared territory index (tools.territory_index), building it if needed.
 
-    if _cache and not force_reload and (time.time() - _cache_loaded_at) < _CACHE_TTL:
-        return
-
-    import tools.territory_data as territory_data
-
-    logger.info("territory_matcher: loading territory data into cache...")
-    t0 = time.time()
-
-    schools = territory_data._load_territory_schools()
-    districts = territory_data._load_territory_districts()
-
-    # Build indexes
-    schools_by_key = {}
-    schools_by_stripped = {}
-    districts_by_key = {}
-    districts_by_stripped = {}
-    by_domain_root = {}
-    by_city_state = {}
-
-    for s in schools:
-        nk = (s.get("Name Key") or "").strip().lower()
-        if nk:
-            schools_by_key.setdefault(nk, []).append(s)
-        sn = _strip_school_suffixes(s.get("School Name") or "")
-        if sn and len(sn) >= 3:
-            schools_by_stripped.setdefault(sn, []).append(s)
-        # City+state index
-        city = (s.get("City") or "").strip().lower()
-        state = (s.get("State") or "").strip().upper()
-        if city and state:
-            by_city_state.setdefault((city, state), []).append(s)
-
-    for d in districts:
-        nk = (d.get("Name Key") or "").strip().lower()
-        if nk:
-            districts_by_key.setdefault(nk, []).append(d)
-        dn = _strip_school_suffixes(d.get("District Name") or "")
-        if dn and len(dn) >= 3:
-            districts_by_stripped.setdefault(dn, []).append(d)
-        # Domain root index
-        d_name = d.get("District Name") or ""
-        for root in generate_domain_roots(d_name):
-            by_domain_root.setdefault(root, []).append(d)
-        # City+state index
-        city = (d.get("City") or "").strip().lower()
-        state = (d.get("State") or "").strip().upper()
-        if city and state:
-            by_city_state.setdefault((city, state), []).append(d)
-
-    # Build city → set of states map (for domain-based city lookup)
-    # Include both original city names AND space-stripped versions
-    # (domain roots have no spaces: "kippneworleans" needs to match "new orleans")
-    city_to_states = {}
-    for (city, state) in by_city_state:
-        city_to_states.setdefault(city, set()).add(state)
-        # Also add space-stripped version for domain containment matching
-        city_nospace = city.replace(" ", "")
-        if city_nospace != city:
-            city_to_states.setdefault(city_nospace, set()).add(state)
-
-    # Also build district name roots → state map (for domain matching)
-    district_name_to_states = {}
-    for d in districts:
-        d_name = (d.get("District Name") or "").strip().lower()
-        d_state = (d.get("State") or "").strip().upper()
-        if d_name and d_state:
-            # Normalize: strip common suffixes
-            core = _strip_school_suffixes(d_name)
-            if core and len(core) >= 4:
-                # Also strip spaces for domain matching
-                core_nospace = core.replace(" ", "")
-                district_name_to_states.setdefault(core_nospace, set()).add(d_state)
-
-    _cache = {
-        "schools": schools,
-        "districts": districts,
-        "schools_by_key": schools_by_key,
-        "schools_by_stripped": schools_by_stripped,
-        "districts_by_key": districts_by_key,
-        "districts_by_stripped": districts_by_stripped,
-        "by_domain_root": by_domain_root,
-        "by_city_state": by_city_state,
-        "city_to_states": city_to_states,
-        "district_name_to_states": district_name_to_states,
-    }
-    _cache_loaded_at = time.time()
+    The index is rebuilt when the territory snapshot generation changes — after
+    sync_territory, or when the hourly sheet re-check finds the tabs were edited
+    by hand (territory_data.refresh_snapshot_from_sheet) — or when force_reload
+    is set.
+    """
+    global _cache
+    import tools.territory_index as territory_index
 
-    elapsed = time.time() - t0
-    logger.info(
-        f"territory_matcher: cache loaded in {elapsed:.1f}s — "
-        f"{len(schools)} schools, {len(districts)} districts, "
-        f"{len(schools_by_key)} school keys, {len(districts_by_key)} district keys, "
-        f"{len(by_domain_root)} domain roots, {len(by_city_state)} city+state combos, "
-        f"{len(city_to_states)} unique cities, {len(district_name_to_states)} district name roots"
-    )
+    idx = territory_index.get_index(force_rebuild=force_reload)
+    if idx is not _cache:
+        _cache = idx
+        logger.info(f"territory_matcher: using territory index — {idx.stats()}")
 
 
 # ─────────────────────────────────────────────
@@ -580,8 +495,8 @@ def lookup_state_from_nces(email: str) -> str:
     if not domain_root or len(domain_root) < 4:
         return ""
 
-    city_to_states = _cache.get("city_to_states", {})
-    district_name_to_states = _cache.get("district_name_to_states", {})
+    city_to_states = _cache.city_to_states
+    district_name_to_states = _cache.district_name_to_states
 
     # Step 1: Strip education keywords from domain root to get core name
     core = domain_root
@@ -612,14 +527,34 @@ def lookup_state_from_nces(email: str) -> str:
 
     # Step 4: Check if a known NCES city is CONTAINED in domain root
     # Only check cities with 6+ chars to avoid false positives (troy, mesa, etc.)
-    for city_name, states in city_to_states.items():
-        if len(city_name) >= 6 and len(states) == 1:
-            if city_name in domain_root and city_name != domain_root:
-                return next(iter(states))
+    # The index holds just those cities (single-state, 6+ chars), in
+    # city_to_states order; max_len excludes city == domain_root.
+    city_index = _cache.unique_city_substring_index()
+    for pos in city_index.keys_in(domain_root, max_len=len(domain_root) - 1):
+        return next(iter(city_to_states[city_index.key(pos)]))
 
     return ""
 
 
+def lookup_states_from_nces(emails) -> list[str]:
+    """
+    Batch lookup_state_from_nces: one state code (or "") per email, in order.
+    Each distinct domain is resolved once. Requires cache to be loaded.
+    """
+    by_domain: dict[str, str] = {}
+    out = []
+    for email in emails:
+        if not email or "@" not in email:
+            out.append("")
+            continue
+        domain = email.lower().split("@")[-1].strip()
+        state = by_domain.get(domain)
+        if state is None:
+            state = by_domain[domain] = lookup_state_from_nces(email)
+        out.append(state)
+    return out
+
+
 # ─────────────────────────────────────────────
 # DOMAIN → STATE LOOKUP (from real SF data)
 # ─────────────────────────────────────────────
@@ -775,14 +710,15 @@ def get_cache_stats() -> dict:
         return {"loaded": False}
     return {
         "loaded": True,
-        "schools": len(_cache["schools"]),
-        "districts": len(_cache["districts"]),
-        "school_keys": len(_cache["schools_by_key"]),
-        "district_keys": len(_cache["districts_by_key"]),
-        "domain_roots": len(_cache["by_domain_root"]),
+        "schools": len(_cache.schools),
+        "districts": len(_cache.districts),
+        "school_keys": len(_cache.schools_by_key),
+        "district_keys": len(_cache.districts_by_key),
+        "domain_roots": len(_cache.by_domain_root),
         "sf_domain_lookup": len(_domain_state_lookup) if _domain_state_lookup else 0,
-        "city_state_combos": len(_cache["by_city_state"]),
-        "age_seconds": int(time.time() - _cache_loaded_at),
+        "city_state_combos": len(_cache.by_city_state),
+        "generation": _cache.generation,
+        "age_seconds": int(time.time() - _cache.built_at),
     }
 
 
@@ -833,7 +769,7 @@ def _match_by_email_domain(email: str, name_key: str, state: str) -> MatchResult
     domain_root = extract_domain_root(email)
     if not domain_root:
         return None
-    matches = _cache["by_domain_root"].get(domain_root, [])
+    matches = _cache.by_domain_root.get(domain_root, [])
     if state:
         matches = _filter_by_state(matches, state)
     if len(matches) == 1:
@@ -890,8 +826,8 @@ def match_record(
             return result
 
     # ── Tier 1: Exact normalized name match ──
-    for entity_type, index in [("school", _cache["schools_by_key"]),
-                                ("district", _cache["districts_by_key"])]:
+    for entity_type, index in [("school", _cache.schools_by_key),
+                                ("district", _cache.districts_by_key)]:
         matches = index.get(name_key, [])
         if state:
             matches = _filter_by_state(matches, state)
@@ -900,8 +836,8 @@ def match_record(
 
     # ── Tier 2: Suffix-stripped name match ──
     if stripped and len(stripped) >= 3:
-        for entity_type, index in [("school", _cache["schools_by_stripped"]),
-                                    ("district", _cache["districts_by_stripped"])]:
+        for entity_type, index in [("school", _cache.schools_by_stripped),
+                                    ("district", _cache.districts_by_stripped)]:
             matches = index.get(stripped, [])
             if state:
                 matches = _filter_by_state(matches, state)
@@ -920,7 +856,7 @@ def match_record(
     # ── Tier 4: City + token overlap ──
     city_lower = city.strip().lower() if city else ""
     if city_lower and state:
-        city_records = _cache["by_city_state"].get((city_lower, state), [])
+        city_records = _cache.by_city_state.get((city_lower, state), [])
         if city_records:
             input_tokens = set(stripped.split()) if stripped else set(name_key.split())
             best_match = None
@@ -949,10 +885,15 @@ def match_record(
                 return _record_to_result(rec, entity_type, conf, f"city_token_overlap({best_overlap:.0%})")
 
     # ── Tier 5: Containment match (state required) ──
+    # Substring index yields, in key order, only the keys that contain or are
+    # contained in `stripped` — same first-match result as scanning every key.
     if state and stripped and len(stripped) >= 8:
-        for entity_type, index in [("school", _cache["schools_by_stripped"]),
-                                    ("district", _cache["districts_by_stripped"])]:
-            for rec_stripped, recs in index.items():
+        for entity_type, index in [("school", _cache.schools_by_stripped),
+                                    ("district", _cache.districts_by_stripped)]:
+            sub_index = _cache.stripped_substring_index(entity_type)
+            for pos in sub_index.containment_candidates(stripped, min_ratio=0.5):
+                rec_stripped = sub_index.key(pos)
+                recs = index[rec_stripped]
                 if len(rec_stripped) < 6:
                     continue
                 # Check containment in both directions
@@ -969,6 +910,34 @@ def match_record(
     return None
 
 
+# Batch pool for match_records(workers=...): below this many records the
+# pool's start-up (each worker loads the index) costs more than it saves
+_PARALLEL_MIN_RECORDS = 2000
+_PARALLEL_MAX_CHUNK = 2000
+
+
+def _record_match_args(rec: dict, name_field: str, email_field: str,
+                       city_field: str, state_field: str) -> tuple[str, str, str, str]:
+    name = rec.get(name_field) or ""
+    email = rec.get(email_field) or ""
+    # Handle email as list (Outreach returns emails as list)
+    if isinstance(email, list):
+        email = email[0] if email else ""
+    return name, email, rec.get(city_field) or "", rec.get(state_field) or ""
+
+
+def _match_chunk(args: tuple[list[tuple[str, str, str, str]], bool]) -> list[MatchResult | None]:
+    """Match (name, email, city, state) tuples in order (also the pool's task)."""
+    chunk, email_priority = args
+    return [match_record(name, email=email, city=city, state=state, email_priority=email_priority)
+            for name, email, city, state in chunk]
+
+
+def _pool_init():
+    """Pool worker start-up: load the read-only territory index once per process."""
+    ensure_cache()
+
+
 def match_records(
     records: list[dict],
     *,
@@ -977,25 +946,53 @@ def match_records(
     city_field: str = "city",
     state_field: str = "state",
     email_priority: bool = False,
+    workers: int = 1,
+    stats: dict | None = None,
 ) -> list[tuple[dict, MatchResult | None]]:
     """
     Match a batch of records. Loads cache once, then matches each record.
-    Returns list of (original_record, match_result_or_None) tuples.
+    Returns list of (original_record, match_result_or_None) tuples, in input order.
+
+    workers > 1 shards the batch across a pool of spawned processes, each of
+    which loads the territory index once (from the warm-start file the parent
+    makes sure exists). For standalone scripts only (scripts/match_leads_csv.py):
+    the bot calls this with the default workers=1 and stays in-process.
+    Batches under _PARALLEL_MIN_RECORDS always run in-process. Pass a dict as
+    stats to get {records, workers, seconds, records_per_sec} back; throughput
+    is logged too.
     """
+    t0 = time.time()
     ensure_cache()
-    results = []
-    for rec in records:
-        name = rec.get(name_field) or ""
-        email = rec.get(email_field) or ""
-        city_val = rec.get(city_field) or ""
-        state_val = rec.get(state_field) or ""
-        # Handle email as list (Outreach returns emails as list)
-        if isinstance(email, list):
-            email = email[0] if email else ""
-        match = match_record(name, email=email, city=city_val, state=state_val,
-                             email_priority=email_priority)
-        results.append((rec, match))
-    return results
+    args = [_record_match_args(rec, name_field, email_field, city_field, state_field)
+            for rec in records]
+    if len(args) < _PARALLEL_MIN_RECORDS:
+        workers = 1
+
+    if workers <= 1:
+        workers = 1
+        matches = _match_chunk((args, email_priority))
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        import tools.territory_index as territory_index
+
+        # Workers warm-start from the persisted index instead of rebuilding it
+        territory_index.ensure_persisted()
+        chunk_size = max(1, min(_PARALLEL_MAX_CHUNK, -(-len(args) // (workers * 4))))
+        chunks = [(args[i:i + chunk_size], email_priority)
+                  for i in range(0, len(args), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_pool_init,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            matches = [m for part in pool.map(_match_chunk, chunks) for m in part]
+
+    elapsed = time.time() - t0
+    rate = len(args) / elapsed if elapsed > 0 else 0.0
+    logger.info(f"territory_matcher: matched {len(args)} records with {workers} worker(s) "
+                f"in {elapsed:.1f}s ({rate:,.0f} records/s)")
+    if stats is not None:
+        stats.update({"records": len(args), "workers": workers,
+                      "seconds": round(elapsed, 3), "records_per_sec": round(rate, 1)})
+    return list(zip(records, matches))
 
 
 # ─────────────────────────────────────────────
@@ -0,0 +1,538 @@
+"""
+tools/territory_snapshot.py — Local columnar snapshot of the NCES territory tabs.
+
+The Territory Districts / Territory Schools tabs hold tens of thousands of rows.
+Reading them over the Sheets API costs several seconds per call, and almost every
+territory-aware command (proximity, matcher cache, signal NCES lookup, gaps, map)
+reads them again. This module keeps an on-disk copy that loads in milliseconds.
+
+Layout (one file per kind + state, so state-filtered reads touch one file):
+  {TERRITORY_SNAPSHOT_DIR}/manifest.json        generation counter + per-state row counts
+  {TERRITORY_SNAPSHOT_DIR}/districts_TX.col     columnar, memory-mappable
+  {TERRITORY_SNAPSHOT_DIR}/schools_TX.col
+  {TERRITORY_SNAPSHOT_DIR}/esa_TX.derived.json  derived per-state tables (see below)
+
+.col file format (little-endian):
+  8 bytes  magic b"SCTSNAP1"
+  4 bytes  uint32 header length
+  N bytes  JSON header: {kind, state, rows, generation, columns: [...]}
+  body     one block per column, 8-byte aligned:
+             str   → uint32 offsets (rows + 1) followed by a UTF-8 blob
+             int   → int64 values, _INT_MISSING for blank
+             float → float64 values, NaN for blank
+
+Written by territory_data.sync_territory after each state is synced, and seeded
+from a full Sheets read the first time a process finds no snapshot. Readers get
+the same list[dict] of strings the Sheets path returns, or typed columns via
+read_table() for consumers that only need a few fields (lat/lon/enrollment).
+
+Derived tables (write_derived / read_derived) are JSON artifacts computed from
+one state's partition — e.g. proximity_engine's district → ESA assignments.
+Each is stamped with the generation of the partition it was computed from and
+read back only while that partition is unchanged, so a sync (or clear)
+invalidates it without any bookkeeping by the writer.
+
+Usage (module-level, not a class):
+  import tools.territory_snapshot as territory_snapshot
+  rows = territory_snapshot.load_rows("districts", "TX")   # None → not snapshotted
+  table = territory_snapshot.read_table("districts", "TX")
+  lats = table.column("Lat")
+"""
+
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from agent.config import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────
+# CONSTANTS
+# ─────────────────────────────────────────────
+
+# Persistent by default (DATA_DIR) — the warm start is needed most right after a redeploy
+SNAPSHOT_DIR = os.environ.get("TERRITORY_SNAPSHOT_DIR", os.path.join(DATA_DIR, "territory_snapshot"))
+
+KINDS = ("districts", "schools")
+
+_DERIVED_SUFFIX = ".derived.json"
+
+_MAGIC = b"SCTSNAP1"
+_FORMAT_VERSION = 1
+_INT_MISSING = -(2 ** 63)
+
+# Typed columns — everything else is stored as a string column
+_COLUMN_TYPES = {
+    "Enrollment": "int",
+    "School Count": "int",
+    "Lat": "float",
+    "Lon": "float",
+}
+
+_write_lock = threading.Lock()
+_table_cache: dict[str, tuple[tuple, "SnapshotTable"]] = {}
+_table_cache_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────
+# HELPERS
+# ─────────────────────────────────────────────
+
+def _manifest_path() -> str:
+    return os.path.join(SNAPSHOT_DIR, "manifest.json")
+
+
+def _table_path(kind: str, state: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{kind}_{state.upper()}.col")
+
+
+def _derived_path(name: str, state: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{name}_{state.upper()}{_DERIVED_SUFFIX}")
+
+
+def _empty_manifest() -> dict:
+    return {
+        "version": _FORMAT_VERSION,
+        "generation": 0,
+        "updated_at": "",
+        "complete": {k: False for k in KINDS},
+        "states": {k: {} for k in KINDS},
+    }
+
+
+def read_manifest() -> dict:
+    """Return the snapshot manifest, or an empty one if no snapshot exists."""
+    try:
+        with open(_manifest_path(), "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != _FORMAT_VERSION:
+            return _empty_manifest()
+        return manifest
+    except (OSError, ValueError):
+        return _empty_manifest()
+
+
+def _write_manifest(manifest: dict):
+    manifest["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    tmp = _manifest_path() + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _manifest_path())
+
+
+def get_generation() -> int:
+    """Current snapshot generation. Bumped on every write; 0 = no snapshot."""
+    return int(read_manifest().get("generation", 0))
+
+
+def _to_int(val):
+    if val is None or val == "":
+        return _INT_MISSING
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        try:
+            return int(float(val))
+        except (ValueError, TypeError):
+            return _INT_MISSING
+
+
+def _to_float(val):
+    if val is None or val == "":
+        return math.nan
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def normalize_row(columns: list[str], row: list) -> list[str]:
+    """Return row as the strings load_rows() gives back after a snapshot round-trip.
+
+    Lets callers compare freshly built rows (ints/floats/strings) against
+    snapshot rows without false differences from number formatting.
+    """
+    out = []
+    for ci, col in enumerate(columns):
+        v = row[ci] if ci < len(row) else ""
+        ctype = _COLUMN_TYPES.get(col, "str")
+        if ctype == "int":
+            iv = _to_int(v)
+            out.append("" if iv == _INT_MISSING else str(iv))
+        elif ctype == "float":
+            fv = _to_float(v)
+            out.append("" if math.isnan(fv) else repr(fv))
+        else:
+            out.append("" if v is None else str(v))
+    return out
+
+
+def _pad8(buf: bytearray):
+    while len(buf) % 8:
+        buf.append(0)
+
+
+def _native(arr: array) -> array:
+    """Return a little-endian copy of arr for writing."""
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+# ─────────────────────────────────────────────
+# WRITE
+# ─────────────────────────────────────────────
+
+def _encode_table(kind: str, state: str, columns: list[str], rows: list[list],
+                  generation: int) -> bytes:
+    """Encode rows (lists ordered like columns) into the .col format."""
+    n = len(rows)
+    body = bytearray()
+    col_meta = []
+    for ci, col in enumerate(columns):
+        ctype = _COLUMN_TYPES.get(col, "str")
+        values = [row[ci] if ci < len(row) else "" for row in rows]
+        _pad8(body)
+        meta = {"name": col, "type": ctype, "offset": len(body)}
+        if ctype == "int":
+            body += _native(array("q", (_to_int(v) for v in values))).tobytes()
+        elif ctype == "float":
+            body += _native(array("d", (_to_float(v) for v in values))).tobytes()
+        else:
+            blob = bytearray()
+            offsets = array("I", [0])
+            for v in values:
+                blob += ("" if v is None else str(v)).encode("utf-8")
+                offsets.append(len(blob))
+            body += _native(offsets).tobytes()
+            meta["data_offset"] = len(body)
+            meta["data_length"] = len(blob)
+            body += blob
+        col_meta.append(meta)
+
+    header = json.dumps({
+        "kind": kind, "state": state, "rows": n,
+        "generation": generation, "columns": col_meta,
+    }).encode("utf-8")
+    prefix = _MAGIC + struct.pack("<I", len(header)) + header
+    pad = (-len(prefix)) % 8
+    return prefix + b"\0" * pad + bytes(body)
+
+
+def _write_table_file(kind: str, state: str, columns: list[str], rows: list[list],
+                      generation: int):
+    path = _table_path(kind, state)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_encode_table(kind, state, columns, rows, generation))
+    os.replace(tmp, path)
+
+
+def _group_by_state(columns: list[str], rows: list[list]) -> dict[str, list[list]]:
+    state_idx = columns.index("State")
+    by_state: dict[str, list[list]] = {}
+    for row in rows:
+        st = (str(row[state_idx]) if state_idx < len(row) else "").strip().upper()
+        if st:
+            by_state.setdefault(st, []).append(row)
+    return by_state
+
+
+def write_states(kind: str, columns: list[str], rows: list[list],
+                 states: list[str] | None = None, complete: bool | None = None) -> int:
+    """Write (replace) the snapshot partitions for the given states.
+
+    Args:
+        kind: "districts" or "schools".
+        columns: column schema the rows are ordered by (DISTRICT_COLUMNS / SCHOOL_COLUMNS).
+        rows: sheet-style rows (lists). Rows for states not in `states` are ignored.
+        states: partitions to replace. None = every state present in rows.
+            A listed state with no rows is written as an empty partition.
+        complete: True when rows are the whole tab (every other partition is
+            dropped); None leaves the completeness flag unchanged.
+
+    Returns the new snapshot generation.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown snapshot kind: {kind}")
+    by_state = _group_by_state(columns, rows)
+    if states is None:
+        states = sorted(by_state)
+    states = [s.strip().upper() for s in states if s and s.strip()]
+
+    with _write_lock:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        manifest = read_manifest()
+        generation = int(manifest.get("generation", 0)) + 1
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        if complete:
+            for old_state in list(manifest["states"][kind]):
+                if old_state not in states:
+                    try:
+                        os.remove(_table_path(kind, old_state))
+                    except OSError:
+                        pass
+                    manifest["states"][kind].pop(old_state, None)
+
+        for st in states:
+            st_rows = by_state.get(st, [])
+            _write_table_file(kind, st, columns, st_rows, generation)
+            manifest["states"][kind][st] = {"rows": len(st_rows), "written_at": now}
+
+        if complete is not None:
+            manifest["complete"][kind] = bool(complete)
+        manifest["generation"] = generation
+        _write_manifest(manifest)
+
+    logger.info(
+        f"territory_snapshot: wrote {kind} for {len(states)} state(s) "
+        f"({sum(len(by_state.get(s, [])) for s in states)} rows), generation {generation}"
+    )
+    return generation
+
+
+def write_dict_rows(kind: str, columns: list[str], records: list[dict],
+                    states: list[str] | None = None, complete: bool | None = None) -> int:
+    """write_states() for list[dict] rows as returned by the Sheets loaders."""
+    rows = [[rec.get(col, "") for col in columns] for rec in records]
+    return write_states(kind, columns, rows, states=states, complete=complete)
+
+
+def clear():
+    """Delete every snapshot partition. Next load falls back to Sheets and reseeds."""
+    with _write_lock:
+        manifest = read_manifest()
+        for kind in KINDS:
+            for st in list(manifest["states"][kind]):
+                try:
+                    os.remove(_table_path(kind, st))
+                except OSError:
+                    pass
+        empty = _empty_manifest()
+        empty["generation"] = int(manifest.get("generation", 0)) + 1
+        if os.path.isdir(SNAPSHOT_DIR):
+            for fname in os.listdir(SNAPSHOT_DIR):
+                if fname.endswith(_DERIVED_SUFFIX):
+                    try:
+                        os.remove(os.path.join(SNAPSHOT_DIR, fname))
+                    except OSError:
+                        pass
+            _write_manifest(empty)
+    with _table_cache_lock:
+        _table_cache.clear()
+
+
+# ─────────────────────────────────────────────
+# READ
+# ─────────────────────────────────────────────
+
+class SnapshotTable:
+    """Memory-mapped view over one .col partition."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        if bytes(buf[:8]) != _MAGIC:
+            raise ValueError(f"Not a territory snapshot: {path}")
+        (hlen,) = struct.unpack("<I", buf[8:12])
+        header = json.loads(bytes(buf[12:12 + hlen]))
+        base = 12 + hlen
+        base += (-base) % 8
+
+        self.kind = header["kind"]
+        self.state = header["state"]
+        self.rows = header["rows"]
+        self.generation = header["generation"]
+        self.columns = [c["name"] for c in header["columns"]]
+        self._meta = {c["name"]: c for c in header["columns"]}
+        self._base = base
+        self._buf = buf
+        self._decoded: dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _typed(self, meta: dict, typecode: str) -> array:
+        start = self._base + meta["offset"]
+        width = array(typecode).itemsize
+        arr = array(typecode)
+        arr.frombytes(self._buf[start:start + width * self.rows])
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr
+
+    def raw(self, name: str):
+        """Typed column: array('q') / array('d') for numeric, list[str] for strings."""
+        meta = self._meta[name]
+        if meta["type"] == "int":
+            return self._typed(meta, "q")
+        if meta["type"] == "float":
+            return self._typed(meta, "d")
+        return self.strings(name)
+
+    def strings(self, name: str) -> list[str]:
+        """String column decoded to a list (cached per table)."""
+        cached = self._decoded.get(name)
+        if cached is not None:
+            return cached
+        meta = self._meta[name]
+        if meta["type"] == "int":
+            out = ["" if v == _INT_MISSING else str(v) for v in self._typed(meta, "q")]
+        elif meta["type"] == "float":
+            out = ["" if math.isnan(v) else repr(v) for v in self._typed(meta, "d")]
+        else:
+            start = self._base + meta["offset"]
+            n1 = self.rows + 1
+            offsets = array("I")
+            offsets.frombytes(self._buf[start:start + 4 * n1])
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            d0 = self._base + meta["data_offset"]
+            blob = bytes(self._buf[d0:d0 + meta["data_length"]]).decode("utf-8")
+            if blob.isascii():
+                out = [blob[offsets[i]:offsets[i + 1]] for i in range(self.rows)]
+            else:
+                raw = bytes(self._buf[d0:d0 + meta["data_length"]])
+                out = [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+        self._decoded[name] = out
+        return out
+
+    def column(self, name: str):
+        """Typed column with blanks as None (int/float) — convenient for Python loops."""
+        meta = self._meta[name]
+        if meta["type"] == "int":
+            return [None if v == _INT_MISSING else v for v in self._typed(meta, "q")]
+        if meta["type"] == "float":
+            return [None if math.isnan(v) else v for v in self._typed(meta, "d")]
+        return self.strings(name)
+
+    def to_dicts(self) -> list[dict]:
+        """Materialize rows as list[dict] of strings, same shape as the Sheets loaders."""
+        cols = [self.strings(c) for c in self.columns]
+        names = self.columns
+        return [dict(zip(names, vals)) for vals in zip(*cols)] if self.rows else []
+
+
+def read_table(kind: str, state: str) -> SnapshotTable | None:
+    """Open (or reuse) the mmap'd partition for kind+state. None if absent."""
+    path = _table_path(kind, state)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _table_cache_lock:
+        hit = _table_cache.get(path)
+        if hit and hit[0] == sig:
+            return hit[1]
+    try:
+        table = SnapshotTable(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"territory_snapshot: unreadable {path}: {e}")
+        return None
+    with _table_cache_lock:
+        _table_cache[path] = (sig, table)
+    return table
+
+
+def snapshot_states(kind: str) -> list[str]:
+    """States present in the snapshot for this kind."""
+    return sorted(read_manifest()["states"].get(kind, {}))
+
+
+def is_complete(kind: str) -> bool:
+    """True if the snapshot holds the whole tab (not just a few synced states)."""
+    return bool(read_manifest()["complete"].get(kind))
+
+
+def load_rows(kind: str, state_filter: str = "") -> list[dict] | None:
+    """Load rows from the snapshot.
+
+    Returns list[dict] (same shape as territory_data's Sheets loaders), or None
+    when the snapshot can't answer — caller should fall back to Sheets.
+    """
+    manifest = read_manifest()
+    present = manifest["states"].get(kind, {})
+    complete = manifest["complete"].get(kind, False)
+    t0 = time.time()
+
+    if state_filter:
+        st = state_filter.strip().upper()
+        if st not in present:
+            return [] if complete else None
+        table = read_table(kind, st)
+        if table is None:
+            return None
+        rows = table.to_dicts()
+    else:
+        if not complete:
+            return None
+        rows = []
+        for st in sorted(present):
+            table = read_table(kind, st)
+            if table is None:
+                return None
+            rows.extend(table.to_dicts())
+
+    logger.debug(
+        f"territory_snapshot: loaded {len(rows)} {kind} "
+        f"({state_filter or 'all states'}) in {(time.time() - t0) * 1000:.0f}ms"
+    )
+    return rows
+
+
+# ─────────────────────────────────────────────
+# DERIVED TABLES
+# ─────────────────────────────────────────────
+
+def partition_generation(kind: str, state: str) -> int | None:
+    """Generation the kind+state partition was written at. None if absent."""
+    table = read_table(kind, (state or "").strip().upper())
+    return table.generation if table is not None else None
+
+
+def write_derived(name: str, state: str, data, generation: int,
+                  source_kind: str = "districts") -> None:
+    """Persist a JSON-serializable table derived from one state's partition.
+
+    generation is the source partition's generation when its rows were read
+    (partition_generation before loading), so a concurrent resync leaves the
+    table stale rather than mislabelled.
+    """
+    st = state.strip().upper()
+    path = _derived_path(name, st)
+    payload = {"name": name, "state": st, "source": source_kind,
+               "generation": generation, "data": data}
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def read_derived(name: str, state: str, source_kind: str = "districts"):
+    """Return a derived table's data, or None if missing or its source partition changed."""
+    st = (state or "").strip().upper()
+    generation = partition_generation(source_kind, st)
+    if generation is None:
+        return None
+    try:
+        with open(_derived_path(name, st), "r") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get("generation") != generation or payload.get("source") != source_kind:
+        return None
+    return payload.get("data")